@@ -0,0 +1,79 @@
+"""Render orders of a product to export files without the GUI.
+
+Usage:
+    python batch.py "Sticker Laundry" --orders 1-40,52 [--formats pdf,png] [--dpi 1200]
+                    [--from 01-09-2025] [--to 30-09-2025] [--fresh] [--trace]
+"""
+import argparse
+import logging
+import os
+import signal
+import sys
+from datetime import datetime, timedelta
+
+# Qt is only used to rasterize SVG custom images; never open a window
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from src.batch import OrderBatchJob, OrderInputError
+
+
+def _parse_date(value: str) -> datetime:
+    try:
+        return datetime.strptime("-".join(f"0{el}" if len(el) == 1 else el for el in value.split("-")), "%d-%m-%Y")
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"date must be dd-mm-YYYY, got {value!r}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("product", help="product name as saved in _internal/products")
+    parser.add_argument("--orders", required=True, help='order ids, e.g. "1-10" or "3,7,9" or "1,2,4-8,10"')
+    parser.add_argument("--formats", default="pdf", help="comma separated: pdf, png, jpg, bmp (default: pdf)")
+    parser.add_argument("--dpi", type=int, default=1200, help="render resolution (default: 1200)")
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    parser.add_argument("--from", dest="date_from", type=_parse_date, default=today - timedelta(days=30),
+                        help="first Dropbox order date to index (dd-mm-YYYY, default: 30 days ago)")
+    parser.add_argument("--to", dest="date_to", type=_parse_date, default=today,
+                        help="last Dropbox order date to index (dd-mm-YYYY, default: today)")
+    parser.add_argument("--fresh", action="store_true",
+                        help="start over instead of resuming an interrupted run of the same orders")
+    parser.add_argument("--trace", action="store_true",
+                        help="write a Chrome trace of the run's stage timings to the logs folder")
+    parser.add_argument("-v", "--verbose", action="store_true", help="debug logging")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format="[%(asctime)s %(name)s] [%(levelname)s] %(message)s",
+    )
+    logging.getLogger("PIL").setLevel(logging.WARNING)
+    if args.dpi <= 0:
+        parser.error("--dpi must be a positive integer")
+    if args.date_from > args.date_to:
+        parser.error("--from must be before or equal to --to")
+
+    job = OrderBatchJob(
+        args.product,
+        args.orders,
+        formats=args.formats.split(","),
+        dpi=args.dpi,
+        dropbox_from=args.date_from,
+        dropbox_to=args.date_to,
+        resume=not args.fresh,
+        trace=args.trace,
+    )
+    signal.signal(signal.SIGINT, lambda *_: job.cancel())
+    try:
+        result = job.run()
+    except OrderInputError as e:
+        logging.error(str(e))
+        return 2
+
+    if result.get("failed_orders"):
+        logging.error(f"Failed orders: {result['failed_orders']}")
+    logging.info(f"Batch finished: {result['status']}")
+    return 0 if result["status"] == "success" else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,173 @@
+"""Throughput benchmark for the EZCAD SDK bridge on the fake DLL backend.
+
+Runs an in-process ``SDKServer`` with ``backend="fake"`` and drives it through
+the regular ``SDKClient`` / ``EzdExporter`` stack, so the numbers include JSON
+RPC, socket and exporter overhead but not the real MarkEzd.dll.
+
+Usage:
+    python -m benchmarks.bench_sdk_bridge [--latency-scale 1.0] [--slots 40] [--json out.json]
+"""
+import argparse
+import json
+import socket
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from PIL import Image
+
+from src.canvas.ezd_export import EzdExporter
+from src.canvas.pen_settings import PenCollection
+from src.core import state as app_state
+from src.sdk.ezcad_sdk import EzcadSDK
+from src.sdk.sdk_client import SDKClient
+from src.sdk.sdk_server import SDKServer
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _start_server(port: int, latency_scale: float) -> SDKServer:
+    EzcadSDK._instance = None
+    server = SDKServer(port=port, backend="fake")
+    server._init_sdk()
+    server.sdk.dll.latency_scale = latency_scale
+    threading.Thread(target=server.start, daemon=True).start()
+    return server
+
+
+class _RpcCounter:
+    def __init__(self, client: SDKClient):
+        self.count = 0
+        original = client._exchange
+
+        def counted(method, params):
+            self.count += 1
+            return original(method, params)
+
+        client._exchange = counted
+
+
+def _grid(count: int, columns: int = 8, pitch_mm: float = 25.0) -> list[tuple[float, float]]:
+    return [(5.0 + (i % columns) * pitch_mm, 5.0 + (i // columns) * pitch_mm) for i in range(count)]
+
+
+def _reference_jigs(image_path: str, slots: int) -> dict[str, list[dict]]:
+    positions = _grid(slots)
+    # Every canvas item has its own z (new items get max z + 1)
+    return {
+        "identical_images": [
+            {"type": "image", "path": image_path, "x_mm": x, "y_mm": y, "w_mm": 20.0, "h_mm": 20.0, "z": i + 1}
+            for i, (x, y) in enumerate(positions)
+        ],
+        "distinct_images": [
+            {"type": "image", "path": image_path, "x_mm": x, "y_mm": y, "w_mm": 20.0 + i * 0.01, "h_mm": 20.0, "z": i + 1}
+            for i, (x, y) in enumerate(positions)
+        ],
+        "identical_texts": [
+            {"type": "text", "text": "SAMPLE", "x_mm": x + 10.0, "y_mm": y + 10.0, "text_width_mm": 18.0, "text_height_mm": 4.0, "z": i + 1}
+            for i, (x, y) in enumerate(positions)
+        ],
+        "identical_barcodes": [
+            {"type": "barcode", "label": "123456789", "x_mm": x, "y_mm": y, "w_mm": 20.0, "h_mm": 8.0, "z": i + 1}
+            for i, (x, y) in enumerate(positions)
+        ],
+    }
+
+
+def _timed(func, *args, **kwargs) -> float:
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def _calls_per_second(func, duration: float = 1.0) -> float:
+    calls = 0
+    deadline = time.perf_counter() + duration
+    start = time.perf_counter()
+    while time.perf_counter() < deadline:
+        func()
+        calls += 1
+    return calls / (time.perf_counter() - start)
+
+
+def run(latency_scale: float = 1.0, slots: int = 40) -> dict:
+    port = _free_port()
+    server = _start_server(port, latency_scale)
+    dll = server.sdk.dll
+
+    SDKClient.reset()
+    app_state._sdk_client = None
+    client = SDKClient(port=port)
+    rpc = _RpcCounter(client)
+    exporter = EzdExporter()
+    results = {"latency_scale": latency_scale, "slots": slots}
+
+    results["initialize_s"] = _timed(client.ensure_initialized)
+    results["ping_per_s"] = _calls_per_second(client.ping)
+    results["get_entity_count_per_s"] = _calls_per_second(lambda: client.get_entity_count())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        image_path = str(Path(tmp) / "logo.png")
+        Image.new("RGBA", (64, 64), (0, 0, 0, 255)).save(image_path)
+
+        results["apply_pens_s"] = _timed(exporter._apply_pen_settings, PenCollection())
+
+        jigs = {}
+        for name, items in _reference_jigs(image_path, slots).items():
+            dll.call_counts.clear()
+            rpc.count = 0
+            elapsed = _timed(exporter.export_scene, items, str(Path(tmp) / f"{name}.ezd"), 200.0, 200.0)
+            jigs[name] = {
+                "export_s": elapsed,
+                "rpc_calls": rpc.count,
+                "dll_calls": sum(dll.call_counts.values()),
+                "entities": len(dll.entities),
+            }
+        results["jigs"] = jigs
+
+    if jigs["distinct_images"]["export_s"] > 0:
+        results["image_batching_speedup"] = jigs["distinct_images"]["export_s"] / max(jigs["identical_images"]["export_s"], 1e-9)
+
+    SDKClient.reset()
+    app_state._sdk_client = None
+    server.stop()
+    EzcadSDK._instance = None
+    return results
+
+
+def _print_report(results: dict):
+    print(f"latency scale:          {results['latency_scale']}")
+    print(f"initialize:             {results['initialize_s'] * 1000:.1f} ms")
+    print(f"ping:                   {results['ping_per_s']:.0f} calls/s")
+    print(f"get_entity_count:       {results['get_entity_count_per_s']:.0f} calls/s")
+    print(f"apply 256 pens:         {results['apply_pens_s'] * 1000:.1f} ms")
+    print(f"{'jig':<22}{'export ms':>12}{'rpc':>8}{'dll':>8}{'entities':>10}")
+    for name, jig in results["jigs"].items():
+        print(f"{name:<22}{jig['export_s'] * 1000:>12.1f}{jig['rpc_calls']:>8}{jig['dll_calls']:>8}{jig['entities']:>10}")
+    if "image_batching_speedup" in results:
+        print(f"template cloning speedup (images): {results['image_batching_speedup']:.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency-scale", type=float, default=1.0)
+    parser.add_argument("--slots", type=int, default=40)
+    parser.add_argument("--json", type=str, default="")
+    args = parser.parse_args()
+
+    results = run(latency_scale=args.latency_scale, slots=args.slots)
+    _print_report(results)
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,7 @@ from src import App, SelectProductScreen, APP_TITLE
 from src.screens.common import *
 from src.screens.nonsticker import *
 from src.screens.sticker import *
-from src.core.state import close_sdk_client
+from src.core.state import close_sdk_client, warm_sdk_client
 
 
 if __name__ == "__main__":
@@ -11,6 +11,7 @@ if __name__ == "__main__":
     logging.getLogger("PIL").setLevel(logging.WARNING)
     app = App(title=APP_TITLE)
     app.show_screen(SelectProductScreen)
+    warm_sdk_client()
     # app.show_screen(NStickerCanvasScreen)
     try:
         app.mainloop()
@@ -0,0 +1 @@
+from .job import OrderBatchJob, OrderInputError, parse_order_input, normalize_formats
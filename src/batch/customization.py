@@ -0,0 +1,162 @@
+"""Extraction of the customizations an Amazon order asks to print.
+
+`CustomizationExtractor` turns ``customizationInfo`` of an order into the
+objects placed into pattern slots (``{"front": [...], "back": [...]}``).
+It is built once per batch so the known font families are read once, and
+every per-order lookup (image placements in ``customizationData``, option
+image occurrences) is computed at most once per order, however many areas
+refer to it.
+"""
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["CustomizationExtractor", "get_image_customization_objs"]
+
+
+def get_image_customization_objs(root_obj: Union[Dict[str, Any], List[Dict[str, Any]]]) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+    """Find the placements holding an ``ImageCustomization`` in `root_obj`.
+
+    A dict whose ``type`` is ImageCustomization is returned as is, which makes
+    its parent (the placement with ``buyerPlacement``) the collected object.
+    """
+    if isinstance(root_obj, dict):
+        root_obj_iter = [root_obj]
+    else:
+        root_obj_iter = root_obj
+
+    founded_objs: List[Dict[str, Any]] = []
+    for object in root_obj_iter:
+        for key, value in object.items():
+            if isinstance(value, (set, list, tuple, dict)):
+                founded_obj = get_image_customization_objs(value)
+                if isinstance(founded_obj, dict):
+                    founded_objs.append(object)
+                elif isinstance(founded_obj, list) and founded_obj:
+                    founded_objs.extend(founded_obj)
+            if key == "type" and value == "ImageCustomization":
+                return object
+
+    return founded_objs
+
+
+class _OrderLookup:
+    """Per-order tables, each built on first use."""
+
+    def __init__(self, order_info: Dict[str, Any]) -> None:
+        self.order_info = order_info
+        self._order_text: Optional[str] = None
+        self._occurrences: Dict[str, int] = {}
+        self._images: Optional[List[Dict[str, Any]]] = None
+
+    def occurrences(self, value: str) -> int:
+        """How many times `value` appears in the order (as ``str(order_info)``)."""
+        count = self._occurrences.get(value)
+        if count is None:
+            if self._order_text is None:
+                self._order_text = str(self.order_info)
+            count = self._occurrences[value] = self._order_text.count(value)
+        return count
+
+    def images(self) -> List[Dict[str, Any]]:
+        """Image objects of the order, normalized for slot filling."""
+        if self._images is None:
+            self._images = []
+            for image in get_image_customization_objs(self.order_info["customizationData"]):
+                image_transform_info = image["buyerPlacement"]
+                image_meta = image["children"][0]
+                if not image_meta["image"]["imageName"]:
+                    continue
+                self._images.append({
+                    "type": "image",
+                    "size": image_transform_info["dimension"],
+                    "position": image_transform_info["position"],
+                    "scale": image_transform_info["scale"],
+                    "rotation": image_transform_info["angleOfRotation"],
+                    "label": image_meta["label"].strip(),
+                    "image_path": image_meta["image"]["imageName"],
+                    "mask_size": image["dimension"],
+                    "mask_position": image["position"],
+                })
+        return self._images
+
+
+class CustomizationExtractor:
+    """Collects the printable customizations of orders.
+
+    Args:
+        fonts_path: ``fonts.json`` mapping the font families an order may use
+            to font files; read on the first text area and kept.
+    """
+
+    def __init__(self, fonts_path: Path) -> None:
+        self.fonts_path = fonts_path
+        self._font_families: Optional[FrozenSet[str]] = None
+
+    @property
+    def font_families(self) -> FrozenSet[str]:
+        if self._font_families is None:
+            with open(self.fonts_path, "r", encoding="utf-8") as f:
+                self._font_families = frozenset(json.load(f))
+        return self._font_families
+
+    def extract(self, order_info: Dict[str, Any]) -> Dict[str, Any]:
+        """Return ``{"status": "success", "data": {"front": [...], "back": [...]}}`` or an error dict."""
+        if "customizationInfo" not in order_info:
+            return {"status": "error", "message": "Customization info not found"}
+        if "version3.0" not in order_info["customizationInfo"]:
+            return {"status": "error", "message": "Customization info version 3.0 not found"}
+        if "surfaces" not in order_info["customizationInfo"]["version3.0"]:
+            return {"status": "error", "message": "Surfaces not found"}
+
+        lookup = _OrderLookup(order_info)
+        objects = {"front": [], "back": []}
+        for i, surface in enumerate(order_info["customizationInfo"]["version3.0"]["surfaces"]):
+            side = "front" if i == 0 else "back"
+            for area in surface['areas']:
+                customization_type = area["customizationType"]
+                if customization_type == "Options":
+                    option_value = area["optionValue"]
+                    if not area["optionImage"] or not option_value:
+                        continue
+                    option_value_lower = option_value.lower()
+                    if option_value_lower in ("nein", "ja") or option_value_lower.startswith(("nein", "ja ")):
+                        continue
+                    # An image repeated all over the order is a generic choice, not a customization
+                    if lookup.occurrences(area["optionImage"]) > 3:
+                        continue
+                    if "GESCHENKBOX" in area["label"].strip().upper():
+                        continue
+                    objects[side].append({
+                        "type": "options",
+                        "label": area["label"].strip(),
+                        "value": option_value,
+                        "image_url": area["optionImage"]
+                    })
+                elif customization_type == "TextPrinting":
+                    if not area['text']:
+                        continue
+
+                    if "fontFamily" in area:
+                        font_family = area["fontFamily"]
+                        if font_family not in self.font_families:
+                            return {"status": "error", "message": f"Font family {font_family} not found"}
+
+                    objects[side].append({
+                        "type": "text",
+                        "color": area.get("fill", None),
+                        "font_family": area.get("fontFamily", None),
+                        "size": area.get("Dimensions", None),
+                        "position": area.get("Position", None),
+                        "label": area["label"].strip(),
+                        "text": area["text"],
+                    })
+                elif customization_type == "ImagePrinting":
+                    objects[side].extend(dict(image) for image in lookup.images())
+                else:
+                    raise RuntimeError(f"Unexpected type: {customization_type}")
+
+        return {"status": "success", "data": objects}
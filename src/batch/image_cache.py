@@ -0,0 +1,188 @@
+"""Memoization of prepared customer images across orders.
+
+Repeat customers and duplicated line items upload the same picture with
+the same placement, so the expensive steps (decode, EXIF rotation, the
+Amazon placement transform, background removal, mask fitting) give the
+same result over and over. `TransformCache` keeps those results keyed by
+a hash of the source bytes plus every parameter of the step, in a memory
+LRU bounded by pixels backed by a disk LRU bounded by bytes.
+
+Cached images are shared between orders: treat them as read-only (every
+PIL operation used by the pipeline returns a new image).
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from PIL import Image
+
+from src.canvas.images import _SizedLRU
+from src.core.state import INTERNAL_PATH
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["TransformCache", "content_hash", "get_image_cache"]
+
+CACHE_DIR = INTERNAL_PATH / "image_cache"
+
+
+def content_hash(data: bytes) -> str:
+    """Hash identifying downloaded image bytes."""
+    return hashlib.sha256(data).hexdigest()
+
+
+class TransformCache:
+    """Memory and disk LRU for prepared images.
+
+    Args:
+        directory: where PNGs are kept between runs; None keeps memory only.
+        memory_max_pixels: bound of the in-memory LRU (summed width*height).
+        disk_max_bytes: bound of the directory; the least recently used
+            files are removed when it is exceeded.
+    """
+
+    MEMORY_MAX_PIXELS = 64_000_000
+    DISK_MAX_BYTES = 512 * 1024 * 1024
+    # Bump when a cached step changes its output
+    VERSION = 3
+
+    def __init__(
+        self,
+        directory: Optional[Path] = CACHE_DIR,
+        memory_max_pixels: int = MEMORY_MAX_PIXELS,
+        disk_max_bytes: int = DISK_MAX_BYTES,
+    ) -> None:
+        self.directory = Path(directory) if directory is not None else None
+        self.disk_max_bytes = int(disk_max_bytes)
+        self._memory = _SizedLRU(memory_max_pixels)
+        self._disk_lock = threading.Lock()
+        self._disk_bytes: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def make_key(cls, step: str, *params: Any) -> str:
+        """Key for the result of `step` applied with `params` (source hash first)."""
+        return hashlib.sha256(repr((cls.VERSION, step, params)).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Image.Image]:
+        image = self._memory.get(key)
+        if image is None:
+            image = self._read_disk(key)
+            if image is not None:
+                self._memory.put(key, image, image.width * image.height)
+        if image is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return image
+
+    def put(self, key: str, image: Image.Image) -> None:
+        self._memory.put(key, image, image.width * image.height)
+        self._write_disk(key, image)
+
+    def get_or_create(self, key: str, create: Callable[[], Image.Image]) -> Image.Image:
+        """Cached image for `key`, or the result of `create()` stored under it."""
+        image = self.get(key)
+        if image is None:
+            image = create()
+            if isinstance(image, Image.Image):
+                self.put(key, image)
+        return image
+
+    def clear(self) -> None:
+        self._memory.clear()
+        if self.directory is None:
+            return
+        with self._disk_lock:
+            for path in self.directory.glob("*.png"):
+                try:
+                    path.unlink()
+                except OSError:
+                    logger.exception(f"Failed to remove cached image {path}")
+            self._disk_bytes = 0
+
+    # ------------------------------ Disk ------------------------------
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.png"
+
+    def _read_disk(self, key: str) -> Optional[Image.Image]:
+        if self.directory is None:
+            return None
+        path = self._path(key)
+        try:
+            with Image.open(path) as im:
+                im.load()
+                image = im.copy()
+            # Touch so the file counts as recently used
+            os.utime(path)
+            return image
+        except FileNotFoundError:
+            return None
+        except Exception:
+            logger.exception(f"Failed to read cached image {path}")
+            return None
+
+    def _write_disk(self, key: str, image: Image.Image) -> None:
+        if self.directory is None:
+            return
+        path = self._path(key)
+        tmp_path = path.with_name(f"{path.stem}.{threading.get_ident()}.tmp")
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            image.save(tmp_path, format="PNG", compress_level=1)
+            size = tmp_path.stat().st_size
+            os.replace(tmp_path, path)
+        except Exception:
+            logger.exception(f"Failed to write cached image {path}")
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+            return
+
+        with self._disk_lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = sum(p.stat().st_size for p in self.directory.glob("*.png"))
+            else:
+                self._disk_bytes += size
+            if self._disk_bytes > self.disk_max_bytes:
+                self._trim_disk()
+
+    def _trim_disk(self) -> None:
+        """Remove least recently used files down to 90% of the bound."""
+        entries = []
+        for path in self.directory.glob("*.png"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        target = int(self.disk_max_bytes * 0.9)
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                path.unlink()
+                total -= size
+            except OSError:
+                logger.exception(f"Failed to evict cached image {path}")
+        self._disk_bytes = total
+
+
+_shared_cache: Optional[TransformCache] = None
+
+
+def get_image_cache() -> TransformCache:
+    """Cache shared by every batch job of the process."""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = TransformCache()
+    return _shared_cache
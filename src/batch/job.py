@@ -0,0 +1,1747 @@
+"""Order-to-PDF pipeline that runs without a Tk screen.
+
+`OrderBatchJob` fetches the selected orders, fills the product pattern with
+their customizations and exports the sheets (PDF/PNG/JPG/BMP) into
+``OUTPUT_PATH``. The order screen drives it from a worker thread with its
+own log and progress callbacks; `batch.py` runs it from the command line.
+"""
+import hashlib
+import logging
+import os
+import threading
+import time
+import requests
+from io import BytesIO
+from pathlib import Path
+from datetime import datetime
+import json
+from collections import deque
+from copy import deepcopy
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple, Union
+
+from PIL import Image, ImageFile, ImageFilter, ExifTags
+from PIL import Image as _PILImage
+from rembg import remove, new_session
+import numpy as np
+import math
+
+from src.core.state import FONTS_PATH, INTERNAL_PATH, MODEL_PATH, state
+from src.core import LOGS_PATH, OUTPUT_PATH, PRODUCTS_PATH, load_product, Profiler, SlotPool, SlotState, span
+from src.utils import svg_to_png
+from src.canvas import PdfExporter, ImageManager, PDFCombiner, PDFInfo
+from src.batch.customization import CustomizationExtractor
+from src.batch.image_cache import TransformCache, content_hash, get_image_cache
+from src.batch.journal import JobJournal, file_sha256
+from src.batch.pipeline import Prefetcher, RenderStage
+from src.screens.common.dropbox_handler import SUCCESS_COLOR, WARNING_COLOR, ERROR_COLOR, BASE_FOLDER, IMAGES_FOLDER, FILES_FOLDER, get_orders_info, Dropbox
+
+logger = logging.getLogger(__name__)
+
+DROPBOX_CLIENT = Dropbox()
+
+model_session = new_session("u2net_custom", model_path=str(MODEL_PATH))
+ImageFile.LOAD_TRUNCATED_IMAGES = True
+
+EXPORT_FORMATS = ("pdf", "png", "jpg", "bmp")
+
+
+class OrderInputError(ValueError):
+    """The order selection is malformed or the orders could not be fetched."""
+
+
+def parse_order_input(input_str: str) -> List[int]:
+    """Parse order input that can contain both ranges and individual numbers.
+    
+    Examples:
+        "1,2,3" -> [1, 2, 3]
+        "1-5" -> [1, 2, 3, 4, 5]
+        "1,2,3,4-8,10" -> [1, 2, 3, 4, 5, 6, 7, 8, 10]
+    """
+    order_numbers = set()
+    parts = [p.strip() for p in input_str.split(",")]
+    
+    for part in parts:
+        if "-" in part:
+            # Handle range
+            range_parts = part.split("-")
+            if len(range_parts) == 2:
+                try:
+                    start = int(range_parts[0].strip())
+                    end = int(range_parts[1].strip())
+                    order_numbers.update(range(start, end + 1))
+                except ValueError:
+                    continue
+        else:
+            # Handle single number
+            try:
+                order_numbers.add(int(part))
+            except ValueError:
+                continue
+    
+    return sorted(list(order_numbers))
+
+
+def normalize_formats(formats: Iterable[str]) -> List[str]:
+    """Lower-case, de-duplicate and filter export formats ("jpeg" -> "jpg")."""
+    formats_norm: List[str] = []
+    seen = set()
+    for f in formats or ():
+        f = (f or "").strip().lower()
+        if f == "jpeg":
+            f = "jpg"
+        if f in EXPORT_FORMATS and f not in seen:
+            seen.add(f)
+            formats_norm.append(f)
+    return formats_norm
+
+
+class OrderBatchJob:
+    """Render a product's orders into export files, independent of any UI.
+
+    Args:
+        product: Product name (``PRODUCTS_PATH / f"{product}.json"``).
+        orders: Order selection, either a string like ``"1,2,4-8"`` or order ids.
+        formats: Export formats (pdf, png, jpg, bmp).
+        dpi: Render resolution.
+        asins: ``[asin, count, mirror]`` entries; defaults to the product's ``ASINs``.
+        dropbox_from: First Dropbox order-folder date to index when orders are not
+            cached yet (kept from ``state`` when omitted).
+        dropbox_to: Last Dropbox order-folder date to index.
+        log: ``log(message, color)`` callback; defaults to the module logger and
+            the daily file in ``LOGS_PATH``.
+        progress: ``progress(value=None, current_index=None, total=None)`` callback.
+        image_cache: Cache of prepared customer images; defaults to the one
+            shared by all jobs of the process.
+        resume: Continue an interrupted run with the same product, orders,
+            formats and dpi from its journal in ``LOGS_PATH / "journal"``
+            instead of starting over.
+        trace: Also write the run's stage timings as a Chrome trace
+            (chrome://tracing, Perfetto) to ``LOGS_PATH``. A summary of them
+            is logged at the end of every run.
+
+    Orders are prepared (downloads, image transforms) up to `PREFETCH_DEPTH`
+    orders ahead on `PREFETCH_WORKERS` threads, and filled sheets are
+    rendered on a background thread with at most `RENDER_QUEUE_DEPTH` sheets
+    waiting, which bounds the images held in memory.
+    """
+
+    PREFETCH_WORKERS = 4
+    PREFETCH_DEPTH = 8
+    RENDER_QUEUE_DEPTH = 2
+
+    def __init__(
+        self,
+        product: str,
+        orders: Union[str, Iterable[int]],
+        formats: Iterable[str] = ("pdf",),
+        dpi: int = 1200,
+        asins: Optional[List[Any]] = None,
+        dropbox_from: Optional[datetime] = None,
+        dropbox_to: Optional[datetime] = None,
+        log: Optional[Callable[..., None]] = None,
+        progress: Optional[Callable[..., None]] = None,
+        image_cache: Optional[TransformCache] = None,
+        resume: bool = True,
+        trace: bool = False,
+    ) -> None:
+        self.product = str(product)
+        if isinstance(orders, str):
+            self.order_ids = parse_order_input(orders)
+        else:
+            self.order_ids = sorted({int(o) for o in orders})
+        self.formats = normalize_formats(formats) or ["pdf"]
+        self.dpi = int(dpi)
+        if asins is None:
+            asins = self._product_asins()
+        self.asins = list(asins or [])
+        self.dropbox_from = dropbox_from
+        self.dropbox_to = dropbox_to
+        self._log_func = log
+        self._log_lock = threading.RLock()
+        self._progress_func = progress
+        self._cancel_requested = False
+
+        # PdfExporter reads these from its owner (same as on the canvas screens)
+        self.images = ImageManager(self)
+        self._rotated_bounds_px = self.images.rotated_bounds_px
+        self._rotated_bounds_mm = self.images.rotated_bounds_mm
+
+        # Track processed files in current run to avoid overwriting
+        self._processed_files = set()
+        self.image_cache = image_cache if image_cache is not None else get_image_cache()
+        # Set while run() renders sheets in the background
+        self._render_stage: Optional[RenderStage] = None
+        self._render_failures: set = set()
+        self.resume = bool(resume)
+        self._journal: Optional[JobJournal] = None
+        # Sheets handed to _submit_sheet, how many of the first ones rendered, and the file names they reserved
+        self._sheets_submitted = 0
+        self._sheets_rendered = 0
+        self._reserved_names: List[str] = []
+        self.trace = bool(trace)
+        # Known font families are read once per job
+        self._customizations = CustomizationExtractor(FONTS_PATH / "fonts.json")
+
+    def _product_asins(self) -> List[Any]:
+        try:
+            with open(PRODUCTS_PATH / f"{self.product}.json", "r", encoding="utf-8") as f:
+                return json.load(f).get("ASINs") or []
+        except Exception:
+            logger.exception(f"Failed to read ASINs of product {self.product}")
+            return []
+
+    def cancel(self) -> None:
+        """Ask the running job to stop after the current download or order."""
+        self._cancel_requested = True
+        # Dropbox indexing only looks at the global flag
+        state.is_cancelled = True
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_requested
+
+    # ------------------------------ Logging ------------------------------
+
+    def log(self, message: str, color: str = None) -> None:
+        # Prefetch threads log too; keep callbacks and file lines from interleaving
+        with self._log_lock:
+            if self._log_func is not None:
+                self._log_func(message, color)
+                return
+            if color == ERROR_COLOR:
+                logger.error(message)
+            elif color == WARNING_COLOR:
+                logger.warning(message)
+            else:
+                logger.info(message)
+            try:
+                current_time = datetime.now().strftime("%H:%M:%S")
+                current_day = datetime.now().strftime("%Y-%m-%d")
+                with open(LOGS_PATH / (current_day + ".log"), "a", encoding="utf-8") as f:
+                    f.write(f"[{current_time}] {message}\n")
+            except Exception:
+                logger.exception("Failed to write batch log file")
+
+    def _report_profile(self, profiler: Profiler) -> None:
+        """Log where the run spent its time and write the trace when `trace` is set."""
+        if not profiler.spans:
+            return
+        try:
+            for line in profiler.report():
+                self.log(line)
+            if self.trace:
+                path = LOGS_PATH / f"trace_{self.product}_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.json"
+                profiler.write_chrome_trace(path)
+                self.log(f"Trace written to {path}")
+        except Exception:
+            logger.exception("Failed to report stage timings")
+
+    def _progress(self, value: float = None, current_index: int = None, total: int = None) -> None:
+        if self._progress_func is None:
+            return
+        try:
+            self._progress_func(value=value, current_index=current_index, total=total)
+        except Exception:
+            logger.exception("Progress callback failed")
+
+    # ------------------------------ Pipeline ------------------------------
+    def _collect_customization_info(self, order_info: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+        return self._customizations.extract(order_info)
+
+    def _download_image_from_amazon(self, image_url: str) -> Dict[str, Union[str, Image.Image]]:
+        retries = 3
+        image_name = image_url.split("/")[-1]
+        while retries > 0:
+            if self._cancel_requested:
+                return {"status": "error", "message": "Cancelled"}
+            try:
+                self.log(f"Downloading image {image_name} from Amazon")
+                with span("download.amazon") as attrs:
+                    response = requests.get(image_url)
+                    attrs["bytes"] = len(response.content or b"")
+                if response.status_code != 200:
+                    self.log(f"Failed to download image {image_name} from Amazon: {response.status_code}. Retrying...")
+                    retries -= 1
+                    time.sleep(5)
+                    continue
+                return {
+                    "status": "success",
+                    "image": Image.open(BytesIO(response.content)),
+                    "content_hash": content_hash(response.content),
+                }
+            except Exception as e:
+                self.log(f"Failed to download image {image_name} from Amazon: {e}. Retrying...")
+                retries -= 1
+                time.sleep(5)
+                continue
+        return {"status": "error", "message": f"Failed to download image {image_name} from Amazon"}
+
+    def _crop_image(self, image: Image.Image) -> Image.Image:
+        return image.crop(image.getbbox())
+
+    def _remove_background(self, image: Image.Image) -> Image.Image:
+        with span("remove_background", pixels=image.width * image.height):
+            return remove(image, session=model_session)
+
+    def _fix_orientation_by_exif(self, img: Image.Image) -> Image.Image:
+        try:
+            exif = img._getexif()
+            if exif:
+                orientation_key = next(
+                    k for k, v in ExifTags.TAGS.items() if v == 'Orientation'
+                )
+                orientation = exif.get(orientation_key)
+
+                if orientation == 3:
+                    img = img.rotate(180, expand=True)
+                elif orientation == 6:
+                    img = img.rotate(270, expand=True)
+                elif orientation == 8:
+                    img = img.rotate(90, expand=True)
+
+            return img
+        except Exception:
+            logger.exception("Failed to fix image orientation by EXIF")
+            return {"status": "error", "message": "Failed to fix image orientation by EXIF"}
+
+    def _download_image_from_dropbox(self, parent_folder: str, child_folder: str, image_path: str) -> Dict[str, Union[str, bytes]]:
+        """Download raw image bytes; decoding is left to `_decode_image` so cached results skip it."""
+        try:
+            self.log(f"Downloading image {image_path} from Dropbox")
+            with span("download.dropbox") as attrs:
+                info = DROPBOX_CLIENT.download_big_file(f"{BASE_FOLDER}/{parent_folder}/{FILES_FOLDER}/{child_folder}/{IMAGES_FOLDER}/{image_path}", str(INTERNAL_PATH) + "/", raw_data=True)
+                if info is None:
+                    return {"status": "error", "message": f"Image {child_folder}/{image_path} not found in Dropbox"} 
+                data = info[1].getvalue()
+                attrs["bytes"] = len(data)
+            return {"status": "success", "data": data, "content_hash": content_hash(data)}
+        except Exception as e:
+            logger.exception("Failed download image from dropbox")
+            return {"status": "error", "message": f"Failed download image from dropbox: {e}"}
+
+    def _decode_image(self, data: bytes) -> Image.Image:
+        with span("decode", bytes=len(data)) as attrs:
+            img_ = Image.open(BytesIO(data))
+            img_.load()
+            attrs["pixels"] = img_.width * img_.height
+            return self._fix_orientation_by_exif(img_)
+
+    def _transform_amazon_image(
+        self,
+        im: Image.Image,
+        scale: float,
+        angle_deg: float,
+        place_xy: Tuple[float, float],
+        mask_rect: Tuple[int, int, int, int],
+        canvas_size: Tuple[int, int] = (500, 500),
+        rotate_resample: str = "bilinear",
+        apply_unsharp: bool = True,
+        unsharp_radius: float = 0.6,
+        unsharp_percent: int = 80,
+        unsharp_threshold: int = 2,
+    ) -> Image.Image:
+        """
+        1) If scale<1, resize with Lanczos (best for downscale) to improve crispness.
+        2) Premultiply alpha to minimize dark/bright fringes at transparency edges.
+        3) Apply affine transform (rotation + translation only) so that ORIGINAL TL maps to place_xy;
+           only the mask rect of the canvas (plus the sharpening margin) is rendered.
+        4) Unpremultiply alpha back to straight RGBA.
+        5) Mask the canvas (outside mask -> transparent).
+        6) Optional UnsharpMask for extra crispness.
+        """
+        # --- ORIGINAL LOAD ---
+        # if im.mode != "RGBA":
+        #     im = im.convert("RGBA")
+
+        # im_scaled = im
+        # print("Original size", im.size)
+
+        # canvas_w, canvas_h = mask_rect[2], mask_rect[3]
+        # canvas_w = int(canvas_w / scale)
+        # canvas_h = int(canvas_h / scale)
+        # print("Canvas size" , canvas_w, canvas_h)
+
+        # canvas = Image.new("RGBA", (canvas_w, canvas_h), (0, 0, 0, 0))
+
+        # if rotate_resample == "bicubic":
+        #     resamp = Image.Resampling.BICUBIC
+        # elif rotate_resample == "nearest":
+        #     resamp = Image.Resampling.NEAREST
+        # else:
+        #     resamp = Image.Resampling.BILINEAR
+
+        # warped = im_scaled.rotate(angle_deg, resample=resamp, expand=True)
+
+        # px, py = place_xy
+        # cx, cy = mask_rect[0], mask_rect[1]
+        # px = int((px - cx) / scale)
+        # py = int((py - cy) / scale)
+        # print("Image size after rotate", warped.size)
+        # print("Placing at", px, py)
+        # canvas.paste(warped, (px, py), warped)
+
+        # return canvas
+        if im.mode != "RGBA":
+            im = im.convert("RGBA")
+
+        # 1) Downscale with Lanczos (only if needed)
+        W, H = im.size
+        new_w = max(1, int(round(W * scale)))
+        new_h = max(1, int(round(H * scale)))
+
+        lanczos = _PILImage.Resampling.LANCZOS
+        bicubic = _PILImage.Resampling.BICUBIC
+        bilinear = _PILImage.Resampling.BILINEAR
+        nearest = _PILImage.Resampling.NEAREST
+        affine_method = _PILImage.Transform.AFFINE
+
+        im_scaled = im.resize((new_w, new_h), lanczos) if (new_w != W or new_h != H) else im
+
+        # 2) Premultiply alpha (Pillow's native premultiplied mode, one buffer)
+        im_pm = im_scaled.convert("RGBa")
+
+        # 3) Affine rotation+translation with exact anchoring for ORIGINAL TL -> place_xy
+        k = 1.0  # scale already applied
+        if angle_deg < 0.5:
+            angle_deg = 0.0
+        theta = math.radians(angle_deg)
+        c, s = math.cos(theta), math.sin(theta)
+        px, py = place_xy
+
+        # inverse matrix for transform (canvas->source)
+        inv_a =  c / k
+        inv_b =  s / k
+        inv_d = -s / k
+        inv_e =  c / k
+        inv_c = -(inv_a * px + inv_b * py)
+        inv_f = -(inv_d * px + inv_e * py)
+
+        if rotate_resample == "bicubic":
+            resamp = bicubic
+        elif rotate_resample == "bilinear":
+            resamp = bilinear
+        elif rotate_resample == "nearest":
+            resamp = nearest
+        else:
+            resamp = bicubic
+
+        # Only the mask rect is warped, plus the margin the sharpening reads around it
+        # (clipped to the canvas, like the full-canvas render this replaces).
+        # Fractional rects give the same boxes as that render: the mask rectangle
+        # truncates its edges and includes them (ImageDraw), the crop rounds them (Image.crop)
+        canvas_w, canvas_h = canvas_size
+        mx, my, mw, mh = mask_rect
+        left, top, right, bottom = int(mx), int(my), int(mx + mw) + 1, int(my + mh) + 1
+        crop = tuple(int(round(v)) for v in (mx, my, mx + mw, my + mh))
+        margin = int(math.ceil(unsharp_radius * 3)) + 3 if apply_unsharp else 0
+        x0, y0 = max(0, min(left, crop[0]) - margin), max(0, min(top, crop[1]) - margin)
+        x1 = min(canvas_w, max(right, crop[2]) + margin)
+        y1 = min(canvas_h, max(bottom, crop[3]) + margin)
+        if x1 <= x0 or y1 <= y0:
+            return Image.new("RGBA", (max(0, crop[2] - crop[0]), max(0, crop[3] - crop[1])), (0, 0, 0, 0))
+
+        warped_pm = im_pm.transform(
+            size=(x1 - x0, y1 - y0),
+            method=affine_method,
+            data=(inv_a, inv_b, inv_c + inv_a * x0 + inv_b * y0, inv_d, inv_e, inv_f + inv_d * x0 + inv_e * y0),
+            resample=resamp,
+            fillcolor=(0, 0, 0, 0),
+        )
+
+        # 4) Unpremultiply alpha
+        out = warped_pm.convert("RGBA")
+
+        # 5) Outside the mask rect (edges included) is transparent; colors are kept for the sharpening
+        alpha = out.getchannel("A")
+        w, h = out.size
+        for box in ((0, 0, w, top - y0), (0, bottom - y0, w, h), (0, 0, left - x0, h), (right - x0, 0, w, h)):
+            box = (max(0, box[0]), max(0, box[1]), min(w, box[2]), min(h, box[3]))
+            if box[2] > box[0] and box[3] > box[1]:
+                alpha.paste(0, box)
+        out.putalpha(alpha)
+
+        # 6) Optional sharpening
+        if apply_unsharp:
+            out = out.filter(ImageFilter.UnsharpMask(radius=unsharp_radius, percent=unsharp_percent, threshold=unsharp_threshold))
+
+        return out.crop((crop[0] - x0, crop[1] - y0, crop[2] - x0, crop[3] - y0))
+
+    def _apply_mask(
+        self, 
+        im: Image.Image, 
+        template_path: Path, 
+        mask_path: Path
+    ) -> Dict[str, Any]:
+
+        def largest_component_bool(bool_mask):
+            """Return the largest 4-connected component from a boolean mask.
+
+            Args:
+                bool_mask: 2D boolean array with candidate pixels set to True.
+
+            Returns:
+                2D boolean array that keeps only the largest component, or None if empty.
+            """
+            h, w = bool_mask.shape
+            if not bool_mask.any():
+                return None
+            visited = np.zeros((h, w), dtype=bool)
+            best = None
+            best_len = 0
+            for i in range(h):
+                for j in range(w):
+                    if bool_mask[i, j] and not visited[i, j]:
+                        stack = [(i, j)]
+                        visited[i, j] = True
+                        coords = []
+                        while stack:
+                            y, x = stack.pop()
+                            coords.append((y, x))
+                            if y>0   and bool_mask[y-1,x] and not visited[y-1,x]: visited[y-1,x]=True; stack.append((y-1,x))
+                            if y+1<h and bool_mask[y+1,x] and not visited[y+1,x]: visited[y+1,x]=True; stack.append((y+1,x))
+                            if x>0   and bool_mask[y,x-1] and not visited[y,x-1]: visited[y,x-1]=True; stack.append((y,x-1))
+                            if x+1<w and bool_mask[y,x+1] and not visited[y,x+1]: visited[y,x+1]=True; stack.append((y,x+1))
+                        if len(coords) > best_len:
+                            best_len = len(coords)
+                            m = np.zeros((h, w), dtype=bool)
+                            ys, xs = zip(*coords)
+                            m[ys, xs] = True
+                            best = m
+            return best
+
+        def content_active_bbox(img_rgba, thr=1):
+            """Compute the bounding box of non-transparent pixels in an RGBA image.
+
+            Args:
+                img_rgba: RGBA PIL image.
+                thr: Alpha threshold; pixels with alpha > thr are considered active.
+
+            Returns:
+                (left, top, right, bottom) bbox of active content, or None if empty.
+            """
+            a = np.array(img_rgba.split()[-1], dtype=np.uint8)
+            ys, xs = np.where(a > thr)
+            if ys.size == 0:
+                return None
+            top, left = int(ys.min()), int(xs.min())
+            bottom, right = int(ys.max()) + 1, int(xs.max()) + 1
+            return (left, top, right, bottom)
+
+        def scale_min_cover_active(img_rgba, target_w, target_h, thr=1):
+            """Cover-fit using only the active (non-transparent) content region.
+
+            Args:
+                img_rgba: RGBA PIL image that may contain transparent padding.
+                target_w: Target width to cover.
+                target_h: Target height to cover.
+                thr: Alpha threshold for active region detection.
+
+            Returns:
+                RGBA image of exactly (target_w, target_h) with content scaled
+                by minimal cover based on its active bbox.
+            """
+            bbox = content_active_bbox(img_rgba, thr=thr)
+            if bbox is None:
+                return Image.new("RGBA", (target_w, target_h), (0, 0, 0, 0))
+            l, t, r, b = bbox
+            core = img_rgba.crop((l, t, r, b))
+            w, h = core.size
+            s = max(target_w / w, target_h / h)
+            nw, nh = max(1, int(round(w * s))), max(1, int(round(h * s)))
+            scaled = core.resize((nw, nh), Image.LANCZOS)
+            x0 = (nw - target_w) // 2
+            y0 = (nh - target_h) // 2
+            return scaled.crop((x0, y0, x0 + target_w, y0 + target_h))
+
+        def paste_with_alpha(template_rgba, content_rgba, alpha_u8, top_left):
+            """Composite content onto template using an 8-bit alpha matte.
+
+            Args:
+                template_rgba: Background RGBA image.
+                content_rgba: Foreground RGBA image sized to the matte.
+                alpha_u8: 2D uint8 alpha (0..255) in template coordinates.
+                top_left: (left, top) paste position.
+
+            Returns:
+                New RGBA image after compositing.
+            """
+            result = template_rgba.copy()
+            result.paste(content_rgba, top_left, Image.fromarray(alpha_u8, mode="L"))
+            return result
+
+        if not template_path.exists():
+            logger.error(f"Template path {template_path} does not exist")
+            return {"status": "error", "message": f"Template path {template_path} does not exist"}
+        template = Image.open(template_path).convert("RGBA")
+
+        if not mask_path.exists():
+            logger.error(f"Mask path {mask_path} does not exist")
+            return {"status": "error", "message": f"Mask path {mask_path} does not exist"}
+        mask_img = Image.open(mask_path).convert("RGBA")
+
+        if mask_img.size != template.size:
+            mask_img = mask_img.resize(template.size, Image.NEAREST)
+
+        im = self._crop_image(im)
+        if im.mode != "RGBA":
+            im = im.convert("RGBA")
+
+        cw = max(template.size[0], mask_img.size[0])
+        ch = max(template.size[1], mask_img.size[1])
+        if template.size != (cw, ch):
+            t = Image.new("RGBA", (cw, ch), (0, 0, 0, 0)); t.paste(template, (0, 0), template); template = t
+        if mask_img.size != (cw, ch):
+            m = Image.new("RGBA", (cw, ch), (0, 0, 0, 0)); m.paste(mask_img, (0, 0), mask_img); mask_img = m
+
+        alpha = np.array(mask_img.split()[-1], dtype=np.uint8)
+        inv_alpha = 255 - alpha
+        window = largest_component_bool(inv_alpha > 0)
+        if window is None:
+            return {"status": "error", "message": "No window found"}
+
+        ys, xs = np.where(window)
+        top, left = int(ys.min()), int(xs.min())
+        bottom, right = int(ys.max()) + 1, int(xs.max()) + 1
+        bw, bh = right - left, bottom - top
+
+        fitted = scale_min_cover_active(im, bw, bh, thr=1)
+        # w0, h0 = im.size
+
+        # scale = min(bw / w0, bh / h0)
+        # nw, nh = max(1, int(round(w0 * scale))), max(1, int(round(h0 * scale)))
+
+        # scaled = im.resize((nw, nh), Image.LANCZOS)
+
+        # # Центровка внутри окна маски
+        # fitted = Image.new("RGBA", (bw, bh), (0, 0, 0, 0))
+        # offset_x = (bw - nw) // 2
+        # offset_y = (bh - nh) // 2
+        # fitted.paste(scaled, (offset_x, offset_y))
+        matte = (window[top:bottom, left:right].astype(np.uint8) * 255)
+
+        result = paste_with_alpha(template, fitted, matte, (left, top))
+        # result.save("after_apply_mask.png")
+        return {"status": "success", "image": result}
+
+    def _apply_mask_cached(self, order_object: Dict[str, Any], template_path: Path, mask_path: Path) -> Dict[str, Any]:
+        """`_apply_mask` for an order image, reused for every unit of the order and for repeated images."""
+        source_key = order_object.get("loaded_image_key")
+        if not source_key:
+            return self._apply_mask(order_object["loaded_image"], template_path, mask_path)
+        try:
+            stamps = [(str(p), os.stat(p).st_mtime_ns) for p in (template_path, mask_path)]
+        except OSError:
+            # Missing files are reported by _apply_mask
+            return self._apply_mask(order_object["loaded_image"], template_path, mask_path)
+        key = TransformCache.make_key("mask", source_key, stamps)
+        image = self.image_cache.get(key)
+        if image is not None:
+            return {"status": "success", "image": image}
+        with span("mask") as attrs:
+            result = self._apply_mask(order_object["loaded_image"], template_path, mask_path)
+            if result["status"] == "success":
+                attrs["pixels"] = result["image"].width * result["image"].height
+        if result["status"] == "success":
+            self.image_cache.put(key, result["image"])
+        return result
+
+    def _prepare_order_data(self, parent_folder: str, child_folder: str, order_info: Dict[str, Any], order_i: int, total_orders: int) -> Dict[str, Any]:
+        if "quantity" not in order_info:
+            return {"status": "error", "message": "Quantity not found"}
+
+        result = self._collect_customization_info(order_info)
+        if result["status"] == "error":
+            return {"status": "error", "message": result["message"]}
+        customization_info = result["data"]
+
+        total_download_image_count = 0
+        total_loaded_image_count = 0
+        for side in customization_info:
+            for object in customization_info[side]:
+                if object["type"] == "options":
+                    total_download_image_count += 1
+                if object["type"] == "image":
+                    total_loaded_image_count += 1
+        self.log(f"[{order_i}/{total_orders}] Total images to download from Amazon: {total_download_image_count}; from Dropbox: {total_loaded_image_count}")
+
+        downloaded_image_count = 0
+        loaded_image_count = 0
+        for side in customization_info:
+            for object in customization_info[side]:
+                if self._cancel_requested:
+                    return {"status": "error", "message": "Cancelled"}
+                
+                if object["type"] == "image":
+                    image_info = self._download_image_from_dropbox(parent_folder, child_folder, object["image_path"])
+                    if image_info["status"] == "error":
+                        return {"status": "error", "message": image_info["message"]}
+                    else:
+                        loaded_image_count += 1
+                        self.log(f"[{order_i}/{total_orders}] Image {loaded_image_count}/{total_loaded_image_count} downloaded from Dropbox")
+                        scale = object["scale"]["scaleX"]
+                        angle_deg = object["rotation"]
+                        place_xy = [object["position"]["x"], object["position"]["y"]]
+                        mask_rect = [object["mask_position"]["x"], object["mask_position"]["y"], object["mask_size"]["width"], object["mask_size"]["height"]]
+                        # Same picture with the same placement (repeat customers, duplicated items) is transformed once
+                        key = TransformCache.make_key("transform", image_info["content_hash"], scale, angle_deg, place_xy, mask_rect)
+
+                        def _transform_image(data=image_info["data"], scale=scale, angle_deg=angle_deg, place_xy=place_xy, mask_rect=mask_rect):
+                            with span("transform", order=order_i) as attrs:
+                                image = self._transform_amazon_image(
+                                    im=self._decode_image(data), 
+                                    scale=scale, 
+                                    angle_deg=angle_deg, 
+                                    place_xy=place_xy, 
+                                    mask_rect=mask_rect
+                                )
+                                attrs["pixels"] = image.width * image.height
+                                return image
+
+                        image = self.image_cache.get_or_create(key, _transform_image)
+                        # image.save("amazon_transformed_image.png")
+                        object["loaded_image"] = image
+                        object["loaded_image_key"] = key
+
+                elif object["type"] == "options":
+                    image_info = self._download_image_from_amazon(object["image_url"])
+                    if image_info["status"] == "error":
+                        return {"status": "error", "message": image_info["message"]}
+                    else:
+                        downloaded_image_count += 1
+                        self.log(f"[{order_i}/{total_orders}] Image {downloaded_image_count}/{total_download_image_count} downloaded from Amazon")
+                        remove_background = not object["image_url"].lower().endswith(".png")
+
+                        def _prepare_option_image(image=image_info["image"], remove_background=remove_background):
+                            if remove_background:
+                                image = self._remove_background(image)
+                            return self._crop_image(image)
+
+                        key = TransformCache.make_key("option", image_info["content_hash"], remove_background)
+                        object["loaded_image"] = self.image_cache.get_or_create(key, _prepare_option_image)
+                        object["loaded_image_key"] = key
+
+        return {"status": "success", "data": customization_info, "asin": order_info["asin"], "quantity": order_info["quantity"]}
+
+    def _make_pdf(
+        self, 
+        data: List[Tuple[Dict[str, Any], Dict[str, Any]]], 
+        jig_size: Tuple[float, float], 
+        pdf_start_oder_i: int, 
+        pdf_end_oder_i: int,
+        pdf_order: int = 1,
+        dpi: int = 1200,
+        formats: List[str] = None,
+        front_barcode = None,
+        back_barcode = None,
+        barcode_text: str = None,
+        reference_text: str = None,
+        jig_cmyk: str = None
+    ) -> Dict[str, str]:
+        try:
+            # Parse CMYK to RGBA for border color
+            def _parse_cmyk_to_rgba(cmyk_str: str, default=(0, 0, 0, 255)) -> tuple[int, int, int, int]:
+                try:
+                    parts = [p.strip() for p in str(cmyk_str or "").split(",")]
+                    # pad/truncate to 4
+                    if len(parts) < 4:
+                        parts += ["0"] * (4 - len(parts))
+                    elif len(parts) > 4:
+                        parts = parts[:4]
+                    c, m, y, k = [float(p or 0) for p in parts]
+                    # auto-detect scale: 0..1, 0..100, or 0..255
+                    vals = [c, m, y, k]
+                    maxv = max(vals)
+                    if maxv <= 1.0:
+                        scale = 1.0
+                    elif maxv <= 100.0:
+                        scale = 100.0
+                    else:
+                        scale = 255.0
+                    c = max(0.0, min(1.0, c / scale))
+                    m = max(0.0, min(1.0, m / scale))
+                    y = max(0.0, min(1.0, y / scale))
+                    k = max(0.0, min(1.0, k / scale))
+                    r = int(round(255 * (1 - c) * (1 - k)))
+                    g = int(round(255 * (1 - m) * (1 - k)))
+                    b = int(round(255 * (1 - y) * (1 - k)))
+                    return (max(0, min(255, r)), max(0, min(255, g)), max(0, min(255, b)), 255)
+                except Exception:
+                    return default
+            
+            # Convert jig CMYK to RGBA for border
+            border_color_rgba = _parse_cmyk_to_rgba(jig_cmyk or "0,0,0,0", default=(0, 0, 0, 255))
+            
+            def _remove_unprocessed_objs(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+                return [item for item in items if item.get("processed", False)]
+
+            exporter = PdfExporter(self)
+            from pathlib import Path as _Path
+            if formats is None:
+                formats = ["pdf"]
+            # Normalize formats
+            fmts_norm: List[str] = []
+            seen = set()
+            for f in formats:
+                ff = (f or "").strip().lower()
+                if ff == "jpeg":
+                    ff = "jpg"
+                if ff in ("pdf", "png", "jpg", "bmp") and ff not in seen:
+                    seen.add(ff)
+                    fmts_norm.append(ff)
+            if not fmts_norm:
+                fmts_norm = ["pdf"]
+
+            # Helper function to generate unique filename with index if file was already processed in this session
+            def _get_unique_base_path(base_name: str) -> _Path:
+                """Generate a unique base path by checking if file already exists in current session."""
+                base = OUTPUT_PATH / base_name
+                base_path = base.resolve()
+                
+                # Check if any file with this base name was processed in current session
+                base_str = str(base_path)
+                matching_files = [f for f in self._processed_files if f.startswith(base_str)]
+                
+                if not matching_files:
+                    # No files processed yet with this base name
+                    return base_path
+                
+                # Find the next available index
+                index = 2
+                while True:
+                    # Try base_name_2, base_name_3, etc.
+                    new_base = OUTPUT_PATH / f"{base_name}_{index}"
+                    new_base_path = new_base.resolve()
+                    new_base_str = str(new_base_path)
+                    
+                    # Check if this indexed version was already processed
+                    if not any(f.startswith(new_base_str) for f in self._processed_files):
+                        return new_base_path
+                    index += 1
+
+            base_front = _get_unique_base_path(f"{self.product}_{pdf_start_oder_i}-{pdf_end_oder_i}_front{f'_{pdf_order}' if pdf_order > 1 else ''}")
+            base_back  = _get_unique_base_path(f"{self.product}_{pdf_start_oder_i}-{pdf_end_oder_i}_back")
+
+            front_items = []
+            back_items = []
+            for front, back in data:
+                front_items.extend(front["objects"] if front else [])
+                if back:
+                    back_items.extend(back["objects"] if back else [])
+
+            if front_barcode:
+                front_barcode["processed"] = True
+                front_items.append(front_barcode)
+            if back_barcode:
+                back_barcode["processed"] = True
+                back_items.append(back_barcode)
+
+            # Group items by export_file field
+            def _group_by_export_file(items_list):
+                """Group items by their export_file assignment, excluding slots"""
+                grouped = {}
+                for item in items_list:
+                    if item.get("type") == "slot":
+                        # Skip slots - they should not be exported
+                        continue
+                    else:
+                        # Regular objects go to their assigned file
+                        ef = item.get("export_file", "File 1")
+                        if ef not in grouped:
+                            grouped[ef] = []
+                        grouped[ef].append(item)
+                return grouped
+            
+            front_grouped = _group_by_export_file(front_items)
+            back_grouped = _group_by_export_file(back_items)
+            
+            # Collect all export file names from both sides
+            export_files_to_render = set(front_grouped.keys()) | set(back_grouped.keys())
+            if not export_files_to_render:
+                export_files_to_render = {"File 1"}  # Default fallback
+            export_files_to_render = sorted(export_files_to_render)  # Sort for consistent ordering
+
+            written_files: List[str] = []
+
+            def _save_last_render(fmt: str, path: str) -> None:
+                with span(f"save_{fmt}") as attrs:
+                    getattr(exporter, f"save_last_render_as_{fmt}")(path)
+                    attrs["bytes"] = os.path.getsize(path) if os.path.exists(path) else 0
+                written_files.append(path)
+
+            def _render_and_save(side_items: List[Dict[str, Any]], base: _Path) -> None:
+                if not side_items:
+                    return
+                items = _remove_unprocessed_objs(side_items)
+                if not items:
+                    return
+                did_pdf = False
+                if "pdf" in fmts_norm:
+                    p_pdf = str(base.with_suffix(".pdf"))
+                    logger.debug("Rendering PDF: %s", p_pdf)
+                    exporter.render_scene_to_pdf(p_pdf, items, jig_size[0], jig_size[1], dpi=dpi, barcode_text=barcode_text, reference_text=reference_text)
+                    did_pdf = True
+                    # Track this file as processed
+                    self._processed_files.add(str(base))
+                    # Always create PNG for PDF combiner (even if not in formats)
+                    p_png = str(base.with_suffix(".png"))
+                    written_files.append(p_pdf)
+                    _save_last_render("png", p_png)
+                    logger.debug(f"Saved PNG for combiner: {p_png}")
+                # Ensure last render image exists even if PDF not requested
+                if not did_pdf and ("png" in fmts_norm or "jpg" in fmts_norm or "bmp" in fmts_norm):
+                    import time as _time
+                    tmp_pdf = str((OUTPUT_PATH / f"__tmp_{int(_time.time()*1000)}.pdf").resolve())
+                    try:
+                        exporter.render_scene_to_pdf(tmp_pdf, items, jig_size[0], jig_size[1], dpi=dpi, barcode_text=barcode_text, reference_text=reference_text)
+                    finally:
+                        try:
+                            os.remove(tmp_pdf)
+                        except Exception:
+                            pass
+                if "png" in fmts_norm and not did_pdf:
+                    # Only save PNG if not already saved above
+                    p_png = str(base.with_suffix(".png"))
+                    _save_last_render("png", p_png)
+                    # Track this file as processed
+                    self._processed_files.add(str(base))
+                if "jpg" in fmts_norm:
+                    p_jpg = str(base.with_suffix(".jpg"))
+                    _save_last_render("jpg", p_jpg)
+                    # Track this file as processed
+                    self._processed_files.add(str(base))
+                if "bmp" in fmts_norm:
+                    p_bmp = str(base.with_suffix(".bmp"))
+                    _save_last_render("bmp", p_bmp)
+                    self._processed_files.add(str(base))
+
+            # Render each export file separately
+            for export_file_name in export_files_to_render:
+                # Get items for this export file
+                front_items_for_file = front_grouped.get(export_file_name, [])
+                back_items_for_file = back_grouped.get(export_file_name, [])
+                
+                # Count non-slot items to determine if file has content
+                front_objects = [it for it in front_items_for_file if it.get("type") != "slot"]
+                back_objects = [it for it in back_items_for_file if it.get("type") != "slot"]
+                
+                # Skip if no objects in this file
+                if not front_objects and not back_objects:
+                    logger.debug(f"Skipping {export_file_name} - no objects assigned")
+                    continue
+                
+                # Generate file names for this export file
+                # Replace spaces and special chars in export file name for filename
+                file_suffix = export_file_name.replace(' ', '_')
+                
+                # Create base paths with export file name
+                base_front_file = _get_unique_base_path(
+                    f"{self.product}_{pdf_start_oder_i}-{pdf_end_oder_i}_front_{file_suffix}{f'_{pdf_order}' if pdf_order > 1 else ''}"
+                )
+                base_back_file = _get_unique_base_path(
+                    f"{self.product}_{pdf_start_oder_i}-{pdf_end_oder_i}_back_{file_suffix}"
+                )
+                
+                # Render frontside for this export file
+                if front_objects:
+                    logger.debug(f"Rendering frontside for {export_file_name}...")
+                    _render_and_save(front_items_for_file, base_front_file)
+                
+                # Render backside for this export file
+                if back_objects:
+                    logger.debug(f"Rendering backside for {export_file_name}...")
+                    _render_and_save(back_items_for_file, base_back_file)
+
+            # Return PDF info for combining (collect from all export files)
+            pdf_infos = []
+            if "pdf" in fmts_norm:
+                for export_file_name in export_files_to_render:
+                    front_objects = [it for it in front_grouped.get(export_file_name, []) if it.get("type") != "slot"]
+                    back_objects = [it for it in back_grouped.get(export_file_name, []) if it.get("type") != "slot"]
+                    
+                    if not front_objects and not back_objects:
+                        continue
+                    
+                    file_suffix = export_file_name.replace(' ', '_')
+                    
+                    if front_objects:
+                        base_front_file = OUTPUT_PATH / f"{self.product}_{pdf_start_oder_i}-{pdf_end_oder_i}_front_{file_suffix}{f'_{pdf_order}' if pdf_order > 1 else ''}"
+                        pdf_path = str(base_front_file.with_suffix(".pdf"))
+                        if os.path.exists(pdf_path):
+                            pdf_infos.append(PDFInfo(
+                                path=pdf_path,
+                                width_mm=jig_size[0],
+                                height_mm=jig_size[1],
+                                order_range=f"{pdf_start_oder_i}-{pdf_end_oder_i}",
+                                side="front",
+                                pdf_order=pdf_order,
+                                dpi=dpi,
+                                cmyk=jig_cmyk or "0,0,0,100"
+                            ))
+                    
+                    if back_objects:
+                        base_back_file = OUTPUT_PATH / f"{self.product}_{pdf_start_oder_i}-{pdf_end_oder_i}_back_{file_suffix}"
+                        pdf_path = str(base_back_file.with_suffix(".pdf"))
+                        if os.path.exists(pdf_path):
+                            pdf_infos.append(PDFInfo(
+                                path=pdf_path,
+                                width_mm=jig_size[0],
+                                height_mm=jig_size[1],
+                                order_range=f"{pdf_start_oder_i}-{pdf_end_oder_i}",
+                                side="back",
+                                pdf_order=pdf_order,
+                                dpi=dpi,
+                                cmyk=jig_cmyk or "0,0,0,100"
+                            ))
+
+            return {"status": "success", "pdf_infos": pdf_infos, "files": written_files}
+
+        except MemoryError:
+            logger.exception("Not enough memory to render PDF")
+            return {"status": "error", "message": "Not enough memory to render PDF"}
+        except Exception as e:
+            logger.exception(e)
+            return {"status": "error", "message": str(e)}
+
+    @staticmethod
+    def _sheet_key(data: List[Tuple[Dict[str, Any], Dict[str, Any]]], pdf_start_oder_i: int, pdf_end_oder_i: int, kwargs: Dict[str, Any]) -> str:
+        """Identify a sheet by its order range and what was placed in which slot."""
+        def _slot(slot: Optional[Dict[str, Any]]) -> Any:
+            if not slot:
+                return None
+            return [slot.get("label"), [[o.get("amazon_label"), o.get("label"), o.get("path")] for o in slot.get("objects") or []]]
+
+        content = [pdf_start_oder_i, pdf_end_oder_i, kwargs.get("pdf_order", 1), kwargs.get("barcode_text"),
+                   [[_slot(front), _slot(back)] for front, back in data]]
+        return hashlib.sha256(json.dumps(content, default=str).encode("utf-8")).hexdigest()
+
+    def _render_sheet(self, data: List[Tuple[Dict[str, Any], Dict[str, Any]]], jig_size: Tuple[float, float],
+                      pdf_start_oder_i: int, pdf_end_oder_i: int, **kwargs: Any) -> Dict[str, Any]:
+        """`_make_pdf`, or the files an interrupted run already rendered for this sheet."""
+        journal = self._journal
+        if journal is None:
+            with span("make_pdf", orders=f"{pdf_start_oder_i}-{pdf_end_oder_i}", slots=len(data)):
+                return self._make_pdf(data, jig_size, pdf_start_oder_i, pdf_end_oder_i, **kwargs)
+
+        key = self._sheet_key(data, pdf_start_oder_i, pdf_end_oder_i, kwargs)
+        recorded = journal.rendered_sheet(key)
+        if recorded is not None:
+            # Keep file naming identical to the interrupted run
+            self._processed_files.update(recorded["reserved"])
+            self.log(f"[{pdf_start_oder_i}-{pdf_end_oder_i}] Files already rendered, reusing them")
+            return {"status": "success", "pdf_infos": recorded["pdf_infos"], "files": recorded["files"],
+                    "reserved": sorted(self._processed_files)}
+
+        reserved_before = set(self._processed_files)
+        with span("make_pdf", orders=f"{pdf_start_oder_i}-{pdf_end_oder_i}", slots=len(data)):
+            result = self._make_pdf(data, jig_size, pdf_start_oder_i, pdf_end_oder_i, **kwargs)
+        if result["status"] == "success":
+            journal.record_sheet(key, result.get("files", []), result.get("pdf_infos", []), self._processed_files - reserved_before)
+            # Names reserved by every sheet up to this one (sheets render in order)
+            result["reserved"] = sorted(self._processed_files)
+        return result
+
+    def _submit_sheet(self, on_done: Callable[[Dict[str, Any]], None], *args: Any, **kwargs: Any) -> None:
+        """Render a sheet on the render thread during run(), inline otherwise."""
+        self._sheets_submitted += 1
+        index = self._sheets_submitted
+
+        def _done(result: Dict[str, Any]) -> None:
+            # Callbacks run in submission order
+            if result.get("status") == "success" and self._sheets_rendered == index - 1:
+                self._sheets_rendered = index
+                self._reserved_names = result.get("reserved", self._reserved_names)
+            on_done(result)
+
+        if self._render_stage is not None:
+            self._render_stage.submit(_done, *args, **kwargs)
+        else:
+            _done(self._render_sheet(*args, **kwargs))
+
+    def _add_to_combiner(self, pdf_combiner: PDFCombiner, pdf_info: PDFInfo) -> None:
+        pdf_combiner.add_pdf(pdf_info)
+        if self._journal is not None:
+            self._journal.record_combine(pdf_info)
+
+    def _process_order(
+        self, 
+        parent_folder: str, 
+        child_folder: str,
+        saved_slots: List[Tuple[Dict[str, Any], Dict[str, Any]]],
+        order_info: Dict[str, Any],
+        slot_state: SlotState,
+        pdf_start_oder_id: int,
+        order_id: int, 
+        last_order_id: int,
+        scene_info: Dict[str, Any],
+        asins_info: List[List[Any]] = None,
+        pdf_combiner: PDFCombiner = None,
+        front_barcode: Optional[dict] = None,
+        back_barcode: Optional[dict] = None,
+        prepared: Optional[Dict[str, Any]] = None,
+        saved_orders: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """Fill slots with one order; `saved_orders` are the order files whose slots are in `saved_slots`."""
+
+        def _select_slot(order_side_data: List[Dict[str, Any]], slot_state: SlotState, side: str, slot_label: Optional[str] = None) -> Dict[str, Any]:
+            # A slot is chosen by the first customization of the order side
+            first = order_side_data[0]
+            key = (first["label"], first["type"] if first["type"] != "options" else "image")
+            slot_pos = slot_state.select(side, key, label=slot_label)
+            if slot_pos is None:
+                not_found_objs = {key} if slot_state.has_free(side, slot_label) else set()
+                return {"status": "error", "message": f"Objects not found in pattern slot: {not_found_objs}"}
+            # In an ASIN pool this also takes the slot label for every other ASIN pattern
+            return {"status": "success", "slot": slot_state.take(side, slot_pos)}
+
+        def _remove_slot_by_label(slot_state: SlotState, side: str, slot_label: str) -> None:
+            try:
+                removed = False
+                removed = slot_state.take_label(side, slot_label) > 0
+                return removed
+            except Exception as e:
+                logger.exception(f"Error removing slot by label '{slot_label}': {e}")
+                return removed
+
+        def _process_object(order_side_data: Dict[str, Any], slot_info: Dict[str, Any], asin_mirror: bool = False) -> Dict[str, Any]:
+            for object in slot_info["objects"]:
+                # Check if object is static - static objects don't need Amazon data match
+                is_static = bool(object.get("is_static", False))
+                
+                if is_static:
+                    # Static objects are processed as-is without Amazon data
+                    object["processed"] = True
+                    object["slot_x_mm"] = slot_info["x_mm"]
+                    object["slot_y_mm"] = slot_info["y_mm"]
+                    object["slot_w_mm"] = slot_info["w_mm"]
+                    object["slot_h_mm"] = slot_info["h_mm"]
+                    continue
+                
+                # Non-static objects require matching with Amazon data
+                order_object = [obj for obj in order_side_data if obj["label"] == object["amazon_label"]]
+                if len(order_object) == 0:
+                    continue
+                order_object = order_object[0]
+
+                if object["type"] == "image":
+                    # Add mirror flag for image objects (from per-ASIN setting)
+                    object["mirror"] = bool(asin_mirror)
+                    # Check if object has custom_images and use custom image instead of Amazon/Dropbox
+                    custom_images_dict = object.get("custom_images", {})
+                    has_custom_images = bool(custom_images_dict and len(custom_images_dict) > 0)
+                    
+                    if has_custom_images:
+                        # Use custom image: the order value should match a key in custom_images dict
+                        order_value = order_object.get("value", "")
+                        custom_image_path = custom_images_dict.get(order_value, None)
+
+                        if custom_image_path:
+                            # Load custom image from the product folder
+                            try:
+                                full_custom_path = PRODUCTS_PATH / custom_image_path
+                                if full_custom_path.exists():
+                                    if full_custom_path.suffix.lower() in [".png", ".jpg", ".jpeg"]:
+                                        custom_image = _PILImage.open(full_custom_path)
+                                    elif full_custom_path.suffix.lower() == ".svg":
+                                        custom_image = svg_to_png(str(full_custom_path))
+                                    else:
+                                        logger.error(f"Unsupported custom image format: {full_custom_path.suffix} for file {full_custom_path}")
+                                        return {"status": "error", "message": f"Unsupported custom image format: {full_custom_path.suffix} for file {full_custom_path}"}
+                                    object["loaded_image"] = custom_image.convert("RGBA")
+                                    object["path"] = full_custom_path.stem + ".png"
+                                    object["processed"] = True
+                                    self.log(f"Use custom image for order {order_id}, amazon_label='{object['amazon_label']}'")
+                                    logger.info(f"Using custom image '{order_value}' -> '{custom_image_path}' for amazon_label='{object['amazon_label']}'")
+                                else:
+                                    logger.error(f"Custom image path not found: {full_custom_path}")
+                                    return {"status": "error", "message": f"Custom image path {full_custom_path} not found"}
+                            except Exception as e:
+                                logger.exception(f"Failed to load custom image {custom_image_path}: {e}")
+                                return {"status": "error", "message": f"Failed to load custom image {custom_image_path}: {e}"}
+                        else:
+                            logger.info(f"No custom image found for value '{order_value}' in custom_images dict")
+                            return {"status": "error", "message": f"Custom image with name {order_value} not found for label '{object['amazon_label']}'"}
+                    else:
+                        if not has_custom_images:
+                            if object["mask_path"] and object["mask_path"] != "None":
+                                mask_path = PRODUCTS_PATH / object["mask_path"]
+                                template_path = PRODUCTS_PATH / object["path"]
+                                result = self._apply_mask_cached(order_object, template_path, mask_path)
+                                if result["status"] == "error":
+                                    return {"status": "error", "message": f"Failed to apply mask for order: {result['message']}"}
+                                object["loaded_image"] = result["image"]
+                            else:
+                                object["loaded_image"] = order_object["loaded_image"]
+
+                            filename = order_object["image_path"].split(".")[0] + ".png" if "image_path" in order_object else order_object["image_url"].split("/")[-1].split(".")[0] + ".png"
+                            object["path"] = str(filename)
+                            object["processed"] = True
+
+                elif object["type"] == "text":
+                    # Add mirror flag for text objects (from per-ASIN setting)
+                    object["mirror"] = bool(asin_mirror)
+                    object["type"] = "rect"
+                    object["label"] = order_object["text"]
+                    if order_object["color"]:
+                        object["label_fill"] = order_object["color"]
+                    if order_object["font_family"]:
+                        object["label_font_family"] = order_object["font_family"]
+                    object["processed"] = True
+
+                object["slot_x_mm"] = slot_info["x_mm"]
+                object["slot_y_mm"] = slot_info["y_mm"]
+                object["slot_w_mm"] = slot_info["w_mm"]
+                object["slot_h_mm"] = slot_info["h_mm"]
+                   
+        if prepared is None:
+            with span("prepare_order", order=order_id):
+                prepared = self._prepare_order_data(parent_folder, child_folder, order_info, order_id, last_order_id)
+        result = prepared
+        if result["status"] == "error":
+            return {"status": "error", "message": result["message"]}
+        order_data = result["data"]
+        order_asin = result["asin"]
+        
+        # Extract mirror flag for this ASIN from ASINs list
+        asin_mirror = False
+        try:
+            if asins_info:
+                for asin_entry in asins_info:
+                    if isinstance(asin_entry, (list, tuple)) and len(asin_entry) >= 3 and asin_entry[0] == order_asin:
+                        asin_mirror = bool(asin_entry[2])
+                        break
+        except Exception:
+            logger.exception(f"Failed to extract mirror flag for ASIN {order_asin}")
+
+        is_saved_slots_processed = False
+
+        selected_slots = []
+        DEBUG_MULTIPLIER = 1
+        try:
+            if asins_info is None:
+                total_count = result["quantity"]
+            else:
+                order_count = [asin_pair[1] for asin_pair in asins_info if asin_pair[0] == order_asin][0]
+                total_count = int(result["quantity"] * order_count)
+        except Exception:
+            logger.exception("Failed to get order count")
+            return {"status": "error", "message": "Failed to get order count"}
+        total_count *= DEBUG_MULTIPLIER
+            
+        pdf_count = 1
+        self.log(f"[{order_id}/{last_order_id}] To process: {total_count} {'pcs' if total_count > 1 else 'pc'}")
+        for i in range(total_count):
+            selected_slot_front = None
+            selected_slot_back = None
+            if order_data.get("front", {}):
+                selected_slot_front = _select_slot(order_data["front"], slot_state, "Frontside")
+                if selected_slot_front["status"] == "error":
+                    return {"status": "error", "message": f"{selected_slot_front['message']}; Order id: {order_id} (ASIN: {order_asin})"}
+                selected_slot_front = selected_slot_front["slot"]
+            if order_data.get("back", {}):
+                selected_slot_back = _select_slot(order_data["back"], slot_state, "Backside", slot_label=selected_slot_front["label"] if selected_slot_front else None)
+                if selected_slot_back["status"] == "error":
+                    return {"status": "error", "message": f"{selected_slot_back['message']}; Order id: {order_id} (ASIN: {order_asin})"}
+                selected_slot_back = selected_slot_back["slot"]
+            
+            logger.info(f"Order {order_id}: Selected slots - Front: {selected_slot_front['label'] if selected_slot_front else 'None'}, Back: {selected_slot_back['label'] if selected_slot_back else 'None'}")
+            
+            if selected_slot_front:
+                res = _process_object(order_data["front"], selected_slot_front, asin_mirror=asin_mirror)
+                if res and res.get("status") == "error":
+                    return {"status": "error", "message": f"{res['message']} (ASIN: {order_asin})"}
+
+                if not selected_slot_back:
+                    res = _remove_slot_by_label(slot_state, "Backside", selected_slot_front["label"])
+                    if not res:
+                        return {"status": "error", "message": f"Failed to remove back slot by label for order {order_id} (ASIN: {order_asin})"}
+            if selected_slot_back:
+                res = _process_object(order_data["back"], selected_slot_back, asin_mirror=asin_mirror)
+                if res and res.get("status") == "error":
+                    return {"status": "error", "message": f"{res['message']} (ASIN: {order_asin})"}
+
+                if not selected_slot_front:
+                    res = _remove_slot_by_label(slot_state, "Frontside", selected_slot_back["label"])
+                    if not res:
+                        return {"status": "error", "message": f"Failed to remove front slot by label for order {order_id} (ASIN: {order_asin})"}
+                
+            selected_slots.append((selected_slot_front, selected_slot_back))
+
+            if slot_state.is_filled:
+                self.log(f"[{order_id}] [{i+1}/{total_count}] The export data is filled, making files...")
+                # Reset ALL ASIN patterns to original state after PDF render
+                if slot_state.pool is not None:
+                    slot_state.pool.reset()
+                else:
+                    slot_state.reset()
+                
+                # Orders whose slots share this sheet fail with it
+                sheet_order_ids = [int(order_file.split("_")[0]) for order_file in saved_orders or []]
+
+                def _on_rendered(result: Dict[str, Any], i: int = i, sheet_order_ids: List[int] = sheet_order_ids) -> None:
+                    if result["status"] == "error":
+                        self._render_failures.update(sheet_order_ids)
+                        self._render_failures.add(order_id)
+                        self.log(f"[{order_id}] Failed to make pdf: {result['message']} (ASIN: {order_asin})", ERROR_COLOR)
+                        return
+                    self.log(f"[{order_id}] [{i+1}/{total_count}] Files made successfully", SUCCESS_COLOR)
+
+                    # Add PDFs to combiner
+                    if pdf_combiner and "pdf_infos" in result and (front_barcode or back_barcode):
+                        for pdf_info in result["pdf_infos"]:
+                            self._add_to_combiner(pdf_combiner, pdf_info)
+
+                jig_info = scene_info["jig"]
+                jig_cmyk = jig_info.get("cmyk", "75,0,75,0")
+                # Rendered in the background during run(); the sheet's slots are a fresh list
+                self._submit_sheet(
+                    _on_rendered,
+                    saved_slots + selected_slots,
+                    (jig_info["width_mm"], jig_info["height_mm"]),
+                    pdf_start_oder_id,
+                    order_id,
+                    pdf_order=pdf_count,
+                    dpi=self.dpi,
+                    formats=self.formats,
+                    barcode_text=str(order_id),
+                    reference_text=order_info["orderId"],
+                    jig_cmyk=jig_cmyk,
+                    front_barcode=front_barcode,
+                    back_barcode=back_barcode
+                )
+                        
+                selected_slots.clear()
+                saved_slots.clear()
+                saved_orders = []
+                is_saved_slots_processed = True
+                pdf_count += 1
+                pdf_start_oder_id = order_id
+            
+        return {"status": "success", "selected_slots": selected_slots, "pdf_start_order_id": pdf_start_oder_id, "is_saved_slots_processed": is_saved_slots_processed}
+
+    def run(self) -> Dict[str, Any]:
+        """Process every selected order and export the filled sheets.
+
+        Returns ``{"status": "success" | "error" | "cancelled", "failed_orders": [...]}``.
+        Raises `OrderInputError` when the order selection is invalid or cannot be fetched.
+        """
+        failed_orders = []
+        # Spans from the prefetch and render threads are recorded too
+        profiler = Profiler()
+        profiler.activate()
+        try:
+            if self._cancel_requested:
+                self.log("Processing cancelled by user.", WARNING_COLOR)
+                return {"status": "cancelled", "failed_orders": failed_orders}
+
+            # Clear processed files set at the start of each processing run
+            # This allows files to be recreated if they were deleted from disk
+            self._processed_files.clear()
+
+            self.log(f"Trying to open the {self.product} pattern file...")
+            try:
+                with open(PRODUCTS_PATH / f"{self.product}.json", "r", encoding="utf-8") as f:
+                    # ASINObjects is resolved lazily from the shared templates
+                    pattern_info = load_product(f)
+
+                    # Keep immutable original copy to fully reset state after each PDF
+                    # (cheap: unresolved ASIN patterns share the compact storage)
+                    original_pattern_info = deepcopy(pattern_info)
+                    
+                    # Check if the new ASINObjects structure exists
+                    has_asin_objects = "ASINObjects" in pattern_info and pattern_info["ASINObjects"]
+                    
+                    if has_asin_objects:
+                        # New structure: clean up each ASIN's objects
+                        self.log(f"Detected ASINObjects structure with {len(pattern_info['ASINObjects'])} ASINs", SUCCESS_COLOR)
+                        for asin, asin_data in pattern_info["ASINObjects"].items():
+                            for side in ["Frontside", "Backside"]:
+                                if side not in asin_data:
+                                    continue
+                                for major in asin_data[side]:
+                                    for slot in major["slots"]:
+                                        for obj_ in slot["objects"]:
+                                            if obj_["type"] == "image":
+                                                if obj_["mask_path"] in [None, ".", "None", "none"]:
+                                                    obj_["mask_path"] = ""
+                                                else:
+                                                    try:
+                                                        Path(obj_["mask_path"])
+                                                    except Exception: 
+                                                        obj_["mask_path"] = ""
+                                            elif obj_["type"] == "text":
+                                                obj_["label"] = ""
+                    else:
+                        # Old structure: clean up global Frontside/Backside
+                        self.log(f"Using legacy pattern structure (no ASINObjects)", WARNING_COLOR)
+                        for side in ["Frontside", "Backside"]:
+                            for major in pattern_info[side]:
+                                for slot in major["slots"]:
+                                    for obj_ in slot["objects"]:
+                                        if obj_["type"] == "image":
+                                            if obj_["mask_path"] in [None, ".", "None", "none"]:
+                                                obj_["mask_path"] = ""
+                                            else:
+                                                try:
+                                                    Path(obj_["mask_path"])
+                                                except Exception: 
+                                                    obj_["mask_path"] = ""
+
+                                        elif obj_["type"] == "text":
+                                            obj_["label"] = ""
+
+            except Exception as e:
+                self.log(f"Failed to open the {self.product} pattern file: {e}", ERROR_COLOR)
+                self._progress(value=100)
+                return {"status": "error", "message": f"Failed to open the {self.product} pattern file: {e}", "failed_orders": failed_orders}
+            self.log(f"{self.product} pattern file opened successfully", SUCCESS_COLOR)
+
+            # Initialize PDF combiner
+            pdf_combiner = PDFCombiner(OUTPUT_PATH)
+            self.log("PDF combiner initialized for combining rendered PDFs")
+
+            total_orders_items: Dict[str, Tuple[Dict[str, Any], str, str]] = {}
+            try:
+                parsed_orders = self.order_ids
+                if not parsed_orders:
+                    raise OrderInputError("Order input should be like 1-10 or 3,7,9 or 1,2,4-8,10")
+                
+                self.log(f"Starting processing for orders: {parsed_orders}")
+                # Dropbox indexing reads its date range from the global state
+                if self.dropbox_from is not None:
+                    state.dropbox_from = self.dropbox_from
+                if self.dropbox_to is not None:
+                    state.dropbox_to = self.dropbox_to
+                orders_info = get_orders_info(
+                    [str(i) for i in parsed_orders],
+                    self.log,
+                    progress_callback=lambda done, total: self._progress(value=(done / total * 100) if total else 0, current_index=done, total=total),
+                )
+                total_orders_items = orders_info["orders"]
+            except OrderInputError:
+                raise
+            except Exception as e:
+                raise OrderInputError(f"Failed to parse order input: {e}") from e
+                 
+            orders_to_process: Dict[str, Tuple[Dict[str, Any], str, str]] = {}
+            # Extract ASINs from the product ASIN list (format: [asin, count, mirror])
+            asins = []
+            for asin_entry in self.asins:
+                if isinstance(asin_entry, (list, tuple)) and len(asin_entry) >= 1:
+                    asins.append(asin_entry[0])
+                else:
+                    asins.append(asin_entry)
+            
+            for order_file, order_info in total_orders_items.items():
+                if "asin" not in order_info[0]:
+                    self.log(f"Order {order_file} has no asin", ERROR_COLOR)
+                    continue
+                
+                if order_info[0]["asin"] in asins:
+                    orders_to_process[order_file] = order_info
+
+            if not orders_to_process:
+                self.log(f"No orders found for ASINs: {asins}", ERROR_COLOR)
+                return {"status": "error", "message": f"No orders found for ASINs: {asins}", "failed_orders": failed_orders}
+            else:
+                self.log(f"Found {len(orders_to_process)} orders for ASINs {asins}", SUCCESS_COLOR)
+
+            orders_to_process = dict(sorted(orders_to_process.items(), key=lambda x: int(x[0].split("_")[0])))
+            last_order_i = max(int(order_path.split("_")[0]) for order_path in orders_to_process)
+
+            # Skip what an interrupted run with the same selection already finished
+            journal = None
+            done_orders: List[str] = []
+            is_sucess = False
+            pdf_start_oder_i = None
+            if self.resume:
+                journal = JobJournal.for_run(LOGS_PATH / "journal", self.product, {
+                    "product": self.product,
+                    "product_sha256": file_sha256(str(PRODUCTS_PATH / f"{self.product}.json")),
+                    "order_ids": self.order_ids,
+                    "asins": self.asins,
+                    "formats": self.formats,
+                    "dpi": self.dpi,
+                })
+                if journal.resumable:
+                    checkpoint = journal.checkpoint
+                    done_orders = list(checkpoint["done_orders"])
+                    failed_orders.extend(checkpoint["failed_orders"])
+                    is_sucess = checkpoint["is_success"]
+                    pdf_start_oder_i = checkpoint["pdf_start"]
+                    self._processed_files.update(checkpoint["reserved"])
+                    for pdf_info in journal.combined_pdfs:
+                        pdf_combiner.add_pdf(pdf_info)
+                    orders_to_process = {k: v for k, v in orders_to_process.items() if k not in set(done_orders)}
+                    self.log(f"Resuming an interrupted run: {len(done_orders)} orders already done, {len(orders_to_process)} left", SUCCESS_COLOR)
+            self._journal = journal
+
+            total_orders = len(orders_to_process) 
+            progress_step = 100 / max(1, len(orders_to_process))
+
+            # Initialize progress bar as zero and show indexing label (thread-safe)
+            try:
+                self._progress(value=0, current_index=0, total=total_orders)
+            except Exception:
+                pass
+
+            # Check if using new ASINObjects structure (use original_pattern_info to avoid dependency on mutations)
+            has_asin_objects = "ASINObjects" in original_pattern_info and original_pattern_info["ASINObjects"]
+
+            current_processing_orders = []
+            # Order files with slots in pdf_data
+            pdf_data_orders: List[str] = []
+            
+            # Create SINGLE shared pattern_data dict for ALL ASINs to ensure slots are globally removed.
+            # Each SlotState only flags taken slots over the original (shared, unmodified) pattern,
+            # so resetting after each PDF does not copy any pattern data.
+            if has_asin_objects:
+                # pattern_data will be a dict keyed by ASIN; the pool shares taken slot labels between them
+                slot_pool = SlotPool()
+                pattern_data = {}
+                for asin in original_pattern_info["ASINObjects"]:
+                    pattern_data[asin] = slot_pool.add(original_pattern_info["ASINObjects"][asin])
+            else:
+                # Legacy: single pattern for all ASINs
+                pattern_data = SlotState(original_pattern_info)
+                
+            pdf_data: List[Tuple[Dict[str, Any], Dict[str, Any]]] = []
+            front_barcode = back_barcode = None
+            resumed_combiner = journal is not None and bool(journal.combined_pdfs)
+            sheet_failed = False
+
+            def _prepare(entry: Tuple[str, Tuple[Dict[str, Any], str, str]]) -> Optional[Dict[str, Any]]:
+                # Runs on a prefetch thread; orders skipped below are not downloaded
+                order_file, (order_info, parent_folder, child_folder) = entry
+                order_asin = order_info.get("asin")
+                if self._cancel_requested or not order_asin:
+                    return None
+                if has_asin_objects and order_asin not in original_pattern_info["ASINObjects"]:
+                    return None
+                order_id = int(order_file.split("_")[0])
+                with span("prepare_order", order=order_id):
+                    return self._prepare_order_data(parent_folder, child_folder, order_info, order_id, last_order_i)
+
+            def _on_sheet_rendered(result: Dict[str, Any], sheet_orders: List[str], first_id: int, last_id: int,
+                                   front_barcode: Optional[dict], back_barcode: Optional[dict]) -> None:
+                nonlocal is_sucess, sheet_failed
+                if result["status"] == "error":
+                    self.log(f"[{first_id}-{last_id}] Failed to export files: " + result["message"], ERROR_COLOR)
+                    failed_orders.extend([order_path for order_path in sheet_orders if order_path not in failed_orders])
+                    sheet_failed = True
+                else:
+                    self.log(f"[{first_id}-{last_id}] Files made successfully", SUCCESS_COLOR)
+                    is_sucess = True
+
+                # Add PDFs to combiner
+                if "pdf_infos" in result and (front_barcode or back_barcode):
+                    for pdf_info in result["pdf_infos"]:
+                        self._add_to_combiner(pdf_combiner, pdf_info)
+
+            # Order boundaries with no slot filled, written once their sheets are rendered
+            pending_checkpoints: Deque[Tuple[int, List[str], List[str], Optional[int]]] = deque()
+
+            def _write_checkpoints() -> None:
+                # Past a failed sheet nothing is written: a restart redoes it from the last checkpoint
+                while pending_checkpoints and pending_checkpoints[0][0] <= self._sheets_rendered:
+                    _, done, failed, pdf_start = pending_checkpoints.popleft()
+                    journal.record_checkpoint(done, failed, self._reserved_names, is_sucess, pdf_start)
+
+            # Downloads run ahead of slot filling and sheets render behind it (see pipeline.py)
+            self._render_failures = set()
+            self._sheets_submitted = self._sheets_rendered = 0
+            self._reserved_names = sorted(self._processed_files)
+            self._render_stage = RenderStage(self._render_sheet, max_pending=self.RENDER_QUEUE_DEPTH)
+            prefetched = iter(Prefetcher(_prepare, orders_to_process.items(), workers=self.PREFETCH_WORKERS, depth=self.PREFETCH_DEPTH))
+            stage_cancelled = True
+            try:
+                for i, ((order_file, order_info_), prepared) in enumerate(prefetched):
+                    order_id = int(order_file.split("_")[0])
+                    order_info, parent_folder, child_folder = order_info_
+                    if pdf_start_oder_i is None:
+                        pdf_start_oder_i = order_id
+
+                    if self._cancel_requested:
+                        self.log("Processing cancelled by user.", WARNING_COLOR)
+                        logger.debug("Processing cancelled by user.")
+                        break
+                    done_orders.append(order_file)
+
+                    # Determine order ASIN and get the appropriate pattern
+                    order_asin = order_info.get("asin")
+                    if not order_asin:
+                        self.log(f"[{order_id}] Order has no ASIN, skipping", ERROR_COLOR)
+                        failed_orders.append(order_file)
+                        continue
+
+                    if has_asin_objects:
+                        # Get ASIN-specific pattern
+                        if order_asin not in original_pattern_info["ASINObjects"]:
+                            self.log(f"[{order_id}] ASIN '{order_asin}' not found in ASINObjects, skipping", ERROR_COLOR)
+                            failed_orders.append(order_file)
+                            continue
+                    
+                        # Use the ASIN-specific pattern for this order (from ORIGINAL, immutable copy)
+                        original_pattern_for_order = original_pattern_info["ASINObjects"][order_asin]
+                        pattern_data_for_order = pattern_data[order_asin]
+                    
+                        # Extract barcodes from ASIN-specific pattern
+                        front_barcode = original_pattern_for_order.get("FrontsideBarcode", None)
+                        back_barcode = original_pattern_for_order.get("BacksideBarcode", None)
+                    else:
+                        # Legacy: use global pattern for all ASINs (from ORIGINAL, immutable copy)
+                        original_pattern_for_order = original_pattern_info
+                        pattern_data_for_order = pattern_data
+                    
+                        # Extract barcodes from global pattern
+                        front_barcode = original_pattern_info.get("FrontsideBarcode", None)
+                        back_barcode = original_pattern_info.get("BacksideBarcode", None)
+
+                    self.log(f"Processing of Order {order_id}/{last_order_i} has been initiated")
+                    logger.debug(f"Processing of Order {order_id}/{last_order_i} has been initiated")
+                    with span("fill_order", order=order_id):
+                        order_result = self._process_order(
+                            parent_folder,
+                            child_folder,
+                            pdf_data,
+                            order_info,
+                            pattern_data_for_order,
+                            pdf_start_oder_i,
+                            order_id,
+                            last_order_i,
+                            pattern_info["Scene"],
+                            pattern_info.get("ASINs", None),
+                            pdf_combiner,
+                            front_barcode=front_barcode,
+                            back_barcode=back_barcode,
+                            prepared=prepared,
+                            saved_orders=list(pdf_data_orders),
+                        )
+                    if order_result["status"] == "error":
+                        if order_result.get("message") == "Cancelled":
+                            self.log("Processing cancelled by user.", WARNING_COLOR)
+                            break
+                        failed_orders.append(order_file)
+                        self.log(f"[{order_id}/{last_order_i}] Order processing failed: " + order_result["message"], ERROR_COLOR)
+                    else:
+                        self.log(f"[{order_id}/{last_order_i}] Order processed successfully", SUCCESS_COLOR)
+                        if order_result["is_saved_slots_processed"]:
+                            pdf_data.clear()
+                            pdf_data_orders.clear()
+                        if order_result["selected_slots"] == (None, None):
+                            self.log(f"[{order_id}/{last_order_i}] Order doesn't require customization", WARNING_COLOR)
+                        else:
+                            if len(order_result["selected_slots"]) > 0:
+                                pdf_data.extend(order_result["selected_slots"])
+                                pdf_data_orders.append(order_file)
+                            current_processing_orders.append(order_file)
+                        pdf_start_oder_i = order_result["pdf_start_order_id"]
+
+                    if self._cancel_requested:
+                        self.log("Processing cancelled by user.", WARNING_COLOR)
+                        break
+
+                    # Check if pattern is filled (the ASIN's own pattern, or the global one for legacy)
+                    pattern_filled = pattern_data_for_order.is_filled
+
+                    if pattern_filled or (i == total_orders - 1 and pdf_data):
+                        self.log(f"[{pdf_start_oder_i}-{order_id}] The export data is filled, making files...")
+
+                        # Reset pattern_data based on structure
+                        if has_asin_objects:
+                            # Reset ALL ASINs to original state
+                            slot_pool.reset()
+                        else:
+                            # Reset global pattern
+                            pattern_data.reset()
+
+                        jig_info = pattern_info["Scene"]["jig"]
+                        jig_cmyk = jig_info.get("cmyk", "75,0,75,0")
+                        self._submit_sheet(
+                            lambda result, args=(list(current_processing_orders), pdf_start_oder_i, order_id, front_barcode, back_barcode):
+                                _on_sheet_rendered(result, *args),
+                            list(pdf_data),
+                            (jig_info["width_mm"], jig_info["height_mm"]),
+                            pdf_start_oder_i,
+                            order_id,
+                            dpi=self.dpi,
+                            formats=self.formats,
+                            barcode_text=str(order_id),
+                            reference_text=order_info["orderId"],
+                            jig_cmyk=jig_cmyk,
+                            front_barcode=front_barcode,
+                            back_barcode=back_barcode
+                        )
+
+                        pdf_data.clear()
+                        pdf_data_orders.clear()
+                        pdf_start_oder_i = None
+
+                    # Update progress (value is percent). Use thread-safe scheduler so UI updates from worker thread.
+                    try:
+                        new_value = min(100.0, float(i + 1) / float(total_orders) * 100.0)
+                    except Exception:
+                        new_value = None
+                    try:
+                        if new_value is not None:
+                            self._progress(value=new_value, current_index=min(i + 1, total_orders), total=total_orders)
+                        else:
+                            self._progress(current_index=min(i + 1, total_orders), total=total_orders)
+                    except Exception:
+                        pass
+
+                    if journal is not None and not pdf_data:
+                        pending_checkpoints.append((self._sheets_submitted, list(done_orders), list(failed_orders), pdf_start_oder_i))
+
+                    # Report sheets rendered meanwhile (logs, failures, combiner) from this thread
+                    self._render_stage.drain()
+                    if journal is not None:
+                        _write_checkpoints()
+
+                stage_cancelled = self._cancel_requested
+            finally:
+                # Stop prefetching, then finish (or drop, when cancelled/failed) the queued sheets before combining
+                prefetched.close()
+                self._render_stage.close(cancel=stage_cancelled)
+                self._render_stage = None
+            if journal is not None:
+                _write_checkpoints()
+            for order_file in orders_to_process:
+                if int(order_file.split("_")[0]) in self._render_failures and order_file not in failed_orders:
+                    failed_orders.append(order_file)
+
+            # Finalize and combine all pending PDFs
+            # True True False 2
+            if is_sucess:
+                if (front_barcode or back_barcode or resumed_combiner) and pdf_combiner.pending_pdfs:
+                    self.log("Combining rendered PDFs into larger sheets...")
+                    try:
+                        combined_paths = pdf_combiner.finalize()
+                        if combined_paths:
+                            self.log(f"Created {len(combined_paths)} combined PDF(s):", SUCCESS_COLOR)
+                            for path in combined_paths:
+                                self.log(f"  - {os.path.basename(path)}", SUCCESS_COLOR)
+                        else:
+                            self.log("No PDFs were combined (possibly all fit in single sheets already)")
+                    except Exception as e:
+                        self.log(f"Failed to combine PDFs: {e}", ERROR_COLOR)
+                        logger.exception("PDF combining failed")
+                    
+                self.log(f"Processing completed! You can find files in outputs/ folder", SUCCESS_COLOR)
+            # if failed_orders:
+            #     self.log(f"Failed orders: {failed_orders}", ERROR_COLOR)
+
+            if self._cancel_requested:
+                status = "cancelled"
+            elif failed_orders and not is_sucess:
+                status = "error"
+            else:
+                status = "success"
+            # A cancelled run or one with unrendered sheets stays resumable
+            if journal is not None and status != "cancelled" and not sheet_failed and not self._render_failures:
+                journal.finish(status)
+            return {"status": status, "failed_orders": failed_orders}
+        finally:
+            self._journal = None
+            profiler.deactivate()
+            self._report_profile(profiler)
+            self._progress(value=100)
@@ -0,0 +1,192 @@
+"""Append-only journal that lets an interrupted batch run resume.
+
+One JSONL file per run signature (product file, orders, formats, dpi) in
+``LOGS_PATH / "journal"``. Events:
+
+- ``start``: the signature.
+- ``sheet``: a rendered sheet, its output files with sha256 hashes, the
+  PDFs handed to the combiner and the file names it reserved.
+- ``combine``: a PDF added to the combiner.
+- ``checkpoint``: every order up to here is done, no slot is filled and
+  every sheet is rendered; with the failed orders, reserved file names and
+  the first order of the next sheet at that point.
+- ``finish``: the run completed; the next run starts a new journal.
+
+A truncated last line (crash while writing) is ignored. Opening an
+unfinished journal drops what was recorded after its last checkpoint,
+except rendered sheets, since the resumed run records that progress again.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from src.canvas import PDFInfo
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["JobJournal", "file_sha256"]
+
+
+def file_sha256(path: str) -> Optional[str]:
+    try:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+    except OSError:
+        return None
+
+
+class JobJournal:
+    """Journal of one batch run signature.
+
+    Opening it reads what a previous, unfinished run with the same signature
+    recorded: `checkpoint` (or None), the combiner PDFs added before it, and
+    the rendered sheets by key. A finished or mismatching journal is
+    started over.
+    """
+
+    def __init__(self, path: Path, signature: Dict[str, Any]) -> None:
+        self.path = Path(path)
+        self.signature = signature
+        self.checkpoint: Optional[Dict[str, Any]] = None
+        self.combined_pdfs: List[PDFInfo] = []
+        self._sheets: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    @classmethod
+    def for_run(cls, directory: Path, name: str, signature: Dict[str, Any]) -> "JobJournal":
+        key = hashlib.sha256(json.dumps(signature, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:16]
+        safe_name = "".join(ch if ch.isalnum() or ch in "-_" else "_" for ch in name)
+        return cls(Path(directory) / f"{safe_name}_{key}.jsonl", signature)
+
+    @property
+    def resumable(self) -> bool:
+        return self.checkpoint is not None
+
+    def _load(self) -> None:
+        events = []
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        events.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        logger.warning(f"Ignoring truncated journal line in {self.path}")
+        except FileNotFoundError:
+            pass
+        except OSError:
+            logger.exception(f"Failed to read journal {self.path}")
+
+        valid = (
+            events
+            and events[0].get("event") == "start"
+            and events[0].get("signature") == json.loads(json.dumps(self.signature, default=str))
+            and not any(event.get("event") == "finish" for event in events)
+        )
+        if not valid:
+            self._start()
+            return
+
+        combined: List[PDFInfo] = []
+        last_checkpoint = 0
+        for i, event in enumerate(events):
+            kind = event.get("event")
+            if kind == "sheet":
+                self._sheets[event["key"]] = event
+            elif kind == "combine":
+                combined.append(PDFInfo(**event["pdf_info"]))
+            elif kind == "checkpoint":
+                self.checkpoint = event
+                self.combined_pdfs = list(combined)
+                last_checkpoint = i
+
+        # Progress past the last checkpoint is redone by this run; only its rendered sheets stay reusable
+        tail = events[last_checkpoint + 1:]
+        if any(event.get("event") != "sheet" for event in tail):
+            self._rewrite(events[:last_checkpoint + 1] + [event for event in tail if event.get("event") == "sheet"])
+
+    def _start(self) -> None:
+        self.checkpoint = None
+        self.combined_pdfs = []
+        self._sheets = {}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "w", encoding="utf-8") as f:
+                f.write(json.dumps({"event": "start", "signature": self.signature}, default=str) + "\n")
+        except OSError:
+            logger.exception(f"Failed to create journal {self.path}")
+
+    def _rewrite(self, events: List[Dict[str, Any]]) -> None:
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for event in events:
+                    f.write(json.dumps(event, default=str) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except OSError:
+            logger.exception(f"Failed to rewrite journal {self.path}")
+
+    def _append(self, event: Dict[str, Any]) -> None:
+        line = json.dumps(event, default=str) + "\n"
+        with self._lock:
+            try:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(line)
+                    f.flush()
+                    os.fsync(f.fileno())
+            except OSError:
+                logger.exception(f"Failed to write journal {self.path}")
+
+    # ------------------------------ Sheets ------------------------------
+    def record_sheet(self, key: str, files: Iterable[str], pdf_infos: Iterable[PDFInfo], reserved: Iterable[str]) -> None:
+        event = {
+            "event": "sheet",
+            "key": key,
+            "files": [{"path": str(p), "sha256": file_sha256(str(p))} for p in files],
+            "pdf_infos": [asdict(info) for info in pdf_infos],
+            "reserved": sorted(reserved),
+        }
+        self._sheets[key] = event
+        self._append(event)
+
+    def rendered_sheet(self, key: str) -> Optional[Dict[str, Any]]:
+        """The recorded sheet `key` if all its output files are still there unchanged."""
+        event = self._sheets.get(key)
+        if event is None or not event["files"]:
+            return None
+        for entry in event["files"]:
+            if entry["sha256"] is None or file_sha256(entry["path"]) != entry["sha256"]:
+                return None
+        return {
+            "files": [entry["path"] for entry in event["files"]],
+            "pdf_infos": [PDFInfo(**info) for info in event["pdf_infos"]],
+            "reserved": list(event["reserved"]),
+        }
+
+    # ------------------------------ Progress ------------------------------
+    def record_combine(self, pdf_info: PDFInfo) -> None:
+        self._append({"event": "combine", "pdf_info": asdict(pdf_info)})
+
+    def record_checkpoint(self, done_orders: Iterable[str], failed_orders: Iterable[str], reserved: Iterable[str],
+                          is_success: bool, pdf_start: Optional[int] = None) -> None:
+        self._append({
+            "event": "checkpoint",
+            "done_orders": list(done_orders),
+            "failed_orders": list(failed_orders),
+            "reserved": sorted(reserved),
+            "is_success": bool(is_success),
+            "pdf_start": pdf_start,
+        })
+
+    def finish(self, status: str) -> None:
+        self._append({"event": "finish", "status": status})
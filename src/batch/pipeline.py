@@ -0,0 +1,109 @@
+"""Bounded stages that let a batch job overlap network, CPU and disk work.
+
+Orders are prepared (downloaded and transformed) ahead of the slot filler
+by `Prefetcher`, and filled sheets are rendered behind it by `RenderStage`.
+Both stages are bounded so at most a few orders' and sheets' images are
+held in memory at once; the slot filling itself stays sequential on the
+calling thread, in order.
+"""
+import logging
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, Tuple
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["Prefetcher", "RenderStage"]
+
+
+class Prefetcher:
+    """Run ``fn(item)`` on worker threads ahead of the consumer.
+
+    Iterating yields ``(item, result)`` in the order of `items`; at most
+    `depth` items are submitted but not yet consumed (back-pressure). An
+    exception raised by `fn` is re-raised when its item is reached. Leaving
+    the iteration early cancels what has not started yet.
+    """
+
+    def __init__(self, fn: Callable[[Any], Any], items: Iterable[Any], workers: int = 4, depth: int = 8) -> None:
+        self.fn = fn
+        self.items = items
+        self.workers = max(1, int(workers))
+        self.depth = max(1, int(depth))
+
+    def __iter__(self) -> Iterator[Tuple[Any, Any]]:
+        executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="batch-prefetch")
+        pending = deque()
+        items = iter(self.items)
+        try:
+            while True:
+                while len(pending) < self.depth:
+                    try:
+                        item = next(items)
+                    except StopIteration:
+                        break
+                    pending.append((item, executor.submit(self.fn, item)))
+                if not pending:
+                    return
+                item, future = pending.popleft()
+                yield item, future.result()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+class RenderStage:
+    """Render sheets on one background thread, in submission order.
+
+    `submit` queues ``render(*args, **kwargs)`` and blocks while
+    `max_pending` renders are already waiting. Results are handed to the
+    `on_done` callbacks on the calling thread by `drain` and `close`, so
+    bookkeeping (failed orders, the PDF combiner) never needs a lock.
+    """
+
+    def __init__(self, render: Callable[..., dict], max_pending: int = 2) -> None:
+        self.render = render
+        self._jobs: queue.Queue = queue.Queue(maxsize=max(1, int(max_pending)))
+        self._done: queue.Queue = queue.Queue()
+        self._cancelled = threading.Event()
+        self._thread = threading.Thread(target=self._worker, name="batch-render", daemon=True)
+        self._thread.start()
+
+    def _worker(self) -> None:
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            on_done, args, kwargs = job
+            if self._cancelled.is_set():
+                continue
+            try:
+                result = self.render(*args, **kwargs)
+            except Exception as e:
+                logger.exception("Sheet render failed")
+                result = {"status": "error", "message": str(e)}
+            self._done.put((on_done, result))
+
+    def submit(self, on_done: Callable[[dict], None], *args: Any, **kwargs: Any) -> None:
+        self._jobs.put((on_done, args, kwargs))
+
+    def drain(self) -> None:
+        """Run the callbacks of the renders finished so far."""
+        while True:
+            try:
+                on_done, result = self._done.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                on_done(result)
+            except Exception:
+                logger.exception("Render callback failed")
+
+    def close(self, cancel: bool = False) -> None:
+        """Wait for queued renders (or drop them with `cancel`) and run their callbacks."""
+        if cancel:
+            self._cancelled.set()
+        self._jobs.put(None)
+        self._thread.join()
+        self.drain()
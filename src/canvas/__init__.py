@@ -3,6 +3,8 @@ from .context_menu import CanvasContextPopup
 from .selection import CanvasSelection
 from .major import MajorManager
 from .jig import JigController
+from .redraw import RedrawScheduler
+from .spatial import SpatialIndex
 from .slots import SlotManager
 from .images import ImageManager
 from .export import PdfExporter
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import functools
+import logging
+import math
+from typing import Optional
+
+from PIL import Image, ImageDraw, ImageFont
+
+from src.canvas.images import _SizedLRU
+
+logger = logging.getLogger(__name__)
+
+# Layout of python-barcode's ImageWriter output for Code128, which sheets were
+# designed with: 0.2 mm modules, 2.54 mm quiet zones, bars from 1 to 16 mm of 17 mm
+QUIET_ZONE_MODULES = 2.54 / 0.2
+BAR_TOP = 1.0 / 17.0
+BAR_BOTTOM = 16.0 / 17.0
+
+# Share of the barcode block height: bars, their text, the reference text below
+BARS_SHARE = 0.7
+TEXT_SHARE = 0.15
+
+# Rendered bar and text blocks, bounded by pixels rather than entries since
+# sheet barcodes at print resolution vary widely in size
+RASTER_CACHE_MAX_PIXELS = 16_000_000
+_rasters = _SizedLRU(RASTER_CACHE_MAX_PIXELS)
+
+
+@functools.lru_cache(maxsize=256)
+def code128_bars(text: str) -> tuple[tuple[float, float], ...]:
+    """Bars of the Code128 symbol for `text` as (left, right) fractions of the symbol width."""
+    import barcode
+
+    modules = barcode.get_barcode_class("code128")(text).build()[0]
+    total = len(modules) + 2 * QUIET_ZONE_MODULES
+    bars = []
+    start = None
+    for i, module in enumerate(modules + "0"):
+        if module == "1" and start is None:
+            start = i
+        elif module != "1" and start is not None:
+            bars.append(((QUIET_ZONE_MODULES + start) / total, (QUIET_ZONE_MODULES + i) / total))
+            start = None
+    return tuple(bars)
+
+
+def layout(h: float) -> tuple[float, float, float]:
+    """Heights of the bars area, the barcode text line and the reference text line of a block `h` high."""
+    bars_h = int(h * BARS_SHARE)
+    text_h = int(h * TEXT_SHARE)
+    return bars_h, text_h, h - bars_h - text_h
+
+
+def rotated_size(w: float, h: float, angle: float) -> tuple[int, int]:
+    a = math.radians(abs(angle) % 360.0)
+    ca, sa = abs(math.cos(a)), abs(math.sin(a))
+    return int((w * ca) + (h * sa)), int((w * sa) + (h * ca))
+
+
+def draw_bars_cairo(context, text: str, x: float, y: float, w: float, h: float, angle: float = 0.0) -> None:
+    """Fill the bars of the block `w` x `h` whose rotated bounds start at (x, y), as vector rectangles.
+
+    `angle` is counter-clockwise in degrees, like PIL's ``rotate``.
+    """
+    bw, bh = rotated_size(w, h, angle)
+    bars_h = layout(h)[0]
+    context.save()
+    try:
+        context.translate(x + bw / 2.0, y + bh / 2.0)
+        context.rotate(-math.radians(angle))
+        context.translate(-w / 2.0, -h / 2.0)
+        top, bottom = bars_h * BAR_TOP, bars_h * BAR_BOTTOM
+        for left, right in code128_bars(text):
+            context.rectangle(left * w, top, (right - left) * w, bottom - top)
+        context.set_source_rgb(0, 0, 0)
+        context.fill()
+    finally:
+        context.restore()
+
+
+def svg_bars_path(text: str, w: float, h: float) -> str:
+    """Path data of the bars of a block `w` x `h` (unrotated, origin at its top-left)."""
+    bars_h = layout(h)[0]
+    top, height = bars_h * BAR_TOP, bars_h * (BAR_BOTTOM - BAR_TOP)
+    return "".join(
+        f"M{left * w:.4f} {top:.4f}h{(right - left) * w:.4f}v{height:.4f}h{-(right - left) * w:.4f}z"
+        for left, right in code128_bars(text)
+    )
+
+
+def _rotate(img: Image.Image, angle: float) -> Image.Image:
+    if abs(angle) > 1e-6:
+        return img.rotate(angle, expand=True, resample=Image.BICUBIC, fillcolor=(0, 0, 0, 0))
+    return img
+
+
+def _cached_raster(key: tuple, build) -> Image.Image:
+    img = _rasters.get(key)
+    if img is None:
+        img = build()
+        _rasters.put(key, img, img.width * img.height)
+    return img
+
+
+def bars_image(text: str, w_px: int, h_px: int, angle: float = 0.0) -> Image.Image:
+    """Transparent RGBA block with the bars of `text` drawn at pixel resolution.
+
+    Cached: the returned image is shared, do not modify it.
+    """
+    return _cached_raster(("bars", text, w_px, h_px, angle), lambda: _draw_bars(text, w_px, h_px, angle))
+
+
+def _draw_bars(text: str, w_px: int, h_px: int, angle: float) -> Image.Image:
+    img = Image.new("RGBA", (w_px, h_px), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
+    bars_h = layout(h_px)[0]
+    top, bottom = int(round(bars_h * BAR_TOP)), int(round(bars_h * BAR_BOTTOM))
+    for left, right in code128_bars(text):
+        x0 = int(round(left * w_px))
+        x1 = max(x0 + 1, int(round(right * w_px)))
+        draw.rectangle([x0, top, x1 - 1, bottom - 1], fill=(0, 0, 0, 255))
+    return _rotate(img, angle)
+
+
+def _font(font_path: Optional[str], size_px: int):
+    if font_path:
+        try:
+            return ImageFont.truetype(font_path, max(1, int(size_px)))
+        except OSError:
+            logger.exception(f"Failed to load barcode font {font_path}")
+    return ImageFont.load_default()
+
+
+def text_image(text: str, reference: str, w_px: int, h_px: int, angle: float = 0.0, font_path: Optional[str] = None) -> Image.Image:
+    """Transparent RGBA block with the text lines under the bars. Cached and shared."""
+    return _cached_raster(("text", text, reference, w_px, h_px, angle, font_path),
+                          lambda: _draw_text(text, reference, w_px, h_px, angle, font_path))
+
+
+def _draw_text(text: str, reference: str, w_px: int, h_px: int, angle: float, font_path: Optional[str]) -> Image.Image:
+    img = Image.new("RGBA", (w_px, h_px), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img, "RGBA")
+    bars_h, text_h, reference_h = layout(h_px)
+    padding = max(2, int(h_px * 0.01))
+    for line, line_top, line_h in ((text, bars_h, text_h), (reference, bars_h + text_h, reference_h)):
+        if not line or line_h <= 0:
+            continue
+        font = _font(font_path, max(8, int(line_h * 0.8)))
+        try:
+            bbox = draw.textbbox((0, 0), line, font=font)
+            line_w = bbox[2] - bbox[0]
+        except Exception:
+            line_w = 0
+        draw.text(((w_px - line_w) // 2, line_top + padding), line, font=font, fill=(0, 0, 0, 255))
+    return _rotate(img, angle)
+
+
+def barcode_image(text: str, reference: str, w_px: int, h_px: int, angle: float = 0.0, font_path: Optional[str] = None) -> Image.Image:
+    """Raster barcode block: bars, text and reference text, composited from the cached layers."""
+    return Image.alpha_composite(bars_image(text, w_px, h_px, angle), text_image(text, reference, w_px, h_px, angle, font_path))
@@ -10,6 +10,7 @@ import functools
 import urllib.request
 
 import math
+import time
 import arabic_reshaper
 from bidi.algorithm import get_display
 import cairo
@@ -20,6 +21,16 @@ from pilmoji import Pilmoji
 from src.core import MM_TO_PX
 from src.core.state import FONTS_PATH, PRODUCTS_PATH, state
 from src.utils import svg_to_png
+from src.canvas.barcodes import (
+    barcode_image,
+    bars_image as barcode_bars_image,
+    draw_bars_cairo,
+    layout as barcode_layout,
+    svg_bars_path,
+    text_image as barcode_text_image,
+)
+from src.canvas.svg_writer import SvgSceneWriter
+from src.core.profiling import record_span, span
 
 TWEMOJI_PNG_DIR: Optional[str] = None
 TWEMOJI_CDN = "https://cdn.jsdelivr.net/gh/twitter/twemoji@14.0.2/assets/72x72"
@@ -63,6 +74,7 @@ class PdfExporter:
             _PIL_Font.FreeTypeFont.getsize = _getsize
 
         # базовые единицы
+        render_start = time.perf_counter()
         px_per_mm = float(dpi) / 25.4
         page_w_px = max(1, int(round(jig_w_mm * px_per_mm)))
         page_h_px = max(1, int(round(jig_h_mm * px_per_mm)))
@@ -514,6 +526,9 @@ class PdfExporter:
         )
         items = [it for _, it in items_sorted]
 
+        # Barcodes drawn as vector bars over the page raster: (text, left_px, top_px, w_px, h_px, angle)
+        vector_barcodes: list[tuple[str, int, int, int, int, float]] = []
+
         if not only_jig:
             # Determine if we should draw borders around images based on pattern JSON
             def _parse_cmyk_to_rgba(cmyk_str: str, default=(0, 0, 0, 255)) -> tuple[int, int, int, int]:
@@ -892,36 +907,14 @@ class PdfExporter:
                     _draw_borders_around_slots(it)
 
                 elif typ == "barcode":
-                    # Render Code128 barcode to PDF with rotation support
+                    # Code128 bars go into the PDF as vector rectangles once the page raster is
+                    # placed (see below); only the text lines under them are rasterized here
                     try:
-                        import barcode
-                        from barcode.writer import ImageWriter
-                        
                         # Use barcode_text parameter instead of label field
                         bc_text = str(barcode_text).strip()
                         if not bc_text:
                             bc_text = "TEST"
-                        
-                        # Generate Code128 barcode WITHOUT built-in text
-                        code128 = barcode.get_barcode_class('code128')
-                        writer = ImageWriter()
-                        barcode_instance = code128(bc_text, writer=writer)
-                        
-                        buffer = BytesIO()
-                        # Disable text rendering in barcode library by passing write_text=False
-                        barcode_instance.write(buffer, options={'write_text': False})
-                        buffer.seek(0)
-                        
-                        barcode_img = _PIL_Image.open(buffer).convert("RGBA")
-                        
-                        # Make white background transparent
-                        data__ = np.array(barcode_img)
-                        r, g, b, a = data__[:,:,0], data__[:,:,1], data__[:,:,2], data__[:,:,3]
-                        # Set alpha to 0 where pixels are white (or near-white)
-                        white_mask = (r > 250) & (g > 250) & (b > 250)
-                        data__[:,:,3] = np.where(white_mask, 0, 255)
-                        barcode_img = _PIL_Image.fromarray(data__, mode="RGBA")
-                        
+
                         # Get barcode dimensions, position, and rotation
                         w_mm = float(it.get("w_mm", 80.0))
                         h_mm = float(it.get("h_mm", 30.0))
@@ -931,102 +924,25 @@ class PdfExporter:
                             angle = float(it.get("angle", 0.0) or 0.0)
                         except Exception:
                             angle = 0.0
-                        
+
                         # Convert to pixels
                         w_px = max(1, int(round(w_mm * px_per_mm)))
                         h_px = max(1, int(round(h_mm * px_per_mm)))
-                        
-                        # Calculate space allocation: 70% for barcode, 15% for barcode text, 15% for reference text
-                        barcode_h_px = int(h_px * 0.7)
-                        barcode_text_h_px = int(h_px * 0.15)
-                        reference_text_h_px = h_px - barcode_h_px - barcode_text_h_px
-                        
-                        # Small padding between items (in pixels)
-                        padding = max(2, int(h_px * 0.01))
-                        
-                        # Resize barcode to allocated space (barcode only, no text)
-                        barcode_resized = barcode_img.resize((w_px, barcode_h_px), _PIL_Image.LANCZOS)
-                        
-                        # Create combined image with barcode, barcode text, and reference text
-                        combined_img = _PIL_Image.new("RGBA", (w_px, h_px), (0, 0, 0, 0))
-                        
-                        # Paste barcode at the top
-                        combined_img.paste(barcode_resized, (0, 0), barcode_resized.split()[-1])
-                        
-                        text_draw = _PIL_Draw.Draw(combined_img, "RGBA")
-                        
-                        # Add barcode text below barcode with minimal padding
-                        if bc_text and barcode_text_h_px > 0:
-                            # Calculate font size to fit the barcode text space
-                            bc_text_font_size_px = max(8, int(barcode_text_h_px * 0.8))
-                            try:
-                                bc_text_font = _truetype_for_family("Myriad Pro", bc_text_font_size_px)
-                            except Exception:
-                                bc_text_font = _PIL_Font.load_default()
-                            
-                            # Draw barcode text centered below barcode with minimal top padding
-                            try:
-                                bbox = text_draw.textbbox((0, 0), bc_text, font=bc_text_font)
-                                text_w = bbox[2] - bbox[0]
-                                text_h = bbox[3] - bbox[1]
-                            except Exception:
-                                text_w, text_h = 0, 0
-                            
-                            text_x = (w_px - text_w) // 2
-                            text_y = barcode_h_px + padding
-                            text_draw.text((text_x, text_y), bc_text, font=bc_text_font, fill=(0, 0, 0, 255))
-                        
-                        # Add reference text below barcode text with minimal padding
-                        ref_text = str(reference_text).strip()
-                        if ref_text and reference_text_h_px > 0:
-                            # Calculate font size to fit the reference text space
-                            ref_text_font_size_px = max(8, int(reference_text_h_px * 0.8))
-                            try:
-                                ref_text_font = _truetype_for_family("Myriad Pro", ref_text_font_size_px)
-                            except Exception:
-                                ref_text_font = _PIL_Font.load_default()
-                            
-                            # Draw reference text centered at bottom with minimal top padding
-                            try:
-                                bbox = text_draw.textbbox((0, 0), ref_text, font=ref_text_font)
-                                text_w = bbox[2] - bbox[0]
-                                text_h = bbox[3] - bbox[1]
-                            except Exception:
-                                text_w, text_h = 0, 0
-                            
-                            text_x = (w_px - text_w) // 2
-                            text_y = barcode_h_px + barcode_text_h_px + padding
-                            text_draw.text((text_x, text_y), ref_text, font=ref_text_font, fill=(0, 0, 0, 255))
-                        
-                        # Now use combined image for rotation
-                        barcode_resized = combined_img
-                        
-                        # Apply rotation if any (same direction as rect labels)
-                        # For rect/barcode, stored angle is already signed to match desired clockwise rotation
-                        if abs(angle) > 1e-6:
-                            try:
-                                barcode_resized = barcode_resized.rotate(angle, expand=True, resample=_PIL_Image.BICUBIC, fillcolor=(0, 0, 0, 0))
-                            except Exception:
-                                barcode_resized = barcode_resized.rotate(angle, expand=True)
-                        
-                        # Compute rotated bounds for placement
-                        import math
-                        a = math.radians(abs(angle) % 360.0)
-                        ca = abs(math.cos(a))
-                        sa = abs(math.sin(a))
-                        bw = int((w_px * ca) + (h_px * sa))
-                        bh = int((w_px * sa) + (h_px * ca))
-                        
+
                         # Position at top-left of rotated bounds (consistent with rect behavior)
-                        left_px = mm_to_px(x_mm)
-                        top_px = mm_to_px(y_mm)
-                        
-                        # Composite barcode onto output image
+                        left_px = int(mm_to_px(x_mm))
+                        top_px = int(mm_to_px(y_mm))
+
+                        # For rect/barcode, stored angle is already signed to match desired clockwise rotation
+                        text_img = barcode_text_image(
+                            bc_text, str(reference_text).strip(), w_px, h_px, angle, _font_path_for_family("Myriad Pro")
+                        )
                         try:
-                            img.alpha_composite(barcode_resized, (int(left_px), int(top_px)))
+                            img.alpha_composite(text_img, (left_px, top_px))
                         except Exception:
-                            img.paste(barcode_resized, (int(left_px), int(top_px)), barcode_resized.split()[-1])
-                        
+                            img.paste(text_img, (left_px, top_px), text_img.split()[-1])
+                        vector_barcodes.append((bc_text, left_px, top_px, w_px, h_px, angle))
+
                     except Exception as e:
                         logger.exception(f"Failed to render barcode in PDF: {e}")
 
@@ -1035,8 +951,10 @@ class PdfExporter:
         alpha = img.split()[-1]
         out_rgb.paste(img.convert("RGB"), mask=alpha)
         out_rgb = _darken_white_color(out_rgb)
+        record_span("pdf.rasterize", render_start, pixels=page_w_px * page_h_px, items=len(items))
 
         width_px, height_px = out_rgb.size
+        write_start = time.perf_counter()
 
         # Переводим пиксели в пункты (1 дюйм = 72 точки)
         width_pt = width_px * 72 / dpi
@@ -1047,8 +965,9 @@ class PdfExporter:
         context = cairo.Context(surface)
 
         # Загружаем PNG в Cairo
-        with io.BytesIO() as buffer:
+        with io.BytesIO() as buffer, span("pdf.encode_png", pixels=width_px * height_px) as attrs:
             out_rgb.save(buffer, format="PNG")
+            attrs["bytes"] = buffer.tell()
             buffer.seek(0)
             image_surface = cairo.ImageSurface.create_from_png(buffer)
 
@@ -1060,24 +979,35 @@ class PdfExporter:
         context.set_source_surface(image_surface, 0, 0)
         context.paint()
 
+        for bc_text, left_px, top_px, w_px, h_px, angle in vector_barcodes:
+            draw_bars_cairo(context, bc_text, left_px, top_px, w_px, h_px, angle)
+
         # Завершаем PDF
         surface.finish()
+        record_span("pdf.write", write_start, bytes=os.path.getsize(path) if os.path.exists(path) else 0)
 
         # Add kiss-cut spot color borders for images if needed
         try:
-            self._add_kiss_cut_borders_to_pdf(path, items, jig_w_mm, jig_h_mm, dpi)
+            with span("pdf.kiss_cut"):
+                self._add_kiss_cut_borders_to_pdf(path, items, jig_w_mm, jig_h_mm, dpi)
         except Exception as e:
             logger.exception(f"Failed to add kiss-cut borders: {e}")
 
         # Expose last rendered raster (for PNG/JPG export)
         try:
             # Keep a copy so later modifications do not affect stored reference
-            self._last_render_image = out_rgb.copy()
+            last_render = out_rgb.copy()
+            # Raster exports get the bars the PDF draws as vectors
+            for bc_text, left_px, top_px, w_px, h_px, angle in vector_barcodes:
+                bars = barcode_bars_image(bc_text, w_px, h_px, angle)
+                last_render.paste(bars, (left_px, top_px), bars)
+            self._last_render_image = last_render
             self._last_render_dpi = int(dpi)
         except Exception:
             # Non-fatal: auxiliary export may be unavailable
             self._last_render_image = None
             self._last_render_dpi = None
+        record_span("render_scene_to_pdf", render_start, pixels=page_w_px * page_h_px)
 
     def _add_kiss_cut_borders_to_pdf(
         self,
@@ -1364,19 +1294,21 @@ class PdfExporter:
         jig_w_mm: float,
         jig_h_mm: float,
         dpi: int = 300,
+        vector: bool = False,
     ) -> None:
         """Render the entire scene to an SVG file with individual objects preserved.
 
         Each object (image, text, rect, barcode) is rendered as a separate SVG element.
-        Images are embedded as base64 data URIs.
-        Text blocks and barcodes are rasterized to match PDF export quality.
+        Images are embedded as base64 data URIs; with `vector`, SVG images are
+        inlined as symbols and every distinct raster is embedded once at its
+        own resolution and drawn with ``<use>``.
+        Barcodes are rasterized to match PDF export quality, or drawn as
+        vector bars with `vector`.
         Slots are rendered as stroked rectangles.
+        The document is written to `path` as it is built.
         """
         from PIL import Image as _PIL_Image
-        from PIL import ImageDraw as _PIL_Draw
         from PIL import ImageFont as _PIL_Font
-        import barcode
-        from barcode.writer import ImageWriter
         import base64
         import arabic_reshaper
         from bidi.algorithm import get_display
@@ -1463,211 +1395,199 @@ class PdfExporter:
                 return s
             return "#000000"
 
-        def _render_barcode_to_image(bc_text: str, w_mm: float, h_mm: float) -> _PIL_Image.Image:
-            w_px = max(1, int(round(w_mm * px_per_mm)))
-            h_px = max(1, int(round(h_mm * px_per_mm)))
-            
-            if not bc_text.strip():
-                bc_text = "TEST"
-            
-            code128 = barcode.get_barcode_class('code128')
-            writer = ImageWriter()
-            barcode_instance = code128(bc_text, writer=writer)
-            
-            buffer = BytesIO()
-            barcode_instance.write(buffer, options={'write_text': False})
-            buffer.seek(0)
-            
-            barcode_img = _PIL_Image.open(buffer).convert("RGBA")
-            
-            data__ = np.array(barcode_img)
-            r, g, b, a = data__[:, :, 0], data__[:, :, 1], data__[:, :, 2], data__[:, :, 3]
-            white_mask = (r > 250) & (g > 250) & (b > 250)
-            data__[:, :, 3] = np.where(white_mask, 0, 255)
-            barcode_img = _PIL_Image.fromarray(data__, mode="RGBA")
-            
-            barcode_h_px = int(h_px * 0.7)
-            barcode_text_h_px = int(h_px * 0.15)
-            reference_text_h_px = h_px - barcode_h_px - barcode_text_h_px
-            padding = max(2, int(h_px * 0.01))
-            
-            barcode_resized = barcode_img.resize((w_px, barcode_h_px), _PIL_Image.LANCZOS)
-            
-            combined_img = _PIL_Image.new("RGBA", (w_px, h_px), (0, 0, 0, 0))
-            combined_img.paste(barcode_resized, (0, 0), barcode_resized.split()[-1])
-            
-            text_draw = _PIL_Draw.Draw(combined_img, "RGBA")
-            
-            if bc_text and barcode_text_h_px > 0:
-                bc_text_font_size_px = max(8, int(barcode_text_h_px * 0.8))
-                bc_text_font = _truetype_for_family("Myriad Pro", bc_text_font_size_px)
-                
-                bbox = text_draw.textbbox((0, 0), bc_text, font=bc_text_font)
-                text_w_val = bbox[2] - bbox[0]
-                
-                text_x = (w_px - text_w_val) // 2
-                text_y = barcode_h_px + padding
-                text_draw.text((text_x, text_y), bc_text, font=bc_text_font, fill=(0, 0, 0, 255))
-            
-            return combined_img
-
-        lines: list[str] = []
-        lines.append('<?xml version="1.0" encoding="UTF-8"?>')
-        lines.append(
-            f'<svg xmlns="http://www.w3.org/2000/svg" '
-            f'xmlns:xlink="http://www.w3.org/1999/xlink" '
-            f'width="{f(w_mm)}mm" height="{f(h_mm)}mm" '
-            f'viewBox="0 0 {f(w_mm)} {f(h_mm)}">'
-        )
+        with open(path, "w", encoding="utf-8") as fp:
+            out = SvgSceneWriter(fp)
+            out.write('<?xml version="1.0" encoding="UTF-8"?>')
+            out.write(
+                f'<svg xmlns="http://www.w3.org/2000/svg" '
+                f'xmlns:xlink="http://www.w3.org/1999/xlink" '
+                f'width="{f(w_mm)}mm" height="{f(h_mm)}mm" '
+                f'viewBox="0 0 {f(w_mm)} {f(h_mm)}">'
+            )
 
-        lines.append(f'  <rect x="0" y="0" width="{f(w_mm)}" height="{f(h_mm)}" fill="none" stroke="#000000" stroke-width="0.3"/>')
+            out.write(f'  <rect x="0" y="0" width="{f(w_mm)}" height="{f(h_mm)}" fill="none" stroke="#000000" stroke-width="0.3"/>')
 
-        sorted_items = sorted(items, key=lambda x: x.get("z", 0))
+            sorted_items = sorted(items, key=lambda x: x.get("z", 0))
 
-        for it in sorted_items:
-            typ = str(it.get("type", ""))
+            for it in sorted_items:
+                typ = str(it.get("type", ""))
 
-            if typ == "slot":
-                x_mm = float(it.get("x_mm", 0.0))
-                y_mm = float(it.get("y_mm", 0.0))
-                sw_mm = float(it.get("w_mm", 0.0))
-                sh_mm = float(it.get("h_mm", 0.0))
-                label = _escape_xml(str(it.get("label", "")))
-                lines.append(
-                    f'  <g class="slot">'
-                    f'<rect x="{f(x_mm)}" y="{f(y_mm)}" width="{f(sw_mm)}" height="{f(sh_mm)}" '
-                    f'fill="none" stroke="#9a9a9a" stroke-width="0.2"/>'
-                )
-                if label:
-                    cx = x_mm + sw_mm / 2.0
-                    cy = y_mm + sh_mm / 2.0
-                    lines.append(
-                        f'    <text x="{f(cx)}" y="{f(cy)}" font-size="2" fill="#c8c8c8" '
-                        f'text-anchor="middle" dominant-baseline="central">{label}</text>'
+                if typ == "slot":
+                    x_mm = float(it.get("x_mm", 0.0))
+                    y_mm = float(it.get("y_mm", 0.0))
+                    sw_mm = float(it.get("w_mm", 0.0))
+                    sh_mm = float(it.get("h_mm", 0.0))
+                    label = _escape_xml(str(it.get("label", "")))
+                    out.write(
+                        f'  <g class="slot">'
+                        f'<rect x="{f(x_mm)}" y="{f(y_mm)}" width="{f(sw_mm)}" height="{f(sh_mm)}" '
+                        f'fill="none" stroke="#9a9a9a" stroke-width="0.2"/>'
                     )
-                lines.append('  </g>')
-
-            elif typ == "image":
-                x_mm = float(it.get("x_mm", 0.0))
-                y_mm = float(it.get("y_mm", 0.0))
-                iw_mm = float(it.get("w_mm", 0.0))
-                ih_mm = float(it.get("h_mm", 0.0))
-                angle = float(it.get("angle", 0.0) or 0.0)
-                img_path = str(it.get("path", ""))
-                loaded_img = it.get("loaded_image", None)
-
-                data_uri = None
-                if loaded_img is not None:
-                    data_uri = _pil_image_to_data_uri(loaded_img)
-                elif img_path:
-                    data_uri = _image_to_data_uri(img_path, iw_mm, ih_mm, angle)
-
-                if data_uri:
+                    if label:
+                        cx = x_mm + sw_mm / 2.0
+                        cy = y_mm + sh_mm / 2.0
+                        out.write(
+                            f'    <text x="{f(cx)}" y="{f(cy)}" font-size="2" fill="#c8c8c8" '
+                            f'text-anchor="middle" dominant-baseline="central">{label}</text>'
+                        )
+                    out.write('  </g>')
+
+                elif typ == "image":
+                    x_mm = float(it.get("x_mm", 0.0))
+                    y_mm = float(it.get("y_mm", 0.0))
+                    iw_mm = float(it.get("w_mm", 0.0))
+                    ih_mm = float(it.get("h_mm", 0.0))
+                    angle = float(it.get("angle", 0.0) or 0.0)
+                    img_path = str(it.get("path", ""))
+                    loaded_img = it.get("loaded_image", None)
+
                     cx = x_mm + iw_mm / 2.0
                     cy = y_mm + ih_mm / 2.0
-                    transform = ""
-                    if abs(angle) > 0.001:
-                        transform = f' transform="rotate({f(-angle)}, {f(cx)}, {f(cy)})"'
-                    lines.append(
-                        f'  <image x="{f(x_mm)}" y="{f(y_mm)}" width="{f(iw_mm)}" height="{f(ih_mm)}" '
-                        f'xlink:href="{data_uri}"{transform} preserveAspectRatio="none"/>'
-                    )
+                    rotate = f"rotate({f(-angle)}, {f(cx)}, {f(cy)})" if abs(angle) > 0.001 else ""
+                    is_svg = img_path.lower().endswith(".svg")
+
+                    if vector:
+                        symbol_id = out.svg_symbol(img_path) if loaded_img is None and is_svg else None
+                        if symbol_id:
+                            transform = f' transform="{rotate}"' if rotate else ""
+                            out.write(
+                                f'  <use xlink:href="#{symbol_id}" x="{f(x_mm)}" y="{f(y_mm)}" '
+                                f'width="{f(iw_mm)}" height="{f(ih_mm)}"{transform}/>'
+                            )
+                            continue
+                        image_id = None
+                        if loaded_img is not None:
+                            # Objects sharing a prepared image reference one copy
+                            image_id = out.raster(("image", id(loaded_img)), loaded_img)
+                        elif img_path and not is_svg and os.path.isfile(img_path):
+                            image_id = out.raster(("file", os.path.abspath(img_path), os.stat(img_path).st_mtime_ns), img_path)
+                        if image_id:
+                            placement = f"translate({f(x_mm)} {f(y_mm)}) scale({f(iw_mm)} {f(ih_mm)})"
+                            out.write(f'  <use xlink:href="#{image_id}" transform="{rotate + " " if rotate else ""}{placement}"/>')
+                            continue
 
-            elif typ == "text":
-                x_mm = float(it.get("x_mm", 0.0))
-                y_mm = float(it.get("y_mm", 0.0))
-                text_content = str(it.get("text", ""))
-                fill_hex = str(it.get("fill", "#ffffff"))
-                font_size_pt = float(it.get("font_size_pt", 12))
-                font_family = str(it.get("font_family", "Myriad Pro"))
-                angle = float(it.get("angle", 0.0) or 0.0)
-
-                # For svg text bigger than I have ~ 20%
-                font_size_pt *= 0.8
+                    data_uri = None
+                    if loaded_img is not None:
+                        data_uri = _pil_image_to_data_uri(loaded_img)
+                    elif img_path:
+                        data_uri = _image_to_data_uri(img_path, iw_mm, ih_mm, angle)
+
+                    if data_uri:
+                        transform = f' transform="{rotate}"' if rotate else ""
+                        out.write(
+                            f'  <image x="{f(x_mm)}" y="{f(y_mm)}" width="{f(iw_mm)}" height="{f(ih_mm)}" '
+                            f'xlink:href="{data_uri}"{transform} preserveAspectRatio="none"/>'
+                        )
+
+                elif typ == "text":
+                    x_mm = float(it.get("x_mm", 0.0))
+                    y_mm = float(it.get("y_mm", 0.0))
+                    text_content = str(it.get("text", ""))
+                    fill_hex = str(it.get("fill", "#ffffff"))
+                    font_size_pt = float(it.get("font_size_pt", 12))
+                    font_family = str(it.get("font_family", "Myriad Pro"))
+                    angle = float(it.get("angle", 0.0) or 0.0)
+
+                    # For svg text bigger than I have ~ 20%
+                    font_size_pt *= 0.8
                 
-                fill_color = _hex_to_rgb(fill_hex)
+                    fill_color = _hex_to_rgb(fill_hex)
                 
-                reshaped_text = arabic_reshaper.reshape(text_content)
-                display_text = get_display(reshaped_text)
-                escaped_text = _escape_xml(display_text)
+                    reshaped_text = arabic_reshaper.reshape(text_content)
+                    display_text = get_display(reshaped_text)
+                    escaped_text = _escape_xml(display_text)
                 
-                transform = ""
-                if abs(angle) > 0.001:
-                    transform = f' transform="rotate({f(-angle)}, {f(x_mm)}, {f(y_mm)})"'
+                    transform = ""
+                    if abs(angle) > 0.001:
+                        transform = f' transform="rotate({f(-angle)}, {f(x_mm)}, {f(y_mm)})"'
                 
-                lines.append(
-                    f'  <text x="{f(x_mm)}" y="{f(y_mm)}" font-family="{_escape_xml(font_family)}" '
-                    f'font-size="{f(font_size_pt)}pt" fill="{fill_color}" '
-                    f'text-anchor="middle" dominant-baseline="central"{transform}>{escaped_text}</text>'
-                )
+                    out.write(
+                        f'  <text x="{f(x_mm)}" y="{f(y_mm)}" font-family="{_escape_xml(font_family)}" '
+                        f'font-size="{f(font_size_pt)}pt" fill="{fill_color}" '
+                        f'text-anchor="middle" dominant-baseline="central"{transform}>{escaped_text}</text>'
+                    )
 
-            elif typ == "rect":
-                x_mm = float(it.get("x_mm", 0.0))
-                y_mm = float(it.get("y_mm", 0.0))
-                rw_mm = float(it.get("w_mm", 0.0))
-                rh_mm = float(it.get("h_mm", 0.0))
-                label = str(it.get("label", ""))
-                label_fill_hex = str(it.get("label_fill", "#ffffff"))
-                label_font_size = float(it.get("label_font_size", 10))
-                label_font_family = str(it.get("label_font_family", "Myriad Pro"))
-                angle = float(it.get("angle", 0.0) or 0.0)
-
-                # For svg text bigger than I have ~ 20%
-                label_font_size *= 0.8
-
-                if label:
-                    label_fill = _hex_to_rgb(label_fill_hex)
+                elif typ == "rect":
+                    x_mm = float(it.get("x_mm", 0.0))
+                    y_mm = float(it.get("y_mm", 0.0))
+                    rw_mm = float(it.get("w_mm", 0.0))
+                    rh_mm = float(it.get("h_mm", 0.0))
+                    label = str(it.get("label", ""))
+                    label_fill_hex = str(it.get("label_fill", "#ffffff"))
+                    label_font_size = float(it.get("label_font_size", 10))
+                    label_font_family = str(it.get("label_font_family", "Myriad Pro"))
+                    angle = float(it.get("angle", 0.0) or 0.0)
+
+                    # For svg text bigger than I have ~ 20%
+                    label_font_size *= 0.8
+
+                    if label:
+                        label_fill = _hex_to_rgb(label_fill_hex)
                     
-                    reshaped_text = arabic_reshaper.reshape(label)
-                    display_text = get_display(reshaped_text)
-                    escaped_text = _escape_xml(display_text)
+                        reshaped_text = arabic_reshaper.reshape(label)
+                        display_text = get_display(reshaped_text)
+                        escaped_text = _escape_xml(display_text)
                     
-                    cx = x_mm + rw_mm / 2.0
-                    cy = y_mm + rh_mm / 2.0
+                        cx = x_mm + rw_mm / 2.0
+                        cy = y_mm + rh_mm / 2.0
                     
-                    transform = ""
-                    if abs(angle) > 0.001:
-                        transform = f' transform="rotate({f(-angle)}, {f(cx)}, {f(cy)})"'
+                        transform = ""
+                        if abs(angle) > 0.001:
+                            transform = f' transform="rotate({f(-angle)}, {f(cx)}, {f(cy)})"'
                     
-                    lines.append(
-                        f'  <text x="{f(cx)}" y="{f(cy)}" font-family="{_escape_xml(label_font_family)}" '
-                        f'font-size="{f(label_font_size)}pt" fill="{label_fill}" '
-                        f'text-anchor="middle" dominant-baseline="central"{transform}>{escaped_text}</text>'
-                    )
+                        out.write(
+                            f'  <text x="{f(cx)}" y="{f(cy)}" font-family="{_escape_xml(label_font_family)}" '
+                            f'font-size="{f(label_font_size)}pt" fill="{label_fill}" '
+                            f'text-anchor="middle" dominant-baseline="central"{transform}>{escaped_text}</text>'
+                        )
 
-            elif typ == "barcode":
-                x_mm = float(it.get("x_mm", 0.0))
-                y_mm = float(it.get("y_mm", 0.0))
-                bw_mm = float(it.get("w_mm", 0.0))
-                bh_mm = float(it.get("h_mm", 0.0))
-                label = str(it.get("label", "Barcode"))
-                angle = float(it.get("angle", 0.0) or 0.0)
+                elif typ == "barcode":
+                    x_mm = float(it.get("x_mm", 0.0))
+                    y_mm = float(it.get("y_mm", 0.0))
+                    bw_mm = float(it.get("w_mm", 0.0))
+                    bh_mm = float(it.get("h_mm", 0.0))
+                    label = str(it.get("label", "Barcode"))
+                    angle = float(it.get("angle", 0.0) or 0.0)
+                    bc_text = label if label.strip() else "TEST"
+                    w_px = max(1, int(round(bw_mm * px_per_mm)))
+                    h_px = max(1, int(round(bh_mm * px_per_mm)))
+
+                    if vector:
+                        # Bars as one path and their text as SVG text, laid out in pixels like the raster
+                        bars_h_px, text_h_px, _ = barcode_layout(h_px)
+                        font_px = max(8, int(text_h_px * 0.8))
+                        padding = max(2, int(h_px * 0.01))
+                        cx = x_mm + bw_mm / 2.0
+                        cy = y_mm + bh_mm / 2.0
+                        rotate = f"rotate({f(-angle)}, {f(cx)}, {f(cy)}) " if abs(angle) > 0.001 else ""
+                        out.write(
+                            f'  <g class="barcode" transform="{rotate}translate({f(cx)} {f(cy)}) '
+                            f'scale({1.0 / px_per_mm:.6f}) translate({f(-w_px / 2.0)} {f(-h_px / 2.0)})">'
+                            f'<path d="{svg_bars_path(bc_text, w_px, h_px)}" fill="#000000"/>'
+                            f'<text x="{f(w_px / 2.0)}" y="{bars_h_px + padding}" font-family="Myriad Pro" font-size="{font_px}" '
+                            f'fill="#000000" text-anchor="middle" dominant-baseline="hanging">{_escape_xml(bc_text)}</text></g>'
+                        )
+                        continue
 
-                barcode_img = _render_barcode_to_image(label, bw_mm, bh_mm)
-                
-                if abs(angle) > 0.001:
-                    barcode_img = barcode_img.rotate(float(angle), expand=True, resample=_PIL_Image.BICUBIC, fillcolor=(0, 0, 0, 0))
+                    # Bar and text layers are rendered once per text, size and angle
+                    barcode_img = barcode_image(bc_text, "", w_px, h_px, angle, _font_path_for_family("Myriad Pro"))
+                    data_uri = _pil_image_to_data_uri(barcode_img)
                 
-                data_uri = _pil_image_to_data_uri(barcode_img)
+                    img_w_mm = barcode_img.width / px_per_mm
+                    img_h_mm = barcode_img.height / px_per_mm
                 
-                img_w_mm = barcode_img.width / px_per_mm
-                img_h_mm = barcode_img.height / px_per_mm
+                    cx = x_mm + bw_mm / 2.0
+                    cy = y_mm + bh_mm / 2.0
+                    offset_x = cx - img_w_mm / 2.0
+                    offset_y = cy - img_h_mm / 2.0
                 
-                cx = x_mm + bw_mm / 2.0
-                cy = y_mm + bh_mm / 2.0
-                offset_x = cx - img_w_mm / 2.0
-                offset_y = cy - img_h_mm / 2.0
-                
-                lines.append(
-                    f'  <image x="{f(offset_x)}" y="{f(offset_y)}" '
-                    f'width="{f(img_w_mm)}" height="{f(img_h_mm)}" '
-                    f'xlink:href="{data_uri}" preserveAspectRatio="none"/>'
-                )
-
-        lines.append('</svg>')
+                    out.write(
+                        f'  <image x="{f(offset_x)}" y="{f(offset_y)}" '
+                        f'width="{f(img_w_mm)}" height="{f(img_h_mm)}" '
+                        f'xlink:href="{data_uri}" preserveAspectRatio="none"/>'
+                    )
 
-        with open(path, "w", encoding="utf-8") as fp:
-            fp.write("\n".join(lines))
+            out.write('</svg>')
 
         logger.info(f"SVG scene exported to: {path}")
 
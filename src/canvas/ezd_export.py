@@ -1,11 +1,16 @@
 import os
+import sys
+import json
+import queue
+import atexit
+import hashlib
 import logging
-import tempfile
+import threading
 import subprocess
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
-from src.core.state import get_sdk_client
+from src.core.state import INTERNAL_PATH, get_sdk_client, get_sdk_pool
 from src.canvas.pen_settings import PenCollection
 
 logger = logging.getLogger(__name__)
@@ -13,6 +18,11 @@ logger = logging.getLogger(__name__)
 TEXT_X_OFFSET = 0.0
 TEXT_Y_OFFSET = 0.0
 
+INKSCAPE_PATH = INTERNAL_PATH / "converter" / "App" / "Inkscape" / "bin" / "inkscape.com"
+DXF_CACHE_PATH = INTERNAL_PATH / "dxf_cache"
+DXF_CACHE_MAX_ENTRIES = 256
+INKSCAPE_SHELL_TIMEOUT = 60.0
+
 
 def convert_to_ezd_coords(x_mm: float, y_mm: float, jig_w_mm: float, jig_h_mm: float) -> tuple[float, float]:
     ezd_x = x_mm - (jig_w_mm / 2)
@@ -69,64 +79,262 @@ def adjust_text_size_iterative(
     return width_sdk, height_sdk
 
 
+def _hidden_process_kwargs() -> dict:
+    if sys.platform != "win32":
+        return {}
+    startupinfo = subprocess.STARTUPINFO()
+    startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW | subprocess.STARTF_USESTDHANDLES
+    startupinfo.wShowWindow = subprocess.SW_HIDE
+    return {
+        "startupinfo": startupinfo,
+        "creationflags": subprocess.CREATE_NO_WINDOW | subprocess.DETACHED_PROCESS,
+    }
+
+
+class InkscapeShell:
+    """Long-lived Inkscape process driven through ``--shell`` mode.
+
+    Inkscape start-up dominates a single conversion, so the process is
+    started once and every SVG -> DXF conversion is sent to it as one
+    line of actions. Each processed line is acknowledged with a ``> ``
+    prompt on stdout, which is how completion is detected.
+
+    Actions are separated by ``;`` and lines by newlines, with no way to
+    escape either, so paths containing them are converted with a one-shot
+    ``--batch-process`` run instead.
+    """
+
+    PROMPT = b"> "
+    UNSAFE_PATH_CHARS = (";", "\n", "\r")
+
+    def __init__(self, inkscape_path: Path = INKSCAPE_PATH, timeout: float = INKSCAPE_SHELL_TIMEOUT):
+        self.inkscape_path = Path(inkscape_path)
+        self.timeout = timeout
+        self.process = None
+        self._output = queue.Queue()
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+
+    def _start(self):
+        if self.process is not None and self.process.poll() is None:
+            return
+        if not self.inkscape_path.exists():
+            raise RuntimeError(f"Inkscape not found at: {self.inkscape_path}")
+
+        self._output = queue.Queue()
+        self.process = subprocess.Popen(
+            [str(self.inkscape_path), "--shell"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            **_hidden_process_kwargs()
+        )
+        threading.Thread(target=self._read_output, args=(self.process, self._output), daemon=True).start()
+        if not self._wait_prompts(1):
+            self.close()
+            raise RuntimeError("Inkscape shell did not start")
+        logger.info(f"Inkscape shell started (pid={self.process.pid})")
+
+    @staticmethod
+    def _read_output(process: subprocess.Popen, output: queue.Queue):
+        while True:
+            chunk = process.stdout.read1(4096)
+            if not chunk:
+                output.put(None)
+                return
+            output.put(chunk)
+
+    def _wait_prompts(self, count: int) -> bool:
+        buffer = b""
+        seen = 0
+        while seen < count:
+            try:
+                chunk = self._output.get(timeout=self.timeout)
+            except queue.Empty:
+                return False
+            if chunk is None:
+                return False
+            buffer += chunk
+            seen += buffer.count(self.PROMPT)
+            buffer = buffer.rsplit(self.PROMPT, 1)[-1]
+        return True
+
+    @staticmethod
+    def _actions(svg_path: str, dxf_path: str) -> str:
+        return (
+            f"file-open:{svg_path}; export-type:dxf; export-filename:{dxf_path}; "
+            f"export-do; file-close\n"
+        )
+
+    @classmethod
+    def _shell_safe(cls, *paths: str) -> bool:
+        return not any(ch in str(path) for path in paths for ch in cls.UNSAFE_PATH_CHARS)
+
+    def _convert_one_shot(self, svg_path: str, dxf_path: str) -> None:
+        if not self.inkscape_path.exists():
+            raise RuntimeError(f"Inkscape not found at: {self.inkscape_path}")
+        cmd = [str(self.inkscape_path), "--batch-process", svg_path, "--export-type=dxf", f"--export-filename={dxf_path}"]
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=self.timeout, **_hidden_process_kwargs())
+        except subprocess.TimeoutExpired:
+            logger.error(f"Inkscape conversion timed out: {svg_path}")
+            return
+        if result.returncode != 0:
+            logger.error(f"Inkscape conversion failed: {result.stderr}")
+
+    def convert_many(self, jobs: list[tuple[str, str]]) -> list[str]:
+        """Convert ``(svg_path, dxf_path)`` pairs in one round trip.
+
+        Returns the DXF paths that were actually written. If the shell
+        stalls or dies, it is killed and restarted on the next call.
+        """
+        if not jobs:
+            return []
+        with self._lock:
+            for svg_path, dxf_path in jobs:
+                if os.path.exists(dxf_path):
+                    os.remove(dxf_path)
+            shell_jobs = [job for job in jobs if self._shell_safe(*job)]
+            for svg_path, dxf_path in jobs:
+                if not self._shell_safe(svg_path, dxf_path):
+                    self._convert_one_shot(svg_path, dxf_path)
+            if shell_jobs:
+                self._start()
+                commands = "".join(self._actions(svg_path, dxf_path) for svg_path, dxf_path in shell_jobs)
+                self.process.stdin.write(commands.encode("utf-8"))
+                self.process.stdin.flush()
+                if not self._wait_prompts(len(shell_jobs)):
+                    logger.error("Inkscape shell stopped responding; restarting on next conversion")
+                    self.close()
+        return [dxf_path for _, dxf_path in jobs if os.path.exists(dxf_path)]
+
+    def close(self):
+        process, self.process = self.process, None
+        if process is None:
+            return
+        if process.poll() is None:
+            try:
+                process.stdin.write(b"quit\n")
+                process.stdin.flush()
+                process.wait(timeout=5)
+            except (OSError, subprocess.TimeoutExpired):
+                process.kill()
+
+
+class DxfCache:
+    """Content-addressed store of SVG -> DXF conversions.
+
+    Keys are SHA-256 digests of the SVG bytes, so every slot copy and
+    every export run of the same artwork reuses one DXF. The least
+    recently used files are evicted once ``max_entries`` is exceeded.
+    """
+
+    def __init__(self, cache_dir: Path = DXF_CACHE_PATH, max_entries: int = DXF_CACHE_MAX_ENTRIES, converter: Optional[InkscapeShell] = None):
+        self.cache_dir = Path(cache_dir)
+        self.max_entries = max_entries
+        self.converter = converter or InkscapeShell()
+        self._digests: dict[tuple[str, int, int], str] = {}
+        self._lock = threading.Lock()
+
+    def _digest(self, svg_path: str) -> str:
+        stat = os.stat(svg_path)
+        key = (os.path.abspath(svg_path), stat.st_mtime_ns, stat.st_size)
+        digest = self._digests.get(key)
+        if digest is None:
+            with open(svg_path, "rb") as f:
+                digest = hashlib.sha256(f.read()).hexdigest()
+            self._digests[key] = digest
+        return digest
+
+    def _entry_path(self, digest: str) -> Path:
+        return self.cache_dir / f"{digest}.dxf"
+
+    def get(self, svg_path: str) -> Optional[str]:
+        entry = self._entry_path(self._digest(svg_path))
+        if not entry.exists():
+            return None
+        os.utime(entry)
+        return str(entry)
+
+    def convert_many(self, svg_paths: list[str]) -> dict[str, str]:
+        """Return ``{svg_path: dxf_path}`` converting only cache misses."""
+        with self._lock:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            result = {}
+            pending = {}
+            for svg_path in dict.fromkeys(svg_paths):
+                cached = self.get(svg_path)
+                if cached:
+                    result[svg_path] = cached
+                    continue
+                entry = str(self._entry_path(self._digest(svg_path)))
+                pending.setdefault(entry, []).append(svg_path)
+
+            if pending:
+                jobs = [(sources[0], entry) for entry, sources in pending.items()]
+                logger.info(f"Converting {len(jobs)} SVG file(s) to DXF ({len(result)} cached)")
+                for entry in self.converter.convert_many(jobs):
+                    for svg_path in pending[entry]:
+                        result[svg_path] = entry
+                self._evict()
+            return result
+
+    def convert(self, svg_path: str) -> Optional[str]:
+        return self.convert_many([svg_path]).get(svg_path)
+
+    def _evict(self):
+        entries = sorted(self.cache_dir.glob("*.dxf"), key=lambda p: p.stat().st_mtime, reverse=True)
+        for stale in entries[self.max_entries:]:
+            stale.unlink(missing_ok=True)
+            logger.debug(f"Evicted cached DXF: {stale.name}")
+
+
+_dxf_cache = None
+
+def get_dxf_cache() -> DxfCache:
+    global _dxf_cache
+    if _dxf_cache is None:
+        _dxf_cache = DxfCache()
+    return _dxf_cache
+
+
 class EzdExporter:
 
-    def __init__(self):
+    def __init__(self, client=None):
         self._initialized = False
+        self._client = client
 
     @property
     def client(self):
-        return get_sdk_client()
+        return self._client or get_sdk_client()
 
     def _ensure_initialized(self):
         if not self._initialized:
             print("[DEBUG] Calling SDK initialize...")
-            result = self.client.initialize()
+            result = self.client.ensure_initialized()
             print(f"[DEBUG] SDK initialize() returned: {result}")
             logger.info(f"SDK initialize() returned: {result}")
             self._initialized = True
 
     def _convert_svg_to_dxf(self, svg_path: str) -> Optional[str]:
-
-        inkscape_path = os.path.join(os.path.dirname(__file__), "..", "..", "_internal", "converter", "App", "Inkscape", "bin", "inkscape.com")
-        inkscape_path = os.path.abspath(inkscape_path)
-        
-        if not os.path.exists(inkscape_path):
-            raise RuntimeError(f"Inkscape not found at: {inkscape_path}")
-        
-        dxf_path = tempfile.mktemp(suffix=".dxf")
-        
-        cmd = [
-            inkscape_path,
-            "--batch-process",
-            svg_path,
-            "--export-type=dxf",
-            f"--export-filename={dxf_path}"
-        ]
-        
-        startupinfo = subprocess.STARTUPINFO()
-        startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW | subprocess.STARTF_USESTDHANDLES
-        startupinfo.wShowWindow = subprocess.SW_HIDE
-        
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            startupinfo=startupinfo,
-            creationflags=subprocess.CREATE_NO_WINDOW | subprocess.DETACHED_PROCESS
-        )
-        
-        if result.returncode != 0:
-            logger.error(f"Inkscape conversion failed: {result.stderr}")
-            return None
-        
-        if not os.path.exists(dxf_path):
-            logger.error(f"DXF file not created: {dxf_path}")
+        dxf_path = get_dxf_cache().convert(svg_path)
+        if dxf_path is None:
+            logger.error(f"Inkscape conversion failed: {svg_path}")
             return None
-        
-        logger.info(f"Inkscape converted SVG to DXF: {dxf_path}")
+        logger.info(f"Using DXF for SVG {svg_path}: {dxf_path}")
         return dxf_path
 
+    def _prefetch_dxf(self, items: list[dict]):
+        svg_paths = []
+        for item in items:
+            if item.get("type") != "image":
+                continue
+            svg_source_path = str(item.get("svg_source_path", "") or "")
+            if svg_source_path and Path(svg_source_path).suffix.lower() == ".svg" and Path(svg_source_path).exists():
+                svg_paths.append(svg_source_path)
+        if svg_paths:
+            get_dxf_cache().convert_many(svg_paths)
+
     def _apply_pen_settings(self, pen_collection: PenCollection):
         for pen_no in range(256):
             pen = pen_collection.get_pen(pen_no)
@@ -223,7 +431,13 @@ class EzdExporter:
         jig_h_mm: float = 0.0,
         clear_before: bool = True,
         pen_collection: Optional[PenCollection] = None,
+        cancelled: Optional[Callable[[], bool]] = None,
     ) -> bool:
+        """Build `items` as one EZD document and save it to `output_path`.
+
+        Returns False without saving when ``cancelled()`` returns True
+        between items.
+        """
         self._ensure_initialized()
         
         if clear_before:
@@ -237,9 +451,14 @@ class EzdExporter:
             logger.debug(f"Item {idx}: type={item.get('type')}, z={item.get('z')}, font_size_pt={item.get('font_size_pt')}, angle={item.get('angle')}")
 
         sorted_items = sorted(items, key=lambda x: x.get("z", 0))
+        self._prefetch_dxf(sorted_items)
 
+        templates: dict[tuple, tuple[str, float, float]] = {}
         entity_index = 0
         for item in sorted_items:
+            if cancelled is not None and cancelled():
+                logger.debug(f"EZD export to {output_path} cancelled")
+                return False
             item_type = item.get("type", "")
             if item_type == "slot":
                 continue
@@ -256,9 +475,16 @@ class EzdExporter:
                 hatch1_enabled = hatch_settings.get("hatch1_enabled", False)
                 hatch2_enabled = hatch_settings.get("hatch2_enabled", False)
                 enable_contour = hatch_settings.get("enable_contour", True)
-                if hatch1_enabled or hatch2_enabled or not enable_contour:
-                    self._apply_hatch_settings(hatch_settings)
-                    use_hatch = True
+                use_hatch = bool(hatch1_enabled or hatch2_enabled or not enable_contour)
+
+            signature = self._entity_signature(item, pen_no, use_hatch)
+            anchor_x, anchor_y = self._entity_anchor(item, jig_w_mm, jig_h_mm)
+            template = templates.get(signature) if signature is not None else None
+            if template is not None and self._clone_entity(template, entity_name, anchor_x, anchor_y):
+                continue
+
+            if use_hatch:
+                self._apply_hatch_settings(hatch_settings)
 
             if item_type == "text":
                 self._add_text_entity(item, entity_name, jig_w_mm, jig_h_mm, use_hatch)
@@ -272,6 +498,9 @@ class EzdExporter:
             self.client.set_entity_pen(entity_name=entity_name, pen_no=pen_no)
             logger.debug(f"Set pen {pen_no} for entity '{entity_name}'")
 
+            if signature is not None:
+                templates.setdefault(signature, (entity_name, anchor_x, anchor_y))
+
         output_file = Path(output_path).resolve()
         output_file.parent.mkdir(parents=True, exist_ok=True)
         
@@ -282,6 +511,124 @@ class EzdExporter:
         logger.info(f"EZD file saved: {output_file}")
         return True
 
+    @staticmethod
+    def _entity_signature(item: dict, pen_no: int, use_hatch: bool) -> Optional[tuple]:
+        item_type = item.get("type", "")
+        hatch = json.dumps(item.get("hatch_settings") or {}, sort_keys=True) if use_hatch else ""
+        # z is left out: the canvas gives every item its own, and entities are added in z order anyway
+        common = (item_type, pen_no, hatch, float(item.get("angle", 0.0)))
+
+        if item_type == "text":
+            text = str(item.get("text", ""))
+            if not text:
+                return None
+            return common + (
+                text,
+                str(item.get("font_family", "Arial")),
+                float(item.get("text_width_mm", 5.0)),
+                float(item.get("text_height_mm", 5.0)),
+            )
+
+        size = (float(item.get("w_mm", 0.0)), float(item.get("h_mm", 0.0)))
+        if item_type in ("rect", "barcode"):
+            label = str(item.get("label", ""))
+            if not label:
+                return None
+            return common + size + (
+                label,
+                str(item.get("label_font_family", "Arial")),
+                float(item.get("label_font_size", 10)),
+                float(item.get("text_width_mm", 5.0)),
+                float(item.get("text_height_mm", 5.0)),
+            )
+
+        if item_type == "image":
+            return common + size + (
+                str(item.get("svg_source_path", "") or ""),
+                str(item.get("path", "")),
+            )
+
+        return None
+
+    @staticmethod
+    def _entity_anchor(item: dict, jig_w_mm: float, jig_h_mm: float) -> tuple[float, float]:
+        x_mm = float(item.get("x_mm", 0.0))
+        y_mm = float(item.get("y_mm", 0.0))
+        if item.get("type") != "text":
+            x_mm += float(item.get("w_mm", 0.0)) / 2
+            y_mm += float(item.get("h_mm", 0.0)) / 2
+        return convert_to_ezd_coords(x_mm, y_mm, jig_w_mm, jig_h_mm)
+
+    def _clone_entity(self, template: tuple[str, float, float], name: str, anchor_x: float, anchor_y: float) -> bool:
+        template_name, template_x, template_y = template
+        error = self.client.copy_entity(name=template_name, new_name=name)
+        if error != 0:
+            logger.warning(f"copy_entity '{template_name}' -> '{name}' failed with error {error}; building from scratch")
+            return False
+
+        dx = anchor_x - template_x
+        dy = anchor_y - template_y
+        if abs(dx) > 0.001 or abs(dy) > 0.001:
+            self.client.move_entity(name=name, dx=dx, dy=dy)
+        logger.debug(f"Cloned '{template_name}' as '{name}' moved by dx={dx:.3f}, dy={dy:.3f}")
+        return True
+
+    def export_scenes(
+        self,
+        jobs: list[tuple[list[dict], str]],
+        jig_w_mm: float = 0.0,
+        jig_h_mm: float = 0.0,
+        pen_collection: Optional[PenCollection] = None,
+        cancelled: Optional[Callable[[], bool]] = None,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+    ) -> list[dict]:
+        """Export independent ``(items, output_path)`` documents concurrently.
+
+        Each document is built on its own pooled SDK server, and a document
+        that fails does not stop the others. Returns one result per job, in
+        the order of ``jobs``: ``{"status": "success", "path": ...}`` or
+        ``{"status": "error", "path": ..., "message": ...}``, where the message
+        is ``"Cancelled"`` for documents left unfinished because
+        ``cancelled()`` returned True. ``on_progress(done, total)`` is called
+        as each document finishes.
+        """
+        done = 0
+
+        def _export(client, job):
+            items, path = job
+            exporter = self if client is self.client else EzdExporter(client=client)
+            try:
+                if not exporter.export_scene(items, path, jig_w_mm, jig_h_mm, clear_before=True,
+                                             pen_collection=pen_collection, cancelled=cancelled):
+                    return {"status": "error", "path": path, "message": "Cancelled"}
+            except Exception as e:
+                logger.exception(f"Failed to export EZD file {path}: {e}")
+                return {"status": "error", "path": path, "message": str(e)}
+            return {"status": "success", "path": path}
+
+        def _on_done(index, result):
+            nonlocal done
+            done += 1
+            if on_progress is not None:
+                on_progress(done, len(jobs))
+
+        if len(jobs) <= 1:
+            results = []
+            for index, job in enumerate(jobs):
+                if cancelled is not None and cancelled():
+                    results.append(None)
+                    continue
+                results.append(_export(self.client, job))
+                _on_done(index, results[-1])
+        else:
+            self._prefetch_dxf([item for items, _ in jobs for item in items])
+            results = get_sdk_pool().map(_export, jobs, cancelled=cancelled, on_done=_on_done)
+
+        return [
+            result if result is not None else {"status": "error", "path": path, "message": "Cancelled"}
+            for result, (_, path) in zip(results, jobs)
+        ]
+
     def _add_text_entity(self, item: dict, name: str, jig_w_mm: float, jig_h_mm: float, use_hatch: bool = False):
         text = str(item.get("text", ""))
         if not text:
@@ -579,3 +926,4 @@ class EzdExporter:
 
     def reset(self):
         self._initialized = False
+        self.client.sdk_initialized = False
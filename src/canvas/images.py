@@ -3,22 +3,97 @@ from __future__ import annotations
 import os
 import math
 import logging
+import functools
+import threading
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
 from typing import Optional
 
 import tkinter as tk
 
 from src.core import MM_TO_PX
 from src.canvas.object import CanvasObject
-from src.utils import svg_to_png
+from src.utils import svg_to_png, _ensure_qt_app
+from .render_queue import RenderQueue
 
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=256)
+def _readable_image(path: str, mtime_ns: int) -> bool:
+    """Whether `path` parses as an SVG or an image Pillow can read, without decoding its pixels."""
+    try:
+        if path.lower().endswith(".svg"):
+            ET.parse(path)
+            return True
+        from PIL import Image  # type: ignore
+        with Image.open(path) as img:
+            img.verify()
+        return True
+    except Exception:
+        return False
+
+
+class _SizedLRU:
+    """LRU mapping bounded by the summed pixel count of its values."""
+
+    def __init__(self, max_pixels: int) -> None:
+        self.max_pixels = int(max_pixels)
+        self.pixels = 0
+        self._data: OrderedDict = OrderedDict()
+        # Pyramids are built on render workers while the Tk thread reads photos
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            self._data.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, value, pixels: int) -> None:
+        if key is None or pixels > self.max_pixels:
+            return
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.pixels -= old[1]
+            self._data[key] = (value, int(pixels))
+            self.pixels += int(pixels)
+            while self.pixels > self.max_pixels and self._data:
+                _key, (_value, size) = self._data.popitem(last=False)
+                self.pixels -= size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.pixels = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
 class ImageManager:
     """Create and render images, including rotation-aware placement and sizing."""
 
+    PHOTO_CACHE_MAX_PIXELS = 24_000_000
+    # Reduced mip levels only (level 0 stays with the item), so one 96 MP photo fits
+    PYRAMID_CACHE_MAX_PIXELS = 32_000_000
+    MIPMAP_MIN_SIDE = 32
+    # Extra fraction of the viewport rendered around it so small pans don't pop in
+    VIEW_MARGIN = 0.25
+    RENDER_WORKERS = 2
+
     def __init__(self, screen: tk.Widget) -> None:
         self.s = screen
+        self._photos = _SizedLRU(self.PHOTO_CACHE_MAX_PIXELS)
+        self._pyramids = _SizedLRU(self.PYRAMID_CACHE_MAX_PIXELS)
+        self._pending: set[int] = set()
+        self._render_queue: Optional[RenderQueue] = None
+        # cid -> meta of photos being rendered on the queue
+        self._photo_jobs: dict[int, dict] = {}
+        self._view_idle_id = None
 
     def rotated_bounds_px(self, w_px: float, h_px: float, angle_deg: float) -> tuple[float, float]:
         """Compute axis-aligned bounding box of a rotated rectangle in pixels.
@@ -62,28 +137,140 @@ class ImageManager:
         """Return a tk.PhotoImage for the given meta.path scaled to (w_px,h_px).
 
         The function prefers Pillow (high-quality resizing and rotation) and
-        supports SVG source rendering via svg_to_png. The returned PhotoImage
+        supports SVG source rendering via svg_to_png. Raster sources are
+        resampled from the nearest level of a cached mipmap pyramid, and the
+        finished photo is kept in an LRU keyed by (path, size, angle, mask) so
+        zooming back and forth does not re-render. The returned PhotoImage
         is stored on the meta dict under 'photo' to prevent garbage-collection
         by Tkinter.
         """
         if w_px < 1 or h_px < 1:
             return None
+        # A background render requested before this edit must not replace its result
+        for cid, job_meta in list(self._photo_jobs.items()):
+            if job_meta is meta:
+                self.cancel_render(("photo", cid))
+                del self._photo_jobs[cid]
         path = meta.get("path")
         if not path or not os.path.exists(path):
             return None
-        # Optional PIL (Pillow) import for high-quality image scaling
+        key = self._photo_key(meta, str(path), int(w_px), int(h_px))
+        if key is not None:
+            cached = self._photos.get(key)
+            if cached is not None:
+                meta["photo"] = cached
+                return cached
+        try:
+            pil = self._rasterize(self._render_source(meta), int(w_px), int(h_px))
+            if pil is not None:
+                return self._photo_from_pil(meta, key, pil)
+        except Exception as e:
+            logger.exception(f"Failed to render photo with PIL: {e}")
+        # Fallback to tk.PhotoImage (best-effort; may not scale exactly)
         try:
-            from PIL import Image, ImageTk  # type: ignore
+            photo = tk.PhotoImage(file=path)
+            meta["photo"] = photo
+            return photo
         except Exception:
-            Image = None  # type: ignore
-            ImageTk = None  # type: ignore
+            return None
 
-        # SVG handling via svg_to_png → PIL → ImageTk
+    def is_readable(self, path: str) -> bool:
+        """Cheap check that an image file can be rendered, for items whose photo is rendered later."""
+        try:
+            return _readable_image(str(path), os.stat(path).st_mtime_ns)
+        except OSError:
+            return False
+
+    def request_photo(self, cid: int, w_px: int, h_px: int) -> None:
+        """Re-render an image item at (w_px,h_px) without blocking the Tk thread.
+
+        Cached photos are applied at once. Otherwise the item shows a cheap
+        placeholder (its current photo scaled by Tk, or a blank photo) while
+        decode and resample run on the render queue; the real photo is swapped
+        in from the main loop. A newer request for the same item supersedes
+        older ones, so stale zoom levels are never applied.
+        """
+        meta = self.s._items.get(cid)
+        if meta is None or w_px < 1 or h_px < 1:
+            return
+        path = meta.get("path")
+        if not path or not os.path.exists(path):
+            return
+        key = self._photo_key(meta, str(path), int(w_px), int(h_px))
+        cached = self._photos.get(key) if key is not None else None
+        if cached is not None:
+            self.cancel_render(("photo", cid))
+            self._photo_jobs.pop(cid, None)
+            meta["photo"] = cached
+            self.s.canvas.itemconfig(cid, image=cached)
+            return
+        placeholder = self._placeholder(meta, int(w_px), int(h_px))
+        if placeholder is not None:
+            meta["photo"] = placeholder
+            self.s.canvas.itemconfig(cid, image=placeholder)
+        if str(path).lower().endswith(".svg"):
+            # Qt needs its application object created on the main thread
+            _ensure_qt_app()
+        source = self._render_source(meta)
+
+        def apply(pil) -> None:
+            if self._photo_jobs.get(cid) is meta:
+                del self._photo_jobs[cid]
+            if self.s._items.get(cid) is not meta or pil is None:
+                return
+            photo = self._photo_from_pil(meta, key, pil)
+            self.s.canvas.itemconfig(cid, image=photo)
+
+        self._photo_jobs[cid] = meta
+        self.render_queue.submit(("photo", cid), lambda: self._rasterize(source, int(w_px), int(h_px)), apply)
+
+    @property
+    def render_queue(self) -> RenderQueue:
+        if self._render_queue is None:
+            self._render_queue = RenderQueue(self.s.canvas, workers=self.RENDER_WORKERS)
+        return self._render_queue
+
+    def cancel_render(self, key) -> None:
+        """Drop the queued background render for `key`, if any (a synchronous render replaces it)."""
+        if self._render_queue is not None:
+            self._render_queue.cancel(key)
+
+    def close(self) -> None:
+        """Stop the render workers; the screen is going away."""
+        if self._render_queue is not None:
+            self._render_queue.close()
+            self._render_queue = None
+        self._photo_jobs.clear()
+
+    def _render_source(self, meta: dict) -> dict:
+        """Snapshot what rasterization needs so workers never read live meta."""
+        try:
+            angle = float(meta.get("angle", 0.0) or 0.0)
+        except Exception:
+            angle = 0.0
+        return {
+            "path": str(meta.get("path")),
+            "mask_path": str(meta.get("mask_path", "") or ""),
+            "angle": angle,
+            "pil": meta.get("pil"),
+        }
+
+    def _rasterize(self, source: dict, w_px: int, h_px: int):
+        """Produce the final RGBA PIL image for a render source (thread-safe, no Tk)."""
+        # Optional PIL (Pillow) import for high-quality image scaling
+        try:
+            from PIL import Image  # type: ignore
+        except Exception:
+            return None
+        path = source["path"]
+        mpath = source["mask_path"]
+        angle = source["angle"]
+        # SVG handling via svg_to_png → PIL
         try:
             ext = os.path.splitext(str(path))[1].lower()
         except Exception:
             ext = ""
-        if ext == ".svg" and Image is not None and ImageTk is not None:
+        if ext == ".svg":
             try:
                 pil = svg_to_png(str(path), width=int(w_px), height=int(h_px), device_pixel_ratio=1.0)
                 try:
@@ -93,65 +280,207 @@ class ImageManager:
                 # Mirror is a per-ASIN export flag; do NOT alter canvas rendering here
                 # Apply mask using clip (cut) logic: keep pixels only where mask alpha > 0
                 try:
-                    mpath = str(meta.get("mask_path", "") or "")
                     if mpath and os.path.exists(mpath):
                         pil = self._apply_mask_clip(pil, mpath, int(w_px), int(h_px))
                 except Exception:
                     logger.exception("Failed to apply window-based mask to SVG rasterization")
-                try:
-                    angle = float(meta.get("angle", 0.0) or 0.0)
-                except Exception:
-                    angle = 0.0
                 if abs(angle) > 1e-6:
                     pil = pil.rotate(-angle, expand=True, resample=Image.BICUBIC)
-                photo = ImageTk.PhotoImage(pil)
-                meta["photo"] = photo
-                return photo
+                return pil
             except Exception as e:
                 logger.exception(f"Failed to rasterize SVG with svg_to_png: {e}")
-        # Try high-quality resize via PIL for raster formats
+        # High-quality resize via PIL for raster formats
+        level = self._nearest_level(source, str(path), int(w_px), int(h_px))
+        resized = level.resize((int(w_px), int(h_px)), Image.LANCZOS)
+        # Mirror is a per-ASIN export flag; do NOT alter canvas rendering here
+        # Apply mask using clip (cut) logic: keep pixels only where mask alpha > 0
         try:
-            if Image is not None and ImageTk is not None:
-                pil = meta.get("pil")
-                if pil is None:
-                    pil = Image.open(path)
-                    meta["pil"] = pil
-                # Ensure RGBA to preserve transparency during rotation
-                try:
-                    pil = pil.convert("RGBA")
-                except Exception as e:
-                    logger.exception(f"Failed to convert raster image to RGBA: {e}")
-                resized = pil.resize((int(w_px), int(h_px)), Image.LANCZOS)
-                # Mirror is a per-ASIN export flag; do NOT alter canvas rendering here
-                # Apply mask using clip (cut) logic: keep pixels only where mask alpha > 0
-                try:
-                    mpath = str(meta.get("mask_path", "") or "")
-                    if mpath and os.path.exists(mpath):
-                        resized = self._apply_mask_clip(resized, mpath, int(w_px), int(h_px))
-                except Exception as e:
-                    logger.exception(f"Failed to apply window-based mask: {e}")
-                # Apply rotation if any (clockwise degrees)
-                angle = 0.0
-                try:
-                    angle = float(meta.get("angle", 0.0) or 0.0)
-                except Exception:
-                    angle = 0.0
-                if abs(angle) > 1e-6:
-                    rotated = resized.rotate(-angle, expand=True, resample=Image.BICUBIC, fillcolor=(0, 0, 0, 0))
-                    resized = rotated
-                photo = ImageTk.PhotoImage(resized)
-                meta["photo"] = photo
-                return photo
+            if mpath and os.path.exists(mpath):
+                resized = self._apply_mask_clip(resized, mpath, int(w_px), int(h_px))
         except Exception as e:
-            logger.exception(f"Failed to render photo with PIL: {e}")
-        # Fallback to tk.PhotoImage (best-effort; may not scale exactly)
+            logger.exception(f"Failed to apply window-based mask: {e}")
+        # Apply rotation if any (clockwise degrees)
+        if abs(angle) > 1e-6:
+            resized = resized.rotate(-angle, expand=True, resample=Image.BICUBIC, fillcolor=(0, 0, 0, 0))
+        return resized
+
+    def _photo_from_pil(self, meta: dict, key: Optional[tuple], pil) -> tk.PhotoImage:
+        from PIL import ImageTk  # type: ignore
+
+        photo = ImageTk.PhotoImage(pil)
+        meta["photo"] = photo
+        self._photos.put(key, photo, pil.width * pil.height)
+        return photo
+
+    def _placeholder(self, meta: dict, w_px: int, h_px: int) -> Optional[tk.PhotoImage]:
+        """Cheap stand-in shown until the background render lands.
+
+        Zoom steps are powers of two, so the current photo can usually be
+        scaled by Tk itself (integer zoom/subsample, done in C).
+        """
+        current = meta.get("photo")
         try:
-            photo = tk.PhotoImage(file=path)
-            meta["photo"] = photo
-            return photo
+            if current is not None:
+                cw = int(current.width())
+                if cw > 0:
+                    up = w_px / float(cw)
+                    down = cw / float(w_px)
+                    for option, factor in (("-zoom", up), ("-subsample", down)):
+                        if factor >= 2 and abs(factor - round(factor)) < 0.05:
+                            n = int(round(factor))
+                            scaled = tk.PhotoImage(master=self.s.canvas)
+                            scaled.tk.call(scaled, "copy", str(current), option, n, n)
+                            return scaled
+                    return current
+            return tk.PhotoImage(master=self.s.canvas, width=int(w_px), height=int(h_px))
+        except Exception:
+            logger.exception("Failed to build placeholder photo")
+            return None
+
+    def _photo_key(self, meta: dict, path: str, w_px: int, h_px: int) -> Optional[tuple]:
+        """Build the photo cache key; file mtimes make edits on disk invalidate it."""
+        try:
+            st = os.stat(path)
+            mpath = str(meta.get("mask_path", "") or "")
+            mask_sig = None
+            if mpath and os.path.exists(mpath):
+                mst = os.stat(mpath)
+                mask_sig = (mpath, mst.st_mtime_ns, mst.st_size)
+            angle = round(float(meta.get("angle", 0.0) or 0.0), 3)
+            return (path, st.st_mtime_ns, st.st_size, w_px, h_px, angle, mask_sig)
         except Exception:
             return None
 
+    def _nearest_level(self, source: dict, path: str, w_px: int, h_px: int):
+        """Return the smallest pyramid level that still covers (w_px, h_px)."""
+        level = None
+        for candidate in self._reduced_levels(source, path):
+            if candidate.width < w_px or candidate.height < h_px:
+                break
+            level = candidate
+        return level if level is not None else self._base_level(source, path)
+
+    @staticmethod
+    def _base_level(source: dict, path: str):
+        """Full-resolution RGBA image (level 0); not cached, the item already holds it as ``pil``."""
+        from PIL import Image  # type: ignore
+
+        pil = source.get("pil")
+        if pil is None:
+            pil = Image.open(path)
+        if pil.mode == "RGBA":
+            return pil
+        # Ensure RGBA to preserve transparency during rotation
+        try:
+            return pil.convert("RGBA")
+        except Exception as e:
+            logger.exception(f"Failed to convert raster image to RGBA: {e}")
+            return pil
+
+    def _reduced_levels(self, source: dict, path: str) -> list:
+        """Return mipmap levels 1.. of a raster source, building them once.
+
+        Each level halves both sides of the previous one with a box filter
+        until the image would drop below ``MIPMAP_MIN_SIDE`` pixels. Only
+        these are cached (a third of the source's pixels), so large photos
+        still fit the cache budget.
+        """
+        try:
+            st = os.stat(path)
+            key = (path, st.st_mtime_ns, st.st_size)
+        except Exception:
+            key = None
+        if key is not None:
+            levels = self._pyramids.get(key)
+            if levels is not None:
+                return levels
+        levels = []
+        level = self._base_level(source, path)
+        while min(level.width, level.height) // 2 >= self.MIPMAP_MIN_SIDE:
+            level = level.reduce(2)
+            levels.append(level)
+        if key is not None:
+            self._pyramids.put(key, levels, max(1, sum(p.width * p.height for p in levels)))
+        return levels
+
+    # ---- Viewport culling ----
+    def view_rect(self) -> Optional[tuple[float, float, float, float]]:
+        """Return the visible canvas area (plus margin), or None if not mapped yet."""
+        try:
+            cw = int(self.s.canvas.winfo_width())
+            ch = int(self.s.canvas.winfo_height())
+            if cw <= 1 or ch <= 1:
+                return None
+            x0 = float(self.s.canvas.canvasx(0))
+            y0 = float(self.s.canvas.canvasy(0))
+        except Exception:
+            return None
+        mx = cw * self.VIEW_MARGIN
+        my = ch * self.VIEW_MARGIN
+        return (x0 - mx, y0 - my, x0 + cw + mx, y0 + ch + my)
+
+    @staticmethod
+    def intersects(view: Optional[tuple], left: float, top: float, w: float, h: float) -> bool:
+        if view is None:
+            return True
+        vx0, vy0, vx1, vy1 = view
+        return left < vx1 and left + w > vx0 and top < vy1 and top + h > vy0
+
+    def defer_render(self, cid: int) -> None:
+        """Remember that an off-screen image still needs a photo at the current zoom."""
+        self._pending.add(cid)
+
+    def discard_pending(self, cid: int) -> None:
+        self._pending.discard(cid)
+
+    def on_view_change(self, *_args) -> None:
+        """Canvas scroll-command hook: the view moved (scroll, pan, resize).
+
+        Deferred images coming into view are rendered once per idle tick.
+        """
+        if not self._pending or self._view_idle_id is not None:
+            return
+        try:
+            self._view_idle_id = self.s.canvas.after_idle(self._render_visible_idle)
+        except Exception:
+            logger.exception("Failed to schedule rendering of images in view")
+            self._view_idle_id = None
+
+    def _render_visible_idle(self) -> None:
+        self._view_idle_id = None
+        try:
+            self.render_visible()
+        except Exception:
+            logger.exception("Failed to render images in view")
+
+    def render_visible(self) -> int:
+        """Render deferred images that have scrolled into view; return how many."""
+        if not self._pending:
+            return 0
+        view = self.view_rect()
+        rendered = 0
+        for cid in list(self._pending):
+            meta = self.s._items.get(cid)
+            if meta is None:
+                self._pending.discard(cid)
+                continue
+            try:
+                # Size from the stored mm so edits made while off-screen are honoured
+                w_px = max(1, int(float(meta.get("w_mm", 0.0)) * MM_TO_PX * self.s._zoom))
+                h_px = max(1, int(float(meta.get("h_mm", 0.0)) * MM_TO_PX * self.s._zoom))
+                bx = self.s.canvas.bbox(cid)
+                if bx:
+                    angle = float(meta.get("angle", 0.0) or 0.0)
+                    bw, bh = self.rotated_bounds_px(w_px, h_px, angle)
+                    if not self.intersects(view, float(bx[0]), float(bx[1]), bw, bh):
+                        continue
+                self.request_photo(cid, w_px, h_px)
+                rendered += 1
+            except Exception:
+                logger.exception(f"Failed to render deferred image {cid}")
+            self._pending.discard(cid)
+        return rendered
+
     def create_image_item(self, path: str, w_mm: float, h_mm: float, x_mm: Optional[float] = None, y_mm: Optional[float] = None) -> None:
         """Create an image item on the canvas and add its metadata.
 
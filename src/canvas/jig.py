@@ -51,7 +51,7 @@ class JigController:
             if t in ("rect", "barcode"):
                 # Rect and barcode labels are rendered as rotated images; re-render at current zoom
                 try:
-                    self.s._update_rect_label_image(cid)
+                    self.s._update_rect_label_image(cid, background=True)
                 except Exception:
                     logger.exception("Failed to update rotated rect/barcode label image during font update")
             elif t == "slot":
@@ -289,6 +289,7 @@ class JigController:
         self.update_scrollregion()
         if center:
             self.center_view()
+        view = self.s.images.view_rect()
         # Reposition all items using persisted mm
         for cid, meta in self.s._items.items():
             t = meta.get("type")
@@ -377,9 +378,12 @@ class JigController:
                 top = y0 + y_mm * MM_TO_PX * self.s._zoom + oy
                 new_left = max(min_left, min(left, max_left))
                 new_top = max(min_top, min(top, max_top))
-                photo = self.s._render_photo(meta, max(1, int(wpx)), max(1, int(hpx)))
-                if photo is not None:
-                    self.s.canvas.itemconfig(cid, image=photo)
+                # Only rasterize images near the viewport; the rest render when scrolled into view
+                if self.s.images.intersects(view, new_left, new_top, bw, bh):
+                    self.s.images.discard_pending(cid)
+                    self.s.images.request_photo(cid, max(1, int(wpx)), max(1, int(hpx)))
+                else:
+                    self.s.images.defer_render(cid)
                 # Use visual top-left directly
                 place_left = new_left
                 place_top = new_top
@@ -408,13 +412,32 @@ class JigController:
         items are redrawn.
         """
         # direction: +1 zoom in, -1 zoom out
+        self.zoom_by(1 if direction > 0 else -1)
+
+    def zoom_by(self, steps: int) -> bool:
+        """Apply several zoom steps at once with a single redraw.
+
+        Args:
+            steps: Net number of doubling (+) or halving (-) steps, e.g. the
+                sum of a burst of wheel events coalesced by the redraw
+                scheduler.
+
+        Returns:
+            Whether the zoom changed (and the scene was redrawn); False when
+            it is already clamped at the limit in that direction.
+        """
+        if not steps:
+            return False
         old_zoom = self.s._zoom
-        if direction > 0:
-            self.s._zoom = min(20.0, self.s._zoom * 2)
-        else:
-            self.s._zoom = max(0.2, self.s._zoom / 2)
+        new_zoom = old_zoom
+        for _ in range(abs(int(steps))):
+            if steps > 0:
+                new_zoom = min(20.0, new_zoom * 2)
+            else:
+                new_zoom = max(0.2, new_zoom / 2)
+        self.s._zoom = new_zoom
         if abs(self.s._zoom - old_zoom) < 1e-6:
-            return
+            return False
         # Compute current viewport center pivot in mm relative to jig
         cw = max(1, self.s.canvas.winfo_width())
         ch = max(1, self.s.canvas.winfo_height())
@@ -443,10 +466,12 @@ class JigController:
                 self.s.canvas.yview_moveto((desired_top - sy0) / (total_h - ch))
         except Exception as e:
             logger.exception(f"Failed to update zoom view: {e}")
-        # After zooming, scale all text fonts to match the new zoom
+        # The view moved after the redraw: render images that are now visible
         try:
-            self.update_all_text_fonts()
+            self.s.images.render_visible()
         except Exception as e:
-            logger.exception(f"Failed to update text fonts: {e}")
+            logger.exception(f"Failed to render visible images after zoom: {e}")
+        # Text fonts were already rescaled by redraw_jig; moving the view does not change them
+        return True
 
 
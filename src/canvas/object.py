@@ -1,21 +1,36 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from typing import Optional, Any, TYPE_CHECKING
+from dataclasses import dataclass, field, fields
+from typing import Optional, Any, Iterator, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from src.canvas.hatch_settings import HatchSettings
 
+# Geometry is normalised to float once, on construction and on item assignment
+_FLOAT_FIELDS = frozenset(("x_mm", "y_mm", "w_mm", "h_mm", "angle"))
+# Runtime-only state; writing these does not bump the revision counter
+_UNTRACKED = frozenset(("_rev", "_extra", "pil", "photo", "canvas_id", "border_id", "label_photo", "label_sig"))
 
-@dataclass
+
+@dataclass(slots=True)
 class CanvasObject:
     """Encapsulates state for an item placed on the canvas.
 
     Fields store geometry in millimeters relative to the jig: top-left for
     rectangles/images and center for text items. Pixel conversion and zooming
     are handled by the screen.
+
+    Storage is slotted; keys that are not declared fields (label styling,
+    border bookkeeping, ...) live in a small overflow dict so the dict-like
+    API below keeps working for every caller.
+
+    Every write to persisted state bumps `revision`, which lets the screen
+    cache each item's serialized form and re-encode only what changed.
     """
 
+    # Declared first so it exists before __init__ assigns the other fields
+    _rev: int = field(default=0, init=False, repr=False, compare=False)
+
     type: str  # "rect", "image", "text", "slot", "major", or "barcode"
 
     # Geometry in millimeters (top-left for rect/image, center for text)
@@ -69,6 +84,31 @@ class CanvasObject:
     # Hatch settings per object (stored as dict, converted to HatchSettings when needed)
     hatch_settings: Optional[dict] = None
 
+    # Ownership and linkage that used to be ad-hoc keys
+    owner_major: str = ""  # name of the major this item belongs to
+    rot_id: Optional[int] = None  # rotated overlay polygon for rects/barcodes
+    pen_number: int = 0
+
+    # Undeclared keys set through obj[key] = value
+    _extra: Optional[dict] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.x_mm = float(self.x_mm or 0.0)
+        self.y_mm = float(self.y_mm or 0.0)
+        self.w_mm = float(self.w_mm or 0.0)
+        self.h_mm = float(self.h_mm or 0.0)
+        self.angle = float(self.angle or 0.0)
+
+    def __setattr__(self, name: str, value) -> None:
+        object.__setattr__(self, name, value)
+        if name not in _UNTRACKED:
+            object.__setattr__(self, "_rev", self._rev + 1)
+
+    @property
+    def revision(self) -> int:
+        """Counter bumped on every change to persisted state."""
+        return self._rev
+
     def is_text_rect(self) -> bool:
         # Text rects have green outline; barcode has black outline but should not be treated as text rect
         """Return True when this object represents a 'text rectangle'.
@@ -88,7 +128,12 @@ class CanvasObject:
         code that used dict meta objects. It returns the attribute value if
         present or the provided default otherwise.
         """
-        return getattr(self, key, default)
+        if key in _FIELD_NAMES:
+            return getattr(self, key)
+        extra = self._extra
+        if extra is not None and key in extra:
+            return extra[key]
+        return default
 
     def __getitem__(self, key: str):
         """Allow bracket access (obj[key]) to read attributes.
@@ -96,7 +141,12 @@ class CanvasObject:
         Raises AttributeError if the attribute does not exist (matching
         previous dict-like expectations where KeyError would be analogous).
         """
-        return getattr(self, key)
+        if key in _FIELD_NAMES:
+            return getattr(self, key)
+        extra = self._extra
+        if extra is not None and key in extra:
+            return extra[key]
+        raise AttributeError(key)
 
     def __setitem__(self, key: str, value):
         """Allow bracket assignment (obj[key] = value) to set attributes.
@@ -104,6 +154,39 @@ class CanvasObject:
         This provides a minimal dict-like interface used in various legacy
         call sites while keeping the benefits of a typed dataclass.
         """
-        setattr(self, key, value)
-
-
+        if key in _FIELD_NAMES:
+            if key in _FLOAT_FIELDS:
+                value = float(value)
+            setattr(self, key, value)
+            return
+        if self._extra is None:
+            self._extra = {}
+        self._extra[key] = value
+        if key not in _UNTRACKED:
+            self._rev += 1
+
+    def __contains__(self, key: str) -> bool:
+        return key in _FIELD_NAMES or (self._extra is not None and key in self._extra)
+
+    def keys(self) -> Iterator[str]:
+        yield from _FIELD_ORDER
+        if self._extra:
+            yield from list(self._extra)
+
+    def items(self) -> Iterator[tuple[str, Any]]:
+        for key in self.keys():
+            yield key, self[key]
+
+    def pop(self, key: str, default=None):
+        """Remove and return an overflow key; declared fields cannot be removed."""
+        if self._extra is not None and key in self._extra:
+            self._rev += 1
+            return self._extra.pop(key)
+        return default
+
+    def to_dict(self) -> dict:
+        return dict(self.items())
+
+
+_FIELD_NAMES = frozenset(f.name for f in fields(CanvasObject) if f.name not in ("_extra", "_rev"))
+_FIELD_ORDER = tuple(f.name for f in fields(CanvasObject) if f.name not in ("_extra", "_rev"))
@@ -17,6 +17,8 @@ import cairo
 from PIL import Image
 import numpy as np
 import pikepdf
+
+from src.core.profiling import span
 Image.MAX_IMAGE_PIXELS = 999_999_999_999_999
 
 logger = logging.getLogger(__name__)
@@ -453,7 +455,8 @@ class PDFCombiner:
                 continue
                 
             # Pack PDFs into sheets
-            sheets = self._simple_pack(pdfs)
+            with span("combine.pack", side=side, pdfs=len(pdfs)):
+                sheets = self._simple_pack(pdfs)
             
             logger.info(f"Created {len(sheets)} sheet(s) for {side} side")
             
@@ -484,7 +487,9 @@ class PDFCombiner:
                 # Use DPI from first PDF in sheet
                 dpi = sheet[0].pdf_info.dpi if sheet else 1200
                 try:
-                    self._render_combined_pdf(sheet, output_path, dpi=dpi)
+                    with span("combine.render", side=side, pdfs=len(sheet)) as attrs:
+                        self._render_combined_pdf(sheet, output_path, dpi=dpi)
+                        attrs["bytes"] = os.path.getsize(output_path)
                     combined_paths.append(output_path)
                     logger.info(f"Created combined PDF: {output_filename} with {len(sheet)} PDFs")
                 except Exception as e:
@@ -503,4 +508,5 @@ class PDFCombiner:
         Returns:
             List of paths to combined PDFs
         """
-        return self.combine_pending(force=True)
+        with span("combine.finalize", pdfs=len(self.pending_pdfs)):
+            return self.combine_pending(force=True)
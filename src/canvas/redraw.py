@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import logging
+
+import tkinter as tk
+
+logger = logging.getLogger(__name__)
+
+
+class RedrawScheduler:
+    """Coalesce canvas invalidations into one flush.
+
+    Event sources that fire in bursts (window resize, wheel zoom) only mark
+    what became dirty; the accumulated work runs once from `after_idle`.
+    Jig size changes come from typing into the size fields, where Tk goes
+    idle between keystrokes, so they wait for a `JIG_DEBOUNCE_MS` pause
+    instead. Larger invalidations absorb smaller ones: a jig change implies
+    a full redraw, and a zoom redraws the scene at the net zoom level
+    (unless it is clamped at a limit and leaves the level unchanged).
+    """
+
+    JIG_DEBOUNCE_MS = 150
+
+    def __init__(self, screen: tk.Widget) -> None:
+        self.s = screen
+        self._after_id = None
+        self._reset()
+
+    def _reset(self) -> None:
+        self._jig_changed = False
+        self._redraw = False
+        self._center = False
+        self._zoom_steps = 0
+
+    @property
+    def pending(self) -> bool:
+        return self._after_id is not None
+
+    def jig_changed(self) -> None:
+        """Jig size changed: redraw, re-clamp majors and re-place slots once typing pauses."""
+        self._jig_changed = True
+        self._unschedule()
+        try:
+            self._after_id = self.s.after(self.JIG_DEBOUNCE_MS, self.flush)
+        except Exception:
+            logger.exception("Failed to schedule jig change redraw")
+            self._after_id = None
+
+    def redraw(self, center: bool = False) -> None:
+        self._redraw = True
+        self._center = self._center or bool(center)
+        self._schedule()
+
+    def zoom(self, direction: int) -> None:
+        self._zoom_steps += 1 if direction > 0 else -1
+        self._schedule()
+
+    def _schedule(self) -> None:
+        if self._after_id is not None:
+            return
+        try:
+            self._after_id = self.s.after_idle(self.flush)
+        except Exception:
+            logger.exception("Failed to schedule coalesced redraw")
+            self._after_id = None
+
+    def _unschedule(self) -> None:
+        if self._after_id is not None:
+            try:
+                self.s.after_cancel(self._after_id)
+            except Exception:
+                logger.exception("Failed to cancel coalesced redraw")
+        self._after_id = None
+
+    def cancel(self) -> None:
+        self._unschedule()
+        self._reset()
+
+    def flush(self) -> None:
+        """Run all accumulated work now (also safe to call directly)."""
+        if self._after_id is not None:
+            try:
+                self.s.after_cancel(self._after_id)
+            except Exception:
+                pass
+        self._after_id = None
+        jig_changed, redraw, center, zoom_steps = self._jig_changed, self._redraw, self._center, self._zoom_steps
+        self._reset()
+
+        if jig_changed:
+            self.s._apply_jig_change()
+        # A zoom that changes the level redraws the scene; one clamped at the
+        # limit does not, so a pending redraw still has to run
+        zoomed = bool(zoom_steps) and bool(self.s.jig.zoom_by(zoom_steps))
+        if redraw and not jig_changed and not zoomed:
+            self.s.jig.redraw_jig(center=center)
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Hashable, Optional
+
+import tkinter as tk
+
+logger = logging.getLogger(__name__)
+
+
+class RenderQueue:
+    """Run image work on background threads and apply results on the Tk thread.
+
+    `submit(key, work, apply)` runs `work()` on a worker thread and later
+    calls `apply(result)` from the Tk main loop (results are polled with
+    `after()`, never touched by workers). Each key only keeps its newest
+    request: submitting again for the same key makes earlier requests stale,
+    so they are skipped if not started yet and their results are dropped.
+    """
+
+    POLL_MS = 15
+
+    def __init__(self, widget: tk.Misc, workers: int = 2) -> None:
+        self.widget = widget
+        self._executor = ThreadPoolExecutor(max_workers=max(1, int(workers)), thread_name_prefix="canvas-render")
+        self._results: "queue.Queue[tuple]" = queue.Queue()
+        self._generations: dict[Hashable, int] = {}
+        self._lock = threading.Lock()
+        self._outstanding = 0
+        self._poll_id = None
+
+    def submit(
+        self,
+        key: Hashable,
+        work: Callable[[], Any],
+        apply: Callable[[Any], None],
+        on_error: Optional[Callable[[BaseException], None]] = None,
+    ) -> None:
+        """Queue `work` for `key`, superseding any earlier request for it."""
+        with self._lock:
+            generation = self._generations.get(key, 0) + 1
+            self._generations[key] = generation
+            self._outstanding += 1
+        self._executor.submit(self._run, key, generation, work, apply, on_error)
+        self._schedule_poll()
+
+    def cancel(self, key: Hashable) -> None:
+        """Mark any queued or running request for `key` as stale."""
+        with self._lock:
+            if key in self._generations:
+                self._generations[key] += 1
+
+    def is_current(self, key: Hashable, generation: int) -> bool:
+        with self._lock:
+            return self._generations.get(key) == generation
+
+    @property
+    def outstanding(self) -> int:
+        with self._lock:
+            return self._outstanding
+
+    def _run(self, key, generation, work, apply, on_error) -> None:
+        if not self.is_current(key, generation):
+            self._results.put((key, generation, None, None, None, None))
+            return
+        try:
+            result = work()
+            self._results.put((key, generation, apply, on_error, result, None))
+        except BaseException as e:
+            self._results.put((key, generation, apply, on_error, None, e))
+
+    def _schedule_poll(self) -> None:
+        if self._poll_id is not None:
+            return
+        try:
+            self._poll_id = self.widget.after(self.POLL_MS, self._poll)
+        except Exception:
+            logger.exception("Failed to schedule render queue poll")
+            self._poll_id = None
+
+    def _poll(self) -> None:
+        self._poll_id = None
+        self.drain()
+        if self.outstanding > 0:
+            self._schedule_poll()
+
+    def drain(self) -> int:
+        """Apply every finished, still-current result; return how many were applied."""
+        applied = 0
+        while True:
+            try:
+                key, generation, apply, on_error, result, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            with self._lock:
+                self._outstanding -= 1
+            if apply is None or not self.is_current(key, generation):
+                continue
+            if error is not None:
+                if on_error is not None:
+                    on_error(error)
+                else:
+                    logger.error(f"Background render for {key!r} failed: {error}")
+                continue
+            try:
+                apply(result)
+                applied += 1
+            except Exception:
+                logger.exception(f"Failed to apply background render for {key!r}")
+        return applied
+
+    def wait_idle(self, timeout: float = 10.0) -> int:
+        """Block until all queued work finished and apply it (tests, shutdown)."""
+        deadline = time.monotonic() + timeout
+        applied = 0
+        while self.outstanding > 0 and time.monotonic() < deadline:
+            applied += self.drain()
+            time.sleep(0.005)
+        return applied + self.drain()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
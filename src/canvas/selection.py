@@ -10,6 +10,7 @@ from tkinter import messagebox, filedialog
 from src.canvas.object import CanvasObject
 from src.core import MM_TO_PX
 from .context_menu import CanvasContextPopup
+from .zorder import ZOrderModel
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +30,7 @@ class CanvasSelection:
         self._suppress_size_trace: bool = False
         self._suppress_pos_trace: bool = False
         self._ctx_popup_obj: Optional[CanvasContextPopup] = None
+        self._zorder = ZOrderModel(screen)
         self._previous_state = {
             "zoom": self.s._zoom,
             "cid": self._selected
@@ -177,6 +179,12 @@ class CanvasSelection:
                 # Use bbox size for both rects and images
                 self._drag_size = (x2 - x1, y2 - y1)
                 self._drag_kind = "rect"
+                if meta.get("type") == "major":
+                    # Collision checks during the drag query the shared index
+                    try:
+                        self.s.spatial.sync(self.s._items)
+                    except Exception:
+                        logger.exception("Failed to sync spatial index for drag")
                 logger.debug("on_click: prepared drag rect; drag_off=%s drag_size=%s", self._drag_off, self._drag_size)
             else:
                 cx, cy = self.s.canvas.coords(target)
@@ -275,21 +283,14 @@ class CanvasSelection:
                 # Previous position in mm (for movement direction)
                 prev_mm_x = float(meta.get("x_mm", 0.0) or 0.0)
                 prev_mm_y = float(meta.get("y_mm", 0.0) or 0.0)
-                # Build list of other majors
-                others = []
-                for rid, m in self.s._items.items():
-                    if rid == self._selected:
-                        continue
-                    if str(m.get("type", "")) != "major":
-                        continue
-                    try:
-                        ox_mm = float(m.get("x_mm", 0.0) or 0.0)
-                        oy_mm = float(m.get("y_mm", 0.0) or 0.0)
-                        ow_mm = float(m.get("w_mm", 0.0) or 0.0)
-                        oh_mm = float(m.get("h_mm", 0.0) or 0.0)
-                    except Exception:
-                        ox_mm, oy_mm, ow_mm, oh_mm = 0.0, 0.0, 0.0, 0.0
-                    others.append((ox_mm, oy_mm, ow_mm, oh_mm))
+                # Only majors near the dragged box can collide with it
+                index = self.s.spatial
+
+                def _neighbors(x_mm, y_mm):
+                    near = (x_mm - pad_mm, y_mm - pad_mm, x_mm + w_mm + pad_mm, y_mm + h_mm + pad_mm)
+                    for rid in sorted(index.query(near, kinds=("major",), exclude=self._selected)):
+                        bx0, by0, bx1, by1 = index.bbox(rid)
+                        yield bx0, by0, bx1 - bx0, by1 - by0
 
                 def _overlaps(ax, ay, aw, ah, bx, by, bw, bh, pad=0.0) -> bool:
                     return not ((ax + aw + pad) <= bx or (bx + bw) <= (ax - pad) or (ay + ah + pad) <= by or (by + bh) <= (ay - pad))
@@ -299,23 +300,23 @@ class CanvasSelection:
                 it = 0
                 while it < max_iter:
                     collided = False
-                    for (ox, oy, ow, oh) in others:
-                        if _overlaps(sx_mm, sy_mm, w_mm, h_mm, ox, oy, ow, oh, pad=pad_mm):
+                    for (nx, ny, nw, nh) in _neighbors(sx_mm, sy_mm):
+                        if _overlaps(sx_mm, sy_mm, w_mm, h_mm, nx, ny, nw, nh, pad=pad_mm):
                             collided = True
                             dx = sx_mm - prev_mm_x
                             dy = sy_mm - prev_mm_y
                             if abs(dx) >= abs(dy):
                                 # Resolve along X
                                 if dx >= 0:
-                                    sx_mm = min(max_x_mm_allowed, ox - pad_mm - w_mm)
+                                    sx_mm = min(max_x_mm_allowed, nx - pad_mm - w_mm)
                                 else:
-                                    sx_mm = max(min_x_mm_allowed, ox + ow + pad_mm)
+                                    sx_mm = max(min_x_mm_allowed, nx + nw + pad_mm)
                             else:
                                 # Resolve along Y
                                 if dy >= 0:
-                                    sy_mm = min(max_y_mm_allowed, oy - pad_mm - h_mm)
+                                    sy_mm = min(max_y_mm_allowed, ny - pad_mm - h_mm)
                                 else:
-                                    sy_mm = max(min_y_mm_allowed, oy + oh + pad_mm)
+                                    sy_mm = max(min_y_mm_allowed, ny + nh + pad_mm)
                             # Re-clamp to bounds
                             sx_mm = float(max(min_x_mm_allowed, min(sx_mm, max_x_mm_allowed)))
                             sy_mm = float(max(min_y_mm_allowed, min(sy_mm, max_y_mm_allowed)))
@@ -383,6 +384,8 @@ class CanvasSelection:
                 meta["x_mm"], meta["y_mm"] = float(sx_mm), float(sy_mm)
             finally:
                 self._suppress_pos_trace = False
+            if self._selected in self.s.spatial:
+                self.s.spatial.update(self._selected, meta)
             # Keep stacking updated so dragged item remains interactable above slots/majors
             try:
                 self._reorder_by_z()
@@ -855,8 +858,19 @@ class CanvasSelection:
         """Apply stacking order with fixed hierarchy and then by z for others.
 
         Hierarchy (bottom → top): majors → slots → other objects (by ascending z).
-        Keep selection border (if any) on top and then re-raise labels above their base.
+        Keep selection border (if any) on top and labels above their base.
+        Only items that are out of order are moved (see `ZOrderModel`); the
+        full restack is kept as a fallback.
         """
+        try:
+            self._zorder.apply(self._selected)
+            return
+        except Exception:
+            logger.exception("Incremental z-order update failed; restacking all items")
+        self._restack_all()
+
+    def _restack_all(self) -> None:
+        """Lower every tracked item and raise it back in hierarchy order."""
         try:
             # Build list of (cid, meta) that have a primary canvas id
             items = [(cid, meta) for cid, meta in self.s._items.items() if cid == meta.get("canvas_id")]
@@ -1021,6 +1035,7 @@ class CanvasSelection:
             self.s.canvas.scan_dragto(e.x, e.y, gain=1)
         except Exception:
             logger.exception("Failed to scan-drag canvas (pan move)")
+        self._render_visible_images()
 
     def on_pan_end(self, _e):
         # no-op; keep for symmetry/future logic
@@ -1088,6 +1103,7 @@ class CanvasSelection:
                 self.s.canvas.yview_moveto(new_fy)
         except Exception:
             logger.exception("Failed to move view during key pan")
+        self._render_visible_images()
         return "break"
 
     def on_wheel_zoom(self, e):
@@ -1097,7 +1113,8 @@ class CanvasSelection:
             delta = 0
         if delta == 0:
             return "break"
-        self.s._zoom_step(1 if delta > 0 else -1)
+        # Wheel events arrive in bursts; the scheduler applies the net zoom once
+        self.s.redraw_scheduler.zoom(1 if delta > 0 else -1)
         return "break"
 
     def on_wheel_pan(self, e):
@@ -1172,8 +1189,16 @@ class CanvasSelection:
                 self.s.canvas.yview_moveto(new_fy)
         except Exception:
             logger.exception("Failed to move view during wheel pan")
+        self._render_visible_images()
         return "break"
 
+    def _render_visible_images(self) -> None:
+        """Render images that were culled during redraw once they come into view."""
+        try:
+            self.s.images.render_visible()
+        except Exception:
+            logger.exception("Failed to render images scrolled into view")
+
     # Core selection API
     def select(self, cid: Optional[int]):
         """Select or clear selection for a canvas item.
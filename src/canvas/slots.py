@@ -12,6 +12,8 @@ class SlotManager:
 
     def __init__(self, screen: tk.Widget) -> None:
         self.s = screen
+        # label canvas id -> text last written by renumber_slots
+        self._label_text: dict[int, str] = {}
 
     def create_slot_at_mm(self, label: str, w_mm: float, h_mm: float, x_mm: float, y_mm: float, owner_major: Optional[str] = None):
         x0, y0, x1, y1 = self.s._jig_inner_rect_px()
@@ -41,7 +43,13 @@ class SlotManager:
             x_mm_i = self.s._snap_mm((new_left - (x0 + ox)) / (MM_TO_PX * max(self.s._zoom, 1e-6)))
             y_mm_i = self.s._snap_mm((new_top - (y0 + oy)) / (MM_TO_PX * max(self.s._zoom, 1e-6)))
         # next z: force slots to be at the very bottom. Use (current global min z - 1)
-        min_z = min(int(m.get("z", 0)) for _cid, m in self.s._items.items()) if self.s._items else 0
+        bulk = getattr(self.s, "_bulk_depth", 0)
+        if bulk:
+            # Bulk restore keeps a running minimum instead of rescanning every item
+            self.s._bulk_min_z -= 1
+            min_z = self.s._bulk_min_z + 1
+        else:
+            min_z = min(int(m.get("z", 0)) for _cid, m in self.s._items.items()) if self.s._items else 0
         obj = CanvasObject(
             type="slot",
             w_mm=float(w_mm_i),
@@ -64,8 +72,8 @@ class SlotManager:
         except Exception:
             raise
         self.s._items[rect] = obj
-        # Respect visibility by active major
-        if hasattr(self.s, "_refresh_major_visibility"):
+        # Respect visibility by active major (once at the end of a bulk restore)
+        if not bulk and hasattr(self.s, "_refresh_major_visibility"):
             try:
                 self.s._refresh_major_visibility()
             except Exception:
@@ -166,22 +174,23 @@ class SlotManager:
         self.renumber_slots()
 
     def renumber_slots(self):
-        # Build owner->list of (left_px, top_px, rect_id, label_id)
+        # Order slots by their mm position from the shared spatial index rather
+        # than asking the canvas for every slot's bbox
+        index = self.s.spatial
+        index.sync(self.s._items)
         groups: dict[str, List[Tuple[float, float, int, Optional[int]]]] = {}
-        for cid, meta in self.s._items.items():
-            if meta.get("type") != "slot":
-                continue
-            try:
-                x1, y1, x2, y2 = self.s.canvas.bbox(cid)
-            except Exception:
-                continue
+        for cid in index.of_kind("slot"):
+            meta = self.s._items[cid]
+            x1, y1, _x2, _y2 = index.bbox(cid)
             owner = str(meta.get("owner_major", ""))
-            groups.setdefault(owner, []).append((float(x1), float(y1), cid, meta.get("label_id")))
+            groups.setdefault(owner, []).append((x1, y1, cid, meta.get("label_id")))
         # For each owner group: sort bottom-to-top (y desc), within row right-to-left (x desc), then number from 1
         for _owner, slots in groups.items():
-            slots.sort(key=lambda t: (-t[1], -t[0]))
+            slots.sort(key=lambda t: (-t[1], -t[0], t[2]))
             for idx, (_lx, _ty, _cid, lbl_id) in enumerate(slots, start=1):
                 if lbl_id:
-                    self.s.canvas.itemconfig(lbl_id, text=f"Slot {idx}")
-
-
+                    text = f"Slot {idx}"
+                    # Skip the Tk round-trip when the label already reads right
+                    if self._label_text.get(lbl_id) != text:
+                        self.s.canvas.itemconfig(lbl_id, text=text)
+                        self._label_text[lbl_id] = text
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import math
+from typing import Iterable, Optional
+
+from src.canvas.object import CanvasObject
+
+# (x0, y0, x1, y1) in millimetres, jig-relative
+BBox = tuple[float, float, float, float]
+
+
+def item_bbox_mm(meta: dict) -> Optional[BBox]:
+    """Axis-aligned bounds of a canvas item in jig millimetres.
+
+    Mirrors how the canvas places items: slots and majors are never rotated,
+    rects/images/barcodes are positioned by the top-left of their rotated
+    bounds, and text stores its center point.
+    """
+    kind = meta.get("type")
+    if isinstance(meta, CanvasObject):
+        # Geometry is already normalised to floats
+        x, y, w, h, angle = meta.x_mm, meta.y_mm, meta.w_mm, meta.h_mm, meta.angle
+        if kind == "text":
+            return (x, y, x, y)
+        if kind in ("rect", "image", "barcode") and angle % 180.0:
+            a = math.radians(angle)
+            ca, sa = abs(math.cos(a)), abs(math.sin(a))
+            w, h = w * ca + h * sa, w * sa + h * ca
+        return (x, y, x + max(0.0, w), y + max(0.0, h))
+    try:
+        x = float(meta.get("x_mm", 0.0) or 0.0)
+        y = float(meta.get("y_mm", 0.0) or 0.0)
+        w = float(meta.get("w_mm", 0.0) or 0.0)
+        h = float(meta.get("h_mm", 0.0) or 0.0)
+    except (TypeError, ValueError):
+        return None
+    if kind == "text":
+        return (x, y, x, y)
+    if kind in ("rect", "image", "barcode"):
+        try:
+            a = math.radians(float(meta.get("angle", 0.0) or 0.0) % 360.0)
+        except (TypeError, ValueError):
+            a = 0.0
+        ca, sa = abs(math.cos(a)), abs(math.sin(a))
+        w, h = w * ca + h * sa, w * sa + h * ca
+    return (x, y, x + max(0.0, w), y + max(0.0, h))
+
+
+class SpatialIndex:
+    """Uniform-grid index over item bounding boxes in millimetre space.
+
+    Items are bucketed into square cells of `cell_mm`; overlap, containment
+    and nearest queries only look at the cells they touch instead of walking
+    every item in `screen._items`. `sync` brings the index up to date with
+    the item dict (cheap when nothing moved) and `update` refreshes a single
+    item while it is being dragged or resized.
+    """
+
+    def __init__(self, cell_mm: float = 25.0) -> None:
+        self.cell_mm = float(cell_mm)
+        self._cells: dict[tuple[int, int], set[int]] = {}
+        self._boxes: dict[int, BBox] = {}
+        self._kinds: dict[int, str] = {}
+        self._by_kind: dict[str, set[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._boxes)
+
+    def __contains__(self, cid: int) -> bool:
+        return cid in self._boxes
+
+    def _cell_range(self, box: BBox):
+        c = self.cell_mm
+        return (
+            range(math.floor(box[0] / c), math.floor(box[2] / c) + 1),
+            range(math.floor(box[1] / c), math.floor(box[3] / c) + 1),
+        )
+
+    def insert(self, cid: int, box: BBox, kind: str) -> None:
+        if cid in self._boxes:
+            self.remove(cid)
+        self._boxes[cid] = box
+        self._kinds[cid] = kind
+        self._by_kind.setdefault(kind, set()).add(cid)
+        xs, ys = self._cell_range(box)
+        for ix in xs:
+            for iy in ys:
+                self._cells.setdefault((ix, iy), set()).add(cid)
+
+    def remove(self, cid: int) -> None:
+        box = self._boxes.pop(cid, None)
+        if box is None:
+            return
+        kind = self._kinds.pop(cid, None)
+        self._by_kind.get(kind, set()).discard(cid)
+        xs, ys = self._cell_range(box)
+        for ix in xs:
+            for iy in ys:
+                bucket = self._cells.get((ix, iy))
+                if bucket is not None:
+                    bucket.discard(cid)
+                    if not bucket:
+                        del self._cells[(ix, iy)]
+
+    def update(self, cid: int, meta: dict) -> None:
+        """Re-index one item from its meta (after a move, resize or rotation)."""
+        box = item_bbox_mm(meta)
+        kind = str(meta.get("type", ""))
+        if box is None:
+            self.remove(cid)
+        elif self._boxes.get(cid) != box or self._kinds.get(cid) != kind:
+            self.insert(cid, box, kind)
+
+    def sync(self, items: dict) -> int:
+        """Match the index to `items`; return how many entries changed."""
+        changed = 0
+        for cid, meta in items.items():
+            primary = meta.get("canvas_id")
+            if primary is not None and primary != cid:
+                continue
+            before = self._boxes.get(cid)
+            self.update(cid, meta)
+            if self._boxes.get(cid) != before:
+                changed += 1
+        for cid in [c for c in self._boxes if c not in items]:
+            self.remove(cid)
+            changed += 1
+        return changed
+
+    def clear(self) -> None:
+        self._cells.clear()
+        self._boxes.clear()
+        self._kinds.clear()
+        self._by_kind.clear()
+
+    def bbox(self, cid: int) -> Optional[BBox]:
+        return self._boxes.get(cid)
+
+    def of_kind(self, kind: str) -> list[int]:
+        return list(self._by_kind.get(kind, ()))
+
+    def _candidates(self, box: BBox) -> set[int]:
+        found: set[int] = set()
+        xs, ys = self._cell_range(box)
+        if len(xs) * len(ys) > len(self._cells):
+            for bucket in self._cells.values():
+                found |= bucket
+            return found
+        for ix in xs:
+            for iy in ys:
+                bucket = self._cells.get((ix, iy))
+                if bucket:
+                    found |= bucket
+        return found
+
+    def query(self, box: BBox, kinds: Optional[Iterable[str]] = None, exclude: Optional[int] = None) -> list[int]:
+        """Items whose bounds intersect `box` (edges touching count)."""
+        kinds = set(kinds) if kinds is not None else None
+        x0, y0, x1, y1 = box
+        hits = []
+        for cid in self._candidates(box):
+            if cid == exclude or (kinds is not None and self._kinds.get(cid) not in kinds):
+                continue
+            bx0, by0, bx1, by1 = self._boxes[cid]
+            if bx0 <= x1 and x0 <= bx1 and by0 <= y1 and y0 <= by1:
+                hits.append(cid)
+        return hits
+
+    def centers_in(self, box: BBox, kinds: Optional[Iterable[str]] = None) -> list[int]:
+        """Items whose center point lies inside `box` (inclusive)."""
+        x0, y0, x1, y1 = box
+        hits = []
+        for cid in self.query(box, kinds):
+            bx0, by0, bx1, by1 = self._boxes[cid]
+            cx = (bx0 + bx1) / 2.0
+            cy = (by0 + by1) / 2.0
+            if x0 <= cx <= x1 and y0 <= cy <= y1:
+                hits.append(cid)
+        return hits
+
+    def containing(self, x: float, y: float, kinds: Optional[Iterable[str]] = None) -> list[int]:
+        return self.query((x, y, x, y), kinds)
+
+    def nearest(self, x: float, y: float, kinds: Optional[Iterable[str]] = None) -> Optional[int]:
+        """Item whose bounds are closest to (x, y), searching outward ring by ring."""
+        kinds = set(kinds) if kinds is not None else None
+        pool = set()
+        for kind in (kinds if kinds is not None else self._by_kind.keys()):
+            pool |= self._by_kind.get(kind, set())
+        if not pool:
+            return None
+        c = self.cell_mm
+        cx, cy = math.floor(x / c), math.floor(y / c)
+        best, best_d = None, math.inf
+        ring = 0
+        max_ring = max((abs(ix - cx) for ix, _ in self._cells), default=0)
+        max_ring = max(max_ring, max((abs(iy - cy) for _, iy in self._cells), default=0))
+        while ring <= max_ring:
+            for ix in range(cx - ring, cx + ring + 1):
+                for iy in range(cy - ring, cy + ring + 1):
+                    if max(abs(ix - cx), abs(iy - cy)) != ring:
+                        continue
+                    for cid in self._cells.get((ix, iy), ()):
+                        if cid not in pool:
+                            continue
+                        bx0, by0, bx1, by1 = self._boxes[cid]
+                        dx = max(bx0 - x, 0.0, x - bx1)
+                        dy = max(by0 - y, 0.0, y - by1)
+                        d = math.hypot(dx, dy)
+                        if d < best_d or (d == best_d and best is not None and cid < best):
+                            best, best_d = cid, d
+            # Anything in a farther ring is at least `ring * cell` away
+            if best is not None and best_d <= ring * c:
+                break
+            ring += 1
+        return best
@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import base64
+import functools
+import hashlib
+import io
+import logging
+import os
+import re
+import xml.etree.ElementTree as ET
+from typing import Any, Hashable, Optional, TextIO
+
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+SVG_NS = "http://www.w3.org/2000/svg"
+XLINK_NS = "http://www.w3.org/1999/xlink"
+XML_NS = "http://www.w3.org/XML/1998/namespace"
+
+# Attributes of a source <svg> root that place it rather than style its content
+_ROOT_PLACEMENT_ATTRS = {"x", "y", "width", "height", "viewBox", "preserveAspectRatio", "version", "baseProfile", "id"}
+_NUMBER = re.compile(r"^\s*([0-9.]+)")
+_CSS_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+_CSS_RULE = re.compile(r"([^{}]+)(\{[^{}]*\})")
+_CSS_CLASS = re.compile(r"\.(-?[_a-zA-Z][\w-]*)")
+# 3 bytes per 4 base64 characters: chunks stay aligned
+_B64_CHUNK = 3 * 64 * 1024
+
+
+def _local_name(tag: str) -> tuple[Optional[str], str]:
+    if tag.startswith("{"):
+        ns, _, local = tag[1:].partition("}")
+        return ns, local
+    return None, tag
+
+
+def _strip_namespaces(elem: ET.Element) -> None:
+    """Rewrite SVG/xlink names to their plain form and drop editor-only markup (Inkscape, RDF, ...)."""
+    for child in list(elem):
+        if not isinstance(child.tag, str):
+            # Comments and processing instructions
+            elem.remove(child)
+            continue
+        ns, local = _local_name(child.tag)
+        if ns not in (None, SVG_NS):
+            elem.remove(child)
+            continue
+        child.tag = local
+        _strip_namespaces(child)
+    for name in list(elem.attrib):
+        ns, local = _local_name(name)
+        if ns in (None, SVG_NS):
+            new_name = local
+        elif ns == XLINK_NS:
+            new_name = f"xlink:{local}"
+        elif ns == XML_NS:
+            new_name = f"xml:{local}"
+        else:
+            del elem.attrib[name]
+            continue
+        if new_name != name:
+            elem.attrib[new_name] = elem.attrib.pop(name)
+
+
+def _prefix_ids(root: ET.Element, prefix: str) -> None:
+    """Make ids of an inlined document unique in the scene (and every reference to them)."""
+    ids = {el.get("id") for el in root.iter() if el.get("id")}
+    if not ids:
+        return
+    names = "|".join(re.escape(i) for i in sorted(ids, key=len, reverse=True))
+    pattern = re.compile(r"#(" + names + r")(?![\w.:-])")
+    # In CSS a dot after an id starts a class selector (`#logo.st0`)
+    css_pattern = re.compile(r"#(" + names + r")(?![\w-])")
+
+    def _rewrite(value: str, pattern: re.Pattern = pattern) -> str:
+        return pattern.sub(lambda m: f"#{prefix}{m.group(1)}", value)
+
+    for el in root.iter():
+        for name, value in list(el.attrib.items()):
+            if name == "id":
+                el.attrib[name] = prefix + value
+            elif "#" in value:
+                el.attrib[name] = _rewrite(value)
+        if el.tag == "style" and el.text and "#" in el.text:
+            el.text = _rewrite(el.text, css_pattern)
+
+
+def _prefix_classes(root: ET.Element, prefix: str) -> bool:
+    """Prefix class names of an inlined document and the selectors of its ``<style>`` rules.
+
+    Run after `_prefix_ids`. Returns False when a stylesheet could still
+    match outside the document: at-rules, or a selector that names none of
+    its (prefixed) classes or ids, such as a bare ``path``.
+    """
+    for el in root.iter():
+        classes = el.get("class")
+        if classes:
+            el.set("class", " ".join(prefix + name for name in classes.split()))
+
+    scoped = True
+
+    def _rule(m: re.Match) -> str:
+        nonlocal scoped
+        selectors = []
+        for selector in m.group(1).split(","):
+            selector = _CSS_CLASS.sub(lambda c: f".{prefix}{c.group(1)}", selector.strip())
+            if f"#{prefix}" not in selector and f".{prefix}" not in selector:
+                scoped = False
+            selectors.append(selector)
+        return ",".join(selectors) + m.group(2)
+
+    for el in root.iter("style"):
+        if not el.text:
+            continue
+        css = _CSS_COMMENT.sub("", el.text)
+        if "@" in css:
+            return False
+        css = _CSS_RULE.sub(_rule, css)
+        if not scoped or _CSS_RULE.sub("", css).strip():
+            return False
+        el.text = css
+    return True
+
+
+def _view_box(root: ET.Element) -> Optional[str]:
+    view_box = root.get("viewBox")
+    if view_box:
+        return " ".join(view_box.replace(",", " ").split())
+    width, height = _NUMBER.match(root.get("width", "")), _NUMBER.match(root.get("height", ""))
+    if width and height:
+        return f"0 0 {width.group(1)} {height.group(1)}"
+    return None
+
+
+@functools.lru_cache(maxsize=64)
+def _svg_symbol(path: str, mtime_ns: int, symbol_id: str) -> Optional[str]:
+    """``<symbol>`` markup of the SVG file at `path`, stretched to whatever box it is used in."""
+    try:
+        root = ET.parse(path).getroot()
+    except (OSError, ET.ParseError):
+        logger.exception(f"Failed to parse SVG {path}")
+        return None
+    if _local_name(root.tag) != (SVG_NS, "svg") and root.tag != "svg":
+        return None
+    view_box = _view_box(root)
+    if view_box is None:
+        return None
+
+    _strip_namespaces(root)
+    _prefix_ids(root, f"{symbol_id}-")
+    if not _prefix_classes(root, f"{symbol_id}-"):
+        logger.debug(f"Stylesheet of {path} cannot be scoped to a symbol; rasterizing it")
+        return None
+    # Presentation attributes of the root (fill, style, ...) still apply to the content
+    group = ET.Element("g", {k: v for k, v in root.attrib.items() if k not in _ROOT_PLACEMENT_ATTRS})
+    group.extend(list(root))
+    body = ET.tostring(group, encoding="unicode", short_empty_elements=True)
+    return f'<symbol id="{symbol_id}" viewBox="{view_box}" preserveAspectRatio="none">{body}</symbol>'
+
+
+class SvgSceneWriter:
+    """Write an SVG document to `fp` element by element.
+
+    Shared content is defined once, right before its first use, and drawn
+    with ``<use>``: source SVG files become ``<symbol>`` elements with their
+    vector content, rasters a unit-sized ``<image>`` scaled into place.
+    """
+
+    def __init__(self, fp: TextIO) -> None:
+        self.fp = fp
+        self._defined: dict[Hashable, str] = {}
+
+    def write(self, line: str) -> None:
+        self.fp.write(line)
+        self.fp.write("\n")
+
+    def svg_symbol(self, path: str) -> Optional[str]:
+        """Id of the symbol inlining the SVG file `path`, or None when it cannot be inlined."""
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+        key = ("svg", os.path.abspath(path), mtime_ns)
+        symbol_id = self._defined.get(key)
+        if symbol_id is None:
+            # Stable across documents so the parsed markup is cached
+            symbol_id = "svg-" + hashlib.sha1(repr(key).encode("utf-8")).hexdigest()[:10]
+            markup = _svg_symbol(path, mtime_ns, symbol_id)
+            if markup is None:
+                return None
+            self.write(f"  <defs>{markup}</defs>")
+            self._defined[key] = symbol_id
+        return symbol_id
+
+    def raster(self, key: Hashable, source: Any) -> Optional[str]:
+        """Id of the shared image for `key`; `source` is a PIL image or an image file path."""
+        image_id = self._defined.get(key)
+        if image_id is not None:
+            return image_id
+        image_id = f"img-{len(self._defined) + 1}"
+        self.fp.write(f'  <defs><image id="{image_id}" width="1" height="1" preserveAspectRatio="none" xlink:href="')
+        try:
+            self._write_data_uri(source)
+        finally:
+            self.fp.write('"/></defs>\n')
+        self._defined[key] = image_id
+        return image_id
+
+    def _write_data_uri(self, source: Any) -> None:
+        if isinstance(source, Image.Image):
+            mime, data = "image/png", _png_bytes(source)
+        else:
+            mime, data = _file_image_bytes(str(source))
+        self.fp.write(f"data:{mime};base64,")
+        for start in range(0, len(data), _B64_CHUNK):
+            self.fp.write(base64.b64encode(data[start:start + _B64_CHUNK]).decode("ascii"))
+
+
+def _png_bytes(img: Image.Image) -> bytes:
+    if img.mode not in ("RGBA", "RGB", "LA", "L", "P", "1"):
+        img = img.convert("RGBA")
+    buffer = io.BytesIO()
+    img.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _file_image_bytes(path: str) -> tuple[str, bytes]:
+    """Bytes of an image file as they can be embedded: PNG and upright JPEG as is, anything else as PNG."""
+    with Image.open(path) as img:
+        fmt = img.format
+        orientation = img.getexif().get(0x0112, 1) if fmt == "JPEG" else 1
+        if fmt == "PNG" or (fmt == "JPEG" and orientation == 1):
+            with open(path, "rb") as fh:
+                return ("image/png" if fmt == "PNG" else "image/jpeg"), fh.read()
+        img.load()
+        return "image/png", _png_bytes(img)
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import bisect
+import logging
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import tkinter as tk
+
+logger = logging.getLogger(__name__)
+
+# A single canvas move: ("raise", item, anchor) puts item just above anchor,
+# ("lower", item, anchor) puts item just below anchor.
+ZMove = Tuple[str, int, int]
+
+
+class ZOrderModel:
+    """Stacking model for the canvas items tracked in `screen._items`.
+
+    The target stacking is built from fixed layers (bottom → top):
+    majors → slots → other objects (by ascending z), where every primary item
+    carries its own group (rotated overlay, label) directly above it and the
+    selected image's border sits on top of everything. Untracked canvas items
+    (jig outline, stray helpers) belong below the tracked block.
+
+    Instead of lowering and re-raising every item, `apply` reads the current
+    display list once, keeps the longest run of items that are already in the
+    right relative order and only moves the rest. A z nudge therefore costs a
+    couple of `tag_raise`/`tag_lower` calls regardless of how many slots the
+    jig holds.
+    """
+
+    LAYERS = ("major", "slot")
+
+    def __init__(self, screen: tk.Widget) -> None:
+        self.s = screen
+
+    def primaries(self) -> List[int]:
+        """Return primary canvas ids in target order (bottom → top)."""
+        majors: List[int] = []
+        slots: List[int] = []
+        others: List[Tuple[int, int]] = []
+        for cid, meta in self.s._items.items():
+            if cid != meta.get("canvas_id"):
+                continue
+            kind = meta.get("type")
+            if kind == "major":
+                majors.append(cid)
+            elif kind == "slot":
+                slots.append(cid)
+            else:
+                try:
+                    z = int(meta.get("z", 0))
+                except Exception:
+                    z = 0
+                others.append((z, cid))
+        # Stable sort keeps insertion order among equal z, as the full restack did
+        others.sort(key=lambda zc: zc[0])
+        return majors + slots + [cid for _z, cid in others]
+
+    def group(self, cid: int) -> List[int]:
+        """Return the canvas ids that stack together with a primary item."""
+        meta = self.s._items.get(cid, {})
+        members = [cid]
+        if meta.get("type") in ("rect", "barcode", "major"):
+            try:
+                rid = int(meta.get("rot_id", 0) or 0)
+            except Exception:
+                rid = 0
+            if rid:
+                members.append(rid)
+        lbl = meta.get("label_id")
+        if lbl:
+            members.append(int(lbl))
+        return members
+
+    def target_order(self, selected: Optional[int] = None) -> List[int]:
+        """Return every tracked canvas id in target order (bottom → top)."""
+        order: List[int] = []
+        for cid in self.primaries():
+            order.extend(self.group(cid))
+        if selected and selected in self.s._items:
+            meta = self.s._items.get(selected, {})
+            if meta.get("type") == "image" and meta.get("border_id"):
+                order.append(int(meta.get("border_id")))
+        return order
+
+    @staticmethod
+    def plan(stack: Sequence[int], target: Sequence[int]) -> List[ZMove]:
+        """Compute the minimal moves that turn `stack` into `target` order.
+
+        Args:
+            stack: Current display list, bottom → top (as from `find_all`).
+            target: Desired order of tracked ids, bottom → top.
+
+        Returns:
+            Moves to apply in order. Ids in `target` that are not on the canvas
+            are ignored; untracked ids above the tracked block are lowered
+            beneath it.
+        """
+        present = set(stack)
+        rank = {}
+        for item in target:
+            if item in present and item not in rank:
+                rank[item] = len(rank)
+        if not rank:
+            return []
+        ordered = sorted(rank, key=rank.get)
+        actual = [item for item in stack if item in rank]
+        keep = _longest_increasing_run(actual, rank)
+
+        moves: List[ZMove] = []
+        bottom = actual[0]
+        for idx, item in enumerate(ordered):
+            if item in keep:
+                continue
+            if idx == 0:
+                if item != bottom:
+                    moves.append(("lower", item, bottom))
+            else:
+                moves.append(("raise", item, ordered[idx - 1]))
+
+        # Untracked items must stay beneath the tracked block
+        seen_bottom = False
+        for item in stack:
+            if item == bottom:
+                seen_bottom = True
+            elif seen_bottom and item not in rank:
+                moves.append(("lower", item, ordered[0]))
+        return moves
+
+    def apply(self, selected: Optional[int] = None) -> int:
+        """Bring the canvas stacking in line with the model; return moves made."""
+        canvas = self.s.canvas
+        stack = tuple(int(i) for i in canvas.find_all())
+        moves = self.plan(stack, self.target_order(selected))
+        for op, item, anchor in moves:
+            if op == "raise":
+                canvas.tag_raise(item, anchor)
+            else:
+                canvas.tag_lower(item, anchor)
+        return len(moves)
+
+
+def _longest_increasing_run(items: Iterable[int], rank: dict) -> set:
+    """Return the items forming a longest subsequence with increasing rank."""
+    items = list(items)
+    tails: List[int] = []
+    tail_idx: List[int] = []
+    prev: List[int] = [-1] * len(items)
+    for i, item in enumerate(items):
+        r = rank[item]
+        pos = bisect.bisect_left(tails, r)
+        if pos == len(tails):
+            tails.append(r)
+            tail_idx.append(i)
+        else:
+            tails[pos] = r
+            tail_idx[pos] = i
+        prev[i] = tail_idx[pos - 1] if pos else -1
+    keep = set()
+    i = tail_idx[-1] if tail_idx else -1
+    while i >= 0:
+        keep.add(items[i])
+        i = prev[i]
+    return keep
@@ -1,3 +1,6 @@
 from .app import *
 from .state import *
-from .objects import *
\ No newline at end of file
+from .objects import *
+from .product_format import *
+from .slot_state import *
+from .profiling import *
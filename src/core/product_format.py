@@ -0,0 +1,265 @@
+"""Compact storage for per-ASIN patterns in product JSON files.
+
+Products keep one Frontside/Backside pattern per ASIN under ``ASINObjects``
+and in practice most of them are identical or differ in a handful of fields.
+On disk the distinct patterns live once under ``ASINTemplates`` and every
+ASIN entry only references a template plus a list of patch operations:
+
+    "ASINTemplates": {"base": {"Frontside": [...], "Backside": [...]}},
+    "ASINObjects": {
+        "B0AAA": {"$base": "base"},
+        "B0BBB": {"$base": "base", "$patch": [["set", ["Frontside", 0, "label"], "Big"]]}
+    }
+
+Entries without ``$base`` are full patterns (the previous format), so old
+files load unchanged and are migrated the next time they are saved.
+"""
+from __future__ import annotations
+
+import json
+import logging
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "ASINPatterns",
+    "compact_asin_objects",
+    "compact_product",
+    "diff_patterns",
+    "apply_patch",
+    "load_product",
+    "expand_product",
+    "migrate_product_file",
+]
+
+TEMPLATES_KEY = "ASINTemplates"
+OBJECTS_KEY = "ASINObjects"
+BASE_KEY = "$base"
+PATCH_KEY = "$patch"
+
+# A distinct pattern becomes its own template once its patch against the
+# closest template is larger than this share of its own encoded size.
+_PATCH_RATIO = 0.5
+
+
+def _clone(value: Any) -> Any:
+    """Deep copy of JSON data (dicts, lists and scalars only)."""
+    if isinstance(value, dict):
+        return {k: _clone(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_clone(v) for v in value]
+    return value
+
+
+def _same(a: Any, b: Any) -> bool:
+    # 1 == 1.0 == True in Python, but they round-trip differently through JSON
+    return type(a) is type(b) and a == b
+
+
+def diff_patterns(base: Any, other: Any, path: tuple = ()) -> list[list]:
+    """Operations that turn `base` into `other`.
+
+    Dicts are compared key by key and lists of equal length element by
+    element; anything else that differs (including lists whose length
+    changed) is replaced as a whole.
+    """
+    if isinstance(base, dict) and isinstance(other, dict):
+        ops: list[list] = []
+        for key, value in other.items():
+            if key in base:
+                ops.extend(diff_patterns(base[key], value, path + (key,)))
+            else:
+                ops.append(["set", list(path + (key,)), _clone(value)])
+        for key in base:
+            if key not in other:
+                ops.append(["del", list(path + (key,))])
+        return ops
+    if isinstance(base, list) and isinstance(other, list) and len(base) == len(other):
+        ops = []
+        for index, (a, b) in enumerate(zip(base, other)):
+            ops.extend(diff_patterns(a, b, path + (index,)))
+        return ops
+    if _same(base, other):
+        return []
+    return [["set", list(path), _clone(other)]]
+
+
+def apply_patch(base: Any, ops) -> Any:
+    """Return a fresh copy of `base` with `ops` applied; `base` is not modified."""
+    result = _clone(base)
+    for op in ops or ():
+        kind, path = op[0], op[1]
+        if not path:
+            if kind == "set":
+                result = _clone(op[2])
+            continue
+        parent = result
+        for key in path[:-1]:
+            parent = parent[key]
+        if kind == "set":
+            parent[path[-1]] = _clone(op[2])
+        elif kind == "del":
+            del parent[path[-1]]
+        else:
+            raise ValueError(f"Unknown pattern patch operation: {kind!r}")
+    return result
+
+
+def _encoded_size(value: Any) -> int:
+    return len(json.dumps(value, ensure_ascii=False, separators=(",", ":")))
+
+
+def compact_asin_objects(asin_objects: Mapping) -> tuple[dict, dict]:
+    """Split full per-ASIN patterns into ``(templates, entries)``.
+
+    Identical patterns share one template; a pattern that only differs a
+    little from an existing template is stored as a patch against it.
+    """
+    groups: dict[str, list[str]] = {}
+    patterns: dict[str, Any] = {}
+    for asin, pattern in asin_objects.items():
+        key = json.dumps(pattern, sort_keys=True, ensure_ascii=False)
+        if key not in groups:
+            groups[key] = []
+            patterns[key] = pattern
+        groups[key].append(asin)
+
+    templates: dict[str, Any] = {}
+    entries: dict[str, dict] = {}
+    # Most shared patterns first, so they become the templates
+    for key in sorted(groups, key=lambda k: -len(groups[k])):
+        pattern = patterns[key]
+        best_name, best_ops, best_size = None, None, None
+        for name, template in templates.items():
+            ops = diff_patterns(template, pattern)
+            size = _encoded_size(ops)
+            if best_size is None or size < best_size:
+                best_name, best_ops, best_size = name, ops, size
+        if best_name is None or best_size > _encoded_size(pattern) * _PATCH_RATIO:
+            best_name = "base" if not templates else f"base{len(templates)}"
+            templates[best_name] = _clone(pattern)
+            best_ops = []
+        for asin in groups[key]:
+            entry: dict[str, Any] = {BASE_KEY: best_name}
+            if best_ops:
+                entry[PATCH_KEY] = best_ops
+            entries[asin] = entry
+    # Keep the ASIN order of the input
+    entries = {asin: entries[asin] for asin in asin_objects}
+    return templates, entries
+
+
+class ASINPatterns(Mapping):
+    """Read-only-storage mapping of ASIN -> full pattern, resolved on access.
+
+    Behaves like the plain ``ASINObjects`` dict of older files: the first
+    lookup of an ASIN materialises its pattern and later lookups return that
+    same object, so callers may mutate it in place. `copy_of` always builds
+    an independent copy from the compact storage, which is what resets to
+    the original pattern should use instead of deep-copying.
+    """
+
+    def __init__(self, entries: Mapping, templates: Optional[Mapping] = None) -> None:
+        self._entries = dict(entries or {})
+        self._templates = dict(templates or {})
+        self._resolved: dict[str, Any] = {}
+
+    def copy_of(self, asin: str) -> Any:
+        entry = self._entries[asin]
+        if isinstance(entry, dict) and BASE_KEY in entry:
+            template = self._templates.get(entry[BASE_KEY])
+            if template is None:
+                raise KeyError(f"Pattern template {entry[BASE_KEY]!r} for ASIN {asin!r} is missing")
+            return apply_patch(template, entry.get(PATCH_KEY))
+        return _clone(entry)
+
+    def __getitem__(self, asin: str) -> Any:
+        try:
+            return self._resolved[asin]
+        except KeyError:
+            pass
+        value = self.copy_of(asin)
+        self._resolved[asin] = value
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, asin: object) -> bool:
+        return asin in self._entries
+
+    def __repr__(self) -> str:
+        return f"ASINPatterns({len(self._entries)} ASINs, {len(self._templates)} templates, {len(self._resolved)} resolved)"
+
+    def __deepcopy__(self, memo: dict) -> "ASINPatterns":
+        from copy import deepcopy
+
+        # Compact storage is never handed out, so copies can share it
+        new = ASINPatterns.__new__(ASINPatterns)
+        new._entries = self._entries
+        new._templates = self._templates
+        new._resolved = deepcopy(self._resolved, memo)
+        return new
+
+    def storage(self) -> tuple[dict, dict]:
+        """The on-disk ``(templates, entries)``; recompacts ASINs that were resolved."""
+        if not self._resolved:
+            return dict(self._templates), dict(self._entries)
+        return compact_asin_objects(self)
+
+
+def expand_product(data: dict) -> dict:
+    """Wrap a loaded product's ``ASINObjects`` into a lazy `ASINPatterns`."""
+    if not isinstance(data, dict):
+        return data
+    templates = data.pop(TEMPLATES_KEY, None)
+    asin_objects = data.get(OBJECTS_KEY)
+    if isinstance(asin_objects, dict):
+        data[OBJECTS_KEY] = ASINPatterns(asin_objects, templates)
+    return data
+
+
+def load_product(fp) -> dict:
+    """`json.load` for product files, resolving per-ASIN patterns lazily."""
+    return expand_product(json.load(fp))
+
+
+def compact_product(data: dict) -> dict:
+    """Copy of a product dict with ``ASINObjects`` in the compact form."""
+    asin_objects = data.get(OBJECTS_KEY)
+    if not asin_objects:
+        return dict(data)
+    if isinstance(asin_objects, ASINPatterns):
+        templates, entries = asin_objects.storage()
+    else:
+        templates, entries = compact_asin_objects(asin_objects)
+    out: dict[str, Any] = {}
+    for key, value in data.items():
+        if key == TEMPLATES_KEY:
+            continue
+        if key == OBJECTS_KEY:
+            out[TEMPLATES_KEY] = templates
+            value = entries
+        out[key] = value
+    return out
+
+
+def migrate_product_file(path) -> bool:
+    """Rewrite a product file in the compact format; return True if it changed."""
+    path = Path(path)
+    with path.open("r", encoding="utf-8") as f:
+        raw = json.load(f)
+    asin_objects = raw.get(OBJECTS_KEY) if isinstance(raw, dict) else None
+    if not asin_objects or TEMPLATES_KEY in raw:
+        return False
+    compact = compact_product(raw)
+    with path.open("w", encoding="utf-8") as f:
+        json.dump(compact, f, ensure_ascii=False, indent=2)
+    logger.info(f"Migrated {path.name} to shared ASIN pattern templates")
+    return True
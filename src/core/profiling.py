@@ -0,0 +1,138 @@
+"""Timing spans for finding where batch runs spend their time.
+
+While a `Profiler` is active, `span(name, **attrs)` blocks anywhere in the
+process (download threads, the render thread, the exporters) are recorded
+with their thread and attributes such as ``order``, ``bytes`` or
+``pixels``. Without an active profiler `span` costs next to nothing, so
+instrumented code does not need to know whether it is being profiled.
+
+At the end of a run `Profiler.report` sums the spans per stage and
+`Profiler.write_chrome_trace` writes them in the Trace Event format read by
+chrome://tracing and Perfetto.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Any, ContextManager, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["Profiler", "span", "record_span"]
+
+# Attributes summed per stage in the report
+_TOTALS = ("bytes", "pixels")
+
+_active: Optional["Profiler"] = None
+
+
+class Profiler:
+    """Collects the spans of one run from every thread."""
+
+    def __init__(self) -> None:
+        self.spans: list[dict[str, Any]] = []
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self._previous: Optional[Profiler] = None
+
+    # ------------------------------ Recording ------------------------------
+    def activate(self) -> None:
+        """Make module-level `span` calls record into this profiler."""
+        global _active
+        self._previous, _active = _active, self
+
+    def deactivate(self) -> None:
+        global _active
+        if _active is self:
+            _active = self._previous
+        self._previous = None
+
+    def add(self, name: str, start: float, end: float, attrs: dict[str, Any]) -> None:
+        thread = threading.current_thread()
+        entry = {"name": name, "start": start - self._origin, "duration": end - start,
+                 "thread": thread.name, "tid": thread.ident, "attrs": attrs}
+        with self._lock:
+            self.spans.append(entry)
+
+    @contextmanager
+    def span(self, name: str, **attrs: Any) -> Iterator[dict[str, Any]]:
+        """Time the block; the yielded dict takes attributes known only inside it."""
+        start = time.perf_counter()
+        try:
+            yield attrs
+        finally:
+            self.add(name, start, time.perf_counter(), attrs)
+
+    # ------------------------------ Reporting ------------------------------
+    def summary(self) -> list[dict[str, Any]]:
+        """Per stage: count, total/mean/max seconds and summed byte and pixel counts, slowest first."""
+        stages: dict[str, dict[str, Any]] = {}
+        with self._lock:
+            spans = list(self.spans)
+        for entry in spans:
+            stage = stages.setdefault(entry["name"], {"name": entry["name"], "count": 0, "total": 0.0, "max": 0.0})
+            stage["count"] += 1
+            stage["total"] += entry["duration"]
+            stage["max"] = max(stage["max"], entry["duration"])
+            for key in _TOTALS:
+                value = entry["attrs"].get(key)
+                if isinstance(value, (int, float)):
+                    stage[key] = stage.get(key, 0) + value
+        for stage in stages.values():
+            stage["mean"] = stage["total"] / stage["count"]
+        return sorted(stages.values(), key=lambda s: s["total"], reverse=True)
+
+    def report(self) -> list[str]:
+        """Summary table as text lines. Stages on parallel threads overlap, so totals can exceed the run time."""
+        elapsed = time.perf_counter() - self._origin
+        lines = [f"Stage timings over {elapsed:.1f}s:"]
+        for stage in self.summary():
+            line = (f"  {stage['name']:<24} {stage['count']:>6}x  total {stage['total']:>8.2f}s  "
+                    f"mean {stage['mean'] * 1000:>8.1f}ms  max {stage['max'] * 1000:>8.1f}ms")
+            if "bytes" in stage:
+                line += f"  {stage['bytes'] / (1024 * 1024):.1f} MB"
+            if "pixels" in stage:
+                line += f"  {stage['pixels'] / 1e6:.1f} Mpx"
+            lines.append(line)
+        return lines
+
+    def write_chrome_trace(self, path: Path) -> Path:
+        """Write the spans as Trace Event JSON (complete events, microseconds)."""
+        pid = os.getpid()
+        with self._lock:
+            spans = list(self.spans)
+        events: list[dict[str, Any]] = []
+        threads: dict[Any, str] = {}
+        for entry in spans:
+            threads.setdefault(entry["tid"], entry["thread"])
+            events.append({
+                "name": entry["name"], "cat": entry["name"].split(".")[0], "ph": "X", "pid": pid, "tid": entry["tid"],
+                "ts": round(entry["start"] * 1e6, 3), "dur": round(entry["duration"] * 1e6, 3), "args": entry["attrs"],
+            })
+        for tid, name in threads.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}})
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, default=str)
+        return path
+
+
+def span(name: str, **attrs: Any) -> ContextManager[dict[str, Any]]:
+    """Time the block in the active profiler, if any."""
+    profiler = _active
+    if profiler is None:
+        return nullcontext(attrs)
+    return profiler.span(name, **attrs)
+
+
+def record_span(name: str, start: float, **attrs: Any) -> None:
+    """Record a span from `start` (``time.perf_counter()``) to now, for blocks too long to indent."""
+    profiler = _active
+    if profiler is not None:
+        profiler.add(name, start, time.perf_counter(), attrs)
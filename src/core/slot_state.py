@@ -0,0 +1,193 @@
+"""Slot allocation state for filling a pattern sheet with orders."""
+from __future__ import annotations
+
+from copy import deepcopy
+from typing import Any, Iterator, Optional
+
+__all__ = ["SlotState", "SlotPool"]
+
+SIDES = ("Frontside", "Backside")
+
+
+class SlotPool:
+    """Shares taken slot labels between the per-ASIN states of one sheet.
+
+    All ASIN patterns of a product are printed on the same jig, so a slot
+    label taken by one ASIN is gone for every other ASIN on both sides.
+    Instead of marking every other pattern on each take, a take is appended
+    to a log and each member replays the entries it has not seen yet the
+    next time it is queried. `reset` starts a new sheet for all members at
+    once by bumping the generation; members drop their flags lazily.
+    """
+
+    def __init__(self) -> None:
+        self.generation = 0
+        self.log: list[tuple[Any, SlotState]] = []
+
+    def reset(self) -> None:
+        """Free every slot of every member (start a new sheet)."""
+        self.generation += 1
+        self.log = []
+
+    def add(self, pattern: dict) -> SlotState:
+        """Create a member state for `pattern`."""
+        return SlotState(pattern, pool=self)
+
+
+class SlotState:
+    """Tracks which slots of a pattern are taken on the current sheet.
+
+    The pattern itself (``{"Frontside": [majors], "Backside": [majors]}``)
+    is shared and never modified: taken slots are flagged in one byte per
+    slot, so `reset` after a sheet is O(slots) instead of re-copying the
+    pattern, and `is_filled` is answered from counters. `take` hands out a
+    private copy of the slot, which callers are free to fill in.
+
+    Slots with objects are indexed per side by every ``(amazon_label, type)``
+    key they hold; each key keeps its positions in pattern order plus a
+    cursor to the first one that may still be free, so `select` skips taken
+    slots once instead of rescanning the side for every order.
+    """
+
+    def __init__(self, pattern: dict, pool: Optional[SlotPool] = None) -> None:
+        self.pattern = pattern
+        self.pool = pool
+        self._slots: dict[str, list[dict]] = {}
+        self._signatures: dict[str, list[frozenset]] = {}
+        self._by_label: dict[str, dict[Any, list[int]]] = {}
+        self._by_key: dict[str, dict[tuple, list[int]]] = {}
+        self._needed: dict[str, int] = {}
+        for side in SIDES:
+            slots: list[dict] = []
+            signatures: list[frozenset] = []
+            by_label: dict[Any, list[int]] = {}
+            by_key: dict[tuple, list[int]] = {}
+            for major in pattern.get(side) or []:
+                for slot in major.get("slots") or []:
+                    pos = len(slots)
+                    signature = frozenset(
+                        (obj.get("amazon_label"), obj.get("type")) for obj in slot.get("objects") or []
+                    )
+                    by_label.setdefault(slot.get("label"), []).append(pos)
+                    for key in signature:
+                        by_key.setdefault(key, []).append(pos)
+                    slots.append(slot)
+                    signatures.append(signature)
+            self._slots[side] = slots
+            self._signatures[side] = signatures
+            self._by_label[side] = by_label
+            self._by_key[side] = by_key
+            self._needed[side] = sum(1 for slot in slots if slot.get("objects"))
+        self.reset()
+
+    def reset(self) -> None:
+        """Free every slot (start a new sheet)."""
+        self._taken = {side: bytearray(len(self._slots[side])) for side in SIDES}
+        self._free_needed = dict(self._needed)
+        self._cursors: dict[str, dict[tuple, int]] = {side: {} for side in SIDES}
+        if self.pool is not None:
+            self._generation = self.pool.generation
+            self._seen = len(self.pool.log)
+
+    def _sync(self) -> None:
+        """Catch up with the pool: a new sheet, or labels taken by other members."""
+        pool = self.pool
+        if pool is None:
+            return
+        if self._generation != pool.generation:
+            self.reset()
+            # Replay what other members took on the new sheet before this one was queried
+            self._seen = 0
+        log = pool.log
+        while self._seen < len(log):
+            label, origin = log[self._seen]
+            self._seen += 1
+            if origin is not self:
+                for side in SIDES:
+                    self._take_label(side, label)
+
+    @property
+    def is_filled(self) -> bool:
+        """A side that has slots with objects ran out of them."""
+        self._sync()
+        return any(self._needed[side] and not self._free_needed[side] for side in SIDES)
+
+    def free_slots(self, side: str) -> Iterator[tuple[int, dict]]:
+        """Yield ``(position, slot)`` for the free slots of `side` in pattern order."""
+        self._sync()
+        taken = self._taken[side]
+        for pos, slot in enumerate(self._slots[side]):
+            if not taken[pos]:
+                yield pos, slot
+
+    def free_labels(self, side: str) -> list:
+        return [slot.get("label") for _, slot in self.free_slots(side)]
+
+    def signature(self, side: str, pos: int) -> frozenset:
+        """``{(amazon_label, type)}`` of the objects placed in a slot."""
+        return self._signatures[side][pos]
+
+    def has_free(self, side: str, label: Any = None) -> bool:
+        """Whether a slot with objects (named `label`, if given) is still free on `side`."""
+        self._sync()
+        if label is None:
+            return self._free_needed[side] > 0
+        taken = self._taken[side]
+        slots = self._slots[side]
+        return any(not taken[pos] and slots[pos].get("objects") for pos in self._by_label[side].get(label, ()))
+
+    def select(self, side: str, key: tuple, label: Any = None) -> Optional[int]:
+        """Position of the first free slot on `side` holding an object `key`.
+
+        `key` is ``(amazon_label, type)``. With `label`, only slots of that
+        name are considered. Returns None when nothing fits; the slot is
+        not taken.
+        """
+        self._sync()
+        taken = self._taken[side]
+        if label is not None:
+            for pos in self._by_label[side].get(label, ()):
+                if not taken[pos] and key in self._signatures[side][pos]:
+                    return pos
+            return None
+        positions = self._by_key[side].get(key)
+        if not positions:
+            return None
+        cursors = self._cursors[side]
+        i = cursors.get(key, 0)
+        # Flags only go from free to taken within a sheet, so skipped positions stay skipped
+        while i < len(positions) and taken[positions[i]]:
+            i += 1
+        cursors[key] = i
+        return positions[i] if i < len(positions) else None
+
+    def _mark(self, side: str, pos: int) -> bool:
+        taken = self._taken[side]
+        if taken[pos]:
+            return False
+        taken[pos] = 1
+        if self._slots[side][pos].get("objects"):
+            self._free_needed[side] -= 1
+        return True
+
+    def _take_label(self, side: str, label: Any) -> int:
+        return sum(1 for pos in self._by_label[side].get(label, ()) if self._mark(side, pos))
+
+    def take(self, side: str, pos: int) -> dict:
+        """Mark a slot taken and return a private copy of it.
+
+        In a pool the slot's label is also taken, on both sides, for every
+        other member.
+        """
+        self._sync()
+        self._mark(side, pos)
+        slot = self._slots[side][pos]
+        if self.pool is not None:
+            self.pool.log.append((slot.get("label"), self))
+            self._seen += 1
+        return deepcopy(slot)
+
+    def take_label(self, side: str, label: Any) -> int:
+        """Mark every free slot named `label` on `side` taken; return how many were."""
+        self._sync()
+        return self._take_label(side, label)
@@ -1,9 +1,12 @@
 import json
+import logging
+import threading
 from pathlib import Path
 from datetime import datetime
 from typing import List, Tuple, Optional
 from dataclasses import dataclass, field, asdict
 
+logger = logging.getLogger(__name__)
 
 MM_TO_PX = 1  # simple scale mm→px for drawing
 APP_TITLE = "Zyntra 1.0"
@@ -29,6 +32,7 @@ CACHE_PATH = INTERNAL_PATH / "cache.json"
 ALL_PRODUCTS = [f.stem for f in INTERNAL_PATH.glob("products/*.json") if f.is_file()]
 
 _sdk_client = None
+_sdk_pool = None
 
 def get_sdk_client():
     global _sdk_client
@@ -37,8 +41,26 @@ def get_sdk_client():
         _sdk_client = SDKClient()
     return _sdk_client
 
+def get_sdk_pool():
+    global _sdk_pool
+    if _sdk_pool is None:
+        from src.sdk import SDKClientPool
+        _sdk_pool = SDKClientPool(get_sdk_client())
+    return _sdk_pool
+
+def warm_sdk_client():
+    def _warm():
+        try:
+            get_sdk_client().warm_up()
+        except Exception:
+            logger.exception("Failed to pre-start SDK server")
+    threading.Thread(target=_warm, daemon=True).start()
+
 def close_sdk_client():
-    global _sdk_client
+    global _sdk_client, _sdk_pool
+    if _sdk_pool is not None:
+        _sdk_pool.close()
+        _sdk_pool = None
     if _sdk_client is not None:
         _sdk_client.close()
         _sdk_client = None
@@ -1,25 +1,12 @@
 import logging
-import os
-from pprint import pprint
 import threading
-import time
-import requests
-from io import BytesIO
-from pathlib import Path
 from datetime import datetime
-import json
-from copy import deepcopy
 
 import tkinter as tk
 from tkinter import TclError, ttk, messagebox
-from typing import Any, Dict, List
-from PIL import ImageDraw, ImageChops, ImageFile, ImageFilter, ExifTags
-from PIL import Image as _PILImage
-from rembg import remove, new_session
-import numpy as np
-import math
+from typing import List
 
-from src.core.state import FONTS_PATH, INPUT_PATH, INTERNAL_PATH, MODEL_PATH, state
+from src.core.state import state
 from src.core import (
     Screen,
     COLOR_BG_DARK,
@@ -27,22 +14,15 @@ from src.core import (
     COLOR_TEXT,
     COLOR_BG_LIGHT,
     scale_px,
-    font_from_pt,
     UI_SCALE,
     LOGS_PATH,
-    OUTPUT_PATH,
-    PRODUCTS_PATH,
 )
 from src.utils import *
-from src.canvas import PdfExporter, ImageManager, PDFCombiner, PDFInfo
-from src.screens.common.dropbox_handler import DEFAULT_COLOR, SUCCESS_COLOR, WARNING_COLOR, ERROR_COLOR, BASE_FOLDER, IMAGES_FOLDER, FILES_FOLDER, get_orders_info, Dropbox
+from src.batch import OrderBatchJob, OrderInputError, parse_order_input, normalize_formats
+from src.screens.common.dropbox_handler import DEFAULT_COLOR, WARNING_COLOR
 
 logger = logging.getLogger(__name__)
 
-DROPBOX_CLIENT = Dropbox()
-
-model_session = new_session("u2net_custom", model_path=str(MODEL_PATH))
-ImageFile.LOAD_TRUNCATED_IMAGES = True
 
 class OrderRangeScreen(Screen):
     def __init__(self, master, app):
@@ -51,12 +31,8 @@ class OrderRangeScreen(Screen):
         # Top line identical to LauncherSelectProduct
         # self.brand_bar(self)
 
-        self.images = ImageManager(self)
-        self._rotated_bounds_px = self.images.rotated_bounds_px
-        self._rotated_bounds_mm = self.images.rotated_bounds_mm
-        
-        # Track processed files in current session to avoid overwriting
-        self._processed_files = set()
+        # Order pipeline of the current run (see src/batch/job.py)
+        self._job = None
 
         # Product tag (dark pill) below the top line
         tk.Label(self,
@@ -353,1466 +329,24 @@ class OrderRangeScreen(Screen):
             pass
 
     # ------------------------------- Start --------------------------------
-    def _get_image_customization_objs(self, root_obj: Union[Dict[str, Any], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
-        if isinstance(root_obj, dict):
-            root_obj_iter = [root_obj]
-        else:
-            root_obj_iter = root_obj
-
-        founded_objs: List[Dict[str, Any]] = []
-        for object in root_obj_iter:
-            for key, value in object.items():
-                if isinstance(value, (set, list, tuple, dict)):
-                    founded_obj = self._get_image_customization_objs(value)
-                    if isinstance(founded_obj, dict):
-                        founded_objs.append(object)
-                    elif isinstance(founded_obj, list) and founded_obj:
-                        founded_objs.extend(founded_obj)
-                if key == "type" and value == "ImageCustomization":
-                    return object
-
-        return founded_objs
-
-    def _collect_customization_info(self, order_info: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
-        if "customizationInfo" not in order_info:
-            return {"status": "error", "message": "Customization info not found"}
-        if "version3.0" not in order_info["customizationInfo"]:
-            return {"status": "error", "message": "Customization info version 3.0 not found"}
-        if "surfaces" not in order_info["customizationInfo"]["version3.0"]:
-            return {"status": "error", "message": "Surfaces not found"}
-
-        objects = {"front": [], "back": []}
-        for i, surface in enumerate(order_info["customizationInfo"]["version3.0"]["surfaces"]):
-            side = "front" if i == 0 else "back"
-            for area in surface['areas']:
-                if area["customizationType"] == "Options":
-                    if not area["optionImage"] or not area["optionValue"] or area["optionValue"].lower().startswith("nein"):
-                        continue
-                    if (area["optionValue"].lower() in ["nein", "ja"] or area["optionValue"].lower().startswith("nein ") or area["optionValue"].lower().startswith("ja ")) or str(order_info).count(area["optionImage"]) > 3:
-                        continue
-                    if "GESCHENKBOX" in area["label"].strip().upper():
-                        continue
-                    objects[side].append({
-                        "type": "options",
-                        "label": area["label"].strip(),
-                        "value": area["optionValue"],
-                        "image_url": area["optionImage"]
-                    })
-                elif area["customizationType"] == "TextPrinting":
-                    if not area['text']:
-                        continue
-
-                    if "fontFamily" in area:
-                        font_family = area["fontFamily"]
-                        with open(FONTS_PATH / "fonts.json", "r", encoding="utf-8") as f:
-                            all_fonts = json.load(f)
-                        if font_family not in all_fonts:
-                            return {"status": "error", "message": f"Font family {font_family} not found"}
-
-                    objects[side].append({
-                        "type": "text",
-                        "color": area.get("fill", None),
-                        "font_family": area.get("fontFamily", None),
-                        "size": area.get("Dimensions", None),
-                        "position": area.get("Position", None),
-                        "label": area["label"].strip(),
-                        "text": area["text"],
-                    })
-                elif area["customizationType"] == "ImagePrinting":
-                    images = self._get_image_customization_objs(order_info["customizationData"])
-                    for image in images:
-                        image_transform_info = image["buyerPlacement"]
-                        image_meta = image["children"][0]
-                        if not image_meta["image"]["imageName"]:
-                            continue
-                        objects[side].append({
-                            "type": "image",
-                            "size": image_transform_info["dimension"],
-                            "position": image_transform_info["position"],
-                            "scale": image_transform_info["scale"],
-                            "rotation": image_transform_info["angleOfRotation"],
-                            "label": image_meta["label"].strip(),
-                            "image_path": image_meta["image"]["imageName"],
-                            "mask_size": image["dimension"],
-                            "mask_position": image["position"],
-                        })
-                else:
-                    raise RuntimeError(f"Unexpected type: {area["customizationType"]}")
-
-        return {"status": "success", "data": objects}
-
-    def _download_image_from_amazon(self, image_url: str) -> Dict[str, Union[str, Image.Image]]:
-        retries = 3
-        image_name = image_url.split("/")[-1]
-        while retries > 0:
-            if getattr(self, "_cancel_requested", False):
-                return {"status": "error", "message": "Cancelled"}
-            try:
-                self.log(f"Downloading image {image_name} from Amazon")
-                response = requests.get(image_url)
-                if response.status_code != 200:
-                    self.log(f"Failed to download image {image_name} from Amazon: {response.status_code}. Retrying...")
-                    retries -= 1
-                    time.sleep(5)
-                    continue
-                return {"status": "success", "image": Image.open(BytesIO(response.content))}
-            except Exception as e:
-                self.log(f"Failed to download image {image_name} from Amazon: {e}. Retrying...")
-                retries -= 1
-                time.sleep(5)
-                continue
-        return {"status": "error", "message": f"Failed to download image {image_name} from Amazon"}
-
-    def _crop_image(self, image: Image.Image) -> Image.Image:
-        return image.crop(image.getbbox())
-
-    def _remove_background(self, image: Image.Image) -> Image.Image:
-        return remove(image, session=model_session)
-
-    def _fix_orientation_by_exif(self, img: Image.Image) -> Image.Image:
-        try:
-            exif = img._getexif()
-            if exif:
-                orientation_key = next(
-                    k for k, v in ExifTags.TAGS.items() if v == 'Orientation'
-                )
-                orientation = exif.get(orientation_key)
-
-                if orientation == 3:
-                    img = img.rotate(180, expand=True)
-                elif orientation == 6:
-                    img = img.rotate(270, expand=True)
-                elif orientation == 8:
-                    img = img.rotate(90, expand=True)
-
-            return img
-        except Exception:
-            logger.exception("Failed to fix image orientation by EXIF")
-            return {"status": "error", "message": "Failed to fix image orientation by EXIF"}
-
-    def _download_image_from_dropbox(self, parent_folder: str, child_folder: str, image_path: str) -> Dict[str, Union[str, Image.Image]]:
-        try:
-            self.log(f"Downloading image {image_path} from Dropbox")
-            info = DROPBOX_CLIENT.download_big_file(f"{BASE_FOLDER}/{parent_folder}/{FILES_FOLDER}/{child_folder}/{IMAGES_FOLDER}/{image_path}", str(INTERNAL_PATH) + "/", raw_data=True)
-            if info is None:
-                return {"status": "error", "message": f"Image {child_folder}/{image_path} not found in Dropbox"} 
-            img_ = Image.open(info[1])
-            img_.load()
-            img_ = self._fix_orientation_by_exif(img_)
-            return {"status": "success", "image": img_}
-        except Exception as e:
-            logger.exception("Failed download image from dropbox")
-            return {"status": "error", "message": f"Failed download image from dropbox: {e}"}
-
-    def _transform_amazon_image(
-        self,
-        im: Image.Image,
-        scale: float,
-        angle_deg: float,
-        place_xy: Tuple[float, float],
-        mask_rect: Tuple[int, int, int, int],
-        canvas_size: Tuple[int, int] = (500, 500),
-        rotate_resample: str = "bilinear",
-        apply_unsharp: bool = True,
-        unsharp_radius: float = 0.6,
-        unsharp_percent: int = 80,
-        unsharp_threshold: int = 2,
-    ) -> Image.Image:
-        """
-        1) If scale<1, resize with Lanczos (best for downscale) to improve crispness.
-        2) Premultiply alpha to minimize dark/bright fringes at transparency edges.
-        3) Apply affine transform (rotation + translation only) so that ORIGINAL TL maps to place_xy.
-        4) Unpremultiply alpha back to straight RGBA.
-        5) Mask the canvas (outside mask -> transparent).
-        6) Optional UnsharpMask for extra crispness.
-        """
-        # --- ORIGINAL LOAD ---
-        # if im.mode != "RGBA":
-        #     im = im.convert("RGBA")
-
-        # im_scaled = im
-        # print("Original size", im.size)
-
-        # canvas_w, canvas_h = mask_rect[2], mask_rect[3]
-        # canvas_w = int(canvas_w / scale)
-        # canvas_h = int(canvas_h / scale)
-        # print("Canvas size" , canvas_w, canvas_h)
-
-        # canvas = Image.new("RGBA", (canvas_w, canvas_h), (0, 0, 0, 0))
-
-        # if rotate_resample == "bicubic":
-        #     resamp = Image.Resampling.BICUBIC
-        # elif rotate_resample == "nearest":
-        #     resamp = Image.Resampling.NEAREST
-        # else:
-        #     resamp = Image.Resampling.BILINEAR
-
-        # warped = im_scaled.rotate(angle_deg, resample=resamp, expand=True)
-
-        # px, py = place_xy
-        # cx, cy = mask_rect[0], mask_rect[1]
-        # px = int((px - cx) / scale)
-        # py = int((py - cy) / scale)
-        # print("Image size after rotate", warped.size)
-        # print("Placing at", px, py)
-        # canvas.paste(warped, (px, py), warped)
-
-        # return canvas
-        if im.mode != "RGBA":
-            im = im.convert("RGBA")
-
-        # 1) Downscale with Lanczos (only if needed)
-        W, H = im.size
-        new_w = max(1, int(round(W * scale)))
-        new_h = max(1, int(round(H * scale)))
-
-        lanczos = _PILImage.Resampling.LANCZOS
-        bicubic = _PILImage.Resampling.BICUBIC
-        bilinear = _PILImage.Resampling.BILINEAR
-        nearest = _PILImage.Resampling.NEAREST
-        affine_method = _PILImage.Transform.AFFINE
-
-        im_scaled = im.resize((new_w, new_h), lanczos) if (new_w != W or new_h != H) else im
-
-        # 2) Premultiply alpha
-        arr = np.asarray(im_scaled).astype(np.float32)  # HxWx4
-        rgb = arr[..., :3]
-        a = arr[..., 3:4] / 255.0
-        rgb_premult = rgb * a
-        arr_pm = np.concatenate([rgb_premult, a * 255.0], axis=-1).astype(np.uint8)
-        im_pm = Image.fromarray(arr_pm, mode="RGBA")
-
-        # 3) Affine rotation+translation with exact anchoring for ORIGINAL TL -> place_xy
-        k = 1.0  # scale already applied
-        if angle_deg < 0.5:
-            angle_deg = 0.0
-        theta = math.radians(angle_deg)
-        c, s = math.cos(theta), math.sin(theta)
-        px, py = place_xy
-
-        # inverse matrix for transform (canvas->source)
-        inv_a =  c / k
-        inv_b =  s / k
-        inv_d = -s / k
-        inv_e =  c / k
-        inv_c = -(inv_a * px + inv_b * py)
-        inv_f = -(inv_d * px + inv_e * py)
-
-        if rotate_resample == "bicubic":
-            resamp = bicubic
-        elif rotate_resample == "bilinear":
-            resamp = bilinear
-        elif rotate_resample == "nearest":
-            resamp = nearest
-        else:
-            resamp = bicubic
-
-        canvas_w, canvas_h = canvas_size
-        warped_pm = im_pm.transform(
-            size=(canvas_w, canvas_h),
-            method=affine_method,
-            data=(inv_a, inv_b, inv_c, inv_d, inv_e, inv_f),
-            resample=resamp,
-            fillcolor=(0, 0, 0, 0),
-        )
-
-        # 4) Unpremultiply alpha
-        arr_w = np.asarray(warped_pm).astype(np.float32)
-        rgb_w = arr_w[..., :3]
-        a_w = arr_w[..., 3:4] / 255.0
-        eps = 1e-6
-        rgb_unpm = np.where(a_w > eps, rgb_w / np.maximum(a_w, eps), 0.0)
-        arr_unpm = np.concatenate([np.clip(rgb_unpm, 0, 255), np.clip(a_w * 255.0, 0, 255)], axis=-1).astype(np.uint8)
-        warped = Image.fromarray(arr_unpm, mode="RGBA")
-
-        # 5) Apply rectangular mask
-        mx, my, mw, mh = mask_rect
-        mask = Image.new("L", (canvas_w, canvas_h), 0)
-        ImageDraw.Draw(mask).rectangle([mx, my, mx + mw, my + mh], fill=255)
-        r, g, b, a = warped.split()
-        a_masked = ImageChops.multiply(a, mask)
-        out = Image.merge("RGBA", (r, g, b, a_masked))
-
-        # 6) Optional sharpening
-        if apply_unsharp:
-            out = out.filter(ImageFilter.UnsharpMask(radius=unsharp_radius, percent=unsharp_percent, threshold=unsharp_threshold))
-
-        return out.crop((mx, my, mx + mw, my + mh))
-
-    def _apply_mask(
-        self, 
-        im: Image.Image, 
-        template_path: Path, 
-        mask_path: Path
-    ) -> Dict[str, Any]:
-
-        def largest_component_bool(bool_mask):
-            """Return the largest 4-connected component from a boolean mask.
-
-            Args:
-                bool_mask: 2D boolean array with candidate pixels set to True.
-
-            Returns:
-                2D boolean array that keeps only the largest component, or None if empty.
-            """
-            h, w = bool_mask.shape
-            if not bool_mask.any():
-                return None
-            visited = np.zeros((h, w), dtype=bool)
-            best = None
-            best_len = 0
-            for i in range(h):
-                for j in range(w):
-                    if bool_mask[i, j] and not visited[i, j]:
-                        stack = [(i, j)]
-                        visited[i, j] = True
-                        coords = []
-                        while stack:
-                            y, x = stack.pop()
-                            coords.append((y, x))
-                            if y>0   and bool_mask[y-1,x] and not visited[y-1,x]: visited[y-1,x]=True; stack.append((y-1,x))
-                            if y+1<h and bool_mask[y+1,x] and not visited[y+1,x]: visited[y+1,x]=True; stack.append((y+1,x))
-                            if x>0   and bool_mask[y,x-1] and not visited[y,x-1]: visited[y,x-1]=True; stack.append((y,x-1))
-                            if x+1<w and bool_mask[y,x+1] and not visited[y,x+1]: visited[y,x+1]=True; stack.append((y,x+1))
-                        if len(coords) > best_len:
-                            best_len = len(coords)
-                            m = np.zeros((h, w), dtype=bool)
-                            ys, xs = zip(*coords)
-                            m[ys, xs] = True
-                            best = m
-            return best
-
-        def content_active_bbox(img_rgba, thr=1):
-            """Compute the bounding box of non-transparent pixels in an RGBA image.
-
-            Args:
-                img_rgba: RGBA PIL image.
-                thr: Alpha threshold; pixels with alpha > thr are considered active.
-
-            Returns:
-                (left, top, right, bottom) bbox of active content, or None if empty.
-            """
-            a = np.array(img_rgba.split()[-1], dtype=np.uint8)
-            ys, xs = np.where(a > thr)
-            if ys.size == 0:
-                return None
-            top, left = int(ys.min()), int(xs.min())
-            bottom, right = int(ys.max()) + 1, int(xs.max()) + 1
-            return (left, top, right, bottom)
-
-        def scale_min_cover_active(img_rgba, target_w, target_h, thr=1):
-            """Cover-fit using only the active (non-transparent) content region.
-
-            Args:
-                img_rgba: RGBA PIL image that may contain transparent padding.
-                target_w: Target width to cover.
-                target_h: Target height to cover.
-                thr: Alpha threshold for active region detection.
-
-            Returns:
-                RGBA image of exactly (target_w, target_h) with content scaled
-                by minimal cover based on its active bbox.
-            """
-            bbox = content_active_bbox(img_rgba, thr=thr)
-            if bbox is None:
-                return Image.new("RGBA", (target_w, target_h), (0, 0, 0, 0))
-            l, t, r, b = bbox
-            core = img_rgba.crop((l, t, r, b))
-            w, h = core.size
-            s = max(target_w / w, target_h / h)
-            nw, nh = max(1, int(round(w * s))), max(1, int(round(h * s)))
-            scaled = core.resize((nw, nh), Image.LANCZOS)
-            x0 = (nw - target_w) // 2
-            y0 = (nh - target_h) // 2
-            return scaled.crop((x0, y0, x0 + target_w, y0 + target_h))
-
-        def paste_with_alpha(template_rgba, content_rgba, alpha_u8, top_left):
-            """Composite content onto template using an 8-bit alpha matte.
-
-            Args:
-                template_rgba: Background RGBA image.
-                content_rgba: Foreground RGBA image sized to the matte.
-                alpha_u8: 2D uint8 alpha (0..255) in template coordinates.
-                top_left: (left, top) paste position.
-
-            Returns:
-                New RGBA image after compositing.
-            """
-            result = template_rgba.copy()
-            result.paste(content_rgba, top_left, Image.fromarray(alpha_u8, mode="L"))
-            return result
-
-        if not template_path.exists():
-            logger.error(f"Template path {template_path} does not exist")
-            return {"status": "error", "message": f"Template path {template_path} does not exist"}
-        template = Image.open(template_path).convert("RGBA")
-
-        if not mask_path.exists():
-            logger.error(f"Mask path {mask_path} does not exist")
-            return {"status": "error", "message": f"Mask path {mask_path} does not exist"}
-        mask_img = Image.open(mask_path).convert("RGBA")
-
-        if mask_img.size != template.size:
-            mask_img = mask_img.resize(template.size, Image.NEAREST)
-
-        im = self._crop_image(im)
-        if im.mode != "RGBA":
-            im = im.convert("RGBA")
-
-        cw = max(template.size[0], mask_img.size[0])
-        ch = max(template.size[1], mask_img.size[1])
-        if template.size != (cw, ch):
-            t = Image.new("RGBA", (cw, ch), (0, 0, 0, 0)); t.paste(template, (0, 0), template); template = t
-        if mask_img.size != (cw, ch):
-            m = Image.new("RGBA", (cw, ch), (0, 0, 0, 0)); m.paste(mask_img, (0, 0), mask_img); mask_img = m
-
-        alpha = np.array(mask_img.split()[-1], dtype=np.uint8)
-        inv_alpha = 255 - alpha
-        window = largest_component_bool(inv_alpha > 0)
-        if window is None:
-            return {"status": "error", "message": "No window found"}
-
-        ys, xs = np.where(window)
-        top, left = int(ys.min()), int(xs.min())
-        bottom, right = int(ys.max()) + 1, int(xs.max()) + 1
-        bw, bh = right - left, bottom - top
-
-        fitted = scale_min_cover_active(im, bw, bh, thr=1)
-        # w0, h0 = im.size
-
-        # scale = min(bw / w0, bh / h0)
-        # nw, nh = max(1, int(round(w0 * scale))), max(1, int(round(h0 * scale)))
-
-        # scaled = im.resize((nw, nh), Image.LANCZOS)
-
-        # # Центровка внутри окна маски
-        # fitted = Image.new("RGBA", (bw, bh), (0, 0, 0, 0))
-        # offset_x = (bw - nw) // 2
-        # offset_y = (bh - nh) // 2
-        # fitted.paste(scaled, (offset_x, offset_y))
-        matte = (window[top:bottom, left:right].astype(np.uint8) * 255)
-
-        result = paste_with_alpha(template, fitted, matte, (left, top))
-        # result.save("after_apply_mask.png")
-        return {"status": "success", "image": result}
-
-    def _prepare_order_data(self, parent_folder: str, child_folder: str, order_info: Dict[str, Any], order_i: int, total_orders: int) -> Dict[str, Any]:
-        if "quantity" not in order_info:
-            return {"status": "error", "message": "Quantity not found"}
-
-        result = self._collect_customization_info(order_info)
-        if result["status"] == "error":
-            return {"status": "error", "message": result["message"]}
-        customization_info = result["data"]
-
-        total_download_image_count = 0
-        total_loaded_image_count = 0
-        for side in customization_info:
-            for object in customization_info[side]:
-                if object["type"] == "options":
-                    total_download_image_count += 1
-                if object["type"] == "image":
-                    total_loaded_image_count += 1
-        self.log(f"[{order_i}/{total_orders}] Total images to download from Amazon: {total_download_image_count}; from Dropbox: {total_loaded_image_count}")
-
-        downloaded_image_count = 0
-        loaded_image_count = 0
-        for side in customization_info:
-            for object in customization_info[side]:
-                if getattr(self, "_cancel_requested", False):
-                    return {"status": "error", "message": "Cancelled"}
-                
-                if object["type"] == "image":
-                    image_info = self._download_image_from_dropbox(parent_folder, child_folder, object["image_path"])
-                    if image_info["status"] == "error":
-                        return {"status": "error", "message": image_info["message"]}
-                    else:
-                        loaded_image_count += 1
-                        self.log(f"[{order_i}/{total_orders}] Image {loaded_image_count}/{total_loaded_image_count} downloaded from Dropbox")
-                        image = self._transform_amazon_image(
-                            im=image_info["image"], 
-                            scale=object["scale"]["scaleX"], 
-                            angle_deg=object["rotation"], 
-                            place_xy=[object["position"]["x"], object["position"]["y"]], 
-                            mask_rect=[object["mask_position"]["x"], object["mask_position"]["y"], object["mask_size"]["width"], object["mask_size"]["height"]]
-                        )
-                        # image.save("amazon_transformed_image.png")
-                        object["loaded_image"] = image
-
-                elif object["type"] == "options":
-                    image_info = self._download_image_from_amazon(object["image_url"])
-                    if image_info["status"] == "error":
-                        return {"status": "error", "message": image_info["message"]}
-                    else:
-                        downloaded_image_count += 1
-                        self.log(f"[{order_i}/{total_orders}] Image {downloaded_image_count}/{total_download_image_count} downloaded from Amazon")
-                        if not object["image_url"].lower().endswith(".png"):
-                            image_info["image"] = self._remove_background(image_info["image"])
-                        image = self._crop_image(image_info["image"])
-                        object["loaded_image"] = image
-
-        return {"status": "success", "data": customization_info, "asin": order_info["asin"], "quantity": order_info["quantity"]}
-
-    def _make_pdf(
-        self, 
-        data: List[Tuple[Dict[str, Any], Dict[str, Any]]], 
-        jig_size: Tuple[float, float], 
-        pdf_start_oder_i: int, 
-        pdf_end_oder_i: int,
-        pdf_order: int = 1,
-        dpi: int = 1200,
-        formats: List[str] = None,
-        front_barcode = None,
-        back_barcode = None,
-        barcode_text: str = None,
-        reference_text: str = None,
-        jig_cmyk: str = None
-    ) -> Dict[str, str]:
-        try:
-            # Parse CMYK to RGBA for border color
-            def _parse_cmyk_to_rgba(cmyk_str: str, default=(0, 0, 0, 255)) -> tuple[int, int, int, int]:
-                try:
-                    parts = [p.strip() for p in str(cmyk_str or "").split(",")]
-                    # pad/truncate to 4
-                    if len(parts) < 4:
-                        parts += ["0"] * (4 - len(parts))
-                    elif len(parts) > 4:
-                        parts = parts[:4]
-                    c, m, y, k = [float(p or 0) for p in parts]
-                    # auto-detect scale: 0..1, 0..100, or 0..255
-                    vals = [c, m, y, k]
-                    maxv = max(vals)
-                    if maxv <= 1.0:
-                        scale = 1.0
-                    elif maxv <= 100.0:
-                        scale = 100.0
-                    else:
-                        scale = 255.0
-                    c = max(0.0, min(1.0, c / scale))
-                    m = max(0.0, min(1.0, m / scale))
-                    y = max(0.0, min(1.0, y / scale))
-                    k = max(0.0, min(1.0, k / scale))
-                    r = int(round(255 * (1 - c) * (1 - k)))
-                    g = int(round(255 * (1 - m) * (1 - k)))
-                    b = int(round(255 * (1 - y) * (1 - k)))
-                    return (max(0, min(255, r)), max(0, min(255, g)), max(0, min(255, b)), 255)
-                except Exception:
-                    return default
-            
-            # Convert jig CMYK to RGBA for border
-            border_color_rgba = _parse_cmyk_to_rgba(jig_cmyk or "0,0,0,0", default=(0, 0, 0, 255))
-            
-            def _remove_unprocessed_objs(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-                return [item for item in items if item.get("processed", False)]
-
-            exporter = PdfExporter(self)
-            from pathlib import Path as _Path
-            if formats is None:
-                formats = ["pdf"]
-            # Normalize formats
-            fmts_norm: List[str] = []
-            seen = set()
-            for f in formats:
-                ff = (f or "").strip().lower()
-                if ff == "jpeg":
-                    ff = "jpg"
-                if ff in ("pdf", "png", "jpg", "bmp") and ff not in seen:
-                    seen.add(ff)
-                    fmts_norm.append(ff)
-            if not fmts_norm:
-                fmts_norm = ["pdf"]
-
-            # Helper function to generate unique filename with index if file was already processed in this session
-            def _get_unique_base_path(base_name: str) -> _Path:
-                """Generate a unique base path by checking if file already exists in current session."""
-                base = OUTPUT_PATH / base_name
-                base_path = base.resolve()
-                
-                # Check if any file with this base name was processed in current session
-                base_str = str(base_path)
-                matching_files = [f for f in self._processed_files if f.startswith(base_str)]
-                
-                if not matching_files:
-                    # No files processed yet with this base name
-                    return base_path
-                
-                # Find the next available index
-                index = 2
-                while True:
-                    # Try base_name_2, base_name_3, etc.
-                    new_base = OUTPUT_PATH / f"{base_name}_{index}"
-                    new_base_path = new_base.resolve()
-                    new_base_str = str(new_base_path)
-                    
-                    # Check if this indexed version was already processed
-                    if not any(f.startswith(new_base_str) for f in self._processed_files):
-                        return new_base_path
-                    index += 1
-
-            base_front = _get_unique_base_path(f"{state.saved_product}_{pdf_start_oder_i}-{pdf_end_oder_i}_front{f'_{pdf_order}' if pdf_order > 1 else ''}")
-            base_back  = _get_unique_base_path(f"{state.saved_product}_{pdf_start_oder_i}-{pdf_end_oder_i}_back")
-
-            front_items = []
-            back_items = []
-            for front, back in data:
-                front_items.extend(front["objects"] if front else [])
-                if back:
-                    back_items.extend(back["objects"] if back else [])
-
-            if front_barcode:
-                front_barcode["processed"] = True
-                front_items.append(front_barcode)
-            if back_barcode:
-                back_barcode["processed"] = True
-                back_items.append(back_barcode)
-
-            # Group items by export_file field
-            def _group_by_export_file(items_list):
-                """Group items by their export_file assignment, excluding slots"""
-                grouped = {}
-                for item in items_list:
-                    if item.get("type") == "slot":
-                        # Skip slots - they should not be exported
-                        continue
-                    else:
-                        # Regular objects go to their assigned file
-                        ef = item.get("export_file", "File 1")
-                        if ef not in grouped:
-                            grouped[ef] = []
-                        grouped[ef].append(item)
-                return grouped
-            
-            front_grouped = _group_by_export_file(front_items)
-            back_grouped = _group_by_export_file(back_items)
-            
-            # Collect all export file names from both sides
-            export_files_to_render = set(front_grouped.keys()) | set(back_grouped.keys())
-            if not export_files_to_render:
-                export_files_to_render = {"File 1"}  # Default fallback
-            export_files_to_render = sorted(export_files_to_render)  # Sort for consistent ordering
-
-            def _render_and_save(side_items: List[Dict[str, Any]], base: _Path) -> None:
-                if not side_items:
-                    return
-                items = _remove_unprocessed_objs(side_items)
-                if not items:
-                    return
-                did_pdf = False
-                if "pdf" in fmts_norm:
-                    p_pdf = str(base.with_suffix(".pdf"))
-                    logger.debug("Rendering PDF: %s", p_pdf)
-                    exporter.render_scene_to_pdf(p_pdf, items, jig_size[0], jig_size[1], dpi=dpi, barcode_text=barcode_text, reference_text=reference_text)
-                    did_pdf = True
-                    # Track this file as processed
-                    self._processed_files.add(str(base))
-                    # Always create PNG for PDF combiner (even if not in formats)
-                    p_png = str(base.with_suffix(".png"))
-                    exporter.save_last_render_as_png(p_png)
-                    logger.debug(f"Saved PNG for combiner: {p_png}")
-                # Ensure last render image exists even if PDF not requested
-                if not did_pdf and ("png" in fmts_norm or "jpg" in fmts_norm or "bmp" in fmts_norm):
-                    import time as _time
-                    tmp_pdf = str((OUTPUT_PATH / f"__tmp_{int(_time.time()*1000)}.pdf").resolve())
-                    try:
-                        exporter.render_scene_to_pdf(tmp_pdf, items, jig_size[0], jig_size[1], dpi=dpi, barcode_text=barcode_text, reference_text=reference_text)
-                    finally:
-                        try:
-                            os.remove(tmp_pdf)
-                        except Exception:
-                            pass
-                if "png" in fmts_norm and not did_pdf:
-                    # Only save PNG if not already saved above
-                    p_png = str(base.with_suffix(".png"))
-                    exporter.save_last_render_as_png(p_png)
-                    # Track this file as processed
-                    self._processed_files.add(str(base))
-                if "jpg" in fmts_norm:
-                    p_jpg = str(base.with_suffix(".jpg"))
-                    exporter.save_last_render_as_jpg(p_jpg)
-                    # Track this file as processed
-                    self._processed_files.add(str(base))
-                if "bmp" in fmts_norm:
-                    p_bmp = str(base.with_suffix(".bmp"))
-                    exporter.save_last_render_as_bmp(p_bmp)
-                    self._processed_files.add(str(base))
-
-            # Render each export file separately
-            for export_file_name in export_files_to_render:
-                # Get items for this export file
-                front_items_for_file = front_grouped.get(export_file_name, [])
-                back_items_for_file = back_grouped.get(export_file_name, [])
-                
-                # Count non-slot items to determine if file has content
-                front_objects = [it for it in front_items_for_file if it.get("type") != "slot"]
-                back_objects = [it for it in back_items_for_file if it.get("type") != "slot"]
-                
-                # Skip if no objects in this file
-                if not front_objects and not back_objects:
-                    logger.debug(f"Skipping {export_file_name} - no objects assigned")
-                    continue
-                
-                # Generate file names for this export file
-                # Replace spaces and special chars in export file name for filename
-                file_suffix = export_file_name.replace(' ', '_')
-                
-                # Create base paths with export file name
-                base_front_file = _get_unique_base_path(
-                    f"{state.saved_product}_{pdf_start_oder_i}-{pdf_end_oder_i}_front_{file_suffix}{f'_{pdf_order}' if pdf_order > 1 else ''}"
-                )
-                base_back_file = _get_unique_base_path(
-                    f"{state.saved_product}_{pdf_start_oder_i}-{pdf_end_oder_i}_back_{file_suffix}"
-                )
-                
-                # Render frontside for this export file
-                if front_objects:
-                    logger.debug(f"Rendering frontside for {export_file_name}...")
-                    _render_and_save(front_items_for_file, base_front_file)
-                
-                # Render backside for this export file
-                if back_objects:
-                    logger.debug(f"Rendering backside for {export_file_name}...")
-                    _render_and_save(back_items_for_file, base_back_file)
-
-            # Return PDF info for combining (collect from all export files)
-            pdf_infos = []
-            if "pdf" in fmts_norm:
-                for export_file_name in export_files_to_render:
-                    front_objects = [it for it in front_grouped.get(export_file_name, []) if it.get("type") != "slot"]
-                    back_objects = [it for it in back_grouped.get(export_file_name, []) if it.get("type") != "slot"]
-                    
-                    if not front_objects and not back_objects:
-                        continue
-                    
-                    file_suffix = export_file_name.replace(' ', '_')
-                    
-                    if front_objects:
-                        base_front_file = OUTPUT_PATH / f"{state.saved_product}_{pdf_start_oder_i}-{pdf_end_oder_i}_front_{file_suffix}{f'_{pdf_order}' if pdf_order > 1 else ''}"
-                        pdf_path = str(base_front_file.with_suffix(".pdf"))
-                        if os.path.exists(pdf_path):
-                            pdf_infos.append(PDFInfo(
-                                path=pdf_path,
-                                width_mm=jig_size[0],
-                                height_mm=jig_size[1],
-                                order_range=f"{pdf_start_oder_i}-{pdf_end_oder_i}",
-                                side="front",
-                                pdf_order=pdf_order,
-                                dpi=dpi,
-                                cmyk=jig_cmyk or "0,0,0,100"
-                            ))
-                    
-                    if back_objects:
-                        base_back_file = OUTPUT_PATH / f"{state.saved_product}_{pdf_start_oder_i}-{pdf_end_oder_i}_back_{file_suffix}"
-                        pdf_path = str(base_back_file.with_suffix(".pdf"))
-                        if os.path.exists(pdf_path):
-                            pdf_infos.append(PDFInfo(
-                                path=pdf_path,
-                                width_mm=jig_size[0],
-                                height_mm=jig_size[1],
-                                order_range=f"{pdf_start_oder_i}-{pdf_end_oder_i}",
-                                side="back",
-                                pdf_order=pdf_order,
-                                dpi=dpi,
-                                cmyk=jig_cmyk or "0,0,0,100"
-                            ))
-
-            return {"status": "success", "pdf_infos": pdf_infos}
-
-        except MemoryError:
-            logger.exception("Not enough memory to render PDF")
-            return {"status": "error", "message": "Not enough memory to render PDF"}
-        except Exception as e:
-            logger.exception(e)
-            return {"status": "error", "message": str(e)}
-
-    def _process_order(
-        self, 
-        parent_folder: str, 
-        child_folder: str,
-        saved_slots: List[Tuple[Dict[str, Any], Dict[str, Any]]],
-        order_info: Dict[str, Any],
-        original_pattern_info: Dict[str, Any],
-        pattern_info: Dict[str, Any], 
-        pdf_start_oder_id: int,
-        order_id: int, 
-        last_order_id: int,
-        scene_info: Dict[str, Any],
-        asins_info: List[List[Any]] = None,
-        pdf_combiner: PDFCombiner = None,
-        front_barcode: Optional[dict] = None,
-        back_barcode: Optional[dict] = None,
-        all_asin_patterns: Dict[str, Dict[str, Any]] = None,
-        original_all_asin_patterns: Dict[str, Dict[str, Any]] = None
-    ) -> Dict[str, Any]:
-
-        def _is_pattern_filled(pattern_info: Dict[str, Any], original_pattern_info: Dict[str, Any]) -> bool:
-                is_need_front = False
-                is_need_back = False
-                for major in original_pattern_info["Frontside"]:
-                    for slot in major["slots"]:
-                        if slot["objects"]:
-                            is_need_front = True
-                for major in original_pattern_info["Backside"]:
-                    for slot in major["slots"]:
-                        if slot["objects"]:
-                            is_need_back = True
-
-                is_filled_front = True if is_need_front else False
-                is_filled_back = True if is_need_back else False
-                for major in pattern_info["Frontside"]:
-                    for slot in major["slots"]:
-                        if slot["objects"]:
-                            is_filled_front = False
-                for major in pattern_info["Backside"]:
-                    for slot in major["slots"]:
-                        if slot["objects"]:
-                            is_filled_back = False
-
-                return is_filled_front or is_filled_back
-
-        def _select_slot(order_side_data: Dict[str, Any], pattern_info: Dict[str, Any], side: str, slot_label: Optional[str] = None, all_asin_patterns: Dict[str, Dict[str, Any]] = None) -> Dict[str, Any]:
-            not_found_objs = []
-            print("Slots Front: ", [slot["label"] for major in pattern_info["Frontside"] for slot in major["slots"]])
-            print("Slots Back: ", [slot["label"] for major in pattern_info["Backside"] for slot in major["slots"]])
-            for major_index, major in enumerate(pattern_info[side]):
-                for slot_index, slot in enumerate(major["slots"]):
-                    if not slot["objects"]:
-                        continue
-                    if slot_label and slot["label"] != slot_label:
-                        continue
-
-                    slot_labels_and_types = {(object["amazon_label"], object["type"]) for object in slot["objects"]}
-                    for object in order_side_data:
-                        if_found = True
-                        if (object["label"], object["type"] if object["type"] != "options" else "image") not in slot_labels_and_types:
-                            not_found_objs.append((object["label"], object["type"] if object["type"] != "options" else "image"))
-                            if_found = False
-                            break
-                        if if_found:
-                            # Remove slot from current pattern
-                            slot_to_return = pattern_info[side][major_index]["slots"].pop(slot_index)
-                            
-                            # Also remove the same slot from all other ASIN patterns to prevent reuse
-                            if all_asin_patterns:
-                                for other_asin, other_pattern in all_asin_patterns.items():
-                                    if other_pattern == pattern_info:
-                                        # Skip current pattern (already removed above)
-                                        continue
-                                    # Remove slot with the same label from other ASIN patterns
-                                    for other_side in ["Frontside", "Backside"]:
-                                        for other_major_index, other_major in enumerate(other_pattern[other_side]):
-                                            for other_slot_index, other_slot in enumerate(other_major["slots"]):
-                                                if other_slot["label"] == slot_to_return["label"]:
-                                                    other_pattern[other_side][other_major_index]["slots"].pop(other_slot_index)
-                                                    break
-                            
-                            return {"status": "success", "slot": slot_to_return}
-                        
-            return {"status": "error", "message": f"Objects not found in pattern slot: {set(not_found_objs)}"}
-
-        def _remove_slot_by_label(pattern_info: Dict[str, Any], side: str, slot_label: str) -> None:
-            try:
-                removed = False
-                print("slot_label", slot_label)
-                print("Front", [slot["label"] for major in pattern_info["Frontside"] for slot in major["slots"]])
-                print("Back", [slot["label"] for major in pattern_info["Backside"] for slot in major["slots"]])
-                for major_index, major in enumerate(pattern_info[side]):
-                    for slot_index, slot in enumerate(major["slots"]):
-                        if slot["label"] == slot_label:
-                            pattern_info[side][major_index]["slots"].pop(slot_index)
-                            removed = True
-                return removed
-            except Exception as e:
-                logger.exception(f"Error removing slot by label '{slot_label}': {e}")
-                return removed
-
-        def _process_object(order_side_data: Dict[str, Any], slot_info: Dict[str, Any], asin_mirror: bool = False) -> Dict[str, Any]:
-            for object in slot_info["objects"]:
-                # Check if object is static - static objects don't need Amazon data match
-                is_static = bool(object.get("is_static", False))
-                
-                if is_static:
-                    # Static objects are processed as-is without Amazon data
-                    object["processed"] = True
-                    object["slot_x_mm"] = slot_info["x_mm"]
-                    object["slot_y_mm"] = slot_info["y_mm"]
-                    object["slot_w_mm"] = slot_info["w_mm"]
-                    object["slot_h_mm"] = slot_info["h_mm"]
-                    continue
-                
-                # Non-static objects require matching with Amazon data
-                order_object = [obj for obj in order_side_data if obj["label"] == object["amazon_label"]]
-                if len(order_object) == 0:
-                    continue
-                order_object = order_object[0]
-
-                if object["type"] == "image":
-                    # Add mirror flag for image objects (from per-ASIN setting)
-                    object["mirror"] = bool(asin_mirror)
-                    # Check if object has custom_images and use custom image instead of Amazon/Dropbox
-                    custom_images_dict = object.get("custom_images", {})
-                    has_custom_images = bool(custom_images_dict and len(custom_images_dict) > 0)
-                    
-                    if has_custom_images:
-                        # Use custom image: the order value should match a key in custom_images dict
-                        order_value = order_object.get("value", "")
-                        custom_image_path = custom_images_dict.get(order_value, None)
-
-                        if custom_image_path:
-                            # Load custom image from the product folder
-                            try:
-                                full_custom_path = PRODUCTS_PATH / custom_image_path
-                                if full_custom_path.exists():
-                                    if full_custom_path.suffix.lower() in [".png", ".jpg", ".jpeg"]:
-                                        custom_image = _PILImage.open(full_custom_path)
-                                    elif full_custom_path.suffix.lower() == ".svg":
-                                        custom_image = svg_to_png(str(full_custom_path))
-                                    else:
-                                        logger.error(f"Unsupported custom image format: {full_custom_path.suffix} for file {full_custom_path}")
-                                        return {"status": "error", "message": f"Unsupported custom image format: {full_custom_path.suffix} for file {full_custom_path}"}
-                                    object["loaded_image"] = custom_image.convert("RGBA")
-                                    object["path"] = full_custom_path.stem + ".png"
-                                    object["processed"] = True
-                                    self.log(f"Use custom image for order {order_id}, amazon_label='{object['amazon_label']}'")
-                                    logger.info(f"Using custom image '{order_value}' -> '{custom_image_path}' for amazon_label='{object['amazon_label']}'")
-                                else:
-                                    logger.error(f"Custom image path not found: {full_custom_path}")
-                                    return {"status": "error", "message": f"Custom image path {full_custom_path} not found"}
-                            except Exception as e:
-                                logger.exception(f"Failed to load custom image {custom_image_path}: {e}")
-                                return {"status": "error", "message": f"Failed to load custom image {custom_image_path}: {e}"}
-                        else:
-                            logger.info(f"No custom image found for value '{order_value}' in custom_images dict")
-                            return {"status": "error", "message": f"Custom image with name {order_value} not found for label '{object['amazon_label']}'"}
-                    else:
-                        if not has_custom_images:
-                            if object["mask_path"] and object["mask_path"] != "None":
-                                mask_path = PRODUCTS_PATH / object["mask_path"]
-                                template_path = PRODUCTS_PATH / object["path"]
-                                result = self._apply_mask(order_object["loaded_image"], template_path, mask_path)
-                                if result["status"] == "error":
-                                    return {"status": "error", "message": f"Failed to apply mask for order: {result['message']}"}
-                                object["loaded_image"] = result["image"]
-                            else:
-                                object["loaded_image"] = order_object["loaded_image"]
-
-                            filename = order_object["image_path"].split(".")[0] + ".png" if "image_path" in order_object else order_object["image_url"].split("/")[-1].split(".")[0] + ".png"
-                            object["path"] = str(filename)
-                            object["processed"] = True
-
-                elif object["type"] == "text":
-                    # Add mirror flag for text objects (from per-ASIN setting)
-                    object["mirror"] = bool(asin_mirror)
-                    object["type"] = "rect"
-                    object["label"] = order_object["text"]
-                    if order_object["color"]:
-                        object["label_fill"] = order_object["color"]
-                    if order_object["font_family"]:
-                        object["label_font_family"] = order_object["font_family"]
-                    object["processed"] = True
-
-                object["slot_x_mm"] = slot_info["x_mm"]
-                object["slot_y_mm"] = slot_info["y_mm"]
-                object["slot_w_mm"] = slot_info["w_mm"]
-                object["slot_h_mm"] = slot_info["h_mm"]
-                   
-        result = self._prepare_order_data(parent_folder, child_folder, order_info, order_id, last_order_id)
-        if result["status"] == "error":
-            return {"status": "error", "message": result["message"]}
-        order_data = result["data"]
-        order_asin = result["asin"]
-        
-        # Extract mirror flag for this ASIN from ASINs list
-        asin_mirror = False
-        try:
-            if asins_info:
-                for asin_entry in asins_info:
-                    if isinstance(asin_entry, (list, tuple)) and len(asin_entry) >= 3 and asin_entry[0] == order_asin:
-                        asin_mirror = bool(asin_entry[2])
-                        break
-        except Exception:
-            logger.exception(f"Failed to extract mirror flag for ASIN {order_asin}")
-
-        link_to_pattern_info = pattern_info
-        started_pattern_info = deepcopy(pattern_info)
-        is_saved_slots_processed = False
-
-        selected_slots = []
-        DEBUG_MULTIPLIER = 1
-        try:
-            if asins_info is None:
-                total_count = result["quantity"]
-            else:
-                order_count = [asin_pair[1] for asin_pair in asins_info if asin_pair[0] == order_asin][0]
-                total_count = int(result["quantity"] * order_count)
-        except Exception:
-            logger.exception("Failed to get order count")
-            return {"status": "error", "message": "Failed to get order count"}
-        total_count *= DEBUG_MULTIPLIER
-            
-        pdf_count = 1
-        self.log(f"[{order_id}/{last_order_id}] To process: {total_count} {'pcs' if total_count > 1 else 'pc'}")
-        for i in range(total_count):
-            selected_slot_front = None
-            selected_slot_back = None
-            if order_data.get("front", {}):
-                selected_slot_front = _select_slot(order_data["front"], pattern_info, "Frontside", all_asin_patterns=all_asin_patterns)
-                if selected_slot_front["status"] == "error":
-                    return {"status": "error", "message": f"{selected_slot_front['message']}; Order id: {order_id} (ASIN: {order_asin})"}
-                selected_slot_front = selected_slot_front["slot"]
-            if order_data.get("back", {}):
-                selected_slot_back = _select_slot(order_data["back"], pattern_info, "Backside", slot_label=selected_slot_front["label"] if selected_slot_front else None, all_asin_patterns=all_asin_patterns)
-                if selected_slot_back["status"] == "error":
-                    return {"status": "error", "message": f"{selected_slot_back['message']}; Order id: {order_id} (ASIN: {order_asin})"}
-                selected_slot_back = selected_slot_back["slot"]
-            
-            logger.info(f"Order {order_id}: Selected slots - Front: {selected_slot_front['label'] if selected_slot_front else 'None'}, Back: {selected_slot_back['label'] if selected_slot_back else 'None'}")
-            
-            if selected_slot_front:
-                res = _process_object(order_data["front"], selected_slot_front, asin_mirror=asin_mirror)
-                if res and res.get("status") == "error":
-                    return {"status": "error", "message": f"{res['message']} (ASIN: {order_asin})"}
-
-                if not selected_slot_back:
-                    res = _remove_slot_by_label(pattern_info, "Backside", selected_slot_front["label"])
-                    if not res:
-                        return {"status": "error", "message": f"Failed to remove back slot by label for order {order_id} (ASIN: {order_asin})"}
-            if selected_slot_back:
-                res = _process_object(order_data["back"], selected_slot_back, asin_mirror=asin_mirror)
-                if res and res.get("status") == "error":
-                    return {"status": "error", "message": f"{res['message']} (ASIN: {order_asin})"}
-
-                if not selected_slot_front:
-                    res = _remove_slot_by_label(pattern_info, "Frontside", selected_slot_back["label"])
-                    if not res:
-                        return {"status": "error", "message": f"Failed to remove front slot by label for order {order_id} (ASIN: {order_asin})"}
-                
-            selected_slots.append((selected_slot_front, selected_slot_back))
-
-            if _is_pattern_filled(pattern_info, original_pattern_info):
-                self.log(f"[{order_id}] [{i+1}/{total_count}] The export data is filled, making files...")
-                pattern_info = deepcopy(original_pattern_info)
-                
-                # Reset ALL ASIN patterns to original state after PDF render
-                if all_asin_patterns and original_all_asin_patterns:
-                    for asin_key in list(all_asin_patterns.keys()):
-                        all_asin_patterns[asin_key].clear()
-                        all_asin_patterns[asin_key].update(deepcopy(original_all_asin_patterns[asin_key]))
-                
-                jig_info = scene_info["jig"]
-                jig_cmyk = jig_info.get("cmyk", "75,0,75,0")
-                result = self._make_pdf(
-                    saved_slots + selected_slots,
-                    (jig_info["width_mm"], jig_info["height_mm"]),
-                    pdf_start_oder_id,
-                    order_id,
-                    pdf_order=pdf_count,
-                    dpi=getattr(self, "_export_dpi", 1200),
-                    formats=getattr(self, "_export_formats", ["pdf"]),
-                    barcode_text=str(order_id),
-                    reference_text=order_info["orderId"],
-                    jig_cmyk=jig_cmyk,
-                    front_barcode=front_barcode,
-                    back_barcode=back_barcode
-                )
-                if result["status"] == "error":
-                    link_to_pattern_info.clear()
-                    link_to_pattern_info.update(started_pattern_info)
-                    return {"status": "error", "message": f"Failed to make pdf: {result['message']} (ASIN: {order_asin})"}
-                self.log(f"[{order_id}] [{i+1}/{total_count}] Files made successfully", SUCCESS_COLOR)
-                
-                # Add PDFs to combiner
-                if pdf_combiner and "pdf_infos" in result and (front_barcode or back_barcode):
-                    for pdf_info in result["pdf_infos"]:
-                        pdf_combiner.add_pdf(pdf_info)
-                        
-                selected_slots.clear()
-                saved_slots.clear()
-                is_saved_slots_processed = True
-                pdf_count += 1
-                pdf_start_oder_id = order_id
-            
-        if link_to_pattern_info != pattern_info:
-            link_to_pattern_info.clear()
-            link_to_pattern_info.update(pattern_info)
-        return {"status": "success", "selected_slots": selected_slots, "pdf_start_order_id": pdf_start_oder_id, "is_saved_slots_processed": is_saved_slots_processed}
-
     def _process_orders(self):
         try:
-            def _is_pattern_filled(pattern_info: Dict[str, Any], original_pattern_info: Dict[str, Any]) -> bool:
-                is_need_front = False
-                is_need_back = False
-                for major in original_pattern_info["Frontside"]:
-                    for slot in major["slots"]:
-                        if slot["objects"]:
-                            is_need_front = True
-                for major in original_pattern_info["Backside"]:
-                    for slot in major["slots"]:
-                        if slot["objects"]:
-                            is_need_back = True
-
-                is_filled_front = True if is_need_front else False
-                is_filled_back = True if is_need_back else False
-                for major in pattern_info["Frontside"]:
-                    for slot in major["slots"]:
-                        if slot["objects"]:
-                            is_filled_front = False
-                for major in pattern_info["Backside"]:
-                    for slot in major["slots"]:
-                        if slot["objects"]:
-                            is_filled_back = False
-
-                return is_filled_front or is_filled_back
-
             if getattr(self, "_cancel_requested", False):
                 self.log("Processing cancelled by user.", WARNING_COLOR)
                 return
-
-            # Clear processed files set at the start of each processing run
-            # This allows files to be recreated if they were deleted from disk
-            self._processed_files.clear()
-
-            self.log(f"Trying to open the {state.saved_product} pattern file...")
-            try:
-                with open(PRODUCTS_PATH / f"{state.saved_product}.json", "r", encoding="utf-8") as f:
-                    pattern_info = json.load(f)
-
-                    # Keep immutable original copy to fully reset state after each PDF
-                    original_pattern_info = deepcopy(pattern_info)
-                    
-                    # Check if the new ASINObjects structure exists
-                    has_asin_objects = "ASINObjects" in pattern_info and pattern_info["ASINObjects"]
-                    
-                    if has_asin_objects:
-                        # New structure: clean up each ASIN's objects
-                        self.log(f"Detected ASINObjects structure with {len(pattern_info['ASINObjects'])} ASINs", SUCCESS_COLOR)
-                        for asin, asin_data in pattern_info["ASINObjects"].items():
-                            for side in ["Frontside", "Backside"]:
-                                if side not in asin_data:
-                                    continue
-                                for major in asin_data[side]:
-                                    for slot in major["slots"]:
-                                        for obj_ in slot["objects"]:
-                                            if obj_["type"] == "image":
-                                                if obj_["mask_path"] in [None, ".", "None", "none"]:
-                                                    obj_["mask_path"] = ""
-                                                else:
-                                                    try:
-                                                        Path(obj_["mask_path"])
-                                                    except Exception: 
-                                                        obj_["mask_path"] = ""
-                                            elif obj_["type"] == "text":
-                                                obj_["label"] = ""
-                    else:
-                        # Old structure: clean up global Frontside/Backside
-                        self.log(f"Using legacy pattern structure (no ASINObjects)", WARNING_COLOR)
-                        for side in ["Frontside", "Backside"]:
-                            for major in pattern_info[side]:
-                                for slot in major["slots"]:
-                                    for obj_ in slot["objects"]:
-                                        if obj_["type"] == "image":
-                                            if obj_["mask_path"] in [None, ".", "None", "none"]:
-                                                obj_["mask_path"] = ""
-                                            else:
-                                                try:
-                                                    Path(obj_["mask_path"])
-                                                except Exception: 
-                                                    obj_["mask_path"] = ""
-
-                                        elif obj_["type"] == "text":
-                                            obj_["label"] = ""
-
-            except Exception as e:
-                self.log(f"Failed to open the {state.saved_product} pattern file: {e}", ERROR_COLOR)
-                self.start_btn.configure(state="normal")
-                # Finalize progress in a thread-safe way
-                try:
-                    if 'total_orders' in locals() and isinstance(total_orders, int) and total_orders > 0:
-                        self._ui_update_progress(value=100, current_index=total_orders, total=total_orders)
-                    else:
-                        self._ui_update_progress(value=100)
-                except Exception:
-                    try:
-                        self.progress["value"] = 100
-                    except Exception:
-                        pass
-                return
-            self.log(f"{state.saved_product} pattern file opened successfully", SUCCESS_COLOR)
-
-            # Initialize PDF combiner
-            pdf_combiner = PDFCombiner(OUTPUT_PATH)
-            self.log("PDF combiner initialized for combining rendered PDFs")
-
-            # Parse order input (supports mixed format like "1,2,3,4-8,10")
-            def parse_order_input(input_str: str) -> List[int]:
-                """Parse order input that can contain both ranges and individual numbers.
-                
-                Examples:
-                    "1,2,3" -> [1, 2, 3]
-                    "1-5" -> [1, 2, 3, 4, 5]
-                    "1,2,3,4-8,10" -> [1, 2, 3, 4, 5, 6, 7, 8, 10]
-                """
-                order_numbers = set()
-                parts = [p.strip() for p in input_str.split(",")]
-                
-                for part in parts:
-                    if "-" in part:
-                        # Handle range
-                        range_parts = part.split("-")
-                        if len(range_parts) == 2:
-                            try:
-                                start = int(range_parts[0].strip())
-                                end = int(range_parts[1].strip())
-                                order_numbers.update(range(start, end + 1))
-                            except ValueError:
-                                continue
-                    else:
-                        # Handle single number
-                        try:
-                            order_numbers.add(int(part))
-                        except ValueError:
-                            continue
-                
-                return sorted(list(order_numbers))
-
-            total_orders_items: Dict[str, Tuple[Dict[str, Any], str, str]] = {}
-            try:
-                parsed_orders = parse_order_input(state.order_from)
-                if not parsed_orders:
-                    messagebox.showerror("Incorrect format", "Order input should be like 1-10 or 3,7,9 or 1,2,4-8,10")
-                    return
-                
-                self.log(f"Starting processing for orders: {parsed_orders}")
-                orders_info = get_orders_info(
-                    [str(i) for i in parsed_orders],
-                    self.log,
-                    progress_callback=lambda done, total: self._ui_update_progress(value=(done / total * 100) if total else 0, current_index=done, total=total),
-                )
-                total_orders_items = orders_info["orders"]
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to parse order input: {e}")
-                return
-                 
-            orders_to_process: Dict[str, Tuple[Dict[str, Any], str, str]] = {}
-            # Extract ASINs from state.asins (format: [asin, count, mirror])
-            asins = []
-            for asin_entry in state.asins:
-                if isinstance(asin_entry, (list, tuple)) and len(asin_entry) >= 1:
-                    asins.append(asin_entry[0])
-                else:
-                    asins.append(asin_entry)
-            
-            for order_file, order_info in total_orders_items.items():
-                if "asin" not in order_info[0]:
-                    self.log(f"Order {order_file} has no asin", ERROR_COLOR)
-                    continue
-                
-                if order_info[0]["asin"] in asins:
-                    orders_to_process[order_file] = order_info
-
-            if not orders_to_process:
-                self.log(f"No orders found for ASINs: {asins}", ERROR_COLOR)
-                return
-            else:
-                self.log(f"Found {len(orders_to_process)} orders for ASINs {asins}", SUCCESS_COLOR)
-
-            total_orders = len(orders_to_process) 
-            progress_step = 100 / len(orders_to_process)
-            orders_to_process = dict(sorted(orders_to_process.items(), key=lambda x: int(x[0].split("_")[0])))
-            last_order_i = max(int(order_path.split("_")[0]) for order_path in orders_to_process)
-
-            # Initialize progress bar as zero and show indexing label (thread-safe)
+            self._job = OrderBatchJob(
+                state.saved_product,
+                state.order_from,
+                formats=getattr(self, "_export_formats", ["pdf"]),
+                dpi=getattr(self, "_export_dpi", 1200),
+                asins=state.asins,
+                log=self.log,
+                progress=self._ui_update_progress,
+            )
             try:
-                self._ui_update_progress(value=0, current_index=0, total=total_orders)
-            except Exception:
-                pass
-
-            # Check if using new ASINObjects structure (use original_pattern_info to avoid dependency on mutations)
-            has_asin_objects = "ASINObjects" in original_pattern_info and original_pattern_info["ASINObjects"]
-
-            failed_orders = []
-            current_processing_orders = []
-            
-            # Create SINGLE shared pattern_data dict for ALL ASINs to ensure slots are globally removed.
-            # Build from original_pattern_info so we can always reset to fresh state after each PDF.
-            if has_asin_objects:
-                # pattern_data will be a dict keyed by ASIN, BUT shared across all order processing
-                pattern_data = {}
-                for asin in original_pattern_info["ASINObjects"]:
-                    pattern_data[asin] = deepcopy(original_pattern_info["ASINObjects"][asin])
-            else:
-                # Legacy: single pattern for all ASINs
-                pattern_data = deepcopy(original_pattern_info)
-                
-            pdf_data: List[Tuple[Dict[str, Any], Dict[str, Any]]] = []
-            pdf_start_oder_i = None
-            is_sucess = False
-            for i, (order_file, order_info_) in enumerate(orders_to_process.items()):
-                order_id = int(order_file.split("_")[0])
-                order_info, parent_folder, child_folder = order_info_
-                if pdf_start_oder_i is None:
-                    pdf_start_oder_i = order_id
-
-                if getattr(self, "_cancel_requested", False):
-                    self.log("Processing cancelled by user.", WARNING_COLOR)
-                    logger.debug("Processing cancelled by user.")
-                    break
-
-                # Determine order ASIN and get the appropriate pattern
-                order_asin = order_info.get("asin")
-                if not order_asin:
-                    self.log(f"[{order_id}] Order has no ASIN, skipping", ERROR_COLOR)
-                    failed_orders.append(order_file)
-                    continue
-
-                if has_asin_objects:
-                    # Get ASIN-specific pattern
-                    if order_asin not in original_pattern_info["ASINObjects"]:
-                        self.log(f"[{order_id}] ASIN '{order_asin}' not found in ASINObjects, skipping", ERROR_COLOR)
-                        failed_orders.append(order_file)
-                        continue
-                    
-                    # Use the ASIN-specific pattern for this order (from ORIGINAL, immutable copy)
-                    original_pattern_for_order = original_pattern_info["ASINObjects"][order_asin]
-                    pattern_data_for_order = pattern_data[order_asin]
-                    
-                    # Extract barcodes from ASIN-specific pattern
-                    front_barcode = original_pattern_for_order.get("FrontsideBarcode", None)
-                    back_barcode = original_pattern_for_order.get("BacksideBarcode", None)
-                else:
-                    # Legacy: use global pattern for all ASINs (from ORIGINAL, immutable copy)
-                    original_pattern_for_order = original_pattern_info
-                    pattern_data_for_order = pattern_data
-                    
-                    # Extract barcodes from global pattern
-                    front_barcode = original_pattern_info.get("FrontsideBarcode", None)
-                    back_barcode = original_pattern_info.get("BacksideBarcode", None)
-
-                self.log(f"Processing of Order {order_id}/{last_order_i} has been initiated")
-                logger.debug(f"Processing of Order {order_id}/{last_order_i} has been initiated")
-                order_result = self._process_order(
-                    parent_folder,
-                    child_folder,
-                    pdf_data,
-                    order_info,
-                    deepcopy(original_pattern_for_order),
-                    pattern_data_for_order,
-                    pdf_start_oder_i,
-                    order_id,
-                    last_order_i,
-                    pattern_info["Scene"],
-                    pattern_info.get("ASINs", None),
-                    pdf_combiner,
-                    front_barcode=front_barcode,
-                    back_barcode=back_barcode,
-                    all_asin_patterns=pattern_data if has_asin_objects else None,
-                    original_all_asin_patterns=original_pattern_info.get("ASINObjects") if has_asin_objects else None
-                )
-                if order_result["status"] == "error":
-                    if order_result.get("message") == "Cancelled":
-                        self.log("Processing cancelled by user.", WARNING_COLOR)
-                        break
-                    failed_orders.append(order_file)
-                    self.log(f"[{order_id}/{last_order_i}] Order processing failed: " + order_result["message"], ERROR_COLOR)
-                else:
-                    self.log(f"[{order_id}/{last_order_i}] Order processed successfully", SUCCESS_COLOR)
-                    if order_result["is_saved_slots_processed"]:
-                        pdf_data.clear()
-                    if order_result["selected_slots"] == (None, None):
-                        self.log(f"[{order_id}/{last_order_i}] Order doesn't require customization", WARNING_COLOR)
-                    else:
-                        if len(order_result["selected_slots"]) > 0:
-                            pdf_data.extend(order_result["selected_slots"])
-                        current_processing_orders.append(order_file)
-                    pdf_start_oder_i = order_result["pdf_start_order_id"]
-
-                if getattr(self, "_cancel_requested", False):
-                    self.log("Processing cancelled by user.", WARNING_COLOR)
-                    break
-
-                # Check if pattern is filled - need to pass the correct pattern based on structure
-                if has_asin_objects:
-                    # For ASINObjects: check the specific ASIN's pattern
-                    pattern_filled = _is_pattern_filled(pattern_data_for_order, original_pattern_for_order)
-                else:
-                    # For legacy: check the global pattern
-                    pattern_filled = _is_pattern_filled(pattern_data, pattern_info)
-
-                if pattern_filled or (i == total_orders - 1 and pdf_data):
-                    self.log(f"[{pdf_start_oder_i}-{order_id}] The export data is filled, making files...")
-
-                    # Reset pattern_data based on structure
-                    if has_asin_objects:
-                        # Reset ALL ASINs to original state
-                        for asin_key in original_pattern_info["ASINObjects"]:
-                            pattern_data[asin_key] = deepcopy(original_pattern_info["ASINObjects"][asin_key])
-                    else:
-                        # Reset global pattern
-                        pattern_data = deepcopy(pattern_info)
-
-                    jig_info = pattern_info["Scene"]["jig"]
-                    jig_cmyk = jig_info.get("cmyk", "75,0,75,0")
-                    result = self._make_pdf(
-                        pdf_data,
-                        (jig_info["width_mm"], jig_info["height_mm"]),
-                        pdf_start_oder_i,
-                        order_id,
-                        dpi=getattr(self, "_export_dpi", 1200),
-                        formats=getattr(self, "_export_formats", ["pdf"]),
-                        barcode_text=str(order_id),
-                        reference_text=order_info["orderId"],
-                        jig_cmyk=jig_cmyk,
-                        front_barcode=front_barcode,
-                        back_barcode=back_barcode
-                    )
-                    if result["status"] == "error":
-                        self.log(f"[{pdf_start_oder_i}-{order_id}] Failed to export files: " + result["message"], ERROR_COLOR)
-                        failed_orders.extend([order_path for order_path in current_processing_orders])
-                    else:
-                        self.log(f"[{pdf_start_oder_i}-{order_id}] Files made successfully", SUCCESS_COLOR)
-                        is_sucess = True
-
-                    # Add PDFs to combiner
-                    if "pdf_infos" in result and (front_barcode or back_barcode):
-                        for pdf_info in result["pdf_infos"]:
-                            pdf_combiner.add_pdf(pdf_info)
-
-                    pdf_data.clear()
-                    pdf_start_oder_i = None
-
-                # Update progress (value is percent). Use thread-safe scheduler so UI updates from worker thread.
-                try:
-                    new_value = min(100.0, float(i + 1) / float(total_orders) * 100.0)
-                except Exception:
-                    new_value = None
-                try:
-                    if new_value is not None:
-                        self._ui_update_progress(value=new_value, current_index=min(i + 1, total_orders), total=total_orders)
-                    else:
-                        self._ui_update_progress(current_index=min(i + 1, total_orders), total=total_orders)
-                except Exception:
-                    pass
-
-            # Finalize and combine all pending PDFs
-            # True True False 2
-            if is_sucess:
-                if (front_barcode or back_barcode) and pdf_combiner.pending_pdfs:
-                    self.log("Combining rendered PDFs into larger sheets...")
-                    try:
-                        combined_paths = pdf_combiner.finalize()
-                        if combined_paths:
-                            self.log(f"Created {len(combined_paths)} combined PDF(s):", SUCCESS_COLOR)
-                            for path in combined_paths:
-                                self.log(f"  - {os.path.basename(path)}", SUCCESS_COLOR)
-                        else:
-                            self.log("No PDFs were combined (possibly all fit in single sheets already)")
-                    except Exception as e:
-                        self.log(f"Failed to combine PDFs: {e}", ERROR_COLOR)
-                        logger.exception("PDF combining failed")
-                    
-                self.log(f"Processing completed! You can find files in outputs/ folder", SUCCESS_COLOR)
-            # if failed_orders:
-            #     self.log(f"Failed orders: {failed_orders}", ERROR_COLOR)
-
+                self._job.run()
+            except OrderInputError as e:
+                self.after(0, lambda msg=str(e): messagebox.showerror("Error", msg))
         finally:
             # Re-enable Start button and reset processing flag when done
             try:
@@ -1826,6 +360,7 @@ class OrderRangeScreen(Screen):
                 # No visible label to finalize (we intentionally removed the index label)
             except Exception:
                 pass
+            self._job = None
             self._is_processing = False
             self._cancel_requested = False
 
@@ -1920,6 +455,9 @@ class OrderRangeScreen(Screen):
         if not from_s:
             messagebox.showerror("Error", "Order number does not exist.")
             return
+        if not parse_order_input(from_s):
+            messagebox.showerror("Incorrect format", "Order input should be like 1-10 or 3,7,9 or 1,2,4-8,10")
+            return
 
         state.order_from = from_s
 
@@ -1943,15 +481,7 @@ class OrderRangeScreen(Screen):
 
         # 3) Formats + DPI
         fmt_s = (self.format_var.get() if hasattr(self, "format_var") else "pdf").strip()
-        fmts = [f.strip().lower() for f in fmt_s.split(",") if f.strip()]
-        formats_norm: List[str] = []
-        seen = set()
-        for f in fmts:
-            if f == "jpeg":
-                f = "jpg"
-            if f in ("pdf", "png", "jpg", "bmp") and f not in seen:
-                seen.add(f)
-                formats_norm.append(f)
+        formats_norm: List[str] = normalize_formats(fmt_s.split(","))
         if not formats_norm:
             messagebox.showerror("Error", "Please enter at least one valid format: pdf, png, jpg, bmp.")
             return
@@ -1985,6 +515,8 @@ class OrderRangeScreen(Screen):
         if getattr(self, "_is_processing", False):
             if not getattr(self, "_cancel_requested", False):
                 self._cancel_requested = True
+                if self._job is not None:
+                    self._job.cancel()
                 try:
                     self.log("Cancellation requested...", WARNING_COLOR)
                 except Exception:
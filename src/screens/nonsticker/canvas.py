@@ -17,6 +17,7 @@ from src.core import Screen, vcmd_float, COLOR_TEXT, COLOR_BG_DARK, COLOR_PILL,
 from src.core.app import COLOR_BG_SCREEN, validate_min1, vcmd_int
 from src.utils import *
 from src.core.state import ALL_PRODUCTS, FONTS_PATH, OUTPUT_PATH, PRODUCTS_PATH, state
+from src.core.product_format import compact_product, load_product
 from src.canvas import (
     CanvasObject, 
     CanvasSelection, 
@@ -31,7 +32,9 @@ from src.canvas import (
     PenSettings,
     PenSettingsDialog,
     PenCollection,
-    PenManager
+    PenManager,
+    RedrawScheduler,
+    SpatialIndex
 )
 from .results_download import NStickerResultsDownloadScreen
 
@@ -134,6 +137,16 @@ class NStickerCanvasScreen(Screen):
         state.error_message = ""
 
         self.jig = JigController(self)
+        self.redraw_scheduler = RedrawScheduler(self)
+        self.spatial = SpatialIndex()
+        # cid -> (meta, key, serialized dict) reused by _serialize_scene
+        self._scene_cache: dict[int, tuple] = {}
+        # Bulk restore state (see _begin_bulk_restore)
+        self._bulk_depth = 0
+        self._bulk_max_z = 0
+        self._bulk_min_z = 0
+        self._bulk_labels: list[int] = []
+        self._bulk_images: list[int] = []
         self.slots = SlotManager(self)
         self.majors = MajorManager(self)
         self.images = ImageManager(self)
@@ -2463,6 +2476,8 @@ class NStickerCanvasScreen(Screen):
         # canvas without visible scrollbars
         self.canvas = tk.Canvas(self.board, bg="#5a5a5a", highlightthickness=0, takefocus=1)
         self.canvas.pack(expand=True, fill="both")
+        # Tk reports every view change (scrolling, panning, resizing) here; culled images render when they show up
+        self.canvas.configure(xscrollcommand=self.images.on_view_change, yscrollcommand=self.images.on_view_change)
         # Managers and method delegations (must be set before bindings)
         # Core state maps used across handlers (must be initialized before any scheduled callbacks)
         self._items: dict[int, CanvasObject] = {}   # canvas_id -> CanvasObject
@@ -2474,7 +2489,7 @@ class NStickerCanvasScreen(Screen):
         # Active major name to filter visibility (items/slots belong to their major)
         self._active_major: str = (self.major_name.get() if hasattr(self, "major_name") else "") or ""
         # Now bind using delegated methods
-        self.canvas.bind("<Configure>", self._redraw_jig)
+        self.canvas.bind("<Configure>", lambda _e: self.redraw_scheduler.redraw(center=True))
         self.canvas.bind("<Button-1>", self.selection.on_click)
         self.canvas.bind("<Button-1>", lambda _e: self.canvas.focus_set(), add="+")
         # After selection changes, refresh text controls
@@ -2489,8 +2504,8 @@ class NStickerCanvasScreen(Screen):
         self.canvas.bind("<ButtonRelease-2>", self.selection.on_pan_end)
         # zoom via Ctrl + MouseWheel / Ctrl + Button-4/5 (Linux)
         self.canvas.bind("<Control-MouseWheel>", self.selection.on_wheel_zoom)
-        self.canvas.bind("<Control-Button-4>", lambda _e: self._zoom_step(+1))
-        self.canvas.bind("<Control-Button-5>", lambda _e: self._zoom_step(-1))
+        self.canvas.bind("<Control-Button-4>", lambda _e: self.redraw_scheduler.zoom(+1))
+        self.canvas.bind("<Control-Button-5>", lambda _e: self.redraw_scheduler.zoom(-1))
         # touchpad/scroll wheel panning (vertical + horizontal with Shift)
         self.canvas.bind("<MouseWheel>", self.selection.on_wheel_pan)
         self.canvas.bind("<Button-4>", self.selection.on_wheel_pan)   # Linux up
@@ -2498,9 +2513,9 @@ class NStickerCanvasScreen(Screen):
         self.canvas.bind("<Shift-MouseWheel>", self.selection.on_wheel_pan)
         # Zoom via +/- keys only when canvas has focus
         for seq in ("<KeyPress-plus>", "<KeyPress-equal>", "<KP_Add>"):
-            self.canvas.bind(seq, lambda _e: self._zoom_step(1))
+            self.canvas.bind(seq, lambda _e: self.redraw_scheduler.zoom(1))
         for seq in ("<KeyPress-minus>", "<KeyPress-KP_Subtract>"):
-            self.canvas.bind(seq, lambda _e: self._zoom_step(-1))
+            self.canvas.bind(seq, lambda _e: self.redraw_scheduler.zoom(-1))
         # initial jig draw (also sets _update_scrollregion delegate before any slot placement)
         self.after(0, self._redraw_jig)
         # initialize jig size from Size fields when no saved size
@@ -2563,7 +2578,15 @@ class NStickerCanvasScreen(Screen):
         self.canvas.bind("<Button-3>", self.selection.maybe_show_context_menu)
 
         # Key bindings moved to canvas-level to require focus
-        
+
+    def destroy(self) -> None:
+        # Background render workers belong to this screen
+        try:
+            self.images.close()
+        except Exception:
+            logger.exception("Failed to stop canvas render workers")
+        super().destroy()
+
     def _update_text_size_ui(self):
         fmt_str = self.format_var.get().lower() if hasattr(self, "format_var") else "pdf"
         is_ezd = "ezd" in fmt_str
@@ -2719,20 +2742,22 @@ class NStickerCanvasScreen(Screen):
     def _find_font_path(self, family: str) -> Optional[str]:
         return self.fonts.find_font_path(family)
 
-    def _update_rect_label_image(self, rect_cid: int) -> None:
-        """Render/update a rect's label as a rotated image and center it inside the rect."""
+    def _update_rect_label_image(self, rect_cid: int, background: bool = False) -> None:
+        """Render/update a rect's label as a rotated image and center it inside the rect.
+
+        With ``background=True`` the PIL text rasterization runs on the image
+        render queue and the label is swapped in from the Tk main loop; bulk
+        refreshes (zoom, redraw) use this so the canvas stays responsive.
+        """
         try:
             meta = self._items.get(rect_cid, {})
             item_type = meta.get("type")
             if item_type not in ("rect", "barcode"):
                 return
-            # Current displayed rect bbox and center
+            # Current displayed rect bbox
             bx = self.canvas.bbox(rect_cid)
             if not bx:
                 return
-            x1, y1, x2, y2 = bx
-            cx = (x1 + x2) / 2.0
-            cy = (y1 + y2) / 2.0
             # Style
             label_text = str(meta.get("label", "Text"))
             try:
@@ -2742,10 +2767,12 @@ class NStickerCanvasScreen(Screen):
             
             fmt_str = self.format_var.get().lower() if hasattr(self, "format_var") else "pdf"
             is_ezd_format = "ezd" in fmt_str
+            target_size = None
             if is_ezd_format and item_type != "barcode":
                 width_mm = float(meta.get("text_width_mm", 5.0))
                 height_mm = float(meta.get("text_height_mm", 5.0))
                 size_px = int(max(width_mm, height_mm) * MM_TO_PX * self._zoom)
+                target_size = (int(width_mm * MM_TO_PX * self._zoom), int(height_mm * MM_TO_PX * self._zoom))
             else:
                 size_px = self._scaled_pt(base_pt)
             
@@ -2756,39 +2783,9 @@ class NStickerCanvasScreen(Screen):
             except Exception:
                 angle = 0.0
             try:
-                from PIL import Image, ImageDraw, ImageFont, ImageTk  # type: ignore
+                from PIL import Image  # type: ignore
             except Exception:
                 return
-            font_path = self._find_font_path(family)
-            try:
-                if font_path:
-                    font = ImageFont.truetype(font_path, max(1, int(size_px)))
-                else:
-                    font = ImageFont.load_default()
-            except Exception:
-                font = ImageFont.load_default()
-            # Measure text
-            tmp = Image.new("RGBA", (1, 1), (0, 0, 0, 0))
-            draw = ImageDraw.Draw(tmp)
-            try:
-                tb = draw.textbbox((0, 0), label_text, font=font)
-                tw = max(1, tb[2] - tb[0])
-                th = max(1, tb[3] - tb[1])
-                off_x = -tb[0]
-                off_y = -tb[1]
-            except Exception:
-                try:
-                    tw = int(draw.textlength(label_text, font=font))
-                    th = max(1, int(size_px * 1.4))
-                except Exception:
-                    tw, th = max(1, int(size_px * 2)), max(1, int(size_px * 1.4))
-                off_x = 0
-                off_y = 0
-            pad = 0
-            img_w = int(tw + 2 * pad)
-            img_h = int(th + 2 * pad)
-            img = Image.new("RGBA", (max(1, img_w), max(1, img_h)), (0, 0, 0, 0))
-            d2 = ImageDraw.Draw(img)
             # Resolve color: support hex (#rrggbb) and named colors via tkinter
             try:
                 color_rgba = (255, 255, 255, 255)
@@ -2806,58 +2803,137 @@ class NStickerCanvasScreen(Screen):
                             pass
             except Exception:
                 color_rgba = (255, 255, 255, 255)
-            d2.text((pad + off_x, pad + off_y), label_text, font=font, fill=color_rgba)
-            
-            if is_ezd_format and item_type != "barcode":
-                target_width_px = int(width_mm * MM_TO_PX * self._zoom)
-                target_height_px = int(height_mm * MM_TO_PX * self._zoom)
-                if img_w > 0 and img_h > 0 and target_width_px > 0 and target_height_px > 0:
-                    new_w = target_width_px
-                    new_h = target_height_px
-                    img = img.resize((max(1, new_w), max(1, new_h)), Image.BICUBIC)
-            
+            spec = {
+                "text": label_text,
+                "font_path": self._find_font_path(family),
+                "size_px": size_px,
+                "color": color_rgba,
+                "angle": angle,
+                "target_size": target_size,
+            }
+            sig = tuple(spec.values())
+            # An older background render must not replace this label later
+            self.images.cancel_render(("label", rect_cid))
+            if meta.get("label_sig") == sig and meta.get("label_photo") is not None:
+                # Nothing about the label image changed (e.g. jig resize): just re-center it
+                lid = int(meta.get("label_id", 0) or 0)
+                if lid and str(self.canvas.type(lid)) == "image":
+                    self._place_rect_label(rect_cid, meta, None, sig)
+                    return
+            if background:
+                self.images.render_queue.submit(
+                    ("label", rect_cid),
+                    lambda: self._rasterize_rect_label(spec),
+                    lambda img: self._place_rect_label(rect_cid, meta, img, sig),
+                )
+                return
+            self._place_rect_label(rect_cid, meta, self._rasterize_rect_label(spec), sig)
+        except Exception:
+            logger.exception("Failed to update rotated label image")
+
+    @staticmethod
+    def _rasterize_rect_label(spec: dict):
+        """Draw a rect label into a rotated RGBA PIL image (no Tk access)."""
+        from PIL import Image, ImageDraw, ImageFont  # type: ignore
+
+        label_text = spec["text"]
+        size_px = spec["size_px"]
+        font_path = spec["font_path"]
+        try:
+            if font_path:
+                font = ImageFont.truetype(font_path, max(1, int(size_px)))
+            else:
+                font = ImageFont.load_default()
+        except Exception:
+            font = ImageFont.load_default()
+        # Measure text
+        tmp = Image.new("RGBA", (1, 1), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(tmp)
+        try:
+            tb = draw.textbbox((0, 0), label_text, font=font)
+            tw = max(1, tb[2] - tb[0])
+            th = max(1, tb[3] - tb[1])
+            off_x = -tb[0]
+            off_y = -tb[1]
+        except Exception:
             try:
-                # Rotate label image in the same (clockwise) direction as overlay math
-                rotated = img.rotate(angle, expand=True, resample=Image.BICUBIC)
+                tw = int(draw.textlength(label_text, font=font))
+                th = max(1, int(size_px * 1.4))
             except Exception:
-                rotated = img
+                tw, th = max(1, int(size_px * 2)), max(1, int(size_px * 1.4))
+            off_x = 0
+            off_y = 0
+        pad = 0
+        img_w = int(tw + 2 * pad)
+        img_h = int(th + 2 * pad)
+        img = Image.new("RGBA", (max(1, img_w), max(1, img_h)), (0, 0, 0, 0))
+        d2 = ImageDraw.Draw(img)
+        d2.text((pad + off_x, pad + off_y), label_text, font=font, fill=spec["color"])
+        
+        target_size = spec["target_size"]
+        if target_size:
+            target_width_px, target_height_px = target_size
+            if img_w > 0 and img_h > 0 and target_width_px > 0 and target_height_px > 0:
+                img = img.resize((max(1, target_width_px), max(1, target_height_px)), Image.BICUBIC)
+        
+        try:
+            # Rotate label image in the same (clockwise) direction as overlay math
+            return img.rotate(spec["angle"], expand=True, resample=Image.BICUBIC)
+        except Exception:
+            return img
+
+    def _place_rect_label(self, rect_cid: int, meta: dict, img, sig: Optional[tuple] = None) -> None:
+        """Show a rasterized label centered on its rect, above the rect overlay.
+
+        ``img=None`` re-centers the current label photo without re-rendering.
+        """
+        if self._items.get(rect_cid) is not meta:
+            return
+        bx = self.canvas.bbox(rect_cid)
+        if not bx:
+            return
+        x1, y1, x2, y2 = bx
+        cx = (x1 + x2) / 2.0
+        cy = (y1 + y2) / 2.0
+        if img is None:
+            photo = meta.get("label_photo")
+        else:
             try:
                 from PIL import ImageTk  # type: ignore
-                photo = ImageTk.PhotoImage(rotated)
+                photo = ImageTk.PhotoImage(img)
             except Exception:
                 return
-            meta["label_photo"] = photo
-            lid = int(meta.get("label_id", 0) or 0)
-            if lid and str(self.canvas.type(lid)) == "image":
-                try:
-                    self.canvas.itemconfig(lid, image=photo)
-                except Exception:
-                    raise
-                self.canvas.coords(lid, cx, cy)
-            else:
-                if lid:
-                    try:
-                        self.canvas.delete(lid)
-                    except Exception:
-                        raise
-                new_lid = self.canvas.create_image(cx, cy, image=photo, anchor="center")
-                meta["label_id"] = new_lid
-            # Keep above overlay/base
-            try:
-                rid = int(meta.get("rot_id", 0) or 0)
-            except Exception:
-                rid = 0
+        meta["label_photo"] = photo
+        meta["label_sig"] = sig
+        lid = int(meta.get("label_id", 0) or 0)
+        if lid and str(self.canvas.type(lid)) == "image":
             try:
-                lbl_id = int(meta.get("label_id", 0) or 0)
-                if lbl_id:
-                    if rid:
-                        self.canvas.tag_raise(lbl_id, rid)
-                    else:
-                        self.canvas.tag_raise(lbl_id, rect_cid)
+                self.canvas.itemconfig(lid, image=photo)
             except Exception:
                 raise
+            self.canvas.coords(lid, cx, cy)
+        else:
+            if lid:
+                try:
+                    self.canvas.delete(lid)
+                except Exception:
+                    raise
+            new_lid = self.canvas.create_image(cx, cy, image=photo, anchor="center")
+            meta["label_id"] = new_lid
+        # Keep above overlay/base
+        try:
+            rid = int(meta.get("rot_id", 0) or 0)
         except Exception:
-            logger.exception("Failed to update rotated label image")
+            rid = 0
+        try:
+            lbl_id = int(meta.get("label_id", 0) or 0)
+            if lbl_id:
+                if rid:
+                    self.canvas.tag_raise(lbl_id, rid)
+                else:
+                    self.canvas.tag_raise(lbl_id, rect_cid)
+        except Exception:
+            raise
 
     def _chip(self, parent, label, var, width=8, label_padx=6, pady=8):
         box = tk.Frame(parent, bg="#6f6f6f")
@@ -3043,6 +3119,10 @@ class NStickerCanvasScreen(Screen):
         self._pen_collection = new_collection
 
     def _on_jig_change(self, *_):
+        # Typing into the jig size fires one trace per keystroke; apply once per idle tick
+        self.redraw_scheduler.jig_changed()
+
+    def _apply_jig_change(self):
         # Redraw jig and re-create slots to fill new area
         self._redraw_jig()
         # Clamp all majors to the new jig size and refresh layout
@@ -3318,27 +3398,30 @@ class NStickerCanvasScreen(Screen):
             active_major = str(self.major_name.get() or "").strip()
         except Exception:
             active_major = ""
-        # Collect and order slots by current canvas position, filtered by owner_major
-        slot_entries: List[Tuple[float, float, int, CanvasObject]] = []  # (left_px, top_px, slot_cid, slot_meta)
-        for scid, smeta in self._items.items():
-            if smeta.get("type") != "slot":
-                continue
+        # Slot ordering and containment below are answered from the mm-space
+        # spatial index instead of one canvas.bbox round-trip per item
+        index = self.spatial
+        index.sync(self._items)
+        # One screen pixel of tolerance, expressed in mm
+        eps_mm = 1.0 / (MM_TO_PX * max(self._zoom, 1e-6))
+        placeable = ("rect", "image", "text")
+
+        def _grown(box):
+            return (box[0] - eps_mm, box[1] - eps_mm, box[2] + eps_mm, box[3] + eps_mm)
+
+        # Collect and order slots by position, filtered by owner_major
+        slot_entries: List[Tuple[float, float, int, CanvasObject]] = []  # (left_mm, top_mm, slot_cid, slot_meta)
+        for scid in index.of_kind("slot"):
+            smeta = self._items[scid]
             try:
                 if active_major and str(smeta.get("owner_major", "")) != active_major:
                     continue
             except Exception:
                 continue
-            try:
-                bx = self.canvas.bbox(scid)
-            except Exception as e:
-                logger.exception(f"Failed to get bbox for slot: {e}")
-                bx = None
-            if not bx:
-                continue
-            sx, sy, _sx2, _sy2 = bx
-            slot_entries.append((float(sx), float(sy), scid, smeta))
+            sx, sy, _sx2, _sy2 = index.bbox(scid)
+            slot_entries.append((sx, sy, scid, smeta))
         # Sort rows bottom->top (y desc), within row right->left (x desc)
-        slot_entries.sort(key=lambda t: (-t[1], -t[0]))
+        slot_entries.sort(key=lambda t: (-t[1], -t[0], t[2]))
 
         if not slot_entries:
             return
@@ -3387,39 +3470,13 @@ class NStickerCanvasScreen(Screen):
                 s1_w = float(slot1_meta.get("w_mm", 0.0))
                 s1_h = float(slot1_meta.get("h_mm", 0.0))
 
-                # Prefer pixel-space bbox to respect rotation and actual rendered bounds
-                try:
-                    slot1_bbox_px = self.canvas.bbox(slot1_id)
-                except Exception:
-                    slot1_bbox_px = None
-
-                def _inside_slot_by_bbox_px(obj_cid: int) -> bool:
-                    try:
-                        if not slot1_bbox_px:
-                            return False
-                        bx = self.canvas.bbox(obj_cid)
-                        if not bx:
-                            return False
-                        ox0, oy0, ox1, oy1 = float(bx[0]), float(bx[1]), float(bx[2]), float(bx[3])
-                        sx0, sy0, sx1, sy1 = float(slot1_bbox_px[0]), float(slot1_bbox_px[1]), float(slot1_bbox_px[2]), float(slot1_bbox_px[3])
-                        cx = (ox0 + ox1) / 2.0
-                        cy = (oy0 + oy1) / 2.0
-                        # Pixel epsilon
-                        eps_px = 1.0
-                        return (cx >= sx0 - eps_px) and (cx <= sx1 + eps_px) and (cy >= sy0 - eps_px) and (cy <= sy1 + eps_px)
-                    except Exception:
-                        return False
-
-                template: list[tuple[int, CanvasObject]] = []  # (cid, meta)
-                for cid, meta in self._items.items():
-                    # Consider only real placeable objects
-                    if meta.get("type") not in ("rect", "image", "text"):
-                        continue
-                    # Duplicate any object whose center lies inside slot 1,
-                    # regardless of its current owner_major (some items might
-                    # have missing or mismatched ownership).
-                    if _inside_slot_by_bbox_px(cid):
-                        template.append((cid, meta))
+                # Duplicate any object whose center lies inside slot 1 (bounds
+                # account for rotation), regardless of its current owner_major
+                # (some items might have missing or mismatched ownership).
+                template: list[tuple[int, CanvasObject]] = [  # (cid, meta)
+                    (cid, self._items[cid])
+                    for cid in sorted(index.centers_in(_grown(index.bbox(slot1_id)), kinds=placeable))
+                ]
 
                 if template:
                     # Duplicate each template object into all other slots of this major
@@ -3442,42 +3499,10 @@ class NStickerCanvasScreen(Screen):
                             base_z = int(global_max_z + 1)
                             dx = float(dest_meta.get("x_mm", 0.0))
                             dy = float(dest_meta.get("y_mm", 0.0))
-                            # Clear existing non-slot objects inside this destination slot before cloning
-                            # Use destination slot's canvas bounding box in pixels for accurate containment
-                            try:
-                                dest_bbox_px = self.canvas.bbox(dest_sid)
-                            except Exception:
-                                dest_bbox_px = None
-                            if not dest_bbox_px:
-                                logger.exception("Destination slot bbox not available before clearing")
-                                raise RuntimeError("Destination slot bbox not available")
+                            # Clear existing non-slot objects inside this destination slot before cloning.
+                            # Only objects are considered, not slots or majors, regardless of owner.
                             try:
-                                dsx0, dsy0, dsx1, dsy1 = float(dest_bbox_px[0]), float(dest_bbox_px[1]), float(dest_bbox_px[2]), float(dest_bbox_px[3])
-                            except Exception:
-                                logger.exception("Failed to parse destination slot bbox before clearing")
-                                raise
-                            try:
-                                to_delete_ids: list[int] = []
-                                for del_cid, del_meta in list(self._items.items()):
-                                    t = del_meta.get("type")
-                                    # Only consider objects, not slots or majors. Clear regardless of owner.
-                                    consider = (t == "rect") or (t == "image") or (t == "text")
-                                    if consider:
-                                        try:
-                                            bx = self.canvas.bbox(del_cid)
-                                            if not bx:
-                                                continue
-                                            ox0, oy0, ox1, oy1 = float(bx[0]), float(bx[1]), float(bx[2]), float(bx[3])
-                                            cx = (ox0 + ox1) / 2.0
-                                            cy = (oy0 + oy1) / 2.0
-                                            # Pixel tolerance
-                                            eps_px = 1.0
-                                            inside = (cx >= dsx0 - eps_px) and (cx <= dsx1 + eps_px) and (cy >= dsy0 - eps_px) and (cy <= dsy1 + eps_px)
-                                        except Exception as e:
-                                            logger.exception("Failed to check object position against destination slot")
-                                            raise
-                                        if inside:
-                                            to_delete_ids.append(del_cid)
+                                to_delete_ids = sorted(index.centers_in(_grown(index.bbox(dest_sid)), kinds=placeable))
                                 for del_id in to_delete_ids:
                                     m = self._items.get(del_id, {})
                                     try:
@@ -3514,6 +3539,7 @@ class NStickerCanvasScreen(Screen):
                                         # Remove base item and purge from registry
                                         self.canvas.delete(del_id)
                                         self._items.pop(del_id, None)
+                                        index.remove(del_id)
                                     except Exception as e:
                                         logger.exception("Failed to clear object inside destination slot")
                                         raise
@@ -3710,7 +3736,7 @@ class NStickerCanvasScreen(Screen):
             return
 
         # Collect placeable items (rect or image), ordered bottom->top, right->left, filtered by owner_major
-        item_entries: List[Tuple[float, float, int, CanvasObject]] = []  # (left_px, top_px, cid, meta)
+        item_entries: List[Tuple[float, float, int, CanvasObject]] = []  # (left_mm, top_mm, cid, meta)
         for cid, meta in self._items.items():
             if meta.get("type") not in ("rect", "image"):
                 continue
@@ -3719,21 +3745,11 @@ class NStickerCanvasScreen(Screen):
                     continue
             except Exception:
                 continue
-            try:
-                bx = self.canvas.bbox(cid)
-            except Exception as e:
-                logger.exception(f"Failed to get bbox for item {cid}: {e}")
-                bx = None
-            if not bx:
-                # For images sometimes bbox can be None until drawn; use coords as fallback
-                try:
-                    cx, cy = self.canvas.coords(cid)
-                    bx = (float(cx), float(cy), float(cx), float(cy))
-                except Exception as e:
-                    logger.exception(f"Failed to get coords for item {cid}: {e}")
-                    continue
+            bx = index.bbox(cid)
+            if bx is None:
+                continue
             ix, iy, _ix2, _iy2 = bx
-            item_entries.append((float(ix), float(iy), cid, meta))
+            item_entries.append((ix, iy, cid, meta))
         item_entries.sort(key=lambda t: (-t[1], -t[0]))
 
         # Map items to slots one-to-one
@@ -5155,6 +5171,7 @@ class NStickerCanvasScreen(Screen):
                 back_grouped = _group_by_export_file(back_items)
                 
                 # Render each export file separately
+                ezd_jobs = []
                 for export_file_name in export_files_to_render:
                     # Get items for this export file
                     front_items_for_file = front_grouped.get(export_file_name, [])
@@ -5172,24 +5189,16 @@ class NStickerCanvasScreen(Screen):
                     # Generate file names for this export file
                     file_suffix = export_file_name.split(' ')[-1]  # e.g., "File 1" -> "1"
                     
-                    # Handle EZD export separately
+                    # Handle EZD export separately: collect documents, build them concurrently below
                     is_ezd = getattr(self, "_is_ezd_export", False)
                     if is_ezd:
                         if front_objects:
-                            logger.debug(f"Exporting EZD frontside for {export_file_name}...")
-                            state.processing_message = f"Exporting EZD frontside for {export_file_name}..."
-                            if state.is_cancelled:
-                                return
                             ezd_front_path = os.path.join(OUTPUT_PATH, f"{state.sku_name}_frontside_{file_suffix}.ezd")
-                            self.ezd_exporter.export_scene(front_items_for_file, ezd_front_path, jx, jy, clear_before=True, pen_collection=self._pen_collection)
+                            ezd_jobs.append((front_items_for_file, ezd_front_path))
                         
                         if back_objects:
-                            logger.debug(f"Exporting EZD backside for {export_file_name}...")
-                            state.processing_message = f"Exporting EZD backside for {export_file_name}..."
-                            if state.is_cancelled:
-                                return
                             ezd_back_path = os.path.join(OUTPUT_PATH, f"{state.sku_name}_backside_{file_suffix}.ezd")
-                            self.ezd_exporter.export_scene(back_items_for_file, ezd_back_path, jx, jy, clear_before=True, pen_collection=self._pen_collection)
+                            ezd_jobs.append((back_items_for_file, ezd_back_path))
                         continue
                     
                     # Render frontside for this export file
@@ -5237,7 +5246,7 @@ class NStickerCanvasScreen(Screen):
                                 logger.exception(f"Failed to save front BMP for {export_file_name}; continuing")
                         if "svg" in fmts:
                             try:
-                                self._render_scene_to_svg(p_front_svg_file, front_items_for_file, jx, jy, dpi=dpi_v)
+                                self._render_scene_to_svg(p_front_svg_file, front_items_for_file, jx, jy, dpi=dpi_v, vector=True)
                             except Exception:
                                 logger.exception(f"Failed to save front SVG for {export_file_name}; continuing")
                     
@@ -5286,9 +5295,31 @@ class NStickerCanvasScreen(Screen):
                                 logger.exception(f"Failed to save back BMP for {export_file_name}; continuing")
                         if "svg" in fmts:
                             try:
-                                self._render_scene_to_svg(p_back_svg_file, back_items_for_file, jx, jy, dpi=dpi_v)
+                                self._render_scene_to_svg(p_back_svg_file, back_items_for_file, jx, jy, dpi=dpi_v, vector=True)
                             except Exception:
                                 logger.exception(f"Failed to save back SVG for {export_file_name}; continuing")
+                if ezd_jobs:
+                    logger.debug(f"Exporting {len(ezd_jobs)} EZD file(s)...")
+                    state.processing_message = f"Exporting {len(ezd_jobs)} EZD file(s)..."
+                    if state.is_cancelled:
+                        return
+
+                    def _ezd_progress(done, total):
+                        state.processing_message = f"Exported {done} of {total} EZD file(s)..."
+
+                    ezd_results = self.ezd_exporter.export_scenes(
+                        ezd_jobs, jx, jy, pen_collection=self._pen_collection,
+                        cancelled=lambda: state.is_cancelled, on_progress=_ezd_progress,
+                    )
+                    if state.is_cancelled:
+                        logger.debug(f"Processing cancelled")
+                        return
+                    ezd_failed = [r for r in ezd_results if r["status"] != "success"]
+                    if ezd_failed:
+                        # The other documents are saved; report every failed one
+                        raise RuntimeError("Failed to export EZD file(s): " + "; ".join(
+                            f"{os.path.basename(r['path'])}: {r['message']}" for r in ezd_failed))
+
                 # Write JSON
                 try:
                     logger.debug(f"Writing JSON file...")
@@ -5297,7 +5328,8 @@ class NStickerCanvasScreen(Screen):
                         return
                     state.processing_message = "Writing JSON file..."
                     with open(json_path, "w", encoding="utf-8") as _f:
-                        json.dump(combined, _f, ensure_ascii=False, indent=2)
+                        # Identical per-ASIN patterns are written once as shared templates
+                        json.dump(compact_product(combined), _f, ensure_ascii=False, indent=2)
                     logger.debug(f"Processing completed")
                     
                 except Exception as e:
@@ -5425,7 +5457,10 @@ class NStickerCanvasScreen(Screen):
             ax_mm, ay_mm = float(x_mm_i), float(y_mm_i)
 
         # next z
-        max_z = max(int(m.get("z", 0)) for _cid, m in self._items.items()) if self._items else 0
+        if self._bulk_depth:
+            max_z = self._bulk_next_z() - 1
+        else:
+            max_z = max(int(m.get("z", 0)) for _cid, m in self._items.items()) if self._items else 0
         self._items[rect] = CanvasObject(
             type="rect",
             w_mm=float(w_mm_i),
@@ -5447,19 +5482,24 @@ class NStickerCanvasScreen(Screen):
             self._items[rect]["label_fill"] = str(text_fill)
         except Exception:
             raise
-        try:
-            self._update_rect_label_image(rect)
-        except Exception:
-            logger.exception("Failed to render rotated rect label on create")
+        if self._bulk_depth:
+            # Rendered once restored styling is applied, see _end_bulk_restore
+            self._bulk_labels.append(rect)
+        else:
+            try:
+                self._update_rect_label_image(rect)
+            except Exception:
+                logger.exception("Failed to render rotated rect label on create")
         # Create overlay to visualize rotation; base rect stays invisible
         self._update_rect_overlay(rect, self._items[rect], new_left, new_top, w, h)
         
         # Auto-save to current ASIN after adding new object
-        try:
-            logger.debug(f"[OBJECT_CREATE] Rect created: id={rect}, label='{label}', x={x_mm:.2f}, y={y_mm:.2f} - auto-saving to ASIN")
-            self._save_current_asin_objects()
-        except Exception:
-            pass
+        if not self._bulk_depth:
+            try:
+                logger.debug(f"[OBJECT_CREATE] Rect created: id={rect}, label='{label}', x={x_mm:.2f}, y={y_mm:.2f} - auto-saving to ASIN")
+                self._save_current_asin_objects()
+            except Exception:
+                pass
         
         return rect
 
@@ -5484,11 +5524,12 @@ class NStickerCanvasScreen(Screen):
         )
         
         # Auto-save to current ASIN after adding new object
-        try:
-            logger.debug(f"[OBJECT_CREATE] Text created: id={tid}, text='{text}', x={x_mm:.2f}, y={y_mm:.2f} - auto-saving to ASIN")
-            self._save_current_asin_objects()
-        except Exception:
-            pass
+        if not self._bulk_depth:
+            try:
+                logger.debug(f"[OBJECT_CREATE] Text created: id={tid}, text='{text}', x={x_mm:.2f}, y={y_mm:.2f} - auto-saving to ASIN")
+                self._save_current_asin_objects()
+            except Exception:
+                pass
         
         return tid
 
@@ -5517,166 +5558,205 @@ class NStickerCanvasScreen(Screen):
             logger.exception("Failed to save current ASIN objects")
     
     def _serialize_scene(self) -> list[dict]:
+        """Serialize `_items` into plain dicts, re-encoding only changed items.
+
+        Each item's encoded form is cached next to the `CanvasObject` it came
+        from and reused while the object's revision (plus, for text and slots,
+        the canvas text) is unchanged. Callers get shallow copies because the
+        export path rewrites paths in the returned dicts in place.
+        """
+        cache = self._scene_cache
         items: list[dict] = []
         for cid, meta in self._items.items():
-            t = meta.get("type")
-            if t == "rect":
-                try:
-                    label_text = str(meta.get("label", ""))
-                    hatch_data = meta.get("hatch_settings")
-                    items.append({
-                        "type": "rect",
-                        "amazon_label": meta.amazon_label,
-                        "is_options": bool(meta.get("is_options", False)),
-                        "is_static": bool(meta.get("is_static", False)),
-                        "label": label_text,
-                        "w_mm": float(meta.get("w_mm", 0.0)),
-                        "h_mm": float(meta.get("h_mm", 0.0)),
-                        "x_mm": float(meta.get("x_mm", 0.0)),
-                        "y_mm": float(meta.get("y_mm", 0.0)),
-                        "outline": str(meta.get("outline", "#d0d0d0")),
-                        "angle": float(meta.get("angle", 0.0) or 0.0),
-                        "z": int(meta.get("z", 0)),
-                        # Persist text styling for rect labels
-                        "label_fill": str(meta.get("label_fill", "#ffffff")),
-                        "label_font_size": int(round(float(meta.get("label_font_size", 10)))),
-                        "label_font_family": str(meta.get("label_font_family", "Myriad Pro")),
-                        # Persist ownership
-                        "owner_major": str(meta.get("owner_major", "")),
-                        # Export file assignment
-                        "export_file": str(meta.get("export_file", "File 1")),
-                        "pen_number": int(meta.get("pen_number", 0)),
-                        # EZD text dimensions
-                        "text_width_mm": float(meta.get("text_width_mm", 5.0)),
-                        "text_height_mm": float(meta.get("text_height_mm", 5.0)),
-                        # Hatch settings per object
-                        "hatch_settings": hatch_data if hatch_data else None,
-                    })
-                except Exception as e:
-                    logger.exception(f"Failed to serialize rect item {cid}: {e}")
-                    continue
-            elif t == "slot":
-                try:
-                    label_id = meta.get("label_id")
-                    label_text = self.canvas.itemcget(label_id, "text") if label_id else ""
-                    items.append({
-                        "type": "slot",
-                        "label": label_text,
-                        "w_mm": float(meta.get("w_mm", 0.0)),
-                        "h_mm": float(meta.get("h_mm", 0.0)),
-                        "x_mm": float(meta.get("x_mm", 0.0)),
-                        "y_mm": float(meta.get("y_mm", 0.0)),
-                        "outline": str(meta.get("outline", "#9a9a9a")),
-                        "z": int(meta.get("z", 0)),
-                        "owner_major": str(meta.get("owner_major", "")),
-                    })
-                except Exception as e:
-                    logger.exception(f"Failed to serialize slot item {cid}: {e}")
-                    continue
-            elif t == "image":
-                try:
-                    custom_imgs_dict = dict(meta.get("custom_images", {}))
-                    custom_img_selected = str(meta.get("custom_image", ""))
-                    hatch_data = meta.get("hatch_settings")
-                    svg_source = meta.get("svg_source_path", "") or ""
-                    logger.info(f"Serializing image cid={cid}: custom_images={custom_imgs_dict}, custom_image={custom_img_selected}")
-                    items.append({
-                        "type": "image",
-                        "amazon_label": meta.amazon_label,
-                        "is_options": bool(meta.get("is_options", False)),
-                        "is_static": bool(meta.get("is_static", False)),
-                        "path": str(meta.get("path", "")),
-                        "mask_path": str(meta.get("mask_path", "") if meta.get("mask_path", "") is not None else ""),
-                        "svg_source_path": str(svg_source) if svg_source else "",
-                        "w_mm": float(meta.get("w_mm", 0.0)),
-                        "h_mm": float(meta.get("h_mm", 0.0)),
-                        "x_mm": float(meta.get("x_mm", 0.0)),
-                        "y_mm": float(meta.get("y_mm", 0.0)),
-                        "angle": float(meta.get("angle", 0.0) or 0.0),
-                        "z": int(meta.get("z", 0)),
-                        "owner_major": str(meta.get("owner_major", "")),
-                        # Export file assignment
-                        "export_file": str(meta.get("export_file", "File 1")),
-                        "pen_number": int(meta.get("pen_number", 0)),
-                        # Custom images (name -> path mapping) and selected custom image
-                        "custom_images": custom_imgs_dict,
-                        "custom_image": custom_img_selected,
-                        # Hatch settings per object
-                        "hatch_settings": hatch_data if hatch_data else None,
-                    })
-                except Exception as e:
-                    logger.exception(f"Failed to serialize image item {cid}: {e}")
-                    continue
-            elif t == "text":
-                try:
-                    txt = self.canvas.itemcget(cid, "text")
-                    fill = meta.get("default_fill", self.canvas.itemcget(cid, "fill") or "white")
-                    x_mm = float(meta.get("x_mm", 0.0))
-                    y_mm = float(meta.get("y_mm", 0.0))
-                    hatch_data = meta.get("hatch_settings")
-                    items.append({
-                        "type": "text",
-                        "amazon_label": meta.amazon_label,
-                        "is_options": bool(meta.get("is_options", False)),
-                        "is_static": bool(meta.get("is_static", False)),
-                        "text": txt,
-                        "x_mm": x_mm,
-                        "y_mm": y_mm,
-                        "fill": fill,
-                        "z": int(meta.get("z", 0)),
-                        "angle": float(meta.get("angle", 0.0) or 0.0),
-                        # Persist text styling for plain text items
-                        "font_size_pt": int(round(float(meta.get("font_size_pt", 12)))),
-                        "font_family": str(meta.get("font_family", "Myriad Pro")),
-                        "owner_major": str(meta.get("owner_major", "")),
-                        # Export file assignment
-                        "export_file": str(meta.get("export_file", "File 1")),
-                        "pen_number": int(meta.get("pen_number", 0)),
-                        # EZD text dimensions
-                        "text_width_mm": float(meta.get("text_width_mm", 5.0)),
-                        "text_height_mm": float(meta.get("text_height_mm", 5.0)),
-                        # Hatch settings per object
-                        "hatch_settings": hatch_data if hatch_data else None,
-                    })
-                except Exception as e:
-                    logger.exception(f"Failed to serialize text item {cid}: {e}")
-                    continue
-            elif t == "barcode":
-                try:
-                    label_text = str(meta.get("label", "Barcode"))
-                    hatch_data = meta.get("hatch_settings")
-                    items.append({
-                        "type": "barcode",
-                        "amazon_label": meta.amazon_label,
-                        "is_options": bool(meta.get("is_options", False)),
-                        "is_static": bool(meta.get("is_static", False)),
-                        "label": label_text,
-                        "w_mm": float(meta.get("w_mm", 0.0)),
-                        "h_mm": float(meta.get("h_mm", 0.0)),
-                        "x_mm": float(meta.get("x_mm", 0.0)),
-                        "y_mm": float(meta.get("y_mm", 0.0)),
-                        "outline": str(meta.get("outline", "black")),
-                        "angle": float(meta.get("angle", 0.0) or 0.0),
-                        "z": int(meta.get("z", 0)),
-                        # Persist text styling for barcode labels
-                        "label_fill": str(meta.get("label_fill", "black")),
-                        "label_font_size": int(round(float(meta.get("label_font_size", 10)))),
-                        "label_font_family": str(meta.get("label_font_family", "Myriad Pro")),
-                        "owner_major": str(meta.get("owner_major", "")),
-                        # Export file assignment
-                        "export_file": str(meta.get("export_file", "File 1")),
-                        "pen_number": int(meta.get("pen_number", 0)),
-                        # EZD text dimensions
-                        "text_width_mm": float(meta.get("text_width_mm", 5.0)),
-                        "text_height_mm": float(meta.get("text_height_mm", 5.0)),
-                        # Hatch settings per object
-                        "hatch_settings": hatch_data if hatch_data else None,
-                    })
-                except Exception as e:
-                    logger.exception(f"Failed to serialize barcode item {cid}: {e}")
-                    continue
+            key = self._scene_item_key(cid, meta)
+            hit = cache.get(cid)
+            if key is None or hit is None or hit[0] is not meta or hit[1] != key:
+                encoded = self._serialize_item(cid, meta)
+                if key is not None:
+                    cache[cid] = (meta, key, encoded)
+            else:
+                encoded = hit[2]
+            if encoded is not None:
+                items.append(dict(encoded))
+        if len(cache) > len(self._items):
+            for cid in [c for c in cache if c not in self._items]:
+                del cache[cid]
         return items
 
+    def _scene_item_key(self, cid: int, meta) -> Optional[tuple]:
+        """Cache key for an item's serialized form, or None when it can't be cached."""
+        if not isinstance(meta, CanvasObject):
+            return None
+        t = meta.type
+        try:
+            if t == "text":
+                return (meta.revision, self.canvas.itemcget(cid, "text"))
+            if t == "slot":
+                label_id = meta.label_id
+                return (meta.revision, self.canvas.itemcget(label_id, "text") if label_id else "")
+        except Exception:
+            return None
+        return (meta.revision,)
+
+    def _serialize_item(self, cid: int, meta) -> Optional[dict]:
+        t = meta.get("type")
+        if t == "rect":
+            try:
+                label_text = str(meta.get("label", ""))
+                hatch_data = meta.get("hatch_settings")
+                return {
+                    "type": "rect",
+                    "amazon_label": meta.amazon_label,
+                    "is_options": bool(meta.get("is_options", False)),
+                    "is_static": bool(meta.get("is_static", False)),
+                    "label": label_text,
+                    "w_mm": float(meta.get("w_mm", 0.0)),
+                    "h_mm": float(meta.get("h_mm", 0.0)),
+                    "x_mm": float(meta.get("x_mm", 0.0)),
+                    "y_mm": float(meta.get("y_mm", 0.0)),
+                    "outline": str(meta.get("outline", "#d0d0d0")),
+                    "angle": float(meta.get("angle", 0.0) or 0.0),
+                    "z": int(meta.get("z", 0)),
+                    # Persist text styling for rect labels
+                    "label_fill": str(meta.get("label_fill", "#ffffff")),
+                    "label_font_size": int(round(float(meta.get("label_font_size", 10)))),
+                    "label_font_family": str(meta.get("label_font_family", "Myriad Pro")),
+                    # Persist ownership
+                    "owner_major": str(meta.get("owner_major", "")),
+                    # Export file assignment
+                    "export_file": str(meta.get("export_file", "File 1")),
+                    "pen_number": int(meta.get("pen_number", 0)),
+                    # EZD text dimensions
+                    "text_width_mm": float(meta.get("text_width_mm", 5.0)),
+                    "text_height_mm": float(meta.get("text_height_mm", 5.0)),
+                    # Hatch settings per object
+                    "hatch_settings": hatch_data if hatch_data else None,
+                }
+            except Exception as e:
+                logger.exception(f"Failed to serialize rect item {cid}: {e}")
+                return None
+        elif t == "slot":
+            try:
+                label_id = meta.get("label_id")
+                label_text = self.canvas.itemcget(label_id, "text") if label_id else ""
+                return {
+                    "type": "slot",
+                    "label": label_text,
+                    "w_mm": float(meta.get("w_mm", 0.0)),
+                    "h_mm": float(meta.get("h_mm", 0.0)),
+                    "x_mm": float(meta.get("x_mm", 0.0)),
+                    "y_mm": float(meta.get("y_mm", 0.0)),
+                    "outline": str(meta.get("outline", "#9a9a9a")),
+                    "z": int(meta.get("z", 0)),
+                    "owner_major": str(meta.get("owner_major", "")),
+                }
+            except Exception as e:
+                logger.exception(f"Failed to serialize slot item {cid}: {e}")
+                return None
+        elif t == "image":
+            try:
+                custom_imgs_dict = dict(meta.get("custom_images", {}))
+                custom_img_selected = str(meta.get("custom_image", ""))
+                hatch_data = meta.get("hatch_settings")
+                svg_source = meta.get("svg_source_path", "") or ""
+                logger.info(f"Serializing image cid={cid}: custom_images={custom_imgs_dict}, custom_image={custom_img_selected}")
+                return {
+                    "type": "image",
+                    "amazon_label": meta.amazon_label,
+                    "is_options": bool(meta.get("is_options", False)),
+                    "is_static": bool(meta.get("is_static", False)),
+                    "path": str(meta.get("path", "")),
+                    "mask_path": str(meta.get("mask_path", "") if meta.get("mask_path", "") is not None else ""),
+                    "svg_source_path": str(svg_source) if svg_source else "",
+                    "w_mm": float(meta.get("w_mm", 0.0)),
+                    "h_mm": float(meta.get("h_mm", 0.0)),
+                    "x_mm": float(meta.get("x_mm", 0.0)),
+                    "y_mm": float(meta.get("y_mm", 0.0)),
+                    "angle": float(meta.get("angle", 0.0) or 0.0),
+                    "z": int(meta.get("z", 0)),
+                    "owner_major": str(meta.get("owner_major", "")),
+                    # Export file assignment
+                    "export_file": str(meta.get("export_file", "File 1")),
+                    "pen_number": int(meta.get("pen_number", 0)),
+                    # Custom images (name -> path mapping) and selected custom image
+                    "custom_images": custom_imgs_dict,
+                    "custom_image": custom_img_selected,
+                    # Hatch settings per object
+                    "hatch_settings": hatch_data if hatch_data else None,
+                }
+            except Exception as e:
+                logger.exception(f"Failed to serialize image item {cid}: {e}")
+                return None
+        elif t == "text":
+            try:
+                txt = self.canvas.itemcget(cid, "text")
+                fill = meta.get("default_fill", self.canvas.itemcget(cid, "fill") or "white")
+                x_mm = float(meta.get("x_mm", 0.0))
+                y_mm = float(meta.get("y_mm", 0.0))
+                hatch_data = meta.get("hatch_settings")
+                return {
+                    "type": "text",
+                    "amazon_label": meta.amazon_label,
+                    "is_options": bool(meta.get("is_options", False)),
+                    "is_static": bool(meta.get("is_static", False)),
+                    "text": txt,
+                    "x_mm": x_mm,
+                    "y_mm": y_mm,
+                    "fill": fill,
+                    "z": int(meta.get("z", 0)),
+                    "angle": float(meta.get("angle", 0.0) or 0.0),
+                    # Persist text styling for plain text items
+                    "font_size_pt": int(round(float(meta.get("font_size_pt", 12)))),
+                    "font_family": str(meta.get("font_family", "Myriad Pro")),
+                    "owner_major": str(meta.get("owner_major", "")),
+                    # Export file assignment
+                    "export_file": str(meta.get("export_file", "File 1")),
+                    "pen_number": int(meta.get("pen_number", 0)),
+                    # EZD text dimensions
+                    "text_width_mm": float(meta.get("text_width_mm", 5.0)),
+                    "text_height_mm": float(meta.get("text_height_mm", 5.0)),
+                    # Hatch settings per object
+                    "hatch_settings": hatch_data if hatch_data else None,
+                }
+            except Exception as e:
+                logger.exception(f"Failed to serialize text item {cid}: {e}")
+                return None
+        elif t == "barcode":
+            try:
+                label_text = str(meta.get("label", "Barcode"))
+                hatch_data = meta.get("hatch_settings")
+                return {
+                    "type": "barcode",
+                    "amazon_label": meta.amazon_label,
+                    "is_options": bool(meta.get("is_options", False)),
+                    "is_static": bool(meta.get("is_static", False)),
+                    "label": label_text,
+                    "w_mm": float(meta.get("w_mm", 0.0)),
+                    "h_mm": float(meta.get("h_mm", 0.0)),
+                    "x_mm": float(meta.get("x_mm", 0.0)),
+                    "y_mm": float(meta.get("y_mm", 0.0)),
+                    "outline": str(meta.get("outline", "black")),
+                    "angle": float(meta.get("angle", 0.0) or 0.0),
+                    "z": int(meta.get("z", 0)),
+                    # Persist text styling for barcode labels
+                    "label_fill": str(meta.get("label_fill", "black")),
+                    "label_font_size": int(round(float(meta.get("label_font_size", 10)))),
+                    "label_font_family": str(meta.get("label_font_family", "Myriad Pro")),
+                    "owner_major": str(meta.get("owner_major", "")),
+                    # Export file assignment
+                    "export_file": str(meta.get("export_file", "File 1")),
+                    "pen_number": int(meta.get("pen_number", 0)),
+                    # EZD text dimensions
+                    "text_width_mm": float(meta.get("text_width_mm", 5.0)),
+                    "text_height_mm": float(meta.get("text_height_mm", 5.0)),
+                    # Hatch settings per object
+                    "hatch_settings": hatch_data if hatch_data else None,
+                }
+            except Exception as e:
+                logger.exception(f"Failed to serialize barcode item {cid}: {e}")
+                return None
+        return None
+
     def _normalize_cmyk(self, value) -> str:
         """Normalize a CMYK-like value into a 4-part comma-separated numeric string.
 
@@ -5713,330 +5793,328 @@ class NStickerCanvasScreen(Screen):
             nums = nums[:4]
         return ",".join(nums)
 
+    def _begin_bulk_restore(self) -> None:
+        """Start a bulk restore; calls nest and only the outermost one counts.
+
+        While active, item creation skips label rendering, image rendering,
+        global z scans, major visibility refreshes and ASIN auto-saves;
+        `_end_bulk_restore` then does each of those once for the whole batch.
+        """
+        self._bulk_depth += 1
+        if self._bulk_depth > 1:
+            return
+        zs = [int(m.get("z", 0)) for m in self._items.values()]
+        self._bulk_max_z = max(zs) if zs else 0
+        self._bulk_min_z = min(zs) if zs else 0
+        self._bulk_labels = []
+        self._bulk_images = []
+
+    def _bulk_next_z(self) -> int:
+        self._bulk_max_z += 1
+        return self._bulk_max_z
+
+    def _end_bulk_restore(self) -> None:
+        self._bulk_depth = max(0, self._bulk_depth - 1)
+        if self._bulk_depth:
+            return
+        labels, self._bulk_labels = self._bulk_labels, []
+        images, self._bulk_images = self._bulk_images, []
+        for cid in labels:
+            if cid in self._items:
+                try:
+                    self._update_rect_label_image(cid, background=True)
+                except Exception:
+                    logger.exception("Failed to render restored label image")
+        # Images get photos from the render queue, nearest the viewport first
+        for cid in images:
+            if cid in self._items:
+                self.images.defer_render(cid)
+        try:
+            self.images.render_visible()
+        except Exception:
+            logger.exception("Failed to render restored images")
+        try:
+            self._refresh_major_visibility()
+        except Exception:
+            logger.exception("Failed to refresh major visibility after restore")
+        self._update_scrollregion()
+        self._raise_all_labels()
+        self.selection._reorder_by_z()
+        self._save_current_asin_objects()
+
     def _restore_scene(self, items: list[dict]):
-        for it in items:
-            t = it.get("type")
-            if t == "rect":
-                outline = str(it.get("outline", "#d0d0d0"))
-                # Prefer saved label fill; otherwise infer from outline for text-rects
-                text_fill = str(it.get("label_fill", "#17a24b" if outline == "#17a24b" else "white"))
-                rid = self._create_rect_at_mm(
-                    it.get("label", ""),
-                    float(it.get("w_mm", 0.0)),
-                    float(it.get("h_mm", 0.0)),
-                    float(it.get("x_mm", 0.0)),
-                    float(it.get("y_mm", 0.0)),
-                    outline=outline,
-                    text_fill=text_fill,
-                    angle=float(it.get("angle", 0.0) or 0.0),
+        self._begin_bulk_restore()
+        try:
+            for it in items:
+                self._restore_item(it)
+                try:
+                    z_val = it.get("z")
+                    if z_val is not None:
+                        self._bulk_max_z = max(self._bulk_max_z, int(z_val))
+                except Exception:
+                    pass
+        finally:
+            self._end_bulk_restore()
+
+    def _restore_item(self, it: dict) -> None:
+        t = it.get("type")
+        if t == "rect":
+            outline = str(it.get("outline", "#d0d0d0"))
+            # Prefer saved label fill; otherwise infer from outline for text-rects
+            text_fill = str(it.get("label_fill", "#17a24b" if outline == "#17a24b" else "white"))
+            rid = self._create_rect_at_mm(
+                it.get("label", ""),
+                float(it.get("w_mm", 0.0)),
+                float(it.get("h_mm", 0.0)),
+                float(it.get("x_mm", 0.0)),
+                float(it.get("y_mm", 0.0)),
+                outline=outline,
+                text_fill=text_fill,
+                angle=float(it.get("angle", 0.0) or 0.0),
+            )
+            try:
+                if rid in self._items:
+                    self._items[rid]["amazon_label"] = it.get("amazon_label", "")
+                    # Restore flags if present
+                    self._items[rid]["is_options"] = self._as_bool(it.get("is_options", False))
+                    self._items[rid]["is_static"] = self._as_bool(it.get("is_static", False))
+                    # Restore export file assignment
+                    self._items[rid]["export_file"] = str(it.get("export_file", "File 1"))
+                    # Restore pen number
+                    self._items[rid]["pen_number"] = int(it.get("pen_number", 0))
+                    # Restore hatch settings
+                    hatch_data = it.get("hatch_settings")
+                    if hatch_data:
+                        self._items[rid]["hatch_settings"] = hatch_data
+                    z_val = it.get("z")
+                    if z_val is not None:
+                        self._items[rid]["z"] = int(z_val)
+                    # Apply restored label styling; the label renders once the restore ends
+                    try:
+                        if "label_fill" in it:
+                            self._items[rid]["label_fill"] = str(it.get("label_fill"))
+                        if "label_font_size" in it:
+                            self._items[rid]["label_font_size"] = int(round(float(it.get("label_font_size", 10))))
+                        if "label_font_family" in it:
+                            self._items[rid]["label_font_family"] = str(it.get("label_font_family", "Myriad Pro"))
+                        restored_width = float(it.get("text_width_mm", 5.0))
+                        restored_height = float(it.get("text_height_mm", 5.0))
+                        self._items[rid].text_width_mm = restored_width
+                        self._items[rid].text_height_mm = restored_height
+                    except Exception:
+                        logger.exception("Failed to apply restored rect label styling")
+            except Exception as e:
+                logger.exception(f"Failed to apply rect z from JSON: {e}")
+        elif t == "slot":
+            outline = str(it.get("outline", "#9a9a9a"))
+            sid = self._create_slot_at_mm(
+                it.get("label", ""),
+                float(it.get("w_mm", 0.0)),
+                float(it.get("h_mm", 0.0)),
+                float(it.get("x_mm", 0.0)),
+                float(it.get("y_mm", 0.0)),
+                owner_major=str(it.get("owner_major", "") or ""),
+            )
+            try:
+                if sid in self._items:
+                    self._items[sid]["amazon_label"] = str(it.get("amazon_label", "") or "")
+                    z_val = it.get("z")
+                    if z_val is not None:
+                        self._items[sid]["z"] = int(z_val)
+            except Exception as e:
+                logger.exception(f"Failed to apply slot z from JSON: {e}")
+        elif t == "image":
+            path_val = str(it.get("path", ""))
+            # Resolve relative path (stored in JSON) to absolute on disk for rendering
+            try:
+                from pathlib import Path as __Path
+                if path_val and not __Path(path_val).is_absolute():
+                    path = str((PRODUCTS_PATH / path_val).resolve())
+                else:
+                    path = path_val
+            except Exception:
+                path = path_val
+            if path and not self.images.is_readable(path):
+                # Its photo is rendered after the restore; an unreadable file would leave an empty item
+                logger.warning(f"Skipping image that cannot be read: {path}")
+            elif path:
+                # Create image at specified mm top-left
+                x_mm = float(it.get("x_mm", 0.0))
+                y_mm = float(it.get("y_mm", 0.0))
+                w_mm = float(it.get("w_mm", 0.0))
+                h_mm = float(it.get("h_mm", 0.0))
+                angle = float(it.get("angle", 0.0) or 0.0)
+                # Create at explicit mm rather than centered
+                # Reuse helper via temporary meta
+                # Compute px and create image
+                jx0, jy0, jx1, jy1 = self._jig_inner_rect_px()
+                ox = self._item_outline_half_px(); oy = self._item_outline_half_px()
+                w_px = int(round(w_mm * MM_TO_PX * self._zoom))
+                h_px = int(round(h_mm * MM_TO_PX * self._zoom))
+                left = jx0 + ox + x_mm * MM_TO_PX * self._zoom
+                top = jy0 + oy + y_mm * MM_TO_PX * self._zoom
+                
+                svg_source_val = str(it.get("svg_source_path", "") or "")
+                svg_source_path = svg_source_val if svg_source_val else None
+                
+                meta = CanvasObject(
+                    type="image",
+                    path=path,
+                    w_mm=float(self._snap_mm(w_mm)),
+                    h_mm=float(self._snap_mm(h_mm)),
+                    x_mm=float(self._snap_mm(x_mm)),
+                    y_mm=float(self._snap_mm(y_mm)),
+                    angle=float(angle),
+                    svg_source_path=svg_source_path,
                 )
+                # Restore optional mask path if provided (resolve if relative)
                 try:
-                    if rid in self._items:
-                        self._items[rid]["amazon_label"] = it.get("amazon_label", "")
-                        # Restore flags if present
-                        self._items[rid]["is_options"] = self._as_bool(it.get("is_options", False))
-                        self._items[rid]["is_static"] = self._as_bool(it.get("is_static", False))
-                        # Restore export file assignment
-                        self._items[rid]["export_file"] = str(it.get("export_file", "File 1"))
-                        # Restore pen number
-                        self._items[rid]["pen_number"] = int(it.get("pen_number", 0))
-                        # Restore hatch settings
-                        hatch_data = it.get("hatch_settings")
-                        if hatch_data:
-                            self._items[rid]["hatch_settings"] = hatch_data
-                        z_val = it.get("z")
-                        if z_val is not None:
-                            self._items[rid]["z"] = int(z_val)
-                        # Apply restored label styling if present and re-render label image
+                    mpath_val = str(it.get("mask_path", "") or "")
+                    if mpath_val:
                         try:
-                            if "label_fill" in it:
-                                self._items[rid]["label_fill"] = str(it.get("label_fill"))
-                            if "label_font_size" in it:
-                                self._items[rid]["label_font_size"] = int(round(float(it.get("label_font_size", 10))))
-                            if "label_font_family" in it:
-                                self._items[rid]["label_font_family"] = str(it.get("label_font_family", "Myriad Pro"))
-                            restored_width = float(it.get("text_width_mm", 5.0))
-                            restored_height = float(it.get("text_height_mm", 5.0))
-                            self._items[rid].text_width_mm = restored_width
-                            self._items[rid].text_height_mm = restored_height
-                            self._update_rect_label_image(rid)
+                            from pathlib import Path as __Path
+                            if not __Path(mpath_val).is_absolute():
+                                mpath = str((PRODUCTS_PATH / mpath_val).resolve())
+                            else:
+                                mpath = mpath_val
                         except Exception:
-                            logger.exception("Failed to apply restored rect label styling")
+                            mpath = mpath_val
+                        meta["mask_path"] = mpath
+                except Exception:
+                    raise
+                meta["amazon_label"] = str(it.get("amazon_label", "") or "")
+                try:
+                    meta["is_options"] = self._as_bool(it.get("is_options", False))
+                    meta["is_static"] = self._as_bool(it.get("is_static", False))
+                    # Restore export file assignment
+                    meta["export_file"] = str(it.get("export_file", "File 1"))
+                    # Restore pen number
+                    meta["pen_number"] = int(it.get("pen_number", 0))
+                    # Restore hatch settings
+                    hatch_data = it.get("hatch_settings")
+                    if hatch_data:
+                        meta["hatch_settings"] = hatch_data
+                    # Restore custom images dict and selected custom image
+                    custom_imgs_from_json = dict(it.get("custom_images", {}))
+                    meta["custom_images"] = custom_imgs_from_json
+                    meta["custom_image"] = str(it.get("custom_image", "") or "")
+                    logger.info(f"Restored image: custom_images={custom_imgs_from_json}, custom_image={meta['custom_image']}, svg_source_path={svg_source_path}")
+                except Exception:
+                    logger.exception("Failed to restore flags for image item")
+                # The photo itself is rendered by _end_bulk_restore
+                bw, bh = self._rotated_bounds_px(w_px, h_px, angle)
+                place_left = left + (w_px - bw) / 2.0
+                place_top = top + (h_px - bh) / 2.0
+                img_id = self.canvas.create_image(place_left, place_top, image="", anchor="nw")
+                meta.canvas_id = img_id
+                # assign next z
+                try:
+                    meta["z"] = int(it["z"]) if it.get("z") is not None else self._bulk_next_z()
                 except Exception as e:
-                    logger.exception(f"Failed to apply rect z from JSON: {e}")
-            elif t == "slot":
-                outline = str(it.get("outline", "#9a9a9a"))
-                sid = self._create_slot_at_mm(
-                    it.get("label", ""),
-                    float(it.get("w_mm", 0.0)),
-                    float(it.get("h_mm", 0.0)),
+                    logger.exception(f"Failed to apply image z from JSON: {e}")
+                    meta["z"] = self._bulk_next_z()
+                # Restore ownership if present
+                try:
+                    owner = str(it.get("owner_major", "") or "")
+                    if owner:
+                        meta["owner_major"] = owner
+                except Exception:
+                    raise
+                self._items[img_id] = meta
+                self._bulk_images.append(img_id)
+        elif t == "text":
+            # Two shapes are encoded as text in saved JSON:
+            # 1) Plain text labels: have a 'text' field and no size.
+            # 2) Text blocks (green rectangles): no 'text' field but have w_mm/h_mm.
+            if ("text" in it) and ("w_mm" not in it and "h_mm" not in it):
+                tid = self._create_text_at_mm(
+                    it.get("text", "Text"),
                     float(it.get("x_mm", 0.0)),
                     float(it.get("y_mm", 0.0)),
-                    owner_major=str(it.get("owner_major", "") or ""),
+                    str(it.get("fill", "white")),
                 )
                 try:
-                    if sid in self._items:
-                        self._items[sid]["amazon_label"] = str(it.get("amazon_label", "") or "")
-                        z_val = it.get("z")
-                        if z_val is not None:
-                            self._items[sid]["z"] = int(z_val)
-                except Exception as e:
-                    logger.exception(f"Failed to apply slot z from JSON: {e}")
-            elif t == "image":
-                path_val = str(it.get("path", ""))
-                # Resolve relative path (stored in JSON) to absolute on disk for rendering
-                try:
-                    from pathlib import Path as __Path
-                    if path_val and not __Path(path_val).is_absolute():
-                        path = str((PRODUCTS_PATH / path_val).resolve())
-                    else:
-                        path = path_val
-                except Exception:
-                    path = path_val
-                if path and os.path.exists(path):
-                    # Create image at specified mm top-left
-                    x_mm = float(it.get("x_mm", 0.0))
-                    y_mm = float(it.get("y_mm", 0.0))
-                    w_mm = float(it.get("w_mm", 0.0))
-                    h_mm = float(it.get("h_mm", 0.0))
-                    angle = float(it.get("angle", 0.0) or 0.0)
-                    # Create at explicit mm rather than centered
-                    # Reuse helper via temporary meta
-                    # Compute px and create image
-                    jx0, jy0, jx1, jy1 = self._jig_inner_rect_px()
-                    ox = self._item_outline_half_px(); oy = self._item_outline_half_px()
-                    w_px = int(round(w_mm * MM_TO_PX * self._zoom))
-                    h_px = int(round(h_mm * MM_TO_PX * self._zoom))
-                    left = jx0 + ox + x_mm * MM_TO_PX * self._zoom
-                    top = jy0 + oy + y_mm * MM_TO_PX * self._zoom
-                    
-                    svg_source_val = str(it.get("svg_source_path", "") or "")
-                    svg_source_path = svg_source_val if svg_source_val else None
-                    
-                    meta = CanvasObject(
-                        type="image",
-                        path=path,
-                        w_mm=float(self._snap_mm(w_mm)),
-                        h_mm=float(self._snap_mm(h_mm)),
-                        x_mm=float(self._snap_mm(x_mm)),
-                        y_mm=float(self._snap_mm(y_mm)),
-                        angle=float(angle),
-                        svg_source_path=svg_source_path,
-                    )
-                    # Restore optional mask path if provided (resolve if relative)
-                    try:
-                        mpath_val = str(it.get("mask_path", "") or "")
-                        if mpath_val:
-                            try:
-                                from pathlib import Path as __Path
-                                if not __Path(mpath_val).is_absolute():
-                                    mpath = str((PRODUCTS_PATH / mpath_val).resolve())
-                                else:
-                                    mpath = mpath_val
-                            except Exception:
-                                mpath = mpath_val
-                            meta["mask_path"] = mpath
-                    except Exception:
-                        raise
-                    meta["amazon_label"] = str(it.get("amazon_label", "") or "")
-                    try:
-                        meta["is_options"] = self._as_bool(it.get("is_options", False))
-                        meta["is_static"] = self._as_bool(it.get("is_static", False))
-                        # Restore export file assignment
-                        meta["export_file"] = str(it.get("export_file", "File 1"))
-                        # Restore pen number
-                        meta["pen_number"] = int(it.get("pen_number", 0))
-                        # Restore hatch settings
-                        hatch_data = it.get("hatch_settings")
-                        if hatch_data:
-                            meta["hatch_settings"] = hatch_data
-                        # Restore custom images dict and selected custom image
-                        custom_imgs_from_json = dict(it.get("custom_images", {}))
-                        meta["custom_images"] = custom_imgs_from_json
-                        meta["custom_image"] = str(it.get("custom_image", "") or "")
-                        logger.info(f"Restored image: custom_images={custom_imgs_from_json}, custom_image={meta['custom_image']}, svg_source_path={svg_source_path}")
-                    except Exception:
-                        logger.exception("Failed to restore flags for image item")
-                    photo = self._render_photo(meta, max(1, int(w_px)), max(1, int(h_px)))
-                    if photo is not None:
-                        bw, bh = self._rotated_bounds_px(w_px, h_px, angle)
-                        place_left = left + (w_px - bw) / 2.0
-                        place_top = top + (h_px - bh) / 2.0
-                        img_id = self.canvas.create_image(place_left, place_top, image=photo, anchor="nw")
-                        meta.canvas_id = img_id
-                        # assign next z
-                        max_z = max(int(m.get("z", 0)) for _cid, m in self._items.items()) if self._items else 0
+                    if tid in self._items:
+                        self._items[tid]["amazon_label"] = str(it.get("amazon_label", "") or "")
                         try:
-                            meta["z"] = int(it.get("z", int(max_z + 1)))
-                        except Exception as e:
-                            logger.exception(f"Failed to apply image z from JSON: {e}")
-                            meta["z"] = int(max_z + 1)
-                        # Restore ownership if present
+                            self._items[tid]["is_options"] = self._as_bool(it.get("is_options", False))
+                            self._items[tid]["is_static"] = self._as_bool(it.get("is_static", False))
+                            # Restore export file assignment
+                            self._items[tid]["export_file"] = str(it.get("export_file", "File 1"))
+                            # Restore pen number
+                            self._items[tid]["pen_number"] = int(it.get("pen_number", 0))
+                            # Restore hatch settings
+                            hatch_data = it.get("hatch_settings")
+                            if hatch_data:
+                                self._items[tid]["hatch_settings"] = hatch_data
+                        except Exception:
+                            logger.exception("Failed to restore flags for text item")
+                        # Restore ownership
                         try:
                             owner = str(it.get("owner_major", "") or "")
                             if owner:
-                                meta["owner_major"] = owner
+                                self._items[tid]["owner_major"] = owner
                         except Exception:
                             raise
-                        self._items[img_id] = meta
-            elif t == "text":
-                # Two shapes are encoded as text in saved JSON:
-                # 1) Plain text labels: have a 'text' field and no size.
-                # 2) Text blocks (green rectangles): no 'text' field but have w_mm/h_mm.
-                if ("text" in it) and ("w_mm" not in it and "h_mm" not in it):
-                    tid = self._create_text_at_mm(
-                        it.get("text", "Text"),
-                        float(it.get("x_mm", 0.0)),
-                        float(it.get("y_mm", 0.0)),
-                        str(it.get("fill", "white")),
-                    )
-                    try:
-                        if tid in self._items:
-                            self._items[tid]["amazon_label"] = str(it.get("amazon_label", "") or "")
-                            try:
-                                self._items[tid]["is_options"] = self._as_bool(it.get("is_options", False))
-                                self._items[tid]["is_static"] = self._as_bool(it.get("is_static", False))
-                                # Restore export file assignment
-                                self._items[tid]["export_file"] = str(it.get("export_file", "File 1"))
-                                # Restore pen number
-                                self._items[tid]["pen_number"] = int(it.get("pen_number", 0))
-                                # Restore hatch settings
-                                hatch_data = it.get("hatch_settings")
-                                if hatch_data:
-                                    self._items[tid]["hatch_settings"] = hatch_data
-                            except Exception:
-                                logger.exception("Failed to restore flags for text item")
-                            # Restore ownership
-                            try:
-                                owner = str(it.get("owner_major", "") or "")
-                                if owner:
-                                    self._items[tid]["owner_major"] = owner
-                            except Exception:
-                                raise
-                            z_val = it.get("z")
-                            if z_val is not None:
-                                self._items[tid]["z"] = int(z_val)
-                            # Apply restored text styling
-                            try:
-                                fam = str(it.get("font_family", "Myriad Pro"))
-                                try:
-                                    base_pt = int(round(float(it.get("font_size_pt", 12))))
-                                except Exception:
-                                    base_pt = 12
-                                self._items[tid]["font_family"] = fam
-                                self._items[tid]["font_size_pt"] = int(base_pt)
-                                self.canvas.itemconfig(tid, font=(fam, self._scaled_pt(base_pt), "bold"))
-                                self._items[tid].text_width_mm = float(it.get("text_width_mm", 5.0))
-                                self._items[tid].text_height_mm = float(it.get("text_height_mm", 5.0))
-                            except Exception:
-                                logger.exception("Failed to apply restored text styling")
-                    except Exception as e:
-                        logger.exception(f"Failed to apply text z from JSON: {e}")
-                else:
-                    rid = self._create_rect_at_mm(
-                        "Text",
-                        float(it["w_mm"]),
-                        float(it["h_mm"]),
-                        float(it["x_mm"]),
-                        float(it["y_mm"]),
-                        outline="#17a24b",
-                        text_fill=str(it.get("label_fill", "#17a24b")),
-                        angle=float(it.get("angle", 0.0) or 0.0),
-                        text_width_mm=float(it.get("text_width_mm", 5.0)),
-                        text_height_mm=float(it.get("text_height_mm", 5.0)),
-                    )
-                    try:
-                        if rid in self._items:
-                            self._items[rid]["amazon_label"] = str(it.get("amazon_label", "") or "")
-                            try:
-                                self._items[rid]["is_options"] = self._as_bool(it.get("is_options", False))
-                                self._items[rid]["is_static"] = self._as_bool(it.get("is_static", False))
-                                # Restore export file assignment
-                                self._items[rid]["export_file"] = str(it.get("export_file", "File 1"))
-                                # Restore pen number
-                                self._items[rid]["pen_number"] = int(it.get("pen_number", 0))
-                                # Restore hatch settings
-                                hatch_data = it.get("hatch_settings")
-                                if hatch_data:
-                                    self._items[rid]["hatch_settings"] = hatch_data
-                            except Exception:
-                                logger.exception("Failed to restore flags for text-rect item")
-                            # Restore ownership
-                            try:
-                                owner = str(it.get("owner_major", "") or "")
-                                if owner:
-                                    self._items[rid]["owner_major"] = owner
-                            except Exception:
-                                raise
-                            z_val = it.get("z")
-                            if z_val is not None:
-                                self._items[rid]["z"] = int(z_val)
-                            # Apply restored label styling for text-rects
+                        z_val = it.get("z")
+                        if z_val is not None:
+                            self._items[tid]["z"] = int(z_val)
+                        # Apply restored text styling
+                        try:
+                            fam = str(it.get("font_family", "Myriad Pro"))
                             try:
-                                if "label_fill" in it:
-                                    self._items[rid]["label_fill"] = str(it.get("label_fill"))
-                                if "label_font_size" in it:
-                                    self._items[rid]["label_font_size"] = int(round(float(it.get("label_font_size", 10))))
-                                if "label_font_family" in it:
-                                    self._items[rid]["label_font_family"] = str(it.get("label_font_family", "Myriad Pro"))
-                                self._update_rect_label_image(rid)
+                                base_pt = int(round(float(it.get("font_size_pt", 12))))
                             except Exception:
-                                logger.exception("Failed to apply restored text-rect label styling")
-                    except Exception as e:
-                        logger.exception(f"Failed to apply text-rect z from JSON: {e}")
-            elif t == "barcode":
-                # Restore barcode as a rectangle with saved styling and label
-                outline = str(it.get("outline", "black"))
-                text_fill = str(it.get("label_fill", "black"))
-                label_text = str(it.get("label", "Barcode"))
+                                base_pt = 12
+                            self._items[tid]["font_family"] = fam
+                            self._items[tid]["font_size_pt"] = int(base_pt)
+                            self.canvas.itemconfig(tid, font=(fam, self._scaled_pt(base_pt), "bold"))
+                            self._items[tid].text_width_mm = float(it.get("text_width_mm", 5.0))
+                            self._items[tid].text_height_mm = float(it.get("text_height_mm", 5.0))
+                        except Exception:
+                            logger.exception("Failed to apply restored text styling")
+                except Exception as e:
+                    logger.exception(f"Failed to apply text z from JSON: {e}")
+            else:
                 rid = self._create_rect_at_mm(
-                    label_text,
-                    float(it.get("w_mm", 80.0)),
-                    float(it.get("h_mm", 30.0)),
-                    float(it.get("x_mm", 0.0)),
-                    float(it.get("y_mm", 0.0)),
-                    outline=outline,
-                    text_fill=text_fill,
+                    "Text",
+                    float(it["w_mm"]),
+                    float(it["h_mm"]),
+                    float(it["x_mm"]),
+                    float(it["y_mm"]),
+                    outline="#17a24b",
+                    text_fill=str(it.get("label_fill", "#17a24b")),
                     angle=float(it.get("angle", 0.0) or 0.0),
+                    text_width_mm=float(it.get("text_width_mm", 5.0)),
+                    text_height_mm=float(it.get("text_height_mm", 5.0)),
                 )
                 try:
                     if rid in self._items:
-                        # Change type from rect to barcode
-                        self._items[rid]["type"] = "barcode"
-                        self._items[rid]["amazon_label"] = it.get("amazon_label", "")
-                        # Restore flags if present
-                        self._items[rid]["is_options"] = self._as_bool(it.get("is_options", False))
-                        self._items[rid]["is_static"] = self._as_bool(it.get("is_static", False))
-                        # Restore export file assignment
-                        self._items[rid]["export_file"] = str(it.get("export_file", "File 1"))
-                        # Restore pen number
-                        self._items[rid]["pen_number"] = int(it.get("pen_number", 0))
-                        # Restore hatch settings
-                        hatch_data = it.get("hatch_settings")
-                        if hatch_data:
-                            self._items[rid]["hatch_settings"] = hatch_data
-                        z_val = it.get("z")
-                        if z_val is not None:
-                            self._items[rid]["z"] = int(z_val)
-                        # Remove rotated overlay for barcode (not used) and ensure base rect is visible
+                        self._items[rid]["amazon_label"] = str(it.get("amazon_label", "") or "")
                         try:
-                            old_rot = int(self._items[rid].get("rot_id", 0) or 0)
+                            self._items[rid]["is_options"] = self._as_bool(it.get("is_options", False))
+                            self._items[rid]["is_static"] = self._as_bool(it.get("is_static", False))
+                            # Restore export file assignment
+                            self._items[rid]["export_file"] = str(it.get("export_file", "File 1"))
+                            # Restore pen number
+                            self._items[rid]["pen_number"] = int(it.get("pen_number", 0))
+                            # Restore hatch settings
+                            hatch_data = it.get("hatch_settings")
+                            if hatch_data:
+                                self._items[rid]["hatch_settings"] = hatch_data
                         except Exception:
-                            old_rot = 0
-                        if old_rot:
-                            try:
-                                self.canvas.delete(old_rot)
-                            except Exception:
-                                pass
-                            self._items[rid]["rot_id"] = None
-                        # Ensure the base rect has a visible fill and outline for barcode
+                            logger.exception("Failed to restore flags for text-rect item")
+                        # Restore ownership
                         try:
-                            self.canvas.itemconfig(rid, outline=outline or "black", fill="white", width=2)
+                            owner = str(it.get("owner_major", "") or "")
+                            if owner:
+                                self._items[rid]["owner_major"] = owner
                         except Exception:
-                            pass
-                        # Keep barcode label in black by default unless overridden by saved data
-                        self._items[rid]["label_fill"] = text_fill or "black"
-                        # Apply restored label styling if present
+                            raise
+                        z_val = it.get("z")
+                        if z_val is not None:
+                            self._items[rid]["z"] = int(z_val)
+                        # Apply restored label styling for text-rects
                         try:
                             if "label_fill" in it:
                                 self._items[rid]["label_fill"] = str(it.get("label_fill"))
@@ -6044,13 +6122,76 @@ class NStickerCanvasScreen(Screen):
                                 self._items[rid]["label_font_size"] = int(round(float(it.get("label_font_size", 10))))
                             if "label_font_family" in it:
                                 self._items[rid]["label_font_family"] = str(it.get("label_font_family", "Myriad Pro"))
-                            self._items[rid].text_width_mm = float(it.get("text_width_mm", 5.0))
-                            self._items[rid].text_height_mm = float(it.get("text_height_mm", 5.0))
-                            self._update_rect_label_image(rid)
                         except Exception:
-                            logger.exception("Failed to apply restored barcode label styling")
+                            logger.exception("Failed to apply restored text-rect label styling")
                 except Exception as e:
-                    logger.exception(f"Failed to restore barcode from JSON: {e}")
+                    logger.exception(f"Failed to apply text-rect z from JSON: {e}")
+        elif t == "barcode":
+            # Restore barcode as a rectangle with saved styling and label
+            outline = str(it.get("outline", "black"))
+            text_fill = str(it.get("label_fill", "black"))
+            label_text = str(it.get("label", "Barcode"))
+            rid = self._create_rect_at_mm(
+                label_text,
+                float(it.get("w_mm", 80.0)),
+                float(it.get("h_mm", 30.0)),
+                float(it.get("x_mm", 0.0)),
+                float(it.get("y_mm", 0.0)),
+                outline=outline,
+                text_fill=text_fill,
+                angle=float(it.get("angle", 0.0) or 0.0),
+            )
+            try:
+                if rid in self._items:
+                    # Change type from rect to barcode
+                    self._items[rid]["type"] = "barcode"
+                    self._items[rid]["amazon_label"] = it.get("amazon_label", "")
+                    # Restore flags if present
+                    self._items[rid]["is_options"] = self._as_bool(it.get("is_options", False))
+                    self._items[rid]["is_static"] = self._as_bool(it.get("is_static", False))
+                    # Restore export file assignment
+                    self._items[rid]["export_file"] = str(it.get("export_file", "File 1"))
+                    # Restore pen number
+                    self._items[rid]["pen_number"] = int(it.get("pen_number", 0))
+                    # Restore hatch settings
+                    hatch_data = it.get("hatch_settings")
+                    if hatch_data:
+                        self._items[rid]["hatch_settings"] = hatch_data
+                    z_val = it.get("z")
+                    if z_val is not None:
+                        self._items[rid]["z"] = int(z_val)
+                    # Remove rotated overlay for barcode (not used) and ensure base rect is visible
+                    try:
+                        old_rot = int(self._items[rid].get("rot_id", 0) or 0)
+                    except Exception:
+                        old_rot = 0
+                    if old_rot:
+                        try:
+                            self.canvas.delete(old_rot)
+                        except Exception:
+                            pass
+                        self._items[rid]["rot_id"] = None
+                    # Ensure the base rect has a visible fill and outline for barcode
+                    try:
+                        self.canvas.itemconfig(rid, outline=outline or "black", fill="white", width=2)
+                    except Exception:
+                        pass
+                    # Keep barcode label in black by default unless overridden by saved data
+                    self._items[rid]["label_fill"] = text_fill or "black"
+                    # Apply restored label styling if present
+                    try:
+                        if "label_fill" in it:
+                            self._items[rid]["label_fill"] = str(it.get("label_fill"))
+                        if "label_font_size" in it:
+                            self._items[rid]["label_font_size"] = int(round(float(it.get("label_font_size", 10))))
+                        if "label_font_family" in it:
+                            self._items[rid]["label_font_family"] = str(it.get("label_font_family", "Myriad Pro"))
+                        self._items[rid].text_width_mm = float(it.get("text_width_mm", 5.0))
+                        self._items[rid].text_height_mm = float(it.get("text_height_mm", 5.0))
+                    except Exception:
+                        logger.exception("Failed to apply restored barcode label styling")
+            except Exception as e:
+                logger.exception(f"Failed to restore barcode from JSON: {e}")
 
     def _maybe_load_saved_product(self):
         # Load saved non-sticker scene when editing an existing product
@@ -6060,9 +6201,8 @@ class NStickerCanvasScreen(Screen):
         path = PRODUCTS_PATH / f"{prod}.json"
         if not path.exists():
             return
-        import json as _json
         with path.open("r", encoding="utf-8") as f:
-            data = _json.load(f)
+            data = load_product(f)
 
         sku_val = data.get("ASINs") or []
         sku_name_val = str(data.get("SkuName") or prod)
@@ -6204,11 +6344,11 @@ class NStickerCanvasScreen(Screen):
         
         # If we have per-ASIN objects, load them into _asin_objects
         if use_per_asin_format:
-            import copy
             logger.debug(f"[RESTORE] Loading per-ASIN objects for {len(asin_objects_data)} ASINs")
             for asin in self._asin_list:
                 if asin in asin_objects_data:
-                    asin_data = asin_objects_data[asin]
+                    # Resolved from the shared template; already a private copy
+                    asin_data = asin_objects_data.copy_of(asin)
                     
                     # Data is always in grouped format (with slots)
                     frontside = asin_data.get("Frontside", [])
@@ -6216,10 +6356,10 @@ class NStickerCanvasScreen(Screen):
                     
                     # Store grouped format
                     self._asin_objects[asin] = {
-                        "front_grouped": copy.deepcopy(frontside),
-                        "back_grouped": copy.deepcopy(backside),
-                        "front_barcode": copy.deepcopy(asin_data.get("FrontsideBarcode")) if "FrontsideBarcode" in asin_data else None,
-                        "back_barcode": copy.deepcopy(asin_data.get("BacksideBarcode")) if "BacksideBarcode" in asin_data else None,
+                        "front_grouped": frontside,
+                        "back_grouped": backside,
+                        "front_barcode": asin_data.get("FrontsideBarcode"),
+                        "back_barcode": asin_data.get("BacksideBarcode"),
                     }
                     logger.debug(f"[RESTORE] Loaded '{asin}' grouped format with {len(frontside)} front groups, {len(backside)} back groups")
             
@@ -6468,26 +6608,31 @@ class NStickerCanvasScreen(Screen):
                 pass
             # Clear anything auto-created and recreate slots from JSON for exact positions
             self._clear_scene(keep_slots=False)
-            for sl in front_slots:
-                sid = self._create_slot_at_mm(
-                    str(sl.get("label", "")),
-                    float(sl.get("w_mm", 0.0)),
-                    float(sl.get("h_mm", 0.0)),
-                    float(sl.get("x_mm", 0.0)),
-                    float(sl.get("y_mm", 0.0)),
-                    owner_major=str(sl.get("owner_major", "") or ""),
-                )
-                try:
-                    if sid in self._items:
-                        z_val = sl.get("z")
-                        if z_val is not None:
-                            self._items[sid]["z"] = int(z_val)
-                except Exception as e:
-                    logger.exception(f"Failed to apply saved slot z from JSON: {e}")
-            # Restore front items on canvas; stash back items for toggling
-            if front_items:
-                logger.info(f"[RESTORE] Restoring {len(front_items)} front items...")
-                self._restore_scene(front_items)
+            # Slots and front items are created as one bulk restore
+            self._begin_bulk_restore()
+            try:
+                for sl in front_slots:
+                    sid = self._create_slot_at_mm(
+                        str(sl.get("label", "")),
+                        float(sl.get("w_mm", 0.0)),
+                        float(sl.get("h_mm", 0.0)),
+                        float(sl.get("x_mm", 0.0)),
+                        float(sl.get("y_mm", 0.0)),
+                        owner_major=str(sl.get("owner_major", "") or ""),
+                    )
+                    try:
+                        if sid in self._items:
+                            z_val = sl.get("z")
+                            if z_val is not None:
+                                self._items[sid]["z"] = int(z_val)
+                    except Exception as e:
+                        logger.exception(f"Failed to apply saved slot z from JSON: {e}")
+                # Restore front items on canvas; stash back items for toggling
+                if front_items:
+                    logger.info(f"[RESTORE] Restoring {len(front_items)} front items...")
+                    self._restore_scene(front_items)
+            finally:
+                self._end_bulk_restore()
             self._scene_store["front"] = list(front_items)
             self._scene_store["back"] = list(back_items)
             self._redraw_jig(center=False)
@@ -1,3 +1,4 @@
 from .ezcad_sdk import *
 from .sdk_client import SDKClient
-from .sdk_server import SDKServer
\ No newline at end of file
+from .sdk_server import SDKServer
+from .sdk_pool import SDKClientPool
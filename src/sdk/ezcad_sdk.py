@@ -6,6 +6,7 @@ from pathlib import Path
 from enum import IntEnum
 from typing import Optional
 
+SDK_BACKEND_ENV = "ZYNTRA_SDK_BACKEND"
 
 class LMC1Error(IntEnum):
     """Error codes returned by LMC control board operations."""
@@ -105,7 +106,7 @@ class DLLFunctionLoader:
     """Helper class for setting up DLL function signatures and return types."""
     
     @staticmethod
-    def setup_dll_functions(dll: ctypes.WinDLL):
+    def setup_dll_functions(dll: "ctypes.WinDLL"):
         """Configure argument types and return types for all DLL functions.
         
         Args:
@@ -461,7 +462,14 @@ class EzcadSDK:
                     cls._instance = super().__new__(cls)
         return cls._instance
 
-    def __init__(self):
+    def __init__(self, backend: Optional[str] = None):
+        """Load the DLL backend on first construction.
+        
+        Args:
+            backend: ``"dll"`` for MarkEzd.dll or ``"fake"`` for the in-memory
+                ``FakeMarkEzdDll``. Defaults to the ``ZYNTRA_SDK_BACKEND``
+                environment variable, falling back to ``"dll"``.
+        """
         if getattr(self, "_init_done", False):
             return
         with self.__class__._lock:
@@ -471,10 +479,18 @@ class EzcadSDK:
 
         self.dll = None
         self.initialized = False
+        self.backend = backend or os.environ.get(SDK_BACKEND_ENV, "dll")
         self.dll = self._load_dll()
     
     def _load_dll(self):
-        dll = ctypes.WinDLL(str(self._SDK_PATH / "MarkEzd.dll"))
+        if self.backend == "fake":
+            try:
+                from .fake_dll import FakeMarkEzdDll
+            except ImportError:
+                from fake_dll import FakeMarkEzdDll
+            dll = FakeMarkEzdDll()
+        else:
+            dll = ctypes.WinDLL(str(self._SDK_PATH / "MarkEzd.dll"))
         DLLFunctionLoader.setup_dll_functions(dll)
         return dll
     
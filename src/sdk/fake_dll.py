@@ -0,0 +1,368 @@
+import ctypes
+import json
+import math
+import os
+import threading
+import time
+from collections import Counter
+from typing import Optional
+
+
+DEFAULT_LATENCIES = {
+    "default": 0.0002,
+    "lmc1_Initial": 1.5,
+    "lmc1_Close": 0.05,
+    "lmc1_LoadEzdFile": 0.05,
+    "lmc1_SaveEntLibToFile": 0.05,
+    "lmc1_AddTextToLib": 0.002,
+    "lmc1_AddFileToLib": 0.02,
+    "lmc1_AddBarCodeToLib": 0.003,
+    "lmc1_AddCurveToLib": 0.001,
+    "lmc1_CopyEnt": 0.0005,
+    "lmc1_GetEntSize": 0.0003,
+}
+
+FAKE_FILE_SIZE_MM = 20.0
+FAKE_BARCODE_MODULES = 11
+
+SUCCESS = 0
+READFILE = 12
+PARAMERROR = 16
+SAVEFILE = 17
+NOFINDENT = 18
+
+
+def _out(ref, value):
+    """Write ``value`` into a ctypes out-parameter passed as ``byref`` or buffer."""
+    target = getattr(ref, "_obj", ref)
+    target.value = value
+
+
+class _FakeFunction:
+    """Callable stand-in for a DLL export; accepts argtypes/restype assignment."""
+
+    def __init__(self, dll: "FakeMarkEzdDll", name: str, impl):
+        self._dll = dll
+        self._name = name
+        self._impl = impl
+        self.argtypes = None
+        self.restype = None
+
+    def __call__(self, *args):
+        return self._dll._invoke(self._name, self._impl, args)
+
+
+class FakeMarkEzdDll:
+    """In-process replacement for ``MarkEzd.dll``.
+
+    Implements the ``lmc1_*`` surface configured by ``DLLFunctionLoader`` on
+    top of an in-memory entity database, so the SDK bridge can run and be
+    profiled without the laser controller. Entities are tracked as axis
+    aligned bounding boxes which is enough for the sizing, scaling, moving
+    and rotating logic used by the exporter. Every call sleeps for a
+    configurable latency to approximate the cost of the real DLL.
+
+    Args:
+        latencies: Per-function latency overrides in seconds. The
+            ``"default"`` key applies to functions without an entry.
+        latency_scale: Multiplier applied to every latency; ``0`` disables
+            sleeping entirely.
+    """
+
+    _FUNCTIONS = (
+        "lmc1_Initial", "lmc1_Close", "lmc1_LoadEzdFile", "lmc1_Mark", "lmc1_MarkEntity",
+        "lmc1_MarkEntityFly", "lmc1_ClearEntLib", "lmc1_SaveEntLibToFile", "lmc1_SetFontParam",
+        "lmc1_SetHatchParam", "lmc1_AddTextToLib", "lmc1_AddFileToLib", "lmc1_AddCurveToLib",
+        "lmc1_AddBarCodeToLib", "lmc1_ChangeTextByName", "lmc1_GetTextByName", "lmc1_GetEntityCount",
+        "lmc1_GetEntityName", "lmc1_GetEntSize", "lmc1_MoveEnt", "lmc1_ScaleEnt", "lmc1_MirrorEnt",
+        "lmc1_RotateEnt", "lmc1_DeleteEnt", "lmc1_CopyEnt", "lmc1_ChangeEntName", "lmc1_ReadPort",
+        "lmc1_WritePort", "lmc1_LaserOn", "lmc1_GetCurCoor", "lmc1_GotoPos", "lmc1_MarkLine",
+        "lmc1_MarkPoint", "lmc1_RedLightMark", "lmc1_SetPenParam", "lmc1_GetPenParam",
+        "lmc1_SetPenParam2", "lmc1_GetPenParam2", "lmc1_GetPenNumberFromEnt", "lmc1_SetEntAllChildPen",
+    )
+
+    def __init__(self, latencies: Optional[dict] = None, latency_scale: float = 1.0):
+        self.latencies = dict(DEFAULT_LATENCIES)
+        self.latencies.update(latencies or {})
+        self.latency_scale = latency_scale
+        self.call_counts = Counter()
+        self.entities: dict[str, dict] = {}
+        self.font = {"name": "Arial", "height": 5.0, "width": 5.0}
+        self.pens: dict[int, tuple] = {}
+        self.pens_wobble: dict[int, tuple] = {}
+        self.port = 0
+        self.position = (0.0, 0.0)
+        self._lock = threading.Lock()
+        self._functions = {name: _FakeFunction(self, name, getattr(self, f"_{name}")) for name in self._FUNCTIONS}
+
+    def __getattr__(self, name: str):
+        functions = self.__dict__.get("_functions", {})
+        if name in functions:
+            return functions[name]
+        raise AttributeError(name)
+
+    def _invoke(self, name: str, impl, args):
+        with self._lock:
+            self.call_counts[name] += 1
+            delay = self.latencies.get(name, self.latencies["default"]) * self.latency_scale
+            if delay > 0:
+                time.sleep(delay)
+            return impl(*args)
+
+    @staticmethod
+    def _anchored_box(x: float, y: float, w: float, h: float, align: int) -> list[float]:
+        if align in (0, 6, 7):
+            min_x = x
+        elif align in (2, 3, 4):
+            min_x = x - w
+        else:
+            min_x = x - w / 2
+        if align in (0, 1, 2):
+            min_y = y
+        elif align in (4, 5, 6):
+            min_y = y - h
+        else:
+            min_y = y - h / 2
+        return [min_x, min_y, min_x + w, min_y + h]
+
+    def _add_entity(self, name: str, kind: str, box: list[float], z: float, pen: int, text: str = "", angle: float = 0.0) -> int:
+        entity = {"kind": kind, "box": box, "z": z, "pen": pen, "text": text}
+        self.entities[name] = entity
+        if angle:
+            self._rotate(entity, (box[0] + box[2]) / 2, (box[1] + box[3]) / 2, angle)
+        return SUCCESS
+
+    @staticmethod
+    def _rotate(entity: dict, cx: float, cy: float, angle: float):
+        rad = math.radians(angle)
+        cos_a, sin_a = math.cos(rad), math.sin(rad)
+        min_x, min_y, max_x, max_y = entity["box"]
+        xs, ys = [], []
+        for px, py in ((min_x, min_y), (max_x, min_y), (max_x, max_y), (min_x, max_y)):
+            dx, dy = px - cx, py - cy
+            xs.append(cx + dx * cos_a - dy * sin_a)
+            ys.append(cy + dx * sin_a + dy * cos_a)
+        entity["box"] = [min(xs), min(ys), max(xs), max(ys)]
+
+    def _lmc1_Initial(self, path, test_mode, hwnd):
+        return SUCCESS
+
+    def _lmc1_Close(self):
+        return SUCCESS
+
+    def _lmc1_LoadEzdFile(self, filename):
+        if not os.path.exists(filename):
+            return READFILE
+        try:
+            with open(filename, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return READFILE
+        self.entities = data.get("entities", {})
+        return SUCCESS
+
+    def _lmc1_Mark(self, fly):
+        return SUCCESS
+
+    def _lmc1_MarkEntity(self, name):
+        return SUCCESS if name in self.entities else NOFINDENT
+
+    def _lmc1_MarkEntityFly(self, name):
+        return SUCCESS if name in self.entities else NOFINDENT
+
+    def _lmc1_ClearEntLib(self):
+        self.entities.clear()
+        return SUCCESS
+
+    def _lmc1_SaveEntLibToFile(self, filename):
+        try:
+            with open(filename, "w", encoding="utf-8") as f:
+                json.dump({"entities": self.entities}, f)
+        except OSError:
+            return SAVEFILE
+        return SUCCESS
+
+    def _lmc1_SetFontParam(self, name, height, width, char_angle, char_space, line_space, equal_width):
+        self.font = {"name": name, "height": height, "width": width}
+        return SUCCESS
+
+    def _lmc1_SetHatchParam(self, *args):
+        return SUCCESS
+
+    def _lmc1_AddTextToLib(self, text, name, x, y, z, align, angle, pen, hatch):
+        w = self.font["width"] * max(1, len(text))
+        h = self.font["height"]
+        return self._add_entity(name, "text", self._anchored_box(x, y, w, h, align), z, pen, text, angle)
+
+    def _lmc1_AddFileToLib(self, filename, name, x, y, z, align, ratio, pen, hatch):
+        if not os.path.exists(filename):
+            return READFILE
+        size = FAKE_FILE_SIZE_MM * (ratio or 1.0)
+        return self._add_entity(name, "file", self._anchored_box(x, y, size, size, align), z, pen, filename)
+
+    def _lmc1_AddCurveToLib(self, points, count, name, pen, hatch):
+        xs = [points[i * 2] for i in range(count)]
+        ys = [points[i * 2 + 1] for i in range(count)]
+        if not xs:
+            return PARAMERROR
+        return self._add_entity(name, "curve", [min(xs), min(ys), max(xs), max(ys)], 0.0, pen)
+
+    def _lmc1_AddBarCodeToLib(self, text, name, x, y, z, align, pen, hatch, barcode_type, attrib, height, narrow_width, *rest):
+        w = (len(text) * FAKE_BARCODE_MODULES + 35) * narrow_width
+        return self._add_entity(name, "barcode", self._anchored_box(x, y, w, height, align), z, pen, text)
+
+    def _lmc1_ChangeTextByName(self, name, text):
+        if name not in self.entities:
+            return NOFINDENT
+        self.entities[name]["text"] = text
+        return SUCCESS
+
+    def _lmc1_GetTextByName(self, name, buffer):
+        if name not in self.entities:
+            return NOFINDENT
+        _out(buffer, self.entities[name]["text"])
+        return SUCCESS
+
+    def _lmc1_GetEntityCount(self):
+        return len(self.entities)
+
+    def _lmc1_GetEntityName(self, index, buffer):
+        names = list(self.entities)
+        if not 0 <= index < len(names):
+            return PARAMERROR
+        _out(buffer, names[index])
+        return SUCCESS
+
+    def _lmc1_GetEntSize(self, name, min_x, min_y, max_x, max_y, z):
+        if name:
+            entity = self.entities.get(name)
+            if entity is None:
+                return NOFINDENT
+            boxes, z_value = [entity["box"]], entity["z"]
+        else:
+            boxes, z_value = [e["box"] for e in self.entities.values()], 0.0
+            if not boxes:
+                return NOFINDENT
+        _out(min_x, min(b[0] for b in boxes))
+        _out(min_y, min(b[1] for b in boxes))
+        _out(max_x, max(b[2] for b in boxes))
+        _out(max_y, max(b[3] for b in boxes))
+        _out(z, z_value)
+        return SUCCESS
+
+    def _lmc1_MoveEnt(self, name, dx, dy):
+        entity = self.entities.get(name)
+        if entity is None:
+            return NOFINDENT
+        b = entity["box"]
+        entity["box"] = [b[0] + dx, b[1] + dy, b[2] + dx, b[3] + dy]
+        return SUCCESS
+
+    def _lmc1_ScaleEnt(self, name, cx, cy, sx, sy):
+        entity = self.entities.get(name)
+        if entity is None:
+            return NOFINDENT
+        b = entity["box"]
+        entity["box"] = [cx + (b[0] - cx) * sx, cy + (b[1] - cy) * sy, cx + (b[2] - cx) * sx, cy + (b[3] - cy) * sy]
+        return SUCCESS
+
+    def _lmc1_MirrorEnt(self, name, cx, cy, mirror_x, mirror_y):
+        entity = self.entities.get(name)
+        if entity is None:
+            return NOFINDENT
+        b = entity["box"]
+        if mirror_x:
+            b[0], b[2] = 2 * cx - b[2], 2 * cx - b[0]
+        if mirror_y:
+            b[1], b[3] = 2 * cy - b[3], 2 * cy - b[1]
+        return SUCCESS
+
+    def _lmc1_RotateEnt(self, name, cx, cy, angle):
+        entity = self.entities.get(name)
+        if entity is None:
+            return NOFINDENT
+        self._rotate(entity, cx, cy, angle)
+        return SUCCESS
+
+    def _lmc1_DeleteEnt(self, name):
+        if self.entities.pop(name, None) is None:
+            return NOFINDENT
+        return SUCCESS
+
+    def _lmc1_CopyEnt(self, name, new_name):
+        entity = self.entities.get(name)
+        if entity is None:
+            return NOFINDENT
+        self.entities[new_name] = json.loads(json.dumps(entity))
+        return SUCCESS
+
+    def _lmc1_ChangeEntName(self, name, new_name):
+        if name not in self.entities:
+            return NOFINDENT
+        self.entities = {new_name if key == name else key: value for key, value in self.entities.items()}
+        return SUCCESS
+
+    def _lmc1_ReadPort(self, data):
+        _out(data, self.port)
+        return SUCCESS
+
+    def _lmc1_WritePort(self, data):
+        self.port = data
+        return SUCCESS
+
+    def _lmc1_LaserOn(self, enabled):
+        return SUCCESS
+
+    def _lmc1_GetCurCoor(self, x, y):
+        _out(x, self.position[0])
+        _out(y, self.position[1])
+        return SUCCESS
+
+    def _lmc1_GotoPos(self, x, y):
+        self.position = (x, y)
+        return SUCCESS
+
+    def _lmc1_MarkLine(self, x1, y1, x2, y2, pen):
+        self.position = (x2, y2)
+        return SUCCESS
+
+    def _lmc1_MarkPoint(self, x, y, delay, pen):
+        self.position = (x, y)
+        return SUCCESS
+
+    def _lmc1_RedLightMark(self):
+        return SUCCESS
+
+    def _lmc1_SetPenParam(self, pen_no, *values):
+        self.pens[pen_no] = values
+        return SUCCESS
+
+    def _lmc1_GetPenParam(self, pen_no, *outs):
+        for ref, value in zip(outs, self.pens.get(pen_no, (0,) * len(outs))):
+            _out(ref, value)
+        return SUCCESS
+
+    def _lmc1_SetPenParam2(self, pen_no, *values):
+        self.pens_wobble[pen_no] = values
+        return SUCCESS
+
+    def _lmc1_GetPenParam2(self, pen_no, *outs):
+        values = self.pens_wobble.get(pen_no)
+        if values is None:
+            values = (0,) * len(outs)
+        else:
+            values = values[:13] + (0.0,) + values[13:]
+        for ref, value in zip(outs, values):
+            _out(ref, value)
+        return SUCCESS
+
+    def _lmc1_GetPenNumberFromEnt(self, name):
+        entity = self.entities.get(name)
+        return -1 if entity is None else entity["pen"]
+
+    def _lmc1_SetEntAllChildPen(self, name, pen_no):
+        entity = self.entities.get(name)
+        if entity is None:
+            return NOFINDENT
+        entity["pen"] = pen_no
+        return SUCCESS
@@ -1,62 +1,102 @@
+import os
 import socket
 import json
+import logging
 import subprocess
+import threading
 import time
 import sys
 from pathlib import Path
 
-from .ezcad_sdk import EzcadSDK
+from .ezcad_sdk import EzcadSDK, SDK_BACKEND_ENV
+
+logger = logging.getLogger(__name__)
+
+
+class SDKConnectionError(RuntimeError):
+    pass
 
 
 class SDKClient:
     DEFAULT_PORT = 59123
+    CONNECT_TIMEOUT = 10.0
+    BACKOFF_INITIAL = 0.05
+    BACKOFF_MAX = 1.0
+    HEARTBEAT_INTERVAL = 5.0
+    RESTART_SAFE_METHODS = frozenset({"ping", "initialize", "clear_all", "load_file"})
     _instance = None
-    
+
     def __new__(cls, *args, **kwargs):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
             cls._instance._initialized = False
         return cls._instance
-    
-    def __init__(self, sdk_path: Path = None, port: int = None, python_32bit: str = "py -3.12-32"):
+
+    def __init__(self, sdk_path: Path = None, port: int = None, python_32bit: str = "py -3.12-32", backend: str = None):
         if self._initialized:
             return
         self.port = port or self.DEFAULT_PORT
         self.sdk_path = sdk_path or EzcadSDK._SDK_PATH
         self.python_32bit = python_32bit
+        self.backend = backend
         self.server_process = None
         self.socket = None
+        self.sdk_initialized = False
+        self._initialize_kwargs = None
+        self._lock = threading.RLock()
+        self._heartbeat_stop = threading.Event()
+        self._heartbeat_thread = None
         self._initialized = True
-    
+
+    @classmethod
+    def standalone(cls, **kwargs) -> "SDKClient":
+        """Create a client outside the singleton, e.g. for an extra server in a pool."""
+        client = object.__new__(cls)
+        client._initialized = False
+        client.__init__(**kwargs)
+        return client
+
     @classmethod
     def reset(cls):
         if cls._instance:
             cls._instance.close()
             cls._instance = None
-    
+
     def start_server(self):
-        if self.server_process is not None:
+        if self.server_process is not None and self.server_process.poll() is None:
             return
-        
+
         server_script = Path(__file__).parent / "sdk_server.py"
         project_root = Path(__file__).parent.parent.parent
         cmd = f'cd "{self.sdk_path}" && cd "{project_root}" && {self.python_32bit} "{server_script}" {self.port}'
-        
+
+        env = dict(os.environ)
+        if self.backend:
+            env[SDK_BACKEND_ENV] = self.backend
+
         self.server_process = subprocess.Popen(
             cmd,
             shell=True,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
             creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0
         )
-        
-        for _ in range(50):
-            time.sleep(0.1)
+        self._wait_for_server()
+
+    def _wait_for_server(self):
+        delay = self.BACKOFF_INITIAL
+        deadline = time.monotonic() + self.CONNECT_TIMEOUT
+        while True:
             if self._try_connect():
                 return
-        
-        raise RuntimeError("Failed to start SDK server")
-    
+            if self.server_process is not None and self.server_process.poll() is not None:
+                raise RuntimeError(f"SDK server exited during start-up with code {self.server_process.returncode}")
+            if time.monotonic() >= deadline:
+                raise RuntimeError("Failed to start SDK server")
+            time.sleep(delay)
+            delay = min(delay * 2, self.BACKOFF_MAX)
+
     def _try_connect(self) -> bool:
         try:
             self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
@@ -68,59 +108,140 @@ class SDKClient:
                 self.socket.close()
                 self.socket = None
             return False
-    
+
     def _ensure_connection(self):
         if self.socket is None:
             if not self._try_connect():
                 self.start_server()
-    
-    def _send_request(self, method: str, **params) -> any:
+
+    def _drop_connection(self):
+        if self.socket:
+            self.socket.close()
+            self.socket = None
+
+    def _exchange(self, method: str, params: dict) -> dict:
         self._ensure_connection()
-        
+
         request = {"method": method, "params": params}
-        self.socket.sendall(json.dumps(request).encode("utf-8") + b"\n")
-        
-        buffer = b""
-        while True:
-            chunk = self.socket.recv(4096)
-            if not chunk:
-                raise RuntimeError("Server closed connection")
-            buffer += chunk
-            if b"\n" in buffer:
-                break
-        
-        response = json.loads(buffer.split(b"\n")[0].decode("utf-8"))
-        
+        try:
+            self.socket.sendall(json.dumps(request).encode("utf-8") + b"\n")
+
+            buffer = b""
+            while True:
+                chunk = self.socket.recv(4096)
+                if not chunk:
+                    raise SDKConnectionError("Server closed connection")
+                buffer += chunk
+                if b"\n" in buffer:
+                    break
+        except (ConnectionError, OSError) as e:
+            if isinstance(e, socket.timeout):
+                raise
+            self._drop_connection()
+            raise SDKConnectionError(f"Lost connection to SDK server: {e}") from e
+
+        return json.loads(buffer.split(b"\n")[0].decode("utf-8"))
+
+    def _send_request(self, method: str, **params) -> any:
+        with self._lock:
+            try:
+                response = self._exchange(method, params)
+            except SDKConnectionError:
+                if method == "shutdown":
+                    raise
+                logger.warning(f"SDK server connection lost during '{method}', restarting server")
+                self.restart_server()
+                if method not in self.RESTART_SAFE_METHODS:
+                    raise
+                response = self._exchange(method, params)
+
         if not response.get("success"):
             raise RuntimeError(response.get("error", "Unknown error"))
-        
+
         return response.get("result")
-    
+
     def __getattr__(self, name: str):
         if name.startswith("_"):
             raise AttributeError(name)
-        
+
         def method(**kwargs):
             result = self._send_request(name, **kwargs)
             if name == "get_entity_size" and isinstance(result, list) and len(result) == 2:
                 return result[0], result[1]
             return result
-        
+
         return method
-    
+
     def ping(self) -> str:
         return self._send_request("ping")
-    
-    def close(self):
-        if self.socket:
+
+    def initialize(self, **kwargs):
+        with self._lock:
+            result = self._send_request("initialize", **kwargs)
+            self._initialize_kwargs = kwargs
+            self.sdk_initialized = result == 0
+            return result
+
+    def ensure_initialized(self):
+        with self._lock:
+            if not self.sdk_initialized:
+                return self.initialize(**(self._initialize_kwargs or {}))
+            return 0
+
+    def restart_server(self):
+        with self._lock:
+            self._drop_connection()
+            self._terminate_server()
+            was_initialized = self._initialize_kwargs is not None
+            self.sdk_initialized = False
+            self.start_server()
+            if was_initialized:
+                result = self._exchange("initialize", self._initialize_kwargs)
+                self.sdk_initialized = bool(result.get("success")) and result.get("result") == 0
+
+    def warm_up(self):
+        """Start the server, initialize the DLL and begin health checks."""
+        with self._lock:
+            self._ensure_connection()
+            self.ensure_initialized()
+        self.start_heartbeat()
+
+    def start_heartbeat(self, interval: float = None):
+        if self._heartbeat_thread is not None and self._heartbeat_thread.is_alive():
+            return
+        self._heartbeat_stop.clear()
+        self._heartbeat_thread = threading.Thread(
+            target=self._heartbeat_loop,
+            args=(interval or self.HEARTBEAT_INTERVAL,),
+            daemon=True
+        )
+        self._heartbeat_thread.start()
+
+    def _heartbeat_loop(self, interval: float):
+        while not self._heartbeat_stop.wait(interval):
             try:
-                self._send_request("shutdown")
-            except:
-                pass
-            self.socket.close()
-            self.socket = None
-        
+                self.ping()
+            except Exception:
+                logger.exception("SDK server heartbeat failed")
+
+    def _terminate_server(self):
         if self.server_process:
             self.server_process.terminate()
-            self.server_process.wait(timeout=5)
+            try:
+                self.server_process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.server_process.kill()
             self.server_process = None
+
+    def close(self):
+        self._heartbeat_stop.set()
+        with self._lock:
+            if self.socket:
+                try:
+                    self._exchange("shutdown", {})
+                except:
+                    pass
+                self._drop_connection()
+
+            self._terminate_server()
+            self.sdk_initialized = False
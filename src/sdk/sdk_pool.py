@@ -0,0 +1,126 @@
+import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Optional
+
+from .sdk_client import SDKClient
+
+logger = logging.getLogger(__name__)
+
+# Result of a job skipped after cancellation, before it is replaced by None
+_SKIPPED = object()
+
+
+class SDKClientPool:
+    """Several SDK server processes, each holding its own EZCAD document.
+
+    ``EzcadSDK`` is process-global, so one server can only build one
+    document at a time. The pool runs the primary client on its usual
+    port and starts extra servers on the following ports when needed.
+    Servers that fail to start or initialize are left out for the rest
+    of the session, and the pool works with whatever is left.
+    """
+
+    DEFAULT_SIZE = 4
+
+    def __init__(self, primary: SDKClient, size: int = DEFAULT_SIZE, **client_kwargs):
+        self.primary = primary
+        self.size = max(1, size)
+        self.client_kwargs = client_kwargs
+        self._extra: dict[int, Optional[SDKClient]] = {}
+        self._lock = threading.Lock()
+
+    def _spawn(self, index: int) -> Optional[SDKClient]:
+        port = self.primary.port + index
+        client = SDKClient.standalone(
+            port=port,
+            sdk_path=self.primary.sdk_path,
+            python_32bit=self.primary.python_32bit,
+            backend=self.primary.backend,
+            **self.client_kwargs
+        )
+        try:
+            client.warm_up()
+        except Exception:
+            logger.exception(f"Failed to start pooled SDK server on port {port}")
+            client.close()
+            return None
+        if not client.sdk_initialized:
+            logger.warning(f"Pooled SDK server on port {port} did not initialize; leaving it out")
+            client.close()
+            return None
+        logger.info(f"Pooled SDK server ready on port {port}")
+        return client
+
+    def clients(self, count: int) -> list[SDKClient]:
+        """Return up to ``count`` ready clients, starting missing servers in parallel."""
+        count = max(1, min(count, self.size))
+        with self._lock:
+            missing = [index for index in range(1, count) if index not in self._extra]
+            if missing:
+                with ThreadPoolExecutor(max_workers=len(missing)) as executor:
+                    for index, client in zip(missing, executor.map(self._spawn, missing)):
+                        self._extra[index] = client
+            extra = [self._extra[index] for index in range(1, count) if self._extra.get(index) is not None]
+        return [self.primary] + extra
+
+    def map(
+        self,
+        func: Callable[[SDKClient, object], object],
+        jobs: list,
+        cancelled: Optional[Callable[[], bool]] = None,
+        on_done: Optional[Callable[[int, object], None]] = None,
+    ) -> list:
+        """Run ``func(client, job)`` for every job, one job per server at a time.
+
+        Results are returned in the order of ``jobs``. Jobs that have not
+        started once ``cancelled()`` returns True are skipped and their result
+        is None. ``on_done(index, result)`` is called on the calling thread as
+        each job finishes. ``func`` should catch its own errors: an exception
+        is raised from here only after the jobs already running have finished.
+        """
+        if not jobs:
+            return []
+        results: list = [None] * len(jobs)
+        clients = self.clients(len(jobs))
+        if len(clients) == 1:
+            for index, job in enumerate(jobs):
+                if cancelled is not None and cancelled():
+                    break
+                results[index] = func(clients[0], job)
+                if on_done is not None:
+                    on_done(index, results[index])
+            return results
+
+        free = queue.Queue()
+        for client in clients:
+            free.put(client)
+
+        def run(job):
+            client = free.get()
+            try:
+                if cancelled is not None and cancelled():
+                    return _SKIPPED
+                return func(client, job)
+            finally:
+                free.put(client)
+
+        with ThreadPoolExecutor(max_workers=len(clients)) as executor:
+            futures = {executor.submit(run, job): index for index, job in enumerate(jobs)}
+            for future in as_completed(futures):
+                result = future.result()
+                if result is _SKIPPED:
+                    continue
+                index = futures[future]
+                results[index] = result
+                if on_done is not None:
+                    on_done(index, result)
+        return results
+
+    def close(self):
+        with self._lock:
+            for client in self._extra.values():
+                if client is not None:
+                    client.close()
+            self._extra.clear()
@@ -8,9 +8,10 @@ import os
 class SDKServer:
     DEFAULT_PORT = 59123
     
-    def __init__(self, sdk_path: str = None, port: int = None):
+    def __init__(self, sdk_path: str = None, port: int = None, backend: str = None):
         self.port = port or self.DEFAULT_PORT
         self.sdk_path = sdk_path
+        self.backend = backend
         self.sdk = None
         self.running = False
         self.server_socket = None
@@ -28,7 +29,7 @@ class SDKServer:
                 from .ezcad_sdk import EzcadSDK
             except ImportError:
                 from ezcad_sdk import EzcadSDK
-            self.sdk = EzcadSDK()
+            self.sdk = EzcadSDK(backend=self.backend)
     
     def _handle_request(self, request: dict) -> dict:
         method = request.get("method")
@@ -113,6 +114,7 @@ class SDKServer:
 
 if __name__ == "__main__":
     port = int(sys.argv[1]) if len(sys.argv) > 1 else SDKServer.DEFAULT_PORT
-    sdk_path = sys.argv[2] if len(sys.argv) > 2 else None
-    server = SDKServer(sdk_path=sdk_path, port=port)
+    sdk_path = sys.argv[2] if len(sys.argv) > 2 and sys.argv[2] else None
+    backend = sys.argv[3] if len(sys.argv) > 3 else None
+    server = SDKServer(sdk_path=sdk_path, port=port, backend=backend)
     server.start()
@@ -0,0 +1,75 @@
+from unittest.mock import MagicMock, Mock, patch
+
+import numpy as np
+import pytest
+
+from src.canvas import barcodes
+
+
+def test_bars_follow_code128_modules():
+    import barcode
+
+    modules = barcode.get_barcode_class("code128")("123456").build()[0]
+    bars = barcodes.code128_bars("123456")
+
+    assert len(bars) == modules.count("01") + modules.startswith("1")
+    total = len(modules) + 2 * barcodes.QUIET_ZONE_MODULES
+    assert bars[0][0] == pytest.approx(barcodes.QUIET_ZONE_MODULES / total)
+    assert bars[-1][1] == pytest.approx((barcodes.QUIET_ZONE_MODULES + len(modules)) / total)
+
+
+def test_raster_is_cached_per_text_size_and_angle():
+    first = barcodes.bars_image("42", 300, 100, 0.0)
+
+    assert barcodes.bars_image("42", 300, 100, 0.0) is first
+    assert barcodes.bars_image("42", 300, 100, 90.0).size == (100, 300)
+    alpha = np.array(first)[..., 3]
+    bars_h = barcodes.layout(100)[0]
+    # Bars only in the top share of the block, edges hard (no resampling)
+    assert not alpha[bars_h:].any()
+    assert set(np.unique(alpha)) == {0, 255}
+
+
+def test_raster_cache_is_bounded_by_pixels():
+    from src.canvas.images import _SizedLRU
+
+    with patch.object(barcodes, "_rasters", _SizedLRU(100_000)) as rasters:
+        first = barcodes.bars_image("42", 300, 100, 0.0)
+        barcodes.bars_image("43", 300, 100, 0.0)
+        barcodes.bars_image("44", 300, 100, 0.0)
+        block = barcodes.barcode_image("42", "O-1", 300, 100, 0.0)
+
+        # Only the bar and text layers are kept, the composite is built per call
+        assert rasters.pixels <= 100_000
+        assert barcodes.barcode_image("42", "O-1", 300, 100, 0.0) is not block
+        assert barcodes.bars_image("44", 300, 100, 0.0) is not first
+    assert len(rasters) == 3
+
+
+def test_cairo_bars_are_filled_rectangles():
+    context = Mock()
+
+    barcodes.draw_bars_cairo(context, "42", 10, 20, 300, 100, angle=90.0)
+
+    assert context.rectangle.call_count == len(barcodes.code128_bars("42"))
+    context.rotate.assert_called_once()
+    context.fill.assert_called_once()
+    context.restore.assert_called_once()
+
+
+def test_pdf_draws_vector_bars_and_keeps_them_in_the_raster(tmp_path):
+    from src.canvas.export import PdfExporter
+
+    exporter = PdfExporter(Mock(_scene_store={}, spec=["_scene_store"]))
+    items = [{"type": "barcode", "x_mm": 10.0, "y_mm": 10.0, "w_mm": 40.0, "h_mm": 15.0, "angle": 0, "z": 1}]
+
+    with patch("src.canvas.export.cairo", MagicMock()) as cairo, \
+            patch("src.canvas.export.barcode_bars_image", wraps=barcodes.bars_image) as bars_image:
+        exporter.render_scene_to_pdf(str(tmp_path / "sheet.pdf"), items, 100.0, 60.0, dpi=150, barcode_text="123456", reference_text="O-1")
+
+    context = cairo.Context.return_value
+    assert context.rectangle.call_count == len(barcodes.code128_bars("123456"))
+    bars_image.assert_called_once()
+    # PNG/JPG exports and the combiner still see the bars
+    alpha = np.array(exporter._last_render_image)[..., 3]
+    assert alpha.any()
@@ -0,0 +1,286 @@
+import io
+import json
+import threading
+from unittest.mock import Mock, patch
+
+import pytest
+
+from PIL import Image
+
+from src.batch import OrderBatchJob, OrderInputError, normalize_formats, parse_order_input
+from src.batch.image_cache import TransformCache, content_hash
+
+
+@pytest.fixture
+def product_dir(tmp_path):
+    data = {
+        "ASINs": [["B0TEST", 1, False]],
+        "SkuName": "Batch",
+        "Scene": {"jig": {"width_mm": 100, "height_mm": 100}},
+        "ASINObjects": {"B0TEST": {"Frontside": [], "Backside": []}},
+    }
+    (tmp_path / "Batch.json").write_text(json.dumps(data), encoding="utf-8")
+    with patch("src.batch.job.PRODUCTS_PATH", tmp_path), patch("src.batch.job.OUTPUT_PATH", tmp_path), \
+            patch("src.batch.job.LOGS_PATH", tmp_path):
+        yield tmp_path
+
+
+def test_parse_order_input_mixes_ranges_and_numbers():
+    assert parse_order_input("1,2,4-6,10") == [1, 2, 4, 5, 6, 10]
+    assert parse_order_input("x, 3-") == []
+
+
+def test_normalize_formats():
+    assert normalize_formats(["PDF", " jpeg", "png", "pdf", "tiff"]) == ["pdf", "jpg", "png"]
+
+
+def test_job_reads_asins_from_product(product_dir):
+    job = OrderBatchJob("Batch", "3,1-2", formats=["jpeg"], dpi=300)
+
+    assert job.order_ids == [1, 2, 3]
+    assert job.formats == ["jpg"]
+    assert job.asins == [["B0TEST", 1, False]]
+
+
+def test_job_without_orders_raises(product_dir):
+    job = OrderBatchJob("Batch", "abc")
+
+    with pytest.raises(OrderInputError):
+        job.run()
+
+
+def test_job_reports_when_no_order_matches_asins(product_dir):
+    log = Mock()
+    progress = Mock()
+    orders = {"5_order.json": ({"asin": "OTHER"}, "01.09.2025", "01-09-2025 A")}
+    job = OrderBatchJob("Batch", [5], log=log, progress=progress)
+
+    with patch("src.batch.job.get_orders_info", return_value={"orders": orders}):
+        result = job.run()
+
+    assert result["status"] == "error"
+    assert any("No orders found" in call.args[0] for call in log.call_args_list)
+    progress.assert_called_with(value=100, current_index=None, total=None)
+
+
+def test_cancelled_job_does_nothing(product_dir, monkeypatch):
+    from src.core import state
+    monkeypatch.setattr(state, "is_cancelled", False)
+    job = OrderBatchJob("Batch", [1], log=Mock())
+    job.cancel()
+
+    with patch("src.batch.job.get_orders_info") as fetch:
+        result = job.run()
+
+    assert result["status"] == "cancelled"
+    fetch.assert_not_called()
+
+
+def test_repeated_image_is_transformed_once(product_dir, tmp_path):
+    buffer = io.BytesIO()
+    Image.new("RGB", (8, 8), "red").save(buffer, format="PNG")
+    data = buffer.getvalue()
+    placement = {
+        "dimension": {"width": 10, "height": 10},
+        "position": {"x": 0, "y": 0},
+        "buyerPlacement": {"dimension": {"width": 8, "height": 8}, "position": {"x": 1, "y": 1}, "scale": {"scaleX": 0.5}, "angleOfRotation": 0},
+        "children": [{"type": "ImageCustomization", "label": "Photo", "image": {"imageName": "photo.jpg"}}],
+    }
+    order = {
+        "asin": "B0TEST",
+        "quantity": 2,
+        "customizationInfo": {"version3.0": {"surfaces": [{"areas": [{"customizationType": "ImagePrinting"}]}]}},
+        "customizationData": {"children": [placement]},
+    }
+    job = OrderBatchJob("Batch", [1, 2], log=Mock(), image_cache=TransformCache(tmp_path / "cache"))
+    transformed = Image.new("RGBA", (10, 10))
+
+    with patch.object(job, "_download_image_from_dropbox", return_value={"status": "success", "data": data, "content_hash": content_hash(data)}), \
+            patch.object(job, "_transform_amazon_image", return_value=transformed) as transform:
+        first = job._prepare_order_data("p", "c1", order, 1, 2)
+        second = job._prepare_order_data("p", "c2", order, 2, 2)
+
+    transform.assert_called_once()
+    assert first["data"]["front"][0]["loaded_image"] is second["data"]["front"][0]["loaded_image"]
+    assert first["data"]["front"][0]["loaded_image_key"]
+
+
+def test_transform_keeps_colour_of_semi_transparent_pixels(product_dir):
+    import numpy as np
+
+    pixels = np.zeros((100, 120, 4), np.uint8)
+    pixels[..., :3] = (200, 120, 40)
+    pixels[..., 3] = np.linspace(0, 255, 120, dtype=np.uint8)
+    job = OrderBatchJob("Batch", [1], log=Mock())
+
+    out = job._transform_amazon_image(Image.fromarray(pixels, "RGBA"), scale=0.8, angle_deg=15, place_xy=(5, 10), mask_rect=(20, 30, 60, 50), apply_unsharp=False)
+
+    assert out.size == (60, 50)
+    arr = np.asarray(out).astype(int)
+    visible = arr[..., 3] > 32
+    assert visible.any()
+    assert np.abs(arr[..., :3][visible] - (200, 120, 40)).max() <= 8
+
+
+def _full_canvas_transform(im, scale, angle_deg, place_xy, mask_rect, canvas_size=(500, 500), apply_unsharp=True):
+    """The transform before it rendered only the mask rect: full canvas, float mask and crop."""
+    import math
+
+    import numpy as np
+    from PIL import ImageChops, ImageDraw, ImageFilter
+
+    w, h = im.size
+    new_size = (max(1, int(round(w * scale))), max(1, int(round(h * scale))))
+    im = im.resize(new_size, Image.Resampling.LANCZOS) if new_size != im.size else im
+    arr = np.asarray(im).astype(np.float32)
+    a = arr[..., 3:4] / 255.0
+    im_pm = Image.fromarray(np.concatenate([arr[..., :3] * a, a * 255.0], axis=-1).astype(np.uint8), mode="RGBA")
+    theta = math.radians(0.0 if angle_deg < 0.5 else angle_deg)
+    c, s = math.cos(theta), math.sin(theta)
+    px, py = place_xy
+    warped_pm = im_pm.transform(canvas_size, Image.Transform.AFFINE, (c, s, -(c * px + s * py), -s, c, -(-s * px + c * py)),
+                                resample=Image.Resampling.BILINEAR, fillcolor=(0, 0, 0, 0))
+    arr_w = np.asarray(warped_pm).astype(np.float32)
+    a_w = arr_w[..., 3:4] / 255.0
+    rgb = np.where(a_w > 1e-6, arr_w[..., :3] / np.maximum(a_w, 1e-6), 0.0)
+    warped = Image.fromarray(np.concatenate([np.clip(rgb, 0, 255), np.clip(a_w * 255.0, 0, 255)], axis=-1).astype(np.uint8), mode="RGBA")
+    mx, my, mw, mh = mask_rect
+    mask = Image.new("L", canvas_size, 0)
+    ImageDraw.Draw(mask).rectangle([mx, my, mx + mw, my + mh], fill=255)
+    r, g, b, alpha = warped.split()
+    out = Image.merge("RGBA", (r, g, b, ImageChops.multiply(alpha, mask)))
+    if apply_unsharp:
+        out = out.filter(ImageFilter.UnsharpMask(radius=0.6, percent=80, threshold=2))
+    return out.crop((mx, my, mx + mw, my + mh))
+
+
+@pytest.mark.parametrize("mask_rect", [(20, 30, 60, 50), (0.5, 10.4, 100.6, 80.2), (13.7, 7.5, 40.25, 33.5), (-3.4, 470.6, 30.2, 40.0)])
+@pytest.mark.parametrize("apply_unsharp", [True, False])
+def test_transform_matches_full_canvas_render(product_dir, mask_rect, apply_unsharp):
+    import numpy as np
+
+    # Opaque: the full-canvas render premultiplied twice, which only changed translucent pixels
+    pixels = np.random.default_rng(7).integers(0, 256, (300, 400, 4), dtype=np.uint8)
+    pixels[..., 3] = 255
+    im = Image.fromarray(pixels, "RGBA")
+    job = OrderBatchJob("Batch", [1], log=Mock())
+
+    out = job._transform_amazon_image(im, scale=0.8, angle_deg=15, place_xy=(40.3, 20.7), mask_rect=mask_rect, apply_unsharp=apply_unsharp)
+    expected = _full_canvas_transform(im, 0.8, 15, (40.3, 20.7), mask_rect, apply_unsharp=apply_unsharp)
+
+    assert out.size == expected.size
+    assert np.array_equal(np.asarray(out), np.asarray(expected))
+
+
+def _one_slot_product(product_dir, name):
+    slot = {"label": "Slot 1", "x_mm": 0, "y_mm": 0, "w_mm": 10, "h_mm": 10,
+            "objects": [{"type": "text", "amazon_label": "Name", "label": ""}]}
+    data = {
+        "ASINs": [["B0TEST", 1, False]],
+        "Scene": {"jig": {"width_mm": 100, "height_mm": 100}},
+        "ASINObjects": {"B0TEST": {"Frontside": [{"slots": [slot]}], "Backside": [{"slots": [dict(slot, objects=[])]}]}},
+    }
+    (product_dir / f"{name}.json").write_text(json.dumps(data), encoding="utf-8")
+    orders = {f"{n}_order.json": ({"asin": "B0TEST", "quantity": 1, "orderId": f"O-{n}"}, "p", f"c{n}") for n in (1, 2, 3)}
+    prepared = {
+        "status": "success",
+        "data": {"front": [{"type": "text", "label": "Name", "text": "Anna", "color": None, "font_family": None}], "back": []},
+        "asin": "B0TEST",
+        "quantity": 1,
+    }
+    return orders, prepared
+
+
+def test_run_renders_sheets_off_the_filling_thread(product_dir):
+    orders, prepared = _one_slot_product(product_dir, "Sheets")
+    render_threads = []
+
+    def make_pdf(slots, *args, **kwargs):
+        render_threads.append(threading.get_ident())
+        return {"status": "error", "message": "disk full"} if args[2] == 2 else {"status": "success"}
+
+    job = OrderBatchJob("Sheets", [1, 2, 3], log=Mock())
+    with patch("src.batch.job.PDFCombiner"), \
+            patch("src.batch.job.get_orders_info", return_value={"orders": orders}), \
+            patch.object(job, "_prepare_order_data", return_value=prepared) as prepare, \
+            patch.object(job, "_make_pdf", side_effect=make_pdf):
+        result = job.run()
+
+    assert prepare.call_count == 3
+    assert len(render_threads) == 3
+    assert threading.get_ident() not in render_threads
+    assert result["failed_orders"] == ["2_order.json"]
+
+
+def _run_sheets(job, orders, prepared, make_pdf):
+    with patch("src.batch.job.PDFCombiner"), \
+            patch("src.batch.job.get_orders_info", return_value={"orders": orders}), \
+            patch.object(job, "_prepare_order_data", return_value=prepared) as prepare, \
+            patch.object(job, "_make_pdf", side_effect=make_pdf) as make:
+        result = job.run()
+    return result, [call.args[3] for call in prepare.call_args_list], [call.args[3] for call in make.call_args_list]
+
+
+def test_run_resumes_after_an_interrupted_sheet(product_dir):
+    orders, prepared = _one_slot_product(product_dir, "Sheets")
+
+    def crash_on_last(slots, jig_size, start, end, **kwargs):
+        if end == 3:
+            raise OSError("power cut")
+        return {"status": "success", "pdf_infos": [], "files": []}
+
+    _, _, rendered = _run_sheets(OrderBatchJob("Sheets", [1, 2, 3], log=Mock()), orders, prepared, crash_on_last)
+    assert rendered == [1, 2, 3]
+
+    ok = Mock(return_value={"status": "success", "pdf_infos": [], "files": []})
+    result, prepared_ids, rendered = _run_sheets(OrderBatchJob("Sheets", [1, 2, 3], log=Mock()), orders, prepared, ok)
+    assert result == {"status": "success", "failed_orders": []}
+    assert prepared_ids == rendered == [3]
+
+    # The finished run is not resumed again, nor is one asked to start fresh
+    _, prepared_ids, _ = _run_sheets(OrderBatchJob("Sheets", [1, 2, 3], log=Mock()), orders, prepared, ok)
+    assert prepared_ids == [1, 2, 3]
+    _run_sheets(OrderBatchJob("Sheets", [1, 2, 3], log=Mock()), orders, prepared, crash_on_last)
+    _, _, rendered = _run_sheets(OrderBatchJob("Sheets", [1, 2, 3], log=Mock(), resume=False), orders, prepared, ok)
+    assert rendered == [1, 2, 3]
+
+
+def test_run_logs_stage_timings_and_writes_trace(product_dir):
+    orders, prepared = _one_slot_product(product_dir, "Sheets")
+    log = Mock()
+    ok = Mock(return_value={"status": "success", "pdf_infos": [], "files": []})
+    _run_sheets(OrderBatchJob("Sheets", [1, 2], log=log, trace=True), orders, prepared, ok)
+
+    messages = [call.args[0] for call in log.call_args_list]
+    assert any(m.startswith("Stage timings") for m in messages)
+    assert any(m.strip().startswith("make_pdf") for m in messages)
+    traces = list(product_dir.glob("trace_Sheets_*.json"))
+    assert len(traces) == 1
+    events = json.loads(traces[0].read_text(encoding="utf-8"))["traceEvents"]
+    assert {e["name"] for e in events if e["ph"] == "X"} >= {"fill_order", "make_pdf"}
+
+
+def test_failed_sheet_filled_inside_an_order_fails_its_earlier_orders(product_dir):
+    orders, prepared = _one_slot_product(product_dir, "Sheets")
+    orders.pop("3_order.json")
+    data = json.loads((product_dir / "Sheets.json").read_text(encoding="utf-8"))
+    slots = data["ASINObjects"]["B0TEST"]["Frontside"][0]["slots"]
+    slots.append(dict(slots[0], label="Slot 2"))
+    data["ASINObjects"]["B0TEST"]["Backside"][0]["slots"].append({"label": "Slot 2", "objects": []})
+    (product_dir / "Sheets.json").write_text(json.dumps(data), encoding="utf-8")
+
+    # Order 1 takes one slot; order 2 fills the sheet with its first unit, inside _process_order
+    def prepare(parent, child, order_info, order_id, last_id):
+        return dict(prepared, quantity=2 if order_id == 2 else 1)
+
+    def make_pdf(slots, jig_size, start, end, **kwargs):
+        return {"status": "error", "message": "disk full"} if len(slots) == 2 else {"status": "success", "files": []}
+
+    job = OrderBatchJob("Sheets", [1, 2], log=Mock())
+    with patch("src.batch.job.PDFCombiner"), \
+            patch("src.batch.job.get_orders_info", return_value={"orders": orders}), \
+            patch.object(job, "_prepare_order_data", side_effect=prepare), \
+            patch.object(job, "_make_pdf", side_effect=make_pdf):
+        result = job.run()
+
+    assert sorted(result["failed_orders"]) == ["1_order.json", "2_order.json"]
@@ -0,0 +1,162 @@
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import pytest
+from PIL import Image
+
+from src.canvas.images import ImageManager, _SizedLRU
+from src.canvas.object import CanvasObject
+from src.core import MM_TO_PX
+
+
+@pytest.fixture
+def photo_factory():
+    with patch("PIL.ImageTk.PhotoImage", side_effect=lambda pil: Mock(size=pil.size)) as factory:
+        yield factory
+
+
+@pytest.fixture
+def manager():
+    canvas = Mock()
+    canvas.winfo_width.return_value = 400
+    canvas.winfo_height.return_value = 300
+    canvas.canvasx.return_value = 0
+    canvas.canvasy.return_value = 0
+    screen = SimpleNamespace(canvas=canvas, _items={}, _zoom=1.0)
+    return ImageManager(screen)
+
+
+@pytest.fixture
+def photo_path(tmp_path):
+    path = tmp_path / "photo.png"
+    Image.new("RGBA", (1024, 768), (200, 10, 10, 255)).save(path)
+    return str(path)
+
+
+def test_repeated_render_is_served_from_cache(manager, photo_factory, photo_path):
+    meta = CanvasObject(type="image", path=photo_path)
+
+    first = manager.render_photo(meta, 100, 80)
+    second = manager.render_photo(meta, 100, 80)
+
+    assert first is second
+    assert photo_factory.call_count == 1
+    assert meta["photo"] is first
+
+
+def test_angle_change_misses_cache(manager, photo_factory, photo_path):
+    meta = CanvasObject(type="image", path=photo_path)
+    manager.render_photo(meta, 100, 80)
+    meta["angle"] = 90.0
+    rotated = manager.render_photo(meta, 100, 80)
+
+    assert photo_factory.call_count == 2
+    assert rotated.size == (80, 100)
+
+
+def test_resample_starts_from_nearest_mip_level(manager, photo_path):
+    meta = CanvasObject(type="image", path=photo_path)
+
+    assert manager._nearest_level(meta, photo_path, 100, 80).size == (128, 96)
+    assert manager._nearest_level(meta, photo_path, 600, 400).size == (1024, 768)
+    assert len(manager._pyramids) == 1
+
+
+def test_lru_evicts_by_pixel_budget():
+    cache = _SizedLRU(max_pixels=100)
+    cache.put("a", 1, 60)
+    cache.put("b", 2, 30)
+    cache.get("a")
+    cache.put("c", 3, 30)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.pixels == 90
+
+
+def test_render_visible_only_draws_images_in_view(manager, photo_factory, photo_path):
+    size_mm = 50 / MM_TO_PX
+    near = CanvasObject(type="image", path=photo_path, w_mm=size_mm, h_mm=size_mm)
+    far = CanvasObject(type="image", path=photo_path, w_mm=size_mm, h_mm=size_mm)
+    manager.s._items = {1: near, 2: far}
+    manager.s.canvas.bbox.side_effect = lambda cid: (10, 10, 60, 60) if cid == 1 else (5000, 5000, 5050, 5050)
+    manager.defer_render(1)
+    manager.defer_render(2)
+
+    assert manager.render_visible() == 1
+    manager.render_queue.wait_idle()
+    manager.s.canvas.itemconfig.assert_called_once_with(1, image=near["photo"])
+    assert manager._pending == {2}
+    manager.render_queue.close()
+
+
+def test_request_photo_renders_in_background(manager, photo_factory, photo_path):
+    meta = CanvasObject(type="image", path=photo_path)
+    manager.s._items = {7: meta}
+
+    manager.request_photo(7, 100, 80)
+    manager.render_queue.wait_idle()
+
+    photo = meta["photo"]
+    assert photo.size == (100, 80)
+    manager.s.canvas.itemconfig.assert_called_with(7, image=photo)
+
+    manager.s.canvas.itemconfig.reset_mock()
+    manager.request_photo(7, 100, 80)
+    manager.s.canvas.itemconfig.assert_called_once_with(7, image=photo)
+    manager.render_queue.close()
+
+
+def test_synchronous_render_supersedes_background_request(manager, photo_factory, photo_path):
+    meta = CanvasObject(type="image", path=photo_path)
+    manager.s._items = {7: meta}
+
+    manager.request_photo(7, 100, 80)
+    # e.g. a resize handled synchronously while the zoom render is queued
+    resized = manager.render_photo(meta, 60, 40)
+    manager.render_queue.wait_idle()
+
+    assert meta["photo"] is resized
+    assert all(call.kwargs.get("image") is not None and call.kwargs["image"].size != (100, 80)
+               for call in manager.s.canvas.itemconfig.call_args_list)
+    manager.close()
+    assert manager._render_queue is None
+
+
+def test_is_readable_rejects_missing_and_broken_files(manager, photo_path, tmp_path):
+    broken = tmp_path / "broken.png"
+    broken.write_bytes(b"not an image")
+
+    assert manager.is_readable(photo_path)
+    assert not manager.is_readable(str(broken))
+    assert not manager.is_readable(str(tmp_path / "missing.png"))
+
+
+def test_view_change_renders_deferred_images_once_per_idle_tick(manager):
+    manager.s.canvas.after_idle.return_value = "idle#1"
+    manager.on_view_change("0.0", "1.0")
+    assert not manager.s.canvas.after_idle.called
+
+    manager.defer_render(1)
+    manager.on_view_change("0.0", "0.5")
+    manager.on_view_change("0.1", "0.6")
+    manager.s.canvas.after_idle.assert_called_once_with(manager._render_visible_idle)
+
+    with patch.object(manager, "render_visible") as render_visible:
+        manager._render_visible_idle()
+    render_visible.assert_called_once()
+    assert manager._view_idle_id is None
+
+
+def test_pyramid_of_image_bigger_than_the_cache_is_kept(manager, photo_path):
+    meta = CanvasObject(type="image", path=photo_path)
+    # 1024x768 source: larger than the budget, its reduced levels are not
+    with patch.object(ImageManager, "PYRAMID_CACHE_MAX_PIXELS", 500_000):
+        small_budget = ImageManager(manager.s)
+    source = small_budget._render_source(meta)
+
+    assert small_budget._nearest_level(source, photo_path, 100, 80).size == (128, 96)
+    with patch("PIL.Image.Image.reduce") as reduce:
+        assert small_budget._nearest_level(source, photo_path, 100, 80).size == (128, 96)
+    reduce.assert_not_called()
+    assert small_budget._pyramids.pixels < 500_000
@@ -0,0 +1,52 @@
+import pytest
+
+from src.canvas.object import CanvasObject
+
+
+def test_geometry_is_stored_as_float():
+    obj = CanvasObject(type="rect", x_mm=3, y_mm="4.5", w_mm=10, h_mm=0, angle=90)
+    assert (obj.x_mm, obj.y_mm, obj.w_mm, obj.angle) == (3.0, 4.5, 10.0, 90.0)
+    assert all(isinstance(v, float) for v in (obj.x_mm, obj.y_mm, obj.w_mm, obj.h_mm, obj.angle))
+
+    obj["x_mm"] = 7
+    assert obj["x_mm"] == 7.0 and isinstance(obj.x_mm, float)
+
+
+def test_slotted_storage_keeps_dict_api_for_undeclared_keys():
+    obj = CanvasObject(type="rect")
+    assert not hasattr(obj, "__dict__")
+
+    assert obj.get("label_fill") is None
+    assert obj.get("label_fill", "white") == "white"
+    assert "label_fill" not in obj
+    obj["label_fill"] = "#000000"
+    assert obj["label_fill"] == "#000000"
+    assert "label_fill" in obj
+    assert obj.to_dict()["label_fill"] == "#000000"
+    assert obj.pop("label_fill") == "#000000"
+    with pytest.raises(AttributeError):
+        obj["label_fill"]
+
+
+def test_ownership_fields_have_defaults():
+    obj = CanvasObject(type="image")
+    obj["owner_major"] = "Major 1"
+    assert obj.owner_major == "Major 1"
+    assert obj.get("rot_id") is None
+    assert obj.get("pen_number", 0) == 0
+    assert obj._extra is None
+
+
+def test_revision_tracks_persisted_state_only():
+    obj = CanvasObject(type="image")
+    start = obj.revision
+
+    obj["photo"] = object()
+    obj.canvas_id = 5
+    obj["label_sig"] = ("a",)
+    assert obj.revision == start
+
+    obj.x_mm = 3.0
+    obj["mask_path"] = "m.png"
+    obj["label_fill"] = "#fff"
+    assert obj.revision == start + 3
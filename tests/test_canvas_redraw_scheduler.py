@@ -0,0 +1,65 @@
+from unittest.mock import Mock
+
+import pytest
+
+from src.canvas.redraw import RedrawScheduler
+
+
+@pytest.fixture
+def screen():
+    screen = Mock()
+    screen.after_idle.return_value = "idle#1"
+    screen.after.side_effect = lambda ms, func: f"after#{screen.after.call_count}"
+    return screen
+
+
+def test_typing_jig_size_flushes_once_after_a_pause(screen):
+    scheduler = RedrawScheduler(screen)
+    # One trace per keystroke of "300"; each restarts the debounce
+    for _ in range(3):
+        scheduler.jig_changed()
+
+    assert [call.args for call in screen.after.call_args_list] == [(RedrawScheduler.JIG_DEBOUNCE_MS, scheduler.flush)] * 3
+    assert [call.args for call in screen.after_cancel.call_args_list] == [("after#1",), ("after#2",)]
+    screen.after_idle.assert_not_called()
+    scheduler.flush()
+
+    screen._apply_jig_change.assert_called_once()
+    screen.jig.redraw_jig.assert_not_called()
+    assert not scheduler.pending
+
+
+def test_wheel_burst_applies_net_zoom_with_one_redraw(screen):
+    scheduler = RedrawScheduler(screen)
+    scheduler.redraw(center=True)
+    for direction in (1, 1, 1, -1):
+        scheduler.zoom(direction)
+
+    screen.after_idle.assert_called_once_with(scheduler.flush)
+    scheduler.flush()
+
+    screen.jig.zoom_by.assert_called_once_with(2)
+    screen.jig.redraw_jig.assert_not_called()
+
+
+def test_jig_change_absorbs_pending_redraw(screen):
+    scheduler = RedrawScheduler(screen)
+    scheduler.redraw()
+    scheduler.jig_changed()
+
+    screen.after_cancel.assert_called_once_with("idle#1")
+    scheduler.flush()
+
+    screen._apply_jig_change.assert_called_once()
+    screen.jig.redraw_jig.assert_not_called()
+
+
+def test_redraw_runs_when_zoom_is_clamped(screen):
+    scheduler = RedrawScheduler(screen)
+    screen.jig.zoom_by.return_value = False
+    scheduler.redraw(center=True)
+    scheduler.zoom(1)
+    scheduler.flush()
+
+    screen.jig.zoom_by.assert_called_once_with(1)
+    screen.jig.redraw_jig.assert_called_once_with(center=True)
@@ -0,0 +1,55 @@
+import threading
+from unittest.mock import Mock
+
+from src.canvas.render_queue import RenderQueue
+
+
+def _queue():
+    widget = Mock()
+    widget.after.return_value = "after#1"
+    return RenderQueue(widget, workers=1)
+
+
+def test_results_are_applied_on_drain():
+    rq = _queue()
+    applied = []
+
+    rq.submit("a", lambda: 21 * 2, applied.append)
+
+    assert rq.wait_idle() == 1
+    assert applied == [42]
+    rq.widget.after.assert_called()
+    rq.close()
+
+
+def test_superseded_request_is_dropped():
+    rq = _queue()
+    gate = threading.Event()
+    applied = []
+
+    def slow():
+        gate.wait(5)
+        return "old"
+
+    rq.submit("img", slow, applied.append)
+    rq.submit("img", lambda: "new", applied.append)
+    gate.set()
+
+    rq.wait_idle()
+    assert applied == ["new"]
+    assert rq.outstanding == 0
+    rq.close()
+
+
+def test_cancel_drops_result_and_errors_reach_handler():
+    rq = _queue()
+    applied, errors = [], []
+
+    rq.submit("x", lambda: 1, applied.append)
+    rq.cancel("x")
+    rq.submit("y", lambda: 1 / 0, applied.append, on_error=errors.append)
+
+    rq.wait_idle()
+    assert applied == []
+    assert isinstance(errors[0], ZeroDivisionError)
+    rq.close()
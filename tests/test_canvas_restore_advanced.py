@@ -1,6 +1,6 @@
 import sys
 from pathlib import Path
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
@@ -303,3 +303,20 @@ def test_restore_rotated_grid():
     canvas._restore_scene(scene)
     assert len(canvas._items) >= 25
     canvas.destroy()
+
+def test_restore_renders_labels_and_saves_once_per_batch():
+    app, canvas = get_canvas()
+    scene = [
+        {"type": "rect", "label": f"R{i}", "x_mm": float(i * 10), "y_mm": 5.0, "w_mm": 8.0, "h_mm": 8.0, "z": i + 1}
+        for i in range(12)
+    ]
+    with patch.object(canvas, '_update_rect_label_image') as mock_label, \
+            patch.object(canvas, '_save_current_asin_objects') as mock_save:
+        canvas._restore_scene(scene)
+    assert mock_label.call_count == 12
+    assert all(c.kwargs.get("background") for c in mock_label.call_args_list)
+    assert mock_save.call_count == 1
+    assert canvas._bulk_depth == 0
+    zs = sorted(int(m.get("z", 0)) for m in canvas._items.values() if m.get("type") == "rect")
+    assert zs[-12:] == list(range(1, 13))
+    canvas.destroy()
@@ -1,6 +1,6 @@
 import sys
 from pathlib import Path
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
@@ -111,3 +111,26 @@ def test_restore_mixed_types():
     ]
     canvas._restore_scene(scene)
     canvas.destroy()
+
+def test_serialize_reuses_unchanged_items():
+    app, canvas = get_canvas()
+    rid = canvas._create_rect_at_mm("R1", 50.0, 40.0, 10.0, 15.0)
+    first = canvas._serialize_scene()
+    with patch.object(canvas, '_serialize_item', wraps=canvas._serialize_item) as mock_item:
+        second = canvas._serialize_scene()
+        assert mock_item.call_count == 0
+        canvas._items[rid]["x_mm"] = 20.0
+        third = canvas._serialize_scene()
+        assert mock_item.call_count == 1
+    assert first == second
+    assert first[0] is not second[0]
+    assert [it for it in third if it["type"] == "rect"][0]["x_mm"] == 20.0
+    canvas.destroy()
+
+def test_serialize_returns_independent_copies():
+    app, canvas = get_canvas()
+    canvas._create_rect_at_mm("R1", 50.0, 40.0, 10.0, 15.0)
+    rect = [it for it in canvas._serialize_scene() if it["type"] == "rect"][0]
+    rect["label"] = "changed"
+    assert [it for it in canvas._serialize_scene() if it["type"] == "rect"][0]["label"] == "R1"
+    canvas.destroy()
@@ -0,0 +1,78 @@
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+
+from src.canvas.object import CanvasObject
+from src.canvas.slots import SlotManager
+from src.canvas.spatial import SpatialIndex, item_bbox_mm
+
+
+@pytest.fixture
+def index():
+    return SpatialIndex(cell_mm=20.0)
+
+
+def _slot(x, y, w=10.0, h=10.0, **kw):
+    return CanvasObject(type="slot", x_mm=x, y_mm=y, w_mm=w, h_mm=h, **kw)
+
+
+def test_rotated_items_use_rotated_bounds():
+    meta = CanvasObject(type="image", x_mm=5.0, y_mm=5.0, w_mm=40.0, h_mm=10.0, angle=90.0)
+    x0, y0, x1, y1 = item_bbox_mm(meta)
+    assert (x0, y0) == (5.0, 5.0)
+    assert x1 == pytest.approx(15.0)
+    assert y1 == pytest.approx(45.0)
+
+
+def test_query_finds_only_overlapping_items(index):
+    items = {1: _slot(0, 0), 2: _slot(100, 100), 3: CanvasObject(type="major", x_mm=5, y_mm=5, w_mm=50, h_mm=50)}
+    index.sync(items)
+
+    assert sorted(index.query((8, 8, 12, 12))) == [1, 3]
+    assert index.query((8, 8, 12, 12), kinds=("major",), exclude=None) == [3]
+    assert index.query((8, 8, 12, 12), kinds=("major",), exclude=3) == []
+
+
+def test_sync_tracks_moves_and_removals(index):
+    items = {1: _slot(0, 0), 2: _slot(50, 0)}
+    index.sync(items)
+    items[1]["x_mm"] = 200.0
+    del items[2]
+
+    assert index.sync(items) == 2
+    assert index.query((0, 0, 60, 20)) == []
+    assert index.containing(205, 5) == [1]
+    assert index.sync(items) == 0
+
+
+def test_centers_in_and_nearest(index):
+    items = {
+        1: _slot(0, 0, 30, 30),
+        2: _slot(100, 0, 30, 30),
+        3: CanvasObject(type="text", x_mm=15.0, y_mm=15.0),
+        4: CanvasObject(type="rect", x_mm=25.0, y_mm=25.0, w_mm=20.0, h_mm=20.0),
+    }
+    index.sync(items)
+
+    assert index.centers_in((0, 0, 30, 30), kinds=("text", "rect")) == [3]
+    assert index.nearest(90, 10, kinds=("slot",)) == 2
+    assert index.nearest(40, 10, kinds=("slot",)) == 1
+
+
+def test_renumber_slots_orders_by_mm_and_skips_unchanged_labels():
+    canvas = Mock()
+    items = {
+        1: _slot(0, 0, label_id=11),
+        2: _slot(20, 0, label_id=12),
+        3: _slot(0, 20, label_id=13),
+    }
+    manager = SlotManager(SimpleNamespace(canvas=canvas, _items=items, spatial=SpatialIndex()))
+
+    manager.renumber_slots()
+
+    assert {c.args[0]: c.kwargs["text"] for c in canvas.itemconfig.call_args_list} == {13: "Slot 1", 12: "Slot 2", 11: "Slot 3"}
+    canvas.bbox.assert_not_called()
+    canvas.itemconfig.reset_mock()
+    manager.renumber_slots()
+    canvas.itemconfig.assert_not_called()
@@ -0,0 +1,109 @@
+from types import SimpleNamespace
+
+import pytest
+
+from src.canvas.object import CanvasObject
+from src.canvas.selection import CanvasSelection
+from src.canvas.zorder import ZOrderModel
+
+
+class FakeCanvas:
+    """Display list with Tk raise/lower semantics that counts stacking calls."""
+
+    def __init__(self):
+        self.stack = []
+        self.calls = 0
+        self._next = 1
+
+    def create(self):
+        cid = self._next
+        self._next += 1
+        self.stack.append(cid)
+        return cid
+
+    def find_all(self):
+        return tuple(self.stack)
+
+    def tag_raise(self, item, anchor=None):
+        self.calls += 1
+        self.stack.remove(item)
+        if anchor is None:
+            self.stack.append(item)
+        else:
+            self.stack.insert(self.stack.index(anchor) + 1, item)
+
+    def tag_lower(self, item, anchor=None):
+        self.calls += 1
+        self.stack.remove(item)
+        if anchor is None:
+            self.stack.insert(0, item)
+        else:
+            self.stack.insert(self.stack.index(anchor), item)
+
+
+@pytest.fixture
+def screen():
+    return SimpleNamespace(canvas=FakeCanvas(), _items={}, _zoom=1.0)
+
+
+def _add(screen, kind, z=0, label=False):
+    cid = screen.canvas.create()
+    meta = CanvasObject(type=kind, canvas_id=cid, z=z)
+    if label:
+        meta["label_id"] = screen.canvas.create()
+    screen._items[cid] = meta
+    return cid
+
+
+def _tracked(screen, model):
+    order = set(model.target_order())
+    return [i for i in screen.canvas.stack if i in order]
+
+
+def test_plan_is_empty_when_already_ordered():
+    assert ZOrderModel.plan([1, 2, 3, 4], [1, 2, 3, 4]) == []
+
+
+def test_plan_moves_single_item():
+    assert ZOrderModel.plan([1, 3, 2, 4], [1, 2, 3, 4]) in ([("raise", 2, 1)], [("raise", 3, 2)])
+
+
+def test_layers_and_labels_are_restored(screen):
+    obj = _add(screen, "image", z=0)
+    slot = _add(screen, "slot", label=True)
+    major = _add(screen, "major", label=True)
+    model = ZOrderModel(screen)
+
+    model.apply()
+
+    major_lbl = screen._items[major]["label_id"]
+    slot_lbl = screen._items[slot]["label_id"]
+    assert _tracked(screen, model) == [major, major_lbl, slot, slot_lbl, obj]
+    assert model.apply() == 0
+
+
+def test_untracked_items_are_kept_below(screen):
+    slot = _add(screen, "slot")
+    jig = screen.canvas.create()
+    model = ZOrderModel(screen)
+
+    assert model.apply() == 1
+    assert screen.canvas.stack.index(jig) < screen.canvas.stack.index(slot)
+
+
+def test_nudge_on_large_jig_costs_constant_calls(screen):
+    for _ in range(600):
+        _add(screen, "slot", label=True)
+    objs = [_add(screen, "image", z=i) for i in range(5)]
+    selection = CanvasSelection.__new__(CanvasSelection)
+    selection.s = screen
+    selection._selected = objs[1]
+    selection._zorder = ZOrderModel(screen)
+    selection._reorder_by_z()
+    screen.canvas.calls = 0
+
+    selection.nudge_z(+1)
+
+    assert screen.canvas.calls <= 2
+    assert [screen._items[c]["z"] for c in objs] == [0, 2, 1, 3, 4]
+    assert _tracked(screen, selection._zorder)[-5:] == [objs[0], objs[2], objs[1], objs[3], objs[4]]
@@ -0,0 +1,84 @@
+import json
+
+import pytest
+
+from src.batch.customization import CustomizationExtractor, get_image_customization_objs
+
+
+def _placement(name, label="Photo"):
+    return {
+        "type": "PlacementContainerCustomization",
+        "dimension": {"width": 100, "height": 80},
+        "position": {"x": 1, "y": 2},
+        "buyerPlacement": {"dimension": {"width": 50, "height": 40}, "position": {"x": 3, "y": 4}, "scale": {"scaleX": 1}, "angleOfRotation": 0},
+        "children": [{"type": "ImageCustomization", "label": f" {label} ", "image": {"imageName": name}}],
+    }
+
+
+def _order(areas_front, areas_back=(), data=None):
+    return {
+        "customizationInfo": {"version3.0": {"surfaces": [{"areas": list(areas_front)}, {"areas": list(areas_back)}]}},
+        "customizationData": data or {"type": "FlatContainerCustomization", "children": []},
+    }
+
+
+@pytest.fixture
+def extractor(tmp_path):
+    fonts = tmp_path / "fonts.json"
+    fonts.write_text(json.dumps({"Pacifico": "Pacifico"}), encoding="utf-8")
+    return CustomizationExtractor(fonts)
+
+
+def test_fonts_are_read_once(extractor):
+    area = {"customizationType": "TextPrinting", "label": "Name ", "text": "Anna", "fontFamily": "Pacifico"}
+
+    first = extractor.extract(_order([area]))
+    extractor.fonts_path.unlink()
+    second = extractor.extract(_order([area], [dict(area, fontFamily="Arial")]))
+
+    assert first["data"]["front"][0]["label"] == "Name"
+    assert second == {"status": "error", "message": "Font family Arial not found"}
+
+
+def test_image_areas_reuse_one_walk(extractor):
+    data = {"children": [_placement("a.jpg"), _placement("", label="Empty"), {"children": [_placement("b.jpg", label="Logo")]}]}
+    area = {"customizationType": "ImagePrinting"}
+
+    result = extractor.extract(_order([area], [area], data=data))
+
+    front, back = result["data"]["front"], result["data"]["back"]
+    assert [obj["image_path"] for obj in front] == ["a.jpg", "b.jpg"]
+    assert front == back and front[0] is not back[0]
+    assert front[1]["label"] == "Logo"
+    assert front[0]["mask_size"] == {"width": 100, "height": 80}
+
+
+def test_options_skip_answers_and_repeated_images(extractor):
+    def option(label, value, image):
+        return {"customizationType": "Options", "label": label, "optionValue": value, "optionImage": image}
+
+    areas = [
+        option("Motiv", "Herz", "https://img/heart.png"),
+        option("Extra", "Ja bitte", "https://img/yes.png"),
+        option("Extra 2", "Nein", "https://img/no.png"),
+        option("Geschenkbox", "Rot", "https://img/box.png"),
+        option("Farbe", "Blau", "https://img/swatch.png"),
+    ]
+    order = _order(areas, data={"swatches": ["https://img/swatch.png"] * 3})
+
+    result = extractor.extract(order)
+
+    assert [obj["label"] for obj in result["data"]["front"]] == ["Motiv"]
+
+
+def test_missing_surfaces_and_unknown_type(extractor):
+    assert extractor.extract({"customizationInfo": {"version3.0": {}}})["message"] == "Surfaces not found"
+    with pytest.raises(RuntimeError):
+        extractor.extract(_order([{"customizationType": "Engraving"}]))
+
+
+def test_get_image_customization_objs_returns_placements():
+    placement = _placement("a.jpg")
+
+    assert get_image_customization_objs({"children": [placement]}) == [placement]
+    assert get_image_customization_objs(placement["children"][0]) is placement["children"][0]
@@ -0,0 +1,96 @@
+import os
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.canvas.ezd_export import DxfCache, EzdExporter, InkscapeShell
+
+
+class FakeConverter:
+    def __init__(self):
+        self.calls = []
+
+    def convert_many(self, jobs):
+        self.calls.append(list(jobs))
+        for _, dxf_path in jobs:
+            with open(dxf_path, "w", encoding="utf-8") as f:
+                f.write("0\nEOF\n")
+        return [dxf_path for _, dxf_path in jobs]
+
+
+@pytest.fixture
+def svg_files(tmp_path):
+    paths = []
+    for idx, body in enumerate(["<svg id='a'/>", "<svg id='a'/>", "<svg id='b'/>"]):
+        path = tmp_path / f"logo_{idx}.svg"
+        path.write_text(body, encoding="utf-8")
+        paths.append(str(path))
+    return paths
+
+
+def test_identical_content_converted_once(tmp_path, svg_files):
+    converter = FakeConverter()
+    cache = DxfCache(cache_dir=tmp_path / "cache", converter=converter)
+
+    result = cache.convert_many(svg_files * 20)
+
+    assert len(converter.calls) == 1
+    assert len(converter.calls[0]) == 2
+    assert result[svg_files[0]] == result[svg_files[1]]
+    assert result[svg_files[0]] != result[svg_files[2]]
+
+
+def test_second_run_hits_cache(tmp_path, svg_files):
+    converter = FakeConverter()
+    cache = DxfCache(cache_dir=tmp_path / "cache", converter=converter)
+    cache.convert_many(svg_files)
+
+    fresh = DxfCache(cache_dir=tmp_path / "cache", converter=converter)
+    assert os.path.exists(fresh.convert(svg_files[2]))
+    assert len(converter.calls) == 1
+
+
+def test_eviction_keeps_max_entries(tmp_path, svg_files):
+    cache = DxfCache(cache_dir=tmp_path / "cache", max_entries=1, converter=FakeConverter())
+    cache.convert_many(svg_files)
+
+    assert len(list((tmp_path / "cache").glob("*.dxf"))) == 1
+
+
+def test_failed_conversion_returns_none(tmp_path, svg_files):
+    converter = Mock()
+    converter.convert_many = Mock(return_value=[])
+    cache = DxfCache(cache_dir=tmp_path / "cache", converter=converter)
+
+    assert cache.convert(svg_files[0]) is None
+
+
+def test_export_prefetches_all_svgs_in_one_batch(tmp_path, svg_files, monkeypatch):
+    import src.canvas.ezd_export as ezd_export
+
+    converter = FakeConverter()
+    monkeypatch.setattr(ezd_export, "_dxf_cache", DxfCache(cache_dir=tmp_path / "cache", converter=converter))
+    items = [{"type": "image", "svg_source_path": path} for path in svg_files]
+    items.append({"type": "image", "path": "photo.png"})
+
+    EzdExporter()._prefetch_dxf(items)
+
+    assert len(converter.calls) == 1
+
+
+def test_path_with_semicolon_skips_the_shell(tmp_path):
+    inkscape = tmp_path / "inkscape.com"
+    inkscape.write_text("", encoding="utf-8")
+    shell = InkscapeShell(inkscape)
+    svg_path, dxf_path = str(tmp_path / "a;b.svg"), str(tmp_path / "a;b.dxf")
+
+    def run(cmd, **kwargs):
+        open(dxf_path, "w").close()
+        return Mock(returncode=0)
+
+    with patch("src.canvas.ezd_export.subprocess.run", side_effect=run) as one_shot, \
+            patch.object(shell, "_start") as start:
+        assert shell.convert_many([(svg_path, dxf_path)]) == [dxf_path]
+
+    start.assert_not_called()
+    assert one_shot.call_args.args[0][1:] == ["--batch-process", svg_path, "--export-type=dxf", f"--export-filename={dxf_path}"]
@@ -0,0 +1,90 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.canvas.ezd_export import EzdExporter
+
+
+@pytest.fixture
+def client():
+    mock = MagicMock()
+    mock.add_file.return_value = 0
+    mock.copy_entity.return_value = 0
+    mock.get_entity_size.return_value = (0, {"min_x": -5.0, "min_y": -5.0, "max_x": 5.0, "max_y": 5.0, "z": 0.0})
+    return mock
+
+
+@pytest.fixture
+def exporter(client):
+    with patch.object(EzdExporter, "client", new=client):
+        yield EzdExporter()
+
+
+@pytest.fixture
+def image_path(tmp_path):
+    path = tmp_path / "logo.png"
+    path.write_bytes(b"png")
+    return str(path)
+
+
+def _image(path, x_mm, y_mm, **extra):
+    item = {"type": "image", "path": path, "x_mm": x_mm, "y_mm": y_mm, "w_mm": 10.0, "h_mm": 10.0, "angle": 0.0, "z": 1}
+    item.update(extra)
+    return item
+
+
+def test_identical_images_are_cloned(exporter, client, image_path, tmp_path):
+    items = [_image(image_path, 10.0 + 20.0 * i, 10.0) for i in range(4)]
+
+    exporter.export_scene(items, str(tmp_path / "out.ezd"), jig_w_mm=100.0, jig_h_mm=100.0)
+
+    assert client.add_file.call_count == 1
+    assert client.copy_entity.call_count == 3
+    client.copy_entity.assert_any_call(name="entity_0", new_name="entity_3")
+    client.move_entity.assert_any_call(name="entity_3", dx=60.0, dy=0.0)
+
+
+def test_items_with_distinct_z_are_cloned(exporter, client, image_path, tmp_path):
+    # The canvas gives each new item max z + 1
+    items = [_image(image_path, 10.0 + 20.0 * i, 10.0, z=i + 1) for i in range(4)]
+    items.append({"type": "text", "text": "Hi", "x_mm": 10.0, "y_mm": 40.0, "z": 5})
+    items.append({"type": "text", "text": "Hi", "x_mm": 30.0, "y_mm": 40.0, "z": 6})
+
+    exporter.export_scene(items, str(tmp_path / "out.ezd"), jig_w_mm=100.0, jig_h_mm=100.0)
+
+    assert client.add_file.call_count == 1
+    assert client.copy_entity.call_count == 4
+
+
+def test_different_specs_are_built_separately(exporter, client, image_path, tmp_path):
+    items = [
+        _image(image_path, 10.0, 10.0),
+        _image(image_path, 30.0, 10.0, angle=90.0),
+        _image(image_path, 50.0, 10.0, pen=2),
+    ]
+
+    exporter.export_scene(items, str(tmp_path / "out.ezd"), jig_w_mm=100.0, jig_h_mm=100.0)
+
+    assert client.add_file.call_count == 3
+    client.copy_entity.assert_not_called()
+
+
+def test_failed_copy_falls_back_to_full_build(exporter, client, image_path, tmp_path):
+    client.copy_entity.return_value = 18
+    items = [_image(image_path, 10.0, 10.0), _image(image_path, 30.0, 10.0)]
+
+    exporter.export_scene(items, str(tmp_path / "out.ezd"), jig_w_mm=100.0, jig_h_mm=100.0)
+
+    assert client.add_file.call_count == 2
+
+
+def test_text_clone_moves_by_center_delta(exporter, client, tmp_path):
+    items = [
+        {"type": "text", "text": "Hi", "x_mm": 10.0, "y_mm": 10.0, "z": 1},
+        {"type": "text", "text": "Hi", "x_mm": 10.0, "y_mm": 40.0, "z": 1},
+    ]
+
+    exporter.export_scene(items, str(tmp_path / "out.ezd"), jig_w_mm=100.0, jig_h_mm=100.0)
+
+    client.copy_entity.assert_called_once_with(name="entity_0", new_name="entity_1")
+    client.move_entity.assert_called_once_with(name="entity_1", dx=0.0, dy=-30.0)
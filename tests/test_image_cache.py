@@ -0,0 +1,71 @@
+import os
+
+from PIL import Image
+
+from src.batch.image_cache import TransformCache, content_hash
+
+
+def _image(color, size=(4, 4)):
+    return Image.new("RGBA", size, color)
+
+
+def test_key_depends_on_every_parameter():
+    key = TransformCache.make_key("transform", "abc", 1.0, 0, [1, 2])
+
+    assert key == TransformCache.make_key("transform", "abc", 1.0, 0, [1, 2])
+    assert key != TransformCache.make_key("transform", "abc", 1.0, 90, [1, 2])
+    assert key != TransformCache.make_key("option", "abc", 1.0, 0, [1, 2])
+    assert content_hash(b"x") != content_hash(b"y")
+
+
+def test_get_or_create_runs_once_and_survives_restart(tmp_path):
+    cache = TransformCache(tmp_path)
+    calls = []
+
+    def create():
+        calls.append(1)
+        return _image((255, 0, 0, 255))
+
+    first = cache.get_or_create("k", create)
+    assert cache.get_or_create("k", create) is first
+    assert len(calls) == 1
+
+    reopened = TransformCache(tmp_path)
+    restored = reopened.get_or_create("k", create)
+    assert len(calls) == 1
+    assert restored.getpixel((0, 0)) == (255, 0, 0, 255)
+    assert (reopened.hits, reopened.misses) == (1, 0)
+
+
+def test_errors_are_not_cached(tmp_path):
+    cache = TransformCache(tmp_path)
+
+    assert cache.get_or_create("k", lambda: {"status": "error"}) == {"status": "error"}
+    assert cache.get("k") is None
+    assert not list(tmp_path.glob("*.png"))
+
+
+def test_disk_evicts_least_recently_used(tmp_path):
+    probe = tmp_path / "probe"
+    TransformCache(probe).put("p", _image((1, 2, 3, 255), (32, 32)))
+    size = (probe / "p.png").stat().st_size
+
+    cache = TransformCache(tmp_path / "cache", memory_max_pixels=0, disk_max_bytes=int(size * 2.5))
+    for i, key in enumerate(("a", "b")):
+        cache.put(key, _image((1, 2, 3, 255), (32, 32)))
+        os.utime(cache.directory / f"{key}.png", (1000 + i, 1000 + i))
+    assert cache.get("a") is not None  # touched, now newer than "b"
+    cache.put("c", _image((1, 2, 3, 255), (32, 32)))
+
+    assert sorted(p.stem for p in cache.directory.glob("*.png")) == ["a", "c"]
+
+
+def test_memory_only_cache(tmp_path):
+    cache = TransformCache(None)
+    image = _image((0, 0, 0, 0))
+
+    cache.put("k", image)
+
+    assert cache.get("k") is image
+    cache.clear()
+    assert cache.get("k") is None
@@ -0,0 +1,95 @@
+from src.batch.journal import JobJournal
+from src.canvas import PDFInfo
+
+SIGNATURE = {"product": "Batch", "order_ids": [1, 2, 3], "formats": ["pdf"], "dpi": 300}
+
+
+def _pdf(path):
+    return PDFInfo(path=str(path), width_mm=100.0, height_mm=50.0, order_range="1-2", side="front")
+
+
+def test_unfinished_run_is_resumed(tmp_path):
+    out = tmp_path / "1-2.pdf"
+    out.write_bytes(b"%PDF sheet")
+    journal = JobJournal.for_run(tmp_path / "journal", "Batch", SIGNATURE)
+    assert not journal.resumable
+
+    journal.record_sheet("sheet-1", [out], [_pdf(out)], {"1-2"})
+    journal.record_combine(_pdf(out))
+    journal.record_checkpoint(["1_order.json", "2_order.json"], [], ["1-2"], True, pdf_start=None)
+    # Added after the checkpoint: not restored, the sheet is combined again when reused
+    journal.record_combine(_pdf(tmp_path / "later.pdf"))
+
+    resumed = JobJournal.for_run(tmp_path / "journal", "Batch", SIGNATURE)
+    assert resumed.resumable
+    assert resumed.checkpoint["done_orders"] == ["1_order.json", "2_order.json"]
+    assert resumed.combined_pdfs == [_pdf(out)]
+    assert resumed.rendered_sheet("sheet-1") == {"files": [str(out)], "pdf_infos": [_pdf(out)], "reserved": ["1-2"]}
+
+
+def test_changed_output_is_rendered_again(tmp_path):
+    out = tmp_path / "1-2.pdf"
+    out.write_bytes(b"%PDF sheet")
+    journal = JobJournal(tmp_path / "run.jsonl", SIGNATURE)
+    journal.record_sheet("sheet-1", [out], [], [])
+
+    out.write_bytes(b"%PDF half written")
+    assert JobJournal(tmp_path / "run.jsonl", SIGNATURE).rendered_sheet("sheet-1") is None
+    out.unlink()
+    assert JobJournal(tmp_path / "run.jsonl", SIGNATURE).rendered_sheet("sheet-1") is None
+
+
+def test_truncated_line_is_ignored(tmp_path):
+    journal = JobJournal(tmp_path / "run.jsonl", SIGNATURE)
+    journal.record_checkpoint(["1_order.json"], [], [], False)
+    with open(journal.path, "a", encoding="utf-8") as f:
+        f.write('{"event": "checkpoint", "done_or')
+
+    resumed = JobJournal(tmp_path / "run.jsonl", SIGNATURE)
+    assert resumed.checkpoint["done_orders"] == ["1_order.json"]
+
+
+def test_finished_or_different_run_starts_over(tmp_path):
+    journal = JobJournal(tmp_path / "run.jsonl", SIGNATURE)
+    journal.record_checkpoint(["1_order.json"], [], [], True)
+
+    assert not JobJournal(tmp_path / "run.jsonl", dict(SIGNATURE, dpi=600)).resumable
+    # The mismatching signature restarted the file
+    assert not JobJournal(tmp_path / "run.jsonl", SIGNATURE).resumable
+
+    journal = JobJournal(tmp_path / "run.jsonl", SIGNATURE)
+    journal.record_checkpoint(["1_order.json"], [], [], True)
+    journal.finish("success")
+    assert not JobJournal(tmp_path / "run.jsonl", SIGNATURE).resumable
+
+
+def test_resuming_twice_does_not_combine_a_sheet_twice(tmp_path):
+    a, b, c = (_pdf(tmp_path / f"{name}.pdf") for name in "abc")
+    journal = JobJournal(tmp_path / "run.jsonl", SIGNATURE)
+    journal.record_combine(a)
+    journal.record_checkpoint(["1_order.json"], [], [], True)
+    journal.record_combine(c)
+
+    # First resume redoes B and C past the checkpoint
+    resumed = JobJournal(tmp_path / "run.jsonl", SIGNATURE)
+    assert resumed.combined_pdfs == [a]
+    resumed.record_combine(b)
+    resumed.record_checkpoint(["1_order.json", "2_order.json"], [], [], True)
+    resumed.record_combine(c)
+    resumed.record_checkpoint(["1_order.json", "2_order.json", "3_order.json"], [], [], True)
+
+    assert JobJournal(tmp_path / "run.jsonl", SIGNATURE).combined_pdfs == [a, b, c]
+
+
+def test_sheets_after_the_checkpoint_stay_reusable(tmp_path):
+    out = tmp_path / "3-3.pdf"
+    out.write_bytes(b"%PDF sheet")
+    journal = JobJournal(tmp_path / "run.jsonl", SIGNATURE)
+    journal.record_checkpoint(["1_order.json"], [], [], True)
+    journal.record_sheet("sheet-3", [out], [_pdf(out)], [])
+    journal.record_combine(_pdf(out))
+
+    resumed = JobJournal(tmp_path / "run.jsonl", SIGNATURE)
+    assert resumed.rendered_sheet("sheet-3") is not None
+    assert resumed.combined_pdfs == []
+    assert JobJournal(tmp_path / "run.jsonl", SIGNATURE).rendered_sheet("sheet-3") is not None
@@ -0,0 +1,80 @@
+import threading
+import time
+
+import pytest
+
+from src.batch.pipeline import Prefetcher, RenderStage
+
+
+def test_prefetcher_yields_in_order_with_bounded_lookahead():
+    started = []
+    lock = threading.Lock()
+
+    def work(item):
+        with lock:
+            started.append(item)
+        time.sleep(0.01 * (5 - item))
+        return item * 10
+
+    seen = []
+    for item, result in Prefetcher(work, range(5), workers=3, depth=2):
+        seen.append((item, result))
+        with lock:
+            assert len(started) <= item + 2
+
+    assert seen == [(i, i * 10) for i in range(5)]
+
+
+def test_prefetcher_reraises_and_stops():
+    def work(item):
+        if item == 1:
+            raise ValueError("bad order")
+        return item
+
+    with pytest.raises(ValueError):
+        list(Prefetcher(work, range(10), workers=2, depth=2))
+
+
+def test_render_stage_calls_back_on_caller_thread_in_order():
+    caller = threading.get_ident()
+    render_threads = set()
+    done = []
+
+    def render(n):
+        render_threads.add(threading.get_ident())
+        if n == 2:
+            raise RuntimeError("disk full")
+        return {"status": "success", "n": n}
+
+    def on_done(result):
+        assert threading.get_ident() == caller
+        done.append(result)
+
+    stage = RenderStage(render, max_pending=1)
+    for n in range(4):
+        stage.submit(on_done, n)
+    stage.close()
+
+    assert caller not in render_threads
+    assert [r.get("n") for r in done] == [0, 1, None, 3]
+    assert done[2] == {"status": "error", "message": "disk full"}
+
+
+def test_render_stage_cancel_drops_queued_sheets():
+    started, gate = threading.Event(), threading.Event()
+    rendered = []
+
+    def render(n):
+        started.set()
+        gate.wait(1)
+        rendered.append(n)
+        return {"status": "success"}
+
+    stage = RenderStage(render, max_pending=3)
+    for n in range(3):
+        stage.submit(lambda result: None, n)
+    assert started.wait(1)
+    threading.Timer(0.05, gate.set).start()
+    stage.close(cancel=True)
+
+    assert rendered == [0]
@@ -0,0 +1,123 @@
+import io
+import json
+from copy import deepcopy
+
+import pytest
+
+from src.core.product_format import (
+    ASINPatterns,
+    apply_patch,
+    compact_asin_objects,
+    compact_product,
+    diff_patterns,
+    load_product,
+    migrate_product_file,
+)
+
+
+def _pattern(label="Major size 1", text="Name", slots=8):
+    return {
+        "Frontside": [{
+            "label": label,
+            "slots": [
+                {
+                    "label": f"Slot {i + 1}",
+                    "x_mm": 10.0 * i,
+                    "objects": [{"type": "text", "amazon_label": text, "label": "", "size_pt": 12}],
+                }
+                for i in range(slots)
+            ],
+        }],
+        "Backside": [],
+    }
+
+
+@pytest.fixture
+def asin_objects():
+    other = _pattern(label="Big")
+    other["FrontsideBarcode"] = {"x_mm": 1.0}
+    return {
+        "A1": _pattern(),
+        "A2": _pattern(),
+        "A3": _pattern(),
+        "B1": other,
+        "C1": _pattern(slots=5),
+    }
+
+
+def test_diff_and_patch_round_trip():
+    base = _pattern()
+    other = _pattern(label="Big", slots=3)
+    other["Backside"] = None
+
+    ops = diff_patterns(base, other)
+    patched = apply_patch(base, ops)
+
+    assert patched == other
+    assert base == _pattern()
+    assert diff_patterns(base, _pattern()) == []
+
+
+def test_diff_keeps_int_float_distinction():
+    ops = diff_patterns({"x": 1}, {"x": 1.0})
+
+    assert ops == [["set", ["x"], 1.0]]
+    assert isinstance(apply_patch({"x": 1}, ops)["x"], float)
+
+
+def test_identical_patterns_share_one_template(asin_objects):
+    templates, entries = compact_asin_objects(asin_objects)
+
+    assert list(entries) == list(asin_objects)
+    assert entries["A1"] == entries["A2"] == entries["A3"] == {"$base": "base"}
+    assert entries["B1"]["$base"] == "base"
+    assert entries["B1"]["$patch"]
+    patterns = ASINPatterns(entries, templates)
+    assert {asin: patterns[asin] for asin in patterns} == asin_objects
+
+
+def test_lazy_lookup_is_cached_and_copy_of_is_fresh(asin_objects):
+    templates, entries = compact_asin_objects(asin_objects)
+    patterns = ASINPatterns(entries, templates)
+
+    first = patterns["A1"]
+    first["Frontside"][0]["slots"].pop()
+
+    assert patterns["A1"] is first
+    assert len(patterns.copy_of("A1")["Frontside"][0]["slots"]) == 8
+    assert len(patterns["A2"]["Frontside"][0]["slots"]) == 8
+
+
+def test_deepcopy_preserves_resolved_state(asin_objects):
+    templates, entries = compact_asin_objects(asin_objects)
+    patterns = ASINPatterns(entries, templates)
+    patterns["A1"]["Frontside"][0]["label"] = "Edited"
+
+    copied = deepcopy(patterns)
+    copied["A1"]["Frontside"][0]["label"] = "Copy"
+
+    assert patterns["A1"]["Frontside"][0]["label"] == "Edited"
+    assert copied["A2"]["Frontside"][0]["label"] == "Major size 1"
+
+
+def test_load_product_accepts_legacy_and_compact(asin_objects):
+    legacy = {"SkuName": "X", "Scene": {}, "ASINObjects": asin_objects}
+    compact = compact_product(legacy)
+
+    assert list(compact) == ["SkuName", "Scene", "ASINTemplates", "ASINObjects"]
+    for raw in (legacy, compact):
+        data = load_product(io.StringIO(json.dumps(raw)))
+        assert "ASINTemplates" not in data
+        assert isinstance(data["ASINObjects"], ASINPatterns)
+        assert dict(data["ASINObjects"].items()) == asin_objects
+
+
+def test_migrate_product_file(tmp_path, asin_objects):
+    path = tmp_path / "product.json"
+    path.write_text(json.dumps({"SkuName": "X", "ASINObjects": asin_objects}), encoding="utf-8")
+
+    assert migrate_product_file(path) is True
+    assert migrate_product_file(path) is False
+    with path.open("r", encoding="utf-8") as f:
+        data = load_product(f)
+    assert dict(data["ASINObjects"].items()) == asin_objects
@@ -0,0 +1,67 @@
+import json
+import threading
+import time
+
+import pytest
+
+from src.core.profiling import Profiler, record_span, span
+
+
+@pytest.fixture
+def profiler():
+    profiler = Profiler()
+    profiler.activate()
+    yield profiler
+    profiler.deactivate()
+
+
+def test_spans_are_recorded_from_every_thread(profiler):
+    with span("download", order=1) as attrs:
+        attrs["bytes"] = 100
+    with span("render", pixels=4):
+        pass
+
+    def _worker():
+        with span("download", order=2, bytes=50):
+            pass
+
+    thread = threading.Thread(target=_worker, name="worker")
+    thread.start()
+    thread.join()
+
+    assert [(s["name"], s["thread"]) for s in profiler.spans] == [
+        ("download", threading.current_thread().name), ("render", threading.current_thread().name), ("download", "worker"),
+    ]
+    summary = {stage["name"]: stage for stage in profiler.summary()}
+    assert summary["download"]["count"] == 2
+    assert summary["download"]["bytes"] == 150
+    assert summary["render"]["pixels"] == 4
+    assert "bytes" not in summary["render"]
+    assert profiler.report()[0].startswith("Stage timings")
+
+
+def test_chrome_trace_has_complete_events_and_thread_names(profiler, tmp_path):
+    with span("make_pdf", orders="1-2"):
+        record_span("pdf.rasterize", time.perf_counter(), pixels=10)
+
+    path = profiler.write_chrome_trace(tmp_path / "trace.json")
+    events = json.loads(path.read_text(encoding="utf-8"))["traceEvents"]
+    complete = [e for e in events if e["ph"] == "X"]
+    assert [e["name"] for e in complete] == ["pdf.rasterize", "make_pdf"]
+    assert complete[1]["args"] == {"orders": "1-2"}
+    assert all(e["dur"] >= 0 for e in complete)
+    assert [e["args"]["name"] for e in events if e["ph"] == "M"] == [threading.current_thread().name]
+
+
+def test_span_without_active_profiler_records_nothing():
+    profiler = Profiler()
+    with span("download", bytes=1) as attrs:
+        attrs["pixels"] = 2
+    record_span("render", 0.0)
+    assert profiler.spans == []
+
+    profiler.activate()
+    profiler.deactivate()
+    with span("download"):
+        pass
+    assert profiler.spans == []
@@ -0,0 +1,74 @@
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.sdk.sdk_client import SDKClient, SDKConnectionError
+
+
+@pytest.fixture
+def client():
+    SDKClient.reset()
+    instance = SDKClient(port=59999)
+    yield instance
+    instance.restart_server = Mock()
+    SDKClient.reset()
+
+
+def test_wait_for_server_uses_exponential_backoff(client):
+    client.server_process = Mock()
+    client.server_process.poll.return_value = None
+    client._try_connect = Mock(side_effect=[False, False, False, False, True])
+
+    with patch("src.sdk.sdk_client.time.sleep") as sleep:
+        client._wait_for_server()
+
+    assert [c.args[0] for c in sleep.call_args_list] == [0.05, 0.1, 0.2, 0.4]
+
+
+def test_wait_for_server_fails_fast_when_process_exits(client):
+    client.server_process = Mock()
+    client.server_process.poll.return_value = 1
+    client.server_process.returncode = 1
+    client._try_connect = Mock(return_value=False)
+
+    with patch("src.sdk.sdk_client.time.sleep"):
+        with pytest.raises(RuntimeError, match="exited"):
+            client._wait_for_server()
+
+
+def test_ping_is_retried_after_restart(client):
+    client._exchange = Mock(side_effect=[SDKConnectionError("gone"), {"success": True, "result": "pong"}])
+    client.restart_server = Mock()
+
+    assert client.ping() == "pong"
+    client.restart_server.assert_called_once()
+
+
+def test_stateful_call_restarts_but_raises(client):
+    client._exchange = Mock(side_effect=SDKConnectionError("gone"))
+    client.restart_server = Mock()
+
+    with pytest.raises(SDKConnectionError):
+        client.add_text(text="A", name="a", x=0, y=0)
+    client.restart_server.assert_called_once()
+
+
+def test_ensure_initialized_runs_once(client):
+    client._exchange = Mock(return_value={"success": True, "result": 0})
+
+    assert client.ensure_initialized() == 0
+    assert client.ensure_initialized() == 0
+    assert client._exchange.call_count == 1
+    assert client.sdk_initialized
+
+
+def test_restart_reinitializes_sdk(client):
+    client._exchange = Mock(return_value={"success": True, "result": 0})
+    client.initialize()
+    client.start_server = Mock()
+
+    SDKClient.restart_server(client)
+
+    client.start_server.assert_called_once()
+    assert client._exchange.call_args.args == ("initialize", {})
+    assert client.sdk_initialized
@@ -0,0 +1,86 @@
+import pytest
+
+from src.sdk.ezcad_sdk import EzcadSDK, LMC1Error
+
+
+@pytest.fixture
+def sdk():
+    EzcadSDK._instance = None
+    instance = EzcadSDK(backend="fake")
+    instance.dll.latency_scale = 0
+    yield instance
+    EzcadSDK._instance = None
+
+
+def test_fake_backend_is_selected(sdk):
+    assert sdk.backend == "fake"
+    assert sdk.initialize() == LMC1Error.SUCCESS
+
+
+def test_text_entity_size_and_move(sdk):
+    sdk.set_font(font_name="Arial", height=4.0, width=2.0)
+    assert sdk.add_text(text="ABCDE", name="t", x=0.0, y=0.0) == LMC1Error.SUCCESS
+
+    error, size = sdk.get_entity_size(name="t")
+    assert error == LMC1Error.SUCCESS
+    assert size["max_x"] - size["min_x"] == pytest.approx(10.0)
+    assert size["max_y"] - size["min_y"] == pytest.approx(4.0)
+
+    sdk.move_entity(name="t", dx=5.0, dy=-1.0)
+    _, moved = sdk.get_entity_size(name="t")
+    assert moved["min_x"] == pytest.approx(size["min_x"] + 5.0)
+    assert moved["min_y"] == pytest.approx(size["min_y"] - 1.0)
+
+
+def test_copy_rename_delete(sdk):
+    sdk.add_text(text="A", name="a", x=0.0, y=0.0)
+    assert sdk.copy_entity(name="a", new_name="b") == LMC1Error.SUCCESS
+    assert sdk.get_entity_count() == 2
+    assert sdk.rename_entity(name="b", new_name="c") == LMC1Error.SUCCESS
+    assert sdk.get_entity_name(index=1) == (LMC1Error.SUCCESS, "c")
+    assert sdk.delete_entity(name="missing") == LMC1Error.NOFINDENT
+
+
+def test_save_and_load_roundtrip(sdk, tmp_path):
+    sdk.add_text(text="A", name="a", x=1.0, y=2.0)
+    path = tmp_path / "doc.ezd"
+    assert sdk.save_file(filename=str(path)) == LMC1Error.SUCCESS
+
+    sdk.clear_all()
+    assert sdk.get_entity_count() == 0
+    assert sdk.load_file(filename=str(path)) == LMC1Error.SUCCESS
+    assert sdk.get_entity_count() == 1
+
+
+def test_pen_params_roundtrip(sdk):
+    sdk.set_pen_param(pen_no=3, loop_count=2, speed=1234.0, frequency=30000)
+    error, params = sdk.get_pen_param(pen_no=3)
+    assert error == LMC1Error.SUCCESS
+    assert params["loop_count"] == 2
+    assert params["speed"] == 1234.0
+    assert params["frequency"] == 30000
+
+    sdk.set_pen_param_wobble(pen_no=3, wobble_mode=True, wobble_diameter=1.5)
+    _, wobble = sdk.get_pen_param_wobble(pen_no=3)
+    assert wobble["wobble_mode"] is True
+    assert wobble["wobble_diameter"] == 1.5
+
+
+def test_latency_is_applied_per_call(sdk):
+    sdk.dll.latency_scale = 1
+    sdk.dll.latencies["lmc1_GetEntityCount"] = 0.0
+    sdk.get_entity_count()
+    assert sdk.dll.call_counts["lmc1_GetEntityCount"] == 1
+
+
+@pytest.mark.slow
+def test_bridge_benchmark_runs_end_to_end():
+    from benchmarks.bench_sdk_bridge import run
+
+    results = run(latency_scale=0.0, slots=8)
+
+    assert results["ping_per_s"] > 0
+    identical = results["jigs"]["identical_images"]
+    distinct = results["jigs"]["distinct_images"]
+    assert identical["entities"] == distinct["entities"] == 8
+    assert identical["rpc_calls"] < distinct["rpc_calls"]
@@ -0,0 +1,113 @@
+import threading
+import time
+from unittest.mock import Mock, patch
+
+from src.sdk.sdk_pool import SDKClientPool
+
+
+def _client(port, initialized=True):
+    client = Mock()
+    client.port = port
+    client.sdk_path = "sdk"
+    client.python_32bit = "py"
+    client.backend = None
+    client.sdk_initialized = initialized
+    return client
+
+
+def _standalone_factory(failing_ports=()):
+    def factory(**kwargs):
+        client = _client(kwargs["port"])
+        if kwargs["port"] in failing_ports:
+            client.warm_up.side_effect = RuntimeError("no server")
+        return client
+    return factory
+
+
+def test_map_preserves_job_order():
+    pool = SDKClientPool(_client(100), size=3)
+    with patch("src.sdk.sdk_pool.SDKClient.standalone", side_effect=_standalone_factory()):
+        results = pool.map(lambda client, job: (job, client.port), [3, 1, 2, 5])
+
+    assert [job for job, _ in results] == [3, 1, 2, 5]
+    assert {port for _, port in results} <= {100, 101, 102}
+
+
+def test_each_server_builds_one_document_at_a_time():
+    pool = SDKClientPool(_client(100), size=2)
+    active = {}
+    overlaps = []
+    lock = threading.Lock()
+
+    def work(client, job):
+        with lock:
+            if active.get(client.port):
+                overlaps.append(client.port)
+            active[client.port] = True
+        time.sleep(0.01)
+        with lock:
+            active[client.port] = False
+        return job
+
+    with patch("src.sdk.sdk_pool.SDKClient.standalone", side_effect=_standalone_factory()):
+        assert pool.map(work, list(range(8))) == list(range(8))
+    assert overlaps == []
+
+
+def test_failed_servers_are_left_out_and_not_retried():
+    pool = SDKClientPool(_client(100), size=3)
+    factory = Mock(side_effect=_standalone_factory(failing_ports={102}))
+    with patch("src.sdk.sdk_pool.SDKClient.standalone", factory):
+        assert [c.port for c in pool.clients(3)] == [100, 101]
+        assert [c.port for c in pool.clients(3)] == [100, 101]
+    assert factory.call_count == 2
+
+
+def test_single_job_uses_primary_only():
+    primary = _client(100)
+    pool = SDKClientPool(primary, size=4)
+    with patch("src.sdk.sdk_pool.SDKClient.standalone") as factory:
+        assert pool.map(lambda client, job: client, ["a"]) == [primary]
+    factory.assert_not_called()
+
+
+def test_cancel_skips_jobs_not_yet_started():
+    pool = SDKClientPool(_client(100), size=2)
+    done = []
+    cancel = threading.Event()
+
+    def work(client, job):
+        # Jobs 0 and 1 run side by side; the cancel lands before either frees a server
+        if job == 1:
+            cancel.set()
+        cancel.wait(1)
+        return job
+
+    with patch("src.sdk.sdk_pool.SDKClient.standalone", side_effect=_standalone_factory()):
+        results = pool.map(work, list(range(6)), cancelled=cancel.is_set, on_done=lambda index, result: done.append(index))
+
+    assert results == [0, 1, None, None, None, None]
+    assert sorted(done) == [0, 1]
+
+
+def test_export_scenes_collects_errors_per_document(tmp_path):
+    from src.canvas.ezd_export import EzdExporter
+
+    pool = SDKClientPool(_client(100), size=2)
+    exporter = EzdExporter(client=pool.primary)
+    progress = []
+
+    def export_scene(self, items, path, *args, **kwargs):
+        if path.endswith("bad.ezd"):
+            raise RuntimeError("save failed")
+        return True
+
+    jobs = [([], str(tmp_path / name)) for name in ("a.ezd", "bad.ezd", "c.ezd")]
+    with patch("src.sdk.sdk_pool.SDKClient.standalone", side_effect=_standalone_factory()), \
+            patch("src.canvas.ezd_export.get_sdk_pool", return_value=pool), \
+            patch.object(EzdExporter, "export_scene", export_scene):
+        results = exporter.export_scenes(jobs, on_progress=lambda done, total: progress.append((done, total)))
+
+    assert [r["status"] for r in results] == ["success", "error", "success"]
+    assert results[1]["message"] == "save failed"
+    assert progress == [(1, 3), (2, 3), (3, 3)]
@@ -0,0 +1,100 @@
+import pytest
+
+from src.core.slot_state import SlotPool, SlotState
+
+
+def _slot(label, objects=True):
+    objs = [{"type": "image", "amazon_label": "Photo", "mask_path": ""}] if objects else []
+    return {"label": label, "x_mm": 0.0, "y_mm": 0.0, "w_mm": 10.0, "h_mm": 10.0, "objects": objs}
+
+
+@pytest.fixture
+def pattern():
+    return {
+        "Frontside": [
+            {"label": "Major size 1", "slots": [_slot("Slot 1"), _slot("Slot 2")]},
+            {"label": "Major size 2", "slots": [_slot("Slot 3", objects=False)]},
+        ],
+        "Backside": [
+            {"label": "Major size 1", "slots": [_slot("Slot 1", objects=False), _slot("Slot 2", objects=False)]},
+        ],
+    }
+
+
+def test_take_returns_private_copy_and_leaves_pattern_alone(pattern):
+    state = SlotState(pattern)
+
+    pos, slot = next(state.free_slots("Frontside"))
+    taken = state.take("Frontside", pos)
+    taken["objects"][0]["loaded_image"] = object()
+
+    assert taken["label"] == "Slot 1"
+    assert "loaded_image" not in pattern["Frontside"][0]["slots"][0]["objects"][0]
+    assert state.free_labels("Frontside") == ["Slot 2", "Slot 3"]
+    assert state.signature("Frontside", pos) == {("Photo", "image")}
+
+
+def test_is_filled_counts_only_slots_with_objects(pattern):
+    state = SlotState(pattern)
+
+    assert state.take_label("Frontside", "Slot 1") == 1
+    assert not state.is_filled
+    assert state.take_label("Backside", "Slot 1") == 1
+    assert state.take_label("Backside", "Slot 1") == 0
+    assert not state.is_filled
+    state.take_label("Frontside", "Slot 2")
+    assert state.is_filled
+
+
+def test_reset(pattern):
+    state = SlotState(pattern)
+    state.take_label("Frontside", "Slot 1")
+    state.take_label("Frontside", "Slot 2")
+    assert state.is_filled
+
+    state.reset()
+    assert not state.is_filled
+    assert state.free_labels("Frontside") == ["Slot 1", "Slot 2", "Slot 3"]
+    assert state.free_labels("Backside") == ["Slot 1", "Slot 2"]
+
+
+def test_pattern_without_objects_is_never_filled():
+    state = SlotState({"Frontside": [{"slots": [_slot("Slot 1", objects=False)]}], "Backside": []})
+
+    state.take_label("Frontside", "Slot 1")
+
+    assert not state.is_filled
+
+
+def test_select_uses_key_index_and_label(pattern):
+    state = SlotState(pattern)
+    key = ("Photo", "image")
+
+    pos = state.select("Frontside", key)
+    assert state.take("Frontside", pos)["label"] == "Slot 1"
+    assert state.select("Frontside", key) == 1
+    assert state.select("Frontside", key, label="Slot 1") is None
+    assert state.select("Frontside", ("Name", "text")) is None
+    assert state.has_free("Frontside", "Slot 2")
+    assert not state.has_free("Frontside", "Slot 3")
+
+    state.take_label("Frontside", "Slot 2")
+    assert state.select("Frontside", key) is None
+    assert not state.has_free("Frontside")
+
+
+def test_pool_takes_label_for_other_members_on_both_sides(pattern):
+    pool = SlotPool()
+    first, second = pool.add(pattern), pool.add(pattern)
+
+    first.take("Frontside", first.select("Frontside", ("Photo", "image")))
+
+    assert first.free_labels("Backside") == ["Slot 1", "Slot 2"]
+    assert second.free_labels("Frontside") == ["Slot 2", "Slot 3"]
+    assert second.free_labels("Backside") == ["Slot 2"]
+
+    pool.reset()
+    second.take("Frontside", second.select("Frontside", ("Photo", "image")))
+
+    assert first.free_labels("Frontside") == ["Slot 2", "Slot 3"]
+    assert second.free_labels("Backside") == ["Slot 1", "Slot 2"]
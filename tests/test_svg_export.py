@@ -349,3 +349,123 @@ def test_render_scene_to_svg_dpi_parameter():
     assert len(content_300) > len(content_72)
     
     os.unlink(temp_path)
+
+
+def test_render_scene_to_svg_vector_inlines_svg_images(tmp_path):
+    from src.canvas.export import PdfExporter
+
+    exporter = PdfExporter(Mock())
+    source = tmp_path / "heart.svg"
+    source.write_text(
+        '<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" '
+        'xmlns:inkscape="http://www.inkscape.org/namespaces/inkscape" width="20mm" height="10mm" fill="#ff0000">'
+        '<defs><linearGradient id="g"><stop offset="0"/></linearGradient></defs>'
+        '<inkscape:grid/><path id="p" d="M0 0L20 10" inkscape:label="heart" style="fill:url(#g)"/>'
+        '<use xlink:href="#p"/></svg>',
+        encoding="utf-8",
+    )
+    items = [
+        {"type": "image", "x_mm": 10.0, "y_mm": 10.0, "w_mm": 30.0, "h_mm": 15.0, "path": str(source), "angle": 0, "z": 1},
+        {"type": "image", "x_mm": 50.0, "y_mm": 10.0, "w_mm": 30.0, "h_mm": 15.0, "path": str(source), "angle": 90.0, "z": 1},
+    ]
+    out = tmp_path / "scene.svg"
+
+    with patch("src.canvas.export.svg_to_png") as rasterize:
+        exporter.render_scene_to_svg(str(out), items, 100.0, 100.0, dpi=150, vector=True)
+
+    content = out.read_text(encoding="utf-8")
+    rasterize.assert_not_called()
+    assert "base64" not in content
+    assert content.count("<symbol") == 1 and content.count('viewBox="0 0 20 10"') == 1
+    assert '<g fill="#ff0000">' in content
+    assert "inkscape" not in content
+    symbol_id = content.split('<symbol id="')[1].split('"')[0]
+    assert f'id="{symbol_id}-p"' in content and f'url(#{symbol_id}-g)' in content and f'xlink:href="#{symbol_id}-p"' in content
+    assert content.count(f'<use xlink:href="#{symbol_id}"') == 2
+    assert 'transform="rotate(-90' in content
+
+
+def test_render_scene_to_svg_vector_scopes_inlined_stylesheets(tmp_path):
+    from src.canvas.export import PdfExporter
+
+    exporter = PdfExporter(Mock())
+    styled = tmp_path / "styled.svg"
+    styled.write_text(
+        '<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 10 10">'
+        '<style>/* exported */ .st0{fill:#FFFFFF} #p.st1, .st0 .st1{stroke:#000}</style>'
+        '<path id="p" class="st0 st1" d="M0 0L10 10"/></svg>',
+        encoding="utf-8",
+    )
+    global_rule = tmp_path / "global.svg"
+    global_rule.write_text(
+        '<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 10 10">'
+        '<style>path{fill:red}</style><path d="M0 0L10 10"/></svg>',
+        encoding="utf-8",
+    )
+    items = [
+        {"type": "image", "x_mm": 10.0, "y_mm": 10.0, "w_mm": 10.0, "h_mm": 10.0, "path": str(styled), "angle": 0, "z": 1},
+        {"type": "image", "x_mm": 30.0, "y_mm": 10.0, "w_mm": 10.0, "h_mm": 10.0, "path": str(global_rule), "angle": 0, "z": 1},
+    ]
+    out = tmp_path / "scene.svg"
+
+    with patch("src.canvas.export.svg_to_png", return_value=Image.new("RGBA", (4, 4))) as rasterize:
+        exporter.render_scene_to_svg(str(out), items, 100.0, 100.0, dpi=150, vector=True)
+
+    content = out.read_text(encoding="utf-8")
+    symbol_id = content.split('<symbol id="')[1].split('"')[0]
+    p = f"{symbol_id}-"
+    assert f'class="{p}st0 {p}st1"' in content
+    assert f".{p}st0{{fill:#FFFFFF}}" in content
+    assert f"#{p}p.{p}st1,.{p}st0 .{p}st1{{stroke:#000}}" in content
+    # A type selector would restyle the whole scene: that source is rasterized
+    assert content.count("<symbol") == 1 and "path{fill:red}" not in content
+    rasterize.assert_called_once()
+    assert rasterize.call_args.args[0] == str(global_rule)
+
+
+def test_render_scene_to_svg_vector_embeds_each_raster_once(tmp_path):
+    from src.canvas.export import PdfExporter
+
+    exporter = PdfExporter(Mock())
+    photo = tmp_path / "photo.jpg"
+    Image.new("RGB", (40, 20), (0, 128, 255)).save(photo, format="JPEG")
+    prepared = Image.new("RGBA", (64, 64), (255, 0, 0, 128))
+    items = [
+        {"type": "image", "x_mm": 0.0, "y_mm": 0.0, "w_mm": 10.0, "h_mm": 10.0, "path": "", "loaded_image": prepared, "z": 1},
+        {"type": "image", "x_mm": 20.0, "y_mm": 0.0, "w_mm": 10.0, "h_mm": 10.0, "path": "", "loaded_image": prepared, "z": 1},
+        {"type": "image", "x_mm": 40.0, "y_mm": 0.0, "w_mm": 20.0, "h_mm": 10.0, "path": str(photo), "z": 1},
+        {"type": "image", "x_mm": 40.0, "y_mm": 20.0, "w_mm": 20.0, "h_mm": 10.0, "path": str(photo), "z": 1},
+    ]
+    out = tmp_path / "scene.svg"
+
+    exporter.render_scene_to_svg(str(out), items, 100.0, 100.0, dpi=150, vector=True)
+
+    content = out.read_text(encoding="utf-8")
+    assert content.count("data:image/png;base64,") == 1
+    # The source JPEG is embedded as is, not resized and re-encoded
+    assert content.count("data:image/jpeg;base64,") == 1
+    assert content.count('<use xlink:href="#img-') == 4
+    assert 'transform="translate(40.000 20.000) scale(20.000 10.000)"' in content
+
+
+def test_render_scene_to_svg_vector_barcode():
+    from src.canvas.export import PdfExporter
+
+    exporter = PdfExporter(Mock())
+    items = [
+        {"type": "barcode", "x_mm": 25.0, "y_mm": 25.0, "w_mm": 40.0, "h_mm": 15.0, "label": "BC001", "angle": 90.0, "z": 3},
+    ]
+
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".svg", delete=False) as f:
+        temp_path = f.name
+
+    exporter.render_scene_to_svg(temp_path, items, 100.0, 100.0, dpi=150, vector=True)
+
+    with open(temp_path, "r", encoding="utf-8") as f:
+        content = f.read()
+
+    assert "base64" not in content
+    assert 'class="barcode"' in content and "rotate(-90" in content
+    assert ">BC001</text>" in content
+
+    os.unlink(temp_path)